@@ -0,0 +1,104 @@
+from typing import (
+    Any,
+    Callable,
+)
+
+from benchmarks.bench_vm import (
+    parse,
+    timed,
+)
+from lpp.arrays import (
+    BACKEND,
+    make_array,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import (
+    Environment,
+    Error,
+)
+from lpp.vm import VM
+
+'''
+    Compara operaciones sobre arreglos de un millon de enteros hechas con
+    un solo Infix (elemento por elemento en lpp.arrays) contra la misma
+    cuenta hecha con un `para` que indexa cada elemento, en el evaluador y
+    en la maquina virtual.
+
+    Los arreglos a y b se crean antes de medir y llegan al programa como
+    variables globales.
+
+    python -m benchmarks.bench_arrays
+'''
+
+
+SIZE: int = 1_000_000
+
+# Cada programa da el numero de elementos de a * 2 + b que son menores
+# que 3 * b
+VECTOR: str = '''
+variable c = a * 2 + b < b * 3;
+variable cuenta = funcion(n) {
+    para (variable i = 0, total = 0; i < n; i = i + 1,
+          total = si (c[i]) { total + 1 } si_no { total }) {};
+    total
+};
+cuenta(n);
+'''
+
+LOOP: str = '''
+variable cuenta = funcion(n) {
+    para (variable i = 0, total = 0; i < n; i = i + 1,
+          total = si (a[i] * 2 + b[i] < b[i] * 3) { total + 1 } si_no { total }) {};
+    total
+};
+cuenta(n);
+'''
+
+# Solo la parte vectorizada, sin recorrer el resultado
+OPERATIONS: str = 'a * 2 + b < b * 3;'
+
+
+GLOBALS: list[Any] = [
+    make_array(list(range(SIZE))),
+    make_array([SIZE - value for value in range(SIZE)]),
+    SIZE,
+]
+
+
+def _environment() -> Environment:
+    environment = Environment()
+    environment.names = ['a', 'b', 'n']
+    environment.values = list(GLOBALS)
+    return environment
+
+
+def _backends() -> list[tuple[str, Callable[[str, Environment], Any]]]:
+    return [
+        ('AST', lambda source, environment:
+            Evaluator(environment, memoize=False).evaluate(parse(source))),
+        ('VM', lambda source, environment:
+            VM(environment, memoize=False).execute(parse(source))),
+    ]
+
+
+def main() -> None:
+    # a[i] * 2 + b[i] < b[i] * 3 es lo mismo que a[i] < b[i]
+    expected = sum(1 for value in range(SIZE) if value < SIZE - value)
+    print(f'arreglos con {BACKEND}, {SIZE} elementos')
+
+    for name, execute in _backends():
+        environments = [_environment() for _ in range(3)]
+        operations, operations_seconds = timed(lambda: execute(OPERATIONS, environments[0]))
+        vector, vector_seconds = timed(lambda: execute(VECTOR, environments[1]))
+        loop, loop_seconds = timed(lambda: execute(LOOP, environments[2]))
+        assert not isinstance(operations, Error), operations
+        assert vector == loop == expected, (vector, loop)
+
+        print(f'{name:>8}: operaciones {operations_seconds:6.3f} s, '
+              f'vectorizado + recorrido {vector_seconds:6.3f} s, '
+              f'por elemento {loop_seconds:6.3f} s '
+              f'({loop_seconds / operations_seconds:5.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
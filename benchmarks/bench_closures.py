@@ -0,0 +1,89 @@
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable
+
+from lpp.ast import Function
+from lpp.lexer import Lexer
+from lpp.object import (
+    make_closure,
+    new_frame,
+)
+from lpp.parser import Parser
+from lpp.resolver import resolve
+from lpp.visitor import walk
+
+'''
+    Memoria que retienen millones de closures creadas por una funcion con
+    muchas variables locales, de las que la closure solo usa una.
+
+    Con el analisis de variables libres cada closure guarda una celda; una
+    closure ingenua guarda el frame completo de la funcion que la creo (y
+    con el, todas sus variables).
+
+    python -m benchmarks.bench_closures [closures]
+'''
+
+
+LOCALS: int = 30
+
+
+def build_source() -> str:
+    locals_ = ''.join(f'    variable v{i} = n * {i};\n' for i in range(LOCALS))
+    return f'''
+variable crea = funcion(n) {{
+{locals_}    funcion(x) {{ x + v7 }};
+}};
+'''
+
+
+class NaiveClosure:
+    __slots__ = ('function', 'frame')
+
+    def __init__(self, function: Function, frame: list[Any]) -> None:
+        self.function = function
+        self.frame = frame
+
+
+def measure(name: str, create: Callable[[int], Any], count: int) -> None:
+    tracemalloc.start()
+    start = perf_counter()
+    closures = [create(n) for n in range(count)]
+    seconds = perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{name:>22}: {current / 2 ** 20:8.1f} MiB retenidos '
+          f'({current / count:6.1f} bytes por closure, {seconds:.2f} s)')
+    del closures
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    program = Parser(Lexer(build_source())).parse_program()
+    resolution = resolve(program)
+    assert not resolution.errors
+
+    outer, inner = [node for node in walk(program) if isinstance(node, Function)]
+    print(f'frame de crea: {outer.frame_size} posiciones, '
+          f'la closure usa {inner.free_variables}')
+
+    # Lo que haria una llamada a crea(n): llenar su frame y crear la closure
+    def call(n: int) -> list[Any]:
+        frame = new_frame(outer)
+        frame[0] = n
+        for slot in range(1, outer.frame_size):
+            value = n * slot
+            if slot in outer.cells:
+                frame[slot].value = value
+            else:
+                frame[slot] = value
+        return frame
+
+    measure('variables libres', lambda n: make_closure(inner, call(n)), count)
+    measure('frame completo', lambda n: NaiveClosure(inner, call(n)), count)
+
+
+if __name__ == '__main__':
+    main()
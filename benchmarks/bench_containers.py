@@ -0,0 +1,119 @@
+from typing import (
+    Any,
+    Callable,
+)
+
+from benchmarks.bench_vm import (
+    parse,
+    timed,
+)
+from lpp.ast import Program
+from lpp.compiler import compile_program
+from lpp.containers import (
+    make_list,
+    make_map,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import (
+    Environment,
+    Error,
+    FALSE,
+    TRUE,
+)
+from lpp.vm import VM
+
+'''
+    Listas y mapas grandes:
+
+    - construir un literal de cien mil elementos (enteros y booleanos,
+      asi que es una lista). La maquina virtual lo construye al compilar y
+      al ejecutar es una sola instruccion. El tiempo del evaluador incluye
+      resolver los nombres, que recorre todo el arbol; parsear es lo mas
+      lento porque el lexer revisa cada caracter
+    - indexar y tamano en una lista y un mapa de mil y de un millon de
+      elementos: el tiempo por acceso no depende del tamano
+
+    python -m benchmarks.bench_containers
+'''
+
+
+SIZE: int = 1_000_000
+SMALL: int = 1_000
+LITERAL_SIZE: int = 100_000
+ACCESSES: int = 200_000
+
+LITERAL: str = '[' + ', '.join(str(value) if value % 2 else 'verdadero'
+                               for value in range(LITERAL_SIZE)) + '];'
+
+# Recorre posiciones salteadas de la lista y llaves del mapa
+ACCESS: str = f'''
+variable cuenta = funcion(n) {{
+    para (variable i = 0, total = 0; i < n; i = i + 1,
+          total = total + m[i * 7 - (i * 7 / tamano(m)) * tamano(m)]
+                  + si (l[i * 7 - (i * 7 / tamano(l)) * tamano(l)] == verdadero) {{ 1 }}
+                    si_no {{ 0 }}) {{}};
+    total
+}};
+cuenta({ACCESSES});
+'''
+
+
+def _environment(size: int) -> Environment:
+    environment = Environment()
+    environment.names = ['l', 'm']
+    environment.values = [
+        make_list([TRUE if value % 3 == 0 else FALSE if value % 3 == 1 else value
+                   for value in range(size)]),
+        make_map([item for value in range(size) for item in (value, value % 10)]),
+    ]
+    return environment
+
+
+def _literal() -> None:
+    program, parse_seconds = timed(lambda: parse(LITERAL))
+    bytecode, compile_seconds = timed(lambda: compile_program(program))
+    instructions = len(bytecode.main.code) // 2
+
+    vm_result, vm_seconds = timed(lambda: VM(memoize=False).run(bytecode))
+    evaluated, evaluator_seconds = timed(lambda: Evaluator(memoize=False).evaluate(program))
+    assert not isinstance(vm_result, Error), vm_result
+    assert len(vm_result) == len(evaluated) == LITERAL_SIZE
+
+    print(f'literal de {LITERAL_SIZE} elementos ({type(vm_result).__name__}): '
+          f'parsear {parse_seconds:6.3f} s, compilar {compile_seconds:6.3f} s')
+    print(f'{"VM":>8}: {instructions} instrucciones, {vm_seconds:8.6f} s')
+    print(f'{"AST":>8}: {evaluator_seconds:8.6f} s')
+
+
+def _backends() -> list[tuple[str, Callable[[Program, Environment], Any]]]:
+    return [
+        ('AST', lambda program, environment:
+            Evaluator(environment, memoize=False).evaluate(program)),
+        ('VM', lambda program, environment:
+            VM(environment, memoize=False).execute(program)),
+    ]
+
+
+def _accesses() -> None:
+    program = parse(ACCESS)
+    for size in (SMALL, SIZE):
+        results: list[Any] = []
+        line = f'{size:>8} elementos:'
+        for name, execute in _backends():
+            # El entorno se arma fuera de la medicion
+            environment = _environment(size)
+            result, seconds = timed(lambda: execute(program, environment))
+            assert not isinstance(result, Error), result
+            results.append(result)
+            line += f' {name} {seconds:6.3f} s'
+        assert results[0] == results[1], results
+        print(f'{line} ({ACCESSES} accesos)')
+
+
+def main() -> None:
+    _literal()
+    _accesses()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import sys
+from time import perf_counter
+from typing import Any
+
+from lpp.ast import (
+    ASTNode,
+    Program,
+)
+from lpp.evaluator import Evaluator
+from lpp.lexer import Lexer
+from lpp.object import Error
+from lpp.parser import Parser
+
+'''
+    Evaluaciones de nodos por segundo del evaluador.
+
+    - fibonacci recursivo: muchas llamadas, Infix y `si`
+    - ciclos con recursion: una suma de 1 a n hecha con una funcion que se
+      llama a si misma, repetida muchas veces. Cada llamada de lpp usa
+      varios frames de Python, asi que subimos el limite de recursion
+
+    Primero corremos cada programa con un evaluador que cuenta cuantos nodos
+    evalua y despues lo medimos con el normal.
+
+    python -m benchmarks.bench_evaluator [n_fibonacci]
+'''
+
+
+FIBONACCI: str = '''
+variable fib = funcion(n) {{
+    si (n < 2) {{ retorna n; }}
+    fib(n - 1) + fib(n - 2)
+}};
+fib({n});
+'''
+
+LOOPS: str = '''
+variable suma = funcion(n, total) {{
+    si (n == 0) {{ total }} si_no {{ suma(n - 1, total + n) }}
+}};
+variable repite = funcion(veces, total) {{
+    si (veces == 0) {{ total }} si_no {{ repite(veces - 1, total + suma(80, 0)) }}
+}};
+variable ciclo = funcion(veces, total) {{
+    si (veces == 0) {{ total }} si_no {{ ciclo(veces - 1, total + repite(50, 0)) }}
+}};
+ciclo({n}, 0);
+'''
+
+
+class CountingEvaluator(Evaluator):
+
+    def __init__(self) -> None:
+        super().__init__(memoize=False)
+        self.count = 0
+        for node_class, method in list(self._dispatch.items()):
+            self._dispatch[node_class] = self._counted(method)
+
+    def _counted(self, method: Any) -> Any:
+        def counted(node: ASTNode, frame: Any, closure: Any) -> Any:
+            self.count += 1
+            return method(node, frame, closure)
+        return counted
+
+
+def parse(source: str) -> Program:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    assert not parser.errors, parser.errors
+    return program
+
+
+def measure(name: str, source: str) -> None:
+    counter = CountingEvaluator()
+    expected = counter.evaluate(parse(source))
+    assert not isinstance(expected, Error), expected
+
+    program = parse(source)
+    start = perf_counter()
+    result = Evaluator(memoize=False).evaluate(program)
+    seconds = perf_counter() - start
+    assert result == expected
+
+    print(f'{name:>22}: {counter.count:>10} evaluaciones en {seconds:6.2f} s '
+          f'({counter.count / seconds:12,.0f} por segundo) = {result}')
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    sys.setrecursionlimit(20_000)
+
+    measure(f'fib({n})', FIBONACCI.format(n=n))
+    measure('ciclos con recursion', LOOPS.format(n=10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+from typing import (
+    Any,
+    Callable,
+)
+
+from benchmarks.bench_vm import (
+    parse,
+    timed,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import Error
+from lpp.transpile import (
+    compile_source,
+    run,
+)
+from lpp.vm import VM
+
+'''
+    Compara un ciclo `para` de 10 millones de vueltas contra la misma
+    cuenta hecha con una funcion recursiva de cola, en el evaluador, la
+    maquina virtual y el codigo transpilado a Python.
+
+    El `para` cambia sus variables en el frame de la funcion; la recursion
+    de cola arma un frame nuevo en cada llamada.
+
+    python -m benchmarks.bench_for
+'''
+
+
+ITERATIONS: int = 10_000_000
+
+LOOP: str = f'''
+variable cuenta = funcion(n) {{
+    para (variable i = 0, total = 0; i < n; i = i + 1, total = total + i) {{}};
+    total
+}};
+cuenta({ITERATIONS});
+'''
+
+RECURSION: str = f'''
+variable cuenta = funcion(i, n, total) {{
+    si (i < n) {{ retorna cuenta(i + 1, n, total + i); }}
+    total
+}};
+cuenta(0, {ITERATIONS}, 0);
+'''
+
+
+def _backends() -> list[tuple[str, Callable[[str], Any]]]:
+    return [
+        ('AST', lambda source: Evaluator(memoize=False).evaluate(parse(source))),
+        ('VM', lambda source: VM(memoize=False).execute(parse(source))),
+        ('Python', lambda source: run(compile_source(source))),
+    ]
+
+
+def main() -> None:
+    expected = ITERATIONS * (ITERATIONS - 1) // 2
+
+    for name, execute in _backends():
+        loop, loop_seconds = timed(lambda: execute(LOOP))
+        recursion, recursion_seconds = timed(lambda: execute(RECURSION))
+        assert not isinstance(loop, Error), loop
+        assert loop == recursion == expected, (loop, recursion)
+
+        print(f'{name:>8}: para {loop_seconds:6.3f} s, recursion {recursion_seconds:6.3f} s '
+              f'({recursion_seconds / loop_seconds:4.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
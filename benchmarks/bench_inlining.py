@@ -0,0 +1,81 @@
+from time import perf_counter
+
+from lpp.ast import (
+    Call,
+    Program,
+)
+from lpp.inlining import FunctionInlining
+from lpp.lexer import Lexer
+from lpp.optimizer import (
+    count_nodes,
+    optimize,
+)
+from lpp.parser import Parser
+from lpp.visitor import walk
+
+'''
+    Cuantas llamadas quita el inlining en un programa con muchas funciones
+    auxiliares pequeñas usadas desde funciones "calientes".
+
+    Cada funcion caliente no tiene ciclos, asi que las llamadas que quedan
+    en su cuerpo son las que hace cada vez que se ejecuta.
+
+    python -m benchmarks.bench_inlining
+'''
+
+
+HELPERS: str = '''
+variable suma = funcion(x, y) { x + y; };
+variable resta = funcion(x, y) { retorna x - y; };
+variable cuadrado = funcion(x) { x * x };
+variable mayor = funcion(x, y) { si (x > y) { x } si_no { y } };
+variable norma = funcion(x, y) { suma(cuadrado(x), cuadrado(y)) };
+'''
+
+HOT: str = '''
+variable caliente{i} = funcion(a, b) {{
+    variable d = resta(norma(a, b), cuadrado(a + {i}));
+    retorna mayor(suma(d, {i}), resta(b, a)) * cuadrado(d);
+}};
+caliente{i}({i}, 2);
+'''
+
+
+def build_program(functions: int) -> Program:
+    source = HELPERS + ''.join(HOT.format(i=i) for i in range(functions))
+    return Parser(Lexer(source)).parse_program()
+
+
+def count_calls(program: Program) -> int:
+    return sum(1 for node in walk(program) if type(node) is Call)
+
+
+def main() -> None:
+    functions = 2_000
+    program = build_program(functions)
+    calls_before = count_calls(program)
+    nodes_before = count_nodes(program)
+
+    start = perf_counter()
+    stats = FunctionInlining(growth=2).run(program)
+    seconds = perf_counter() - start
+    print(f'una pasada de inlining: {seconds * 1000:.1f} ms, {stats.changes} llamadas '
+          f'inlineadas, llamadas {calls_before} -> {count_calls(program)}')
+
+    program = build_program(functions)
+    start = perf_counter()
+    history = optimize(program)
+    seconds = perf_counter() - start
+    calls_after = count_calls(program)
+    print(f'optimize hasta punto fijo: {seconds * 1000:.1f} ms, '
+          f'{len(history) // 4} rondas, nodos {nodes_before} -> {count_nodes(program)}')
+
+    # Una llamada a la funcion caliente mas las que hace su cuerpo
+    per_call_before = (calls_before - functions) // functions + 1
+    per_call_after = calls_after // functions
+    print(f'llamadas por ejecucion de una funcion caliente: '
+          f'{per_call_before} -> {per_call_after}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import sys
+
+from benchmarks.bench_vm import (
+    parse,
+    timed,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import Error
+from lpp.vm import VM
+
+'''
+    Memorizacion automatica de funciones puras (lpp.purity): el mismo
+    programa en el evaluador y en la maquina virtual con y sin memoize,
+    y el porcentaje de aciertos de cada cache.
+
+    python -m benchmarks.bench_memo
+'''
+
+
+FIBONACCI: str = '''
+variable fib = funcion(n) {
+    si (n < 2) { retorna n; }
+    fib(n - 1) + fib(n - 2)
+};
+fib(22);
+'''
+
+# Caminos en una cuadricula moviendose solo hacia abajo o a la derecha
+PATHS: str = '''
+variable caminos = funcion(filas, columnas) {
+    si (filas == 0) { retorna 1; }
+    si (columnas == 0) { retorna 1; }
+    caminos(filas - 1, columnas) + caminos(filas, columnas - 1)
+};
+caminos(9, 9);
+'''
+
+
+def measure(name: str, source: str) -> None:
+    for backend_name, make in (('AST', Evaluator), ('VM', VM)):
+        plain = make(memoize=False)  # type: ignore
+        memoized = make()  # type: ignore
+        run_plain = plain.evaluate if isinstance(plain, Evaluator) else plain.execute
+        run_memoized = memoized.evaluate if isinstance(memoized, Evaluator) \
+            else memoized.execute
+
+        expected, plain_seconds = timed(lambda: run_plain(parse(source)))
+        assert not isinstance(expected, Error), expected
+        result, memo_seconds = timed(lambda: run_memoized(parse(source)))
+        assert result == expected, (result, expected)
+
+        print(f'{name:>10} {backend_name:>3}: sin memo {plain_seconds:7.3f} s, '
+              f'con memo {memo_seconds:7.4f} s ({plain_seconds / memo_seconds:6.1f}x)')
+        for cache in memoized.memo_caches.values():
+            print(f'{"":>16}{cache}')
+
+
+def main() -> None:
+    sys.setrecursionlimit(20_000)
+
+    measure('fibonacci', FIBONACCI)
+    measure('caminos', PATHS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import sys
+
+from benchmarks.bench_vm import (
+    ARITHMETIC,
+    CLOSURES,
+    FIBONACCI,
+    parse,
+    timed,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import Error
+from lpp.specializing import SpecializingEvaluator
+
+'''
+    Compara el evaluador generico que recorre el AST contra el que
+    especializa sus nodos (lpp.specializing) con los programas de bench_vm.
+    Ninguno memoriza funciones puras.
+
+    python -m benchmarks.bench_specializing
+'''
+
+
+def measure(name: str, source: str) -> None:
+    expected, generic_seconds = timed(
+        lambda: Evaluator(memoize=False).evaluate(parse(source)))
+    assert not isinstance(expected, Error), expected
+
+    evaluator = SpecializingEvaluator()
+    result, specialized_seconds = timed(lambda: evaluator.evaluate(parse(source)))
+    assert result == expected, (result, expected)
+
+    print(f'{name:>12}: generico {generic_seconds:6.3f} s, especializado '
+          f'{specialized_seconds:6.3f} s ({generic_seconds / specialized_seconds:4.1f}x), '
+          f'{evaluator.specializations} especializaciones, '
+          f'{evaluator.deoptimizations} desoptimizaciones')
+
+
+def main() -> None:
+    sys.setrecursionlimit(20_000)
+
+    measure('fibonacci', FIBONACCI)
+    measure('aritmetica', ARITHMETIC)
+    measure('closures', CLOSURES)
+
+
+if __name__ == '__main__':
+    main()
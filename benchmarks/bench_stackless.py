@@ -0,0 +1,55 @@
+import sys
+
+from benchmarks.bench_vm import (
+    ARITHMETIC,
+    FIBONACCI,
+    parse,
+    timed,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import Error
+from lpp.stackless import StacklessEvaluator
+
+'''
+    Compara el evaluador que usa la pila de Python contra el que lleva su
+    propia pila (lpp.stackless), y mide una recursion que no es de cola
+    mas profunda de lo que aguanta la pila de Python.
+
+    python -m benchmarks.bench_stackless
+'''
+
+
+DEEP: str = '''
+variable suma = funcion(n) {
+    si (n == 0) { 0 } si_no { n + suma(n - 1) }
+};
+suma(1000000);
+'''
+
+
+def measure(name: str, source: str) -> None:
+    expected, ast_seconds = timed(lambda: Evaluator(memoize=False).evaluate(parse(source)))
+    evaluator = StacklessEvaluator()
+    result, stackless_seconds = timed(lambda: evaluator.evaluate(parse(source)))
+
+    if isinstance(expected, Error):
+        evaluator_time = f'{expected.message}'
+    else:
+        assert result == expected, (result, expected)
+        evaluator_time = f'{ast_seconds:6.3f} s'
+    assert not isinstance(result, Error), result
+
+    print(f'{name:>12}: AST {evaluator_time}, sin pila {stackless_seconds:6.3f} s, '
+          f'profundidad {evaluator.max_depth}')
+
+
+def main() -> None:
+    sys.setrecursionlimit(20_000)
+
+    measure('fibonacci', FIBONACCI)
+    measure('aritmetica', ARITHMETIC)
+    measure('profunda', DEEP)
+
+
+if __name__ == '__main__':
+    main()
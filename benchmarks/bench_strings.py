@@ -0,0 +1,91 @@
+from sys import maxsize
+from typing import (
+    Any,
+    Callable,
+)
+
+from benchmarks.bench_vm import (
+    parse,
+    timed,
+)
+from lpp import strings
+from lpp.evaluator import Evaluator
+from lpp.object import String
+from lpp.transpile import (
+    compile_source,
+    run,
+)
+from lpp.vm import VM
+
+'''
+    Construye un texto grande agregando una linea de 100 caracteres en cada
+    vuelta de un `para` (`s = s + linea`), hasta 100MB, en el evaluador, en
+    la maquina virtual y en el codigo transpilado a Python. Mide construirlo
+    y unirlo al final en un solo str (String.value()), que es lo que haria
+    quien lo escribe a un archivo.
+
+    Con cuerdas el tiempo por MB es el mismo en 1, 10 y 100MB. La linea
+    "plano" es la misma cuenta en la maquina virtual con LEAF_SIZE tan
+    grande que cada `+` copia todo el texto, como con str de Python: al
+    duplicar el tamano el tiempo se multiplica por cuatro o mas, asi que
+    solo se mide con textos chicos.
+
+    python -m benchmarks.bench_strings
+'''
+
+
+LINE: str = 'x' * 99 + '\\n'
+LINE_SIZE: int = 100
+
+SIZES: list[int] = [1_000_000, 10_000_000, 100_000_000]
+FLAT_SIZES: list[int] = [1_000_000, 2_000_000]
+
+SOURCE: str = '''
+variable construye = funcion(linea, n) {
+    para (variable i = 0, s = ""; i < n; i = i + 1, s = s + linea) {};
+    s
+};
+construye("%s", %d);
+'''
+
+
+def _source(size: int) -> str:
+    return SOURCE % (LINE, size // LINE_SIZE)
+
+
+def _backends() -> list[tuple[str, Callable[[str], Any]]]:
+    return [
+        ('AST', lambda source: Evaluator(memoize=False).evaluate(parse(source))),
+        ('VM', lambda source: VM(memoize=False).execute(parse(source))),
+        ('Python', lambda source: run(compile_source(source))),
+    ]
+
+
+def _build(name: str, execute: Callable[[str], Any], size: int) -> None:
+    source = _source(size)
+    result, build_seconds = timed(lambda: execute(source))
+    assert type(result) is String, result
+    text, join_seconds = timed(result.value)
+    assert len(text) == size and text.endswith('x\n')
+
+    total = build_seconds + join_seconds
+    print(f'{size // 1_000_000:>4} MB {name:>7}: construir {build_seconds:7.3f} s, '
+          f'unir {join_seconds:6.3f} s ({total / (size / 1_000_000):6.3f} s por MB)')
+
+
+def main() -> None:
+    for size in SIZES:
+        for name, execute in _backends():
+            _build(name, execute, size)
+
+    leaf_size = strings.LEAF_SIZE
+    strings.LEAF_SIZE = maxsize
+    try:
+        for size in FLAT_SIZES:
+            _build('plano', _backends()[1][1], size)
+    finally:
+        strings.LEAF_SIZE = leaf_size
+
+
+if __name__ == '__main__':
+    main()
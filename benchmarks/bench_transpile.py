@@ -0,0 +1,53 @@
+import sys
+
+from benchmarks.bench_vm import (
+    ARITHMETIC,
+    CLOSURES,
+    FIBONACCI,
+    parse,
+    timed,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import Error
+from lpp.transpile import (
+    compile_source,
+    run,
+)
+
+'''
+    Compara el evaluador que recorre el AST contra el codigo transpilado a
+    Python (lpp.transpile) con los programas de bench_vm.
+
+    La primera compilacion incluye parsear, inferir tipos y compile(); la
+    segunda sale del cache por hash del codigo fuente. El evaluador no
+    memoriza funciones puras, igual que el codigo transpilado.
+
+    python -m benchmarks.bench_transpile
+'''
+
+
+def measure(name: str, source: str) -> None:
+    program = parse(source)
+    expected, ast_seconds = timed(lambda: Evaluator(memoize=False).evaluate(program))
+    assert not isinstance(expected, Error), expected
+
+    code, compile_seconds = timed(lambda: compile_source(source))
+    _, cached_seconds = timed(lambda: compile_source(source))
+    result, python_seconds = timed(lambda: run(code))
+    assert result == expected, (result, expected)
+
+    print(f'{name:>12}: AST {ast_seconds:6.3f} s, Python {python_seconds:6.3f} s '
+          f'({ast_seconds / python_seconds:4.1f}x), compilar {compile_seconds * 1000:5.2f} ms, '
+          f'cache {cached_seconds * 1000:5.3f} ms')
+
+
+def main() -> None:
+    sys.setrecursionlimit(20_000)
+
+    measure('fibonacci', FIBONACCI)
+    measure('aritmetica', ARITHMETIC)
+    measure('closures', CLOSURES)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+from timeit import timeit
+
+from lpp.ast import (
+    ASTNode,
+    Block,
+    Boolean,
+    Call,
+    Expression,
+    ExpressionStatement,
+    Function,
+    Identifier,
+    If,
+    Infix,
+    Integer,
+    LetStatement,
+    Prefix,
+    Program,
+    ReturnStatement,
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.visitor import NodeVisitor, walk
+
+'''
+    Compara los visitors de lpp.visitor contra un recorrido recursivo
+    escrito a mano con cadenas de isinstance, que es lo que hacia cada
+    analisis antes.
+
+    python -m benchmarks.bench_visitor
+'''
+
+
+STATEMENT: str = '''
+variable f{i} = funcion(x, y) {{
+    si (x < y) {{ retorna suma(x * 2, -y + {i}); }} si_no {{ retorna !verdadero; }}
+}};
+f{i}(a, b + c * d - e / {i});
+'''
+
+
+def build_program(statements: int) -> Program:
+    source = ''.join(STATEMENT.format(i=i) for i in range(statements))
+    return Parser(Lexer(source)).parse_program()
+
+
+def naive_count(node: ASTNode) -> int:
+    if isinstance(node, Program) or isinstance(node, Block):
+        return sum(naive_count(statement) for statement in node.statements)
+    elif isinstance(node, LetStatement):
+        return naive_count(node.name) + naive_count(node.value)  # type: ignore
+    elif isinstance(node, ReturnStatement):
+        return naive_count(node.return_value)  # type: ignore
+    elif isinstance(node, ExpressionStatement):
+        return naive_count(node.expression)  # type: ignore
+    elif isinstance(node, Identifier):
+        return 1
+    elif isinstance(node, Integer) or isinstance(node, Boolean):
+        return 0
+    elif isinstance(node, Prefix):
+        return naive_count(node.right)  # type: ignore
+    elif isinstance(node, Infix):
+        return naive_count(node.left) + naive_count(node.right)  # type: ignore
+    elif isinstance(node, If):
+        count = naive_count(node.condition) + naive_count(node.consequence)  # type: ignore
+        if node.alternative is not None:
+            count += naive_count(node.alternative)
+        return count
+    elif isinstance(node, Function):
+        return sum(naive_count(parameter) for parameter in node.parameters) + \
+            naive_count(node.body)  # type: ignore
+    elif isinstance(node, Call):
+        return naive_count(node.function) + \
+            sum(naive_count(argument) for argument in node.arguments or [])
+    return 0
+
+
+class IdentifierCounter(NodeVisitor):
+    def __init__(self) -> None:
+        self.count = 0
+
+    def visit_Identifier(self, node: Identifier) -> None:
+        self.count += 1
+
+    def enter_Identifier(self, node: Identifier) -> None:
+        self.count += 1
+
+
+def visitor_count(program: Program) -> int:
+    counter = IdentifierCounter()
+    counter.visit(program)
+    return counter.count
+
+
+def traverse_count(program: Program) -> int:
+    counter = IdentifierCounter()
+    counter.traverse(program)
+    return counter.count
+
+
+def walk_count(program: Program) -> int:
+    return sum(1 for node in walk(program) if type(node) is Identifier)
+
+
+def main() -> None:
+    program = build_program(2_000)
+    nodes = sum(1 for _ in walk(program))
+    print(f'{nodes} nodos')
+
+    expected = naive_count(program)
+    for name, fn in [('isinstance recursivo', naive_count),
+                     ('NodeVisitor.visit', visitor_count),
+                     ('NodeVisitor.traverse', traverse_count),
+                     ('walk', walk_count)]:
+        assert fn(program) == expected
+        seconds = timeit(lambda: fn(program), number=10) / 10
+        print(f'{name:>22}: {seconds * 1000:8.2f} ms  '
+              f'({nodes / seconds / 1e6:.2f} M nodos/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import sys
+from time import perf_counter
+from typing import Any, Callable
+
+from lpp.ast import Program
+from lpp.compiler import compile_program
+from lpp.evaluator import Evaluator
+from lpp.lexer import Lexer
+from lpp.object import Error
+from lpp.parser import Parser
+from lpp.vm import VM
+
+'''
+    Compara el evaluador que recorre el AST contra el bytecode en la
+    maquina virtual con los mismos programas:
+
+    - fibonacci recursivo
+    - aritmetica en ciclos hechos con recursion
+    - closures: crear muchas y llamarlas
+
+    El tiempo de la maquina virtual no incluye compilar; la compilacion se
+    mide aparte. El evaluador usa la pila de Python en cada llamada, asi que
+    subimos el limite de recursion. La memorizacion de funciones puras esta
+    apagada en los dos (ver bench_memo).
+
+    python -m benchmarks.bench_vm
+'''
+
+
+FIBONACCI: str = '''
+variable fib = funcion(n) {
+    si (n < 2) { retorna n; }
+    fib(n - 1) + fib(n - 2)
+};
+fib(23);
+'''
+
+ARITHMETIC: str = '''
+variable paso = funcion(i, acumulado) {
+    si (i == 0) { acumulado } si_no {
+        paso(i - 1, (acumulado * 7 + i * 3 - i / 2) - (acumulado / 3) * 2 + -i)
+    }
+};
+variable ciclo = funcion(veces, total) {
+    si (veces == 0) { total } si_no { ciclo(veces - 1, total + paso(150, veces)) }
+};
+ciclo(400, 0);
+'''
+
+CLOSURES: str = '''
+variable sumador = funcion(x) { funcion(y) { x + y } };
+variable componer = funcion(f, g) { funcion(x) { f(g(x)) } };
+variable ciclo = funcion(i, total) {
+    si (i == 0) { total } si_no {
+        variable f = componer(sumador(i), sumador(1));
+        ciclo(i - 1, total + f(i))
+    }
+};
+variable repite = funcion(veces, total) {
+    si (veces == 0) { total } si_no { repite(veces - 1, total + ciclo(200, 0)) }
+};
+repite(150, 0);
+'''
+
+
+def parse(source: str) -> Program:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    assert not parser.errors, parser.errors
+    return program
+
+
+def timed(run: Callable[[], Any]) -> tuple[Any, float]:
+    start = perf_counter()
+    result = run()
+    return result, perf_counter() - start
+
+
+def measure(name: str, source: str) -> None:
+    program = parse(source)
+    expected, ast_seconds = timed(lambda: Evaluator(memoize=False).evaluate(program))
+    assert not isinstance(expected, Error), expected
+
+    bytecode, compile_seconds = timed(lambda: compile_program(parse(source)))
+    result, vm_seconds = timed(lambda: VM(memoize=False).run(bytecode))
+    assert result == expected, (result, expected)
+
+    print(f'{name:>12}: AST {ast_seconds:6.3f} s, VM {vm_seconds:6.3f} s '
+          f'({ast_seconds / vm_seconds:4.1f}x), compilar {compile_seconds * 1000:5.2f} ms')
+
+
+def main() -> None:
+    sys.setrecursionlimit(20_000)
+
+    measure('fibonacci', FIBONACCI)
+    measure('aritmetica', ARITHMETIC)
+    measure('closures', CLOSURES)
+
+
+if __name__ == '__main__':
+    main()
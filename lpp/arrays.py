@@ -0,0 +1,207 @@
+from array import array
+from itertools import repeat
+from operator import (
+    add,
+    eq,
+    floordiv,
+    gt,
+    lt,
+    mul,
+    ne,
+    neg,
+    sub,
+)
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Optional,
+)
+
+from lpp.ast import (
+    ArrayLiteral,
+    Boolean,
+    Integer,
+)
+from lpp.object import (
+    Array,
+    EvaluationError,
+    FALSE,
+    TRUE,
+    type_name,
+)
+
+try:
+    import numpy  # type: ignore[import-not-found]
+except ImportError:
+    numpy = None  # type: ignore
+
+'''
+    Arreglos de lpp y sus operaciones.
+
+    Un literal con solo enteros (que tienen que caber en 64 bits) o solo
+    booleanos es un arreglo; cualquier otro es una lista (ver
+    lpp.containers). Un arreglo guarda sus elementos sin envolver: en un numpy.ndarray si NumPy esta instalado y si no en un
+    array.array ('q' para enteros, 'b' para booleanos). Los arreglos no
+    cambian; cada operacion regresa uno nuevo.
+
+    Un Infix con un arreglo se aplica elemento por elemento en una sola
+    operacion: con NumPy es la ufunc del operador y sin NumPy un map del
+    operador de Python sobre los array.array, que corre en C sin pasar por
+    el interprete de lpp. Puede ser entre dos arreglos del mismo tamano o
+    entre un arreglo y un escalar de su mismo tipo. Las comparaciones (y
+    == y != entre arreglos) dan un arreglo de booleanos. Como en NumPy, los
+    resultados que no caben en 64 bits dan la vuelta.
+
+    Todos los evaluadores usan estas funciones, asi que dan los mismos
+    resultados y los mismos errores.
+'''
+
+
+BACKEND: str = 'numpy' if numpy is not None else 'array'
+
+_MIN = -2 ** 63
+_MAX = 2 ** 63 - 1
+_MASK = 2 ** 64 - 1
+
+_COMPARISONS: frozenset[str] = frozenset(('<', '>', '==', '!='))
+
+_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    '+': add,
+    '-': sub,
+    '*': mul,
+    '/': floordiv,
+    '<': lt,
+    '>': gt,
+    '==': eq,
+    '!=': ne,
+}
+
+if numpy is not None:
+    _UFUNCS: dict[str, Any] = {
+        '+': numpy.add,
+        '-': numpy.subtract,
+        '*': numpy.multiply,
+        '/': numpy.floor_divide,
+        '<': numpy.less,
+        '>': numpy.greater,
+        '==': numpy.equal,
+        '!=': numpy.not_equal,
+    }
+
+
+def _fail(message: str) -> Any:
+    raise EvaluationError(message)
+
+
+# Sin NumPy: los valores que se salen de 64 bits dan la vuelta como en NumPy
+def _wrap(values: Iterable[int]) -> array:
+    return array('q', [((value - _MIN) & _MASK) + _MIN for value in values])
+
+
+# Los valores ya se revisaron: todos caben en 64 bits
+def _integers(values: array) -> Any:
+    if numpy is not None:
+        return numpy.frombuffer(values, dtype=numpy.int64)
+    return values
+
+
+def _booleans(values: list[bool]) -> Any:
+    if numpy is not None:
+        return numpy.fromiter(values, dtype=numpy.bool_)
+    return array('b', values)
+
+
+# El arreglo con estos elementos, o None si no son puros enteros o puros
+# booleanos (entonces son una lista, ver lpp.containers)
+def make_array(elements: list[Any]) -> Optional[Array]:
+    # array.array revisa en C que todos sean enteros de 64 bits; los
+    # valores de lpp que no son enteros no se pueden convertir
+    try:
+        return Array(_integers(array('q', elements)))
+    except OverflowError:
+        if all(type(element) is int for element in elements):
+            return _fail('Entero fuera de rango para un arreglo')
+    except TypeError:
+        pass
+
+    if all(element is TRUE or element is FALSE for element in elements):
+        return Array(_booleans([element is TRUE for element in elements]), True)
+    return None
+
+
+# El arreglo de un literal que solo tiene enteros o solo booleanos, para
+# construirlo una vez antes de ejecutar; None si depende de algo mas
+def literal_array(node: ArrayLiteral) -> Optional[Array]:
+    elements = node.elements
+    if all(type(element) is Integer for element in elements):
+        values: list[int] = [element.value for element in elements]  # type: ignore
+        if all(_MIN <= value <= _MAX for value in values):
+            return Array(_integers(array('q', values)))
+    elif all(type(element) is Boolean for element in elements):
+        return Array(_booleans([bool(element.value) for element in elements]), True)  # type: ignore
+    return None
+
+
+def array_negate(value: Array) -> Array:
+    if value.boolean:
+        return _fail('Operador desconocido: -ARRAY')
+    if numpy is not None:
+        return Array(numpy.negative(value.values))
+    try:
+        return Array(array('q', map(neg, value.values)))
+    except OverflowError:
+        return Array(_wrap(map(neg, value.values)))
+
+
+# Tipo de los elementos de un operando y sus valores: el array.array o
+# ndarray de un arreglo, o el escalar como int o bool de Python
+def _operand(value: Any) -> tuple[str, Any]:
+    if type(value) is Array:
+        return ('BOOLEAN' if value.boolean else 'INTEGER'), value.values
+    if type(value) is int:
+        if value < _MIN or value > _MAX:
+            return _fail('Entero fuera de rango para un arreglo')
+        return 'INTEGER', value
+    if value is TRUE or value is FALSE:
+        return 'BOOLEAN', value is TRUE
+    return type_name(value), None
+
+
+# Infix donde por lo menos un operando es un arreglo
+def array_infix(operator: str, a: Any, b: Any) -> Array:
+    left_type, left = _operand(a)
+    right_type, right = _operand(b)
+    left_array = type(a) is Array
+    right_array = type(b) is Array
+
+    if left_type != right_type or left is None or right is None:
+        return _fail(f'Discrepancia de tipos: {type_name(a)} {operator} {type_name(b)}')
+    if left_type == 'BOOLEAN' and operator not in ('==', '!='):
+        return _fail(f'Operador desconocido: {type_name(a)} {operator} {type_name(b)}')
+    if left_array and right_array and len(left) != len(right):
+        return _fail(f'Los arreglos tienen distinto tamano: {len(left)} y {len(right)}')
+
+    if operator == '/':
+        if (right_array and 0 in right) or (not right_array and right == 0):
+            return _fail('Division entre cero')
+
+    boolean = operator in _COMPARISONS
+    if numpy is not None:
+        return Array(_UFUNCS[operator](left, right), boolean)
+
+    function = _OPERATORS[operator]
+    if boolean:
+        return Array(array('b', _map(function, left, right)), True)
+    try:
+        return Array(array('q', _map(function, left, right)))
+    except OverflowError:
+        return Array(_wrap(_map(function, left, right)))
+
+
+def _map(function: Callable[[Any, Any], Any], left: Any, right: Any) -> Iterable[Any]:
+    if type(left) is array and type(right) is array:
+        return map(function, left, right)
+    if type(left) is array:
+        return map(function, left, repeat(right))
+    return map(function, repeat(left), right)
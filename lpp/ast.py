@@ -2,7 +2,13 @@ from abc import (
     ABC,
     abstractmethod,
 )
+from enum import (
+    auto,
+    Enum,
+    unique,
+)
 from typing import Optional
+from lpp.lexer import escape_string
 from lpp.token import Token
 
 # Aqui se generan 3 nods independientes
@@ -14,6 +20,13 @@ from lpp.token import Token
 
 
 class ASTNode(ABC):
+    # Nombres de los campos que contienen nodos hijos, en el orden en que
+    # aparecen en el codigo fuente. Los usan los visitors para recorrer el arbol
+    _fields: tuple[str, ...] = ()
+    # Posicion en el codigo fuente [start, end). El parser las llena, los
+    # nodos creados a mano se quedan en -1
+    start: int = -1
+    end: int = -1
 
     @abstractmethod
     def token_literal(self) -> str:
@@ -35,10 +48,27 @@ class Statement(ASTNode):
         # Retorna la literal que existe en el token, el pedazo de string de nuestro programa
         return self.token.literal
 
+# Tipos que puede inferir lpp.inference para una expresion
+
+
+@unique
+class ValueType(Enum):
+    INTEGER = auto()
+    BOOLEAN = auto()
+    FUNCTION = auto()
+    ARRAY = auto()
+    LIST = auto()
+    MAP = auto()
+    STRING = auto()
+    UNKNOWN = auto()
+
 # 3 Es un nodo de un AST
 
 
 class Expression(ASTNode):
+    # Tipo del valor de la expresion, lo llena lpp.inference
+    inferred_type: ValueType = ValueType.UNKNOWN
+
     def __init__(self, token: Token) -> None:
         self.token = token
 
@@ -49,6 +79,9 @@ class Expression(ASTNode):
 
 
 class Program(ASTNode):
+    _fields = ('statements',)
+    # Numero de variables globales, lo llena lpp.resolver
+    frame_size: int = 0
 
     def __init__(self, statements: list[Statement]) -> None:
         self.statements = statements
@@ -75,6 +108,17 @@ class Program(ASTNode):
 
 
 class Identifier(Expression):
+    # Donde vive la variable: cuantos frames de funcion hay que subir y su
+    # indice en ese frame. Lo llena lpp.resolver, -1 si no se resolvio
+    depth: int = -1
+    slot: int = -1
+    # Si la variable es de una funcion de afuera (y no global), su indice
+    # entre las variables capturadas por la closure; -1 si no
+    free: int = -1
+    # Si la posicion de su frame guarda una celda porque alguna closure la
+    # captura
+    boxed: bool = False
+
     def __init__(self,
                  token: Token,
                  value: str) -> None:
@@ -86,6 +130,8 @@ class Identifier(Expression):
 
 
 class LetStatement(Statement):
+    _fields = ('name', 'value')
+
     def __init__(self, 
                  token: Token, 
                  name: Optional[Identifier] = None, 
@@ -100,6 +146,7 @@ class LetStatement(Statement):
 
 
 class ReturnStatement(Statement):
+    _fields = ('return_value',)
 
     def __init__(self,
                  token: Token,
@@ -112,6 +159,8 @@ class ReturnStatement(Statement):
 
 
 class ExpressionStatement(Statement):
+    _fields = ('expression',)
+
     def __init__(self,
                  token: Token,
                  expression: Optional[Expression] = None) -> None:
@@ -132,7 +181,25 @@ class Integer(Expression):
     def __str__(self) -> str:
         return str(self.value)
     
+# Texto de un literal "..." ya sin escapes
+class StringLiteral(Expression):
+    def __init__(self,
+                 token: Token,
+                 value: Optional[str] = None) -> None:
+        super().__init__(token)
+        self.value = value
+
+    # Con comillas y escapes, como se escribe en el codigo
+    def __str__(self) -> str:
+        return escape_string(self.value or '')
+
+
 class Prefix(Expression):
+    _fields = ('right',)
+    # Tipo del operando si se puede usar la version solo para enteros o
+    # solo para booleanos, lo llena lpp.inference
+    operand_type: ValueType = ValueType.UNKNOWN
+
     def __init__(self,
                  token: Token,
                  operator: str,
@@ -145,6 +212,10 @@ class Prefix(Expression):
         return f'({self.operator}{str(self.right)})'
     
 class Infix(Expression):
+    _fields = ('left', 'right')
+    # Tipo de los dos operandos si se puede usar la version solo para
+    # enteros, solo para booleanos o solo para textos, lo llena lpp.inference
+    operand_type: ValueType = ValueType.UNKNOWN
 
     def __init__(self,
                  token: Token,
@@ -170,6 +241,7 @@ class Boolean(Expression):
         return self.token_literal()
     
 class Block(Statement):
+    _fields = ('statements',)
 
     def __init__(self,
                  token: Token,
@@ -185,6 +257,8 @@ class Block(Statement):
         return ''.join(out)
 
 class If(Expression):
+    _fields = ('condition', 'consequence', 'alternative')
+
     def __init__(self,
                  token: Token,
                  condition: Optional[Expression] = None,
@@ -205,6 +279,20 @@ class If(Expression):
         return ''.join(out)
     
 class Function(Expression):
+    _fields = ('parameters', 'body')
+    # Numero de variables locales (parametros incluidos), lo llena lpp.resolver
+    frame_size: int = 0
+    # Variables de funciones de afuera que usa el cuerpo (las globales no
+    # cuentan), y de donde sacar la celda de cada una al crear la closure:
+    # (0, slot) del frame que la crea o (1, indice) de las capturadas por la
+    # closure que la crea
+    free_variables: tuple[str, ...] = ()
+    captures: tuple[tuple[int, int], ...] = ()
+    # Posiciones del frame que guardan celdas
+    cells: tuple[int, ...] = ()
+    # Si es pura y vale la pena guardar sus resultados, lo llena lpp.purity
+    memoize: bool = False
+
     def __init__(self, 
                  token: Token,
                  parameters: list[Identifier] = [],
@@ -221,6 +309,11 @@ class Function(Expression):
         return f'{self.token_literal()}({params}) {str(self.body)}'
     
 class Call(Expression):
+    _fields = ('function', 'arguments')
+    # Si lo que regresa la llamada es lo que regresa la funcion que la
+    # contiene, lo llena lpp.tail_calls
+    tail: bool = False
+
     def __init__(self,
                  token: Token,
                  function: Expression,
@@ -238,3 +331,117 @@ class Call(Expression):
 
 
 
+
+
+class Assignment(Statement):
+    _fields = ('name', 'value')
+
+    def __init__(self,
+                 token: Token,
+                 name: Optional[Identifier] = None,
+                 value: Optional[Expression] = None) -> None:
+        super().__init__(token)
+        self.name = name
+        self.value = value
+
+    def __str__(self) -> str:
+        return f'{str(self.name)} = {str(self.value)}'
+
+
+# para (variable i = 0, total = 0; i < n; i = i + 1, total = total + i) { ... }
+# Las variables se definen en el scope de afuera y las asignaciones solo
+# pueden cambiar esas variables. Vale nulo, como `variable`
+class For(Statement):
+    _fields = ('variables', 'condition', 'updates', 'body')
+
+    def __init__(self,
+                 token: Token,
+                 variables: Optional[list[LetStatement]] = None,
+                 condition: Optional[Expression] = None,
+                 updates: Optional[list[Assignment]] = None,
+                 body: Optional[Block] = None) -> None:
+        super().__init__(token)
+        self.variables = variables if variables is not None else []
+        self.condition = condition
+        self.updates = updates if updates is not None else []
+        self.body = body
+
+    def __str__(self) -> str:
+        variables = ', '.join(f'{str(variable.name)} = {str(variable.value)}'
+                              for variable in self.variables)
+        if variables:
+            variables = f'{self.variables[0].token_literal()} {variables}'
+        updates = ', '.join(str(update) for update in self.updates)
+
+        return f'{self.token_literal()} ({variables}; {str(self.condition)}; {updates}) ' + \
+            f'{str(self.body)}'
+
+
+# [1, 2, 3]. Al ejecutarse es un arreglo si tiene puros enteros o puros
+# booleanos y si no una lista
+class ArrayLiteral(Expression):
+    _fields = ('elements',)
+
+    def __init__(self,
+                 token: Token,
+                 elements: Optional[list[Expression]] = None) -> None:
+        super().__init__(token)
+        self.elements = elements if elements is not None else []
+
+    def __str__(self) -> str:
+        return f'[{", ".join(str(element) for element in self.elements)}]'
+
+
+# {llave: valor, ...}. `entries` intercala llaves y valores
+# (k1, v1, k2, v2, ...) para que los hijos queden en el orden del codigo
+class MapLiteral(Expression):
+    _fields = ('entries',)
+
+    def __init__(self,
+                 token: Token,
+                 entries: Optional[list[Expression]] = None) -> None:
+        super().__init__(token)
+        self.entries = entries if entries is not None else []
+
+    @property
+    def keys(self) -> list[Expression]:
+        return self.entries[::2]
+
+    @property
+    def values(self) -> list[Expression]:
+        return self.entries[1::2]
+
+    def __str__(self) -> str:
+        pairs = ', '.join(f'{str(key)}: {str(value)}'
+                          for key, value in zip(self.keys, self.values))
+        return f'{{{pairs}}}'
+
+
+# arreglo[indice], lista[indice] o mapa[llave]
+class Index(Expression):
+    _fields = ('left', 'index')
+
+    def __init__(self,
+                 token: Token,
+                 left: Expression,
+                 index: Optional[Expression] = None) -> None:
+        super().__init__(token)
+        self.left = left
+        self.index = index
+
+    def __str__(self) -> str:
+        return f'({str(self.left)}[{str(self.index)}])'
+
+
+# tamano(x) de un arreglo, una lista o un mapa
+class Length(Expression):
+    _fields = ('argument',)
+
+    def __init__(self,
+                 token: Token,
+                 argument: Optional[Expression] = None) -> None:
+        super().__init__(token)
+        self.argument = argument
+
+    def __str__(self) -> str:
+        return f'{self.token_literal()}({str(self.argument)})'
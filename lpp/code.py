@@ -0,0 +1,229 @@
+from enum import (
+    IntEnum,
+    unique,
+)
+from typing import (
+    Any,
+    Optional,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Identifier,
+)
+
+'''
+    Bytecode de lpp.
+
+    Cada funcion (y el programa) se compila a una lista plana de enteros con
+    instrucciones de ancho fijo: [opcode, operando, opcode, operando, ...].
+    Las instrucciones que no usan operando llevan 0. Asi la maquina virtual
+    avanza siempre de 2 en 2 y los saltos son indices en la lista.
+
+    Los valores constantes (enteros, nombres para los errores, funciones
+    compiladas y arreglos literales) estan en un solo arreglo de constantes
+    por programa. Cada CompiledFunction guarda el arreglo de su programa: una
+    closure creada en una linea anterior del REPL sigue leyendo las
+    constantes de esa linea aunque la maquina virtual ya corra otro
+    programa.
+'''
+
+
+# Los numeros agrupan las instrucciones en tres rangos (leer valores,
+# operadores y control) para que la maquina virtual primero elija el rango
+# y despues compare solo dentro de el. Cada operador binario tiene cuatro
+# versiones segun de donde salen sus valores: de la pila, la derecha de
+# constants[operando] (+10) o de frame[operando] (+20), o la izquierda de
+# frame[operando & 255] y la derecha de constants[operando >> 8] (+30)
+@unique
+class OpCode(IntEnum):
+    GET_LOCAL = 0       # frame[operando]
+    CONSTANT = 1        # push constants[operando]
+    GET_GLOBAL = 2      # globals[operando]
+    GET_FREE = 3        # closure.cells[operando].value
+    GET_CELL = 4        # frame[operando].value
+    TRUE = 5
+    FALSE = 6
+    NULL = 7
+
+    ADD = 10
+    SUB = 11
+    LT = 12
+    MUL = 13
+    GT = 14
+    EQ = 15
+    NE = 16
+    DIV = 17
+    NEG = 18
+    NOT = 19
+    ADD_CONSTANT = 20
+    SUB_CONSTANT = 21
+    LT_CONSTANT = 22
+    MUL_CONSTANT = 23
+    GT_CONSTANT = 24
+    EQ_CONSTANT = 25
+    NE_CONSTANT = 26
+    DIV_CONSTANT = 27
+    ADD_LOCAL = 30
+    SUB_LOCAL = 31
+    LT_LOCAL = 32
+    MUL_LOCAL = 33
+    GT_LOCAL = 34
+    EQ_LOCAL = 35
+    NE_LOCAL = 36
+    DIV_LOCAL = 37
+    ADD_LOCAL_CONSTANT = 40
+    SUB_LOCAL_CONSTANT = 41
+    LT_LOCAL_CONSTANT = 42
+    MUL_LOCAL_CONSTANT = 43
+    GT_LOCAL_CONSTANT = 44
+    EQ_LOCAL_CONSTANT = 45
+    NE_LOCAL_CONSTANT = 46
+    DIV_LOCAL_CONSTANT = 47
+
+    JUMP_IF_FALSE = 50  # saca un valor y salta si es falso o nulo
+    JUMP = 51           # ip = operando
+    CALL = 52           # operando = numero de argumentos
+    TAIL_CALL = 53      # CALL que reutiliza el lugar de la funcion actual
+    RETURN = 54
+    POP = 55
+    SET_LOCAL = 56
+    SET_CELL = 57
+    CLOSURE = 58        # crea la closure de constants[operando]
+    UNDEFINED = 59      # error con el nombre constants[operando]
+    ARRAY = 60          # arreglo o lista con los ultimos operando valores
+    INDEX = 61
+    MAP = 62            # mapa con los ultimos 2 * operando valores
+    LENGTH = 63
+
+
+BINARY_OPERATORS: dict[str, OpCode] = {
+    '+': OpCode.ADD,
+    '-': OpCode.SUB,
+    '*': OpCode.MUL,
+    '/': OpCode.DIV,
+    '<': OpCode.LT,
+    '>': OpCode.GT,
+    '==': OpCode.EQ,
+    '!=': OpCode.NE,
+}
+
+OPERATOR_SYMBOLS: dict[int, str] = {
+    opcode: operator for operator, opcode in BINARY_OPERATORS.items()
+}
+
+# Lo que hay que sumar al opcode de un operador para cada version
+CONSTANT_OPERAND: int = OpCode.ADD_CONSTANT - OpCode.ADD
+LOCAL_OPERAND: int = OpCode.ADD_LOCAL - OpCode.ADD
+LOCAL_CONSTANT_OPERANDS: int = OpCode.ADD_LOCAL_CONSTANT - OpCode.ADD
+
+
+class CompiledFunction:
+    __slots__ = ('name', 'code', 'constants', 'parameters', 'frame_size', 'cells',
+                 'captures', 'direct_arguments', 'memoize', 'sources')
+
+    def __init__(self,
+                 name: str,
+                 parameters: list[Identifier],
+                 frame_size: int,
+                 cells: tuple[int, ...] = (),
+                 captures: tuple[tuple[int, int], ...] = (),
+                 constants: Optional[list[Any]] = None) -> None:
+        self.name = name
+        self.code: list[int] = []
+        # Las constantes del programa donde se compilo
+        self.constants: list[Any] = constants if constants is not None else []
+        # Los identificadores, para mostrar la funcion como funcion(x, y)
+        self.parameters = parameters
+        self.frame_size = frame_size
+        self.cells = cells
+        self.captures = captures
+        # Si los argumentos pueden ser el principio del frame tal cual: los
+        # parametros ocupan las posiciones 0..n-1 en orden y no son celdas
+        self.direct_arguments = not cells and all(
+            parameter.slot == position
+            for position, parameter in enumerate(parameters))
+        # Si sus resultados se memorizan (ver lpp.purity)
+        self.memoize = False
+        # Nodo que genero cada instruccion, por indice de instruccion
+        self.sources: list[Optional[ASTNode]] = []
+
+    def emit(self, opcode: OpCode, operand: int = 0,
+             source: Optional[ASTNode] = None) -> int:
+        position = len(self.code)
+        self.code.append(int(opcode))
+        self.code.append(operand)
+        self.sources.append(source)
+        return position
+
+    def patch(self, position: int, operand: int) -> None:
+        self.code[position + 1] = operand
+
+    def __repr__(self) -> str:
+        return f'<{self.name}>'
+
+
+class Bytecode:
+
+    def __init__(self, main: CompiledFunction, constants: list[Any]) -> None:
+        self.main = main
+        self.constants = constants
+        # Nombres de las posiciones del frame global
+        self.globals: list[str] = []
+        # Globales predefinidas que el programa vuelve a definir (ver
+        # lpp.purity.redefined_globals)
+        self.redefined: set[int] = set()
+
+
+_WITH_OPERAND: frozenset[OpCode] = frozenset((
+    OpCode.CONSTANT, OpCode.JUMP, OpCode.JUMP_IF_FALSE, OpCode.GET_LOCAL,
+    OpCode.SET_LOCAL, OpCode.GET_CELL, OpCode.SET_CELL, OpCode.GET_FREE,
+    OpCode.GET_GLOBAL, OpCode.UNDEFINED, OpCode.CLOSURE, OpCode.CALL,
+    OpCode.TAIL_CALL, OpCode.ARRAY, OpCode.MAP,
+))
+
+# Los operadores que no toman los dos valores de la pila
+_OPERATOR_VERSIONS: frozenset[int] = frozenset(
+    opcode + offset
+    for opcode in OPERATOR_SYMBOLS
+    for offset in (CONSTANT_OPERAND, LOCAL_OPERAND, LOCAL_CONSTANT_OPERANDS))
+
+
+def _disassemble_function(function: CompiledFunction,
+                          constants: list[Any],
+                          out: list[str]) -> list[CompiledFunction]:
+    nested: list[CompiledFunction] = []
+    out.append(f'{function.name}:')
+
+    code = function.code
+    for position in range(0, len(code), 2):
+        opcode = OpCode(code[position])
+        operand = code[position + 1]
+
+        line = f'{position:04d} {opcode.name}'
+        if OpCode.ADD_LOCAL_CONSTANT <= opcode <= OpCode.DIV_LOCAL_CONSTANT:
+            line += f' {operand & 255} {operand >> 8} ({constants[operand >> 8]!r})'
+        elif opcode in _WITH_OPERAND or opcode in _OPERATOR_VERSIONS:
+            line += f' {operand}'
+        if opcode == OpCode.CONSTANT or opcode == OpCode.UNDEFINED or \
+                OpCode.ADD_CONSTANT <= opcode <= OpCode.DIV_CONSTANT:
+            line += f' ({constants[operand]!r})'
+        elif opcode == OpCode.CLOSURE:
+            line += f' ({constants[operand]!r})'
+            nested.append(constants[operand])
+        out.append(line)
+
+    return nested
+
+
+# Texto legible del bytecode: cada funcion con sus instrucciones
+def disassemble(bytecode: Bytecode) -> str:
+    out: list[str] = []
+    pending: list[CompiledFunction] = [bytecode.main]
+    while pending:
+        function = pending.pop(0)
+        if out:
+            out.append('')
+        pending.extend(_disassemble_function(function, function.constants, out))
+
+    return '\n'.join(out)
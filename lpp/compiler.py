@@ -0,0 +1,313 @@
+from typing import (
+    Any,
+    Iterable,
+)
+
+from lpp.ast import (
+    ArrayLiteral,
+    Block,
+    Boolean,
+    Call,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    Program,
+    ReturnStatement,
+    Statement,
+    StringLiteral,
+)
+from lpp.code import (
+    BINARY_OPERATORS,
+    Bytecode,
+    CompiledFunction,
+    CONSTANT_OPERAND,
+    LOCAL_CONSTANT_OPERANDS,
+    LOCAL_OPERAND,
+    OpCode,
+)
+from lpp.containers import literal_list
+from lpp.purity import (
+    mark_memoizable,
+    redefined_globals,
+)
+from lpp.resolver import (
+    resolve,
+    Resolution,
+)
+from lpp.strings import intern
+from lpp.visitor import NodeVisitor
+
+'''
+    Compilador de Program a bytecode (ver lpp.code).
+
+    Usa las posiciones de lpp.resolver: cada Identifier se convierte en la
+    instruccion que lee su posicion (GET_LOCAL, GET_CELL, GET_FREE o
+    GET_GLOBAL). El programa se compila como una funcion mas cuyo frame es
+    el global.
+
+    Cada expresion deja exactamente un valor en la pila. Cada bloque tambien
+    deja uno, el de su ultimo statement (nulo si termina con `variable` o
+    esta vacio), asi que los statements de en medio sacan el suyo con POP.
+
+    Las llamadas en posicion de cola (ver lpp.tail_calls) son TAIL_CALL.
+
+    Los operadores leen los enteros y las variables del frame actual sin
+    pasarlos por la pila (ver lpp.code.OpCode): `n - 1` es una sola
+    instruccion, SUB_LOCAL_CONSTANT, en lugar de GET_LOCAL, CONSTANT, SUB.
+
+    Un `para` no deja valor, como `variable`. Es un ciclo de saltos sobre
+    las posiciones de sus variables en el frame actual: las asignaciones
+    ponen todos los valores nuevos en la pila y despues los guardan del
+    ultimo al primero.
+'''
+
+
+# Si la variable se lee de frame[slot] tal cual
+def _in_frame(node: Identifier) -> bool:
+    return node.depth == 0 and not node.boxed
+
+
+class Compiler(NodeVisitor):
+
+    def __init__(self) -> None:
+        self.constants: list[Any] = []
+        self._integers: dict[int, int] = {}
+        self._strings: dict[str, int] = {}
+        self._names: dict[str, int] = {}
+        self._function: CompiledFunction = CompiledFunction('<programa>', [], 0)
+
+    def compile(self, program: Program, predefined: Iterable[str] = ()) -> Bytecode:
+        predefined = list(predefined)
+        resolution: Resolution = resolve(program, predefined)
+        mark_memoizable(resolution.table)
+
+        main = CompiledFunction('<programa>', [], program.frame_size,
+                                constants=self.constants)
+        self._function = main
+        self._statements(program.statements, program)
+        main.emit(OpCode.RETURN)
+
+        bytecode = Bytecode(main, self.constants)
+        bytecode.globals = resolution.globals
+        bytecode.redefined = redefined_globals(resolution.table, len(predefined))
+        return bytecode
+
+    def _constant(self, value: Any) -> int:
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+    def _statements(self, statements: list[Statement], source: Any) -> None:
+        if not statements:
+            self._function.emit(OpCode.NULL, source=source)
+            return
+
+        last = len(statements) - 1
+        for position, statement in enumerate(statements):
+            self.visit(statement)
+            if type(statement) is LetStatement or type(statement) is For:
+                if position == last:
+                    self._function.emit(OpCode.NULL, source=statement)
+            elif position < last:
+                self._function.emit(OpCode.POP, source=statement)
+
+    def visit_Block(self, node: Block) -> None:
+        self._statements(node.statements, node)
+
+    def visit_LetStatement(self, node: LetStatement) -> None:
+        assert node.name is not None and node.value is not None
+        self.visit(node.value)
+
+        name = node.name
+        opcode = OpCode.SET_CELL if name.boxed else OpCode.SET_LOCAL
+        self._function.emit(opcode, name.slot, name)
+
+    def visit_For(self, node: For) -> None:
+        assert node.condition is not None
+        function = self._function
+        for variable in node.variables:
+            self.visit(variable)
+
+        loop = len(function.code)
+        self.visit(node.condition)
+        exit_jump = function.emit(OpCode.JUMP_IF_FALSE, source=node)
+
+        if node.body is not None and node.body.statements:
+            self.visit(node.body)
+            function.emit(OpCode.POP, source=node)
+
+        for update in node.updates:
+            assert update.value is not None
+            self.visit(update.value)
+        for update in reversed(node.updates):
+            name = update.name
+            assert name is not None
+            opcode = OpCode.SET_CELL if name.boxed else OpCode.SET_LOCAL
+            function.emit(opcode, name.slot, name)
+
+        function.emit(OpCode.JUMP, loop, node)
+        function.patch(exit_jump, len(function.code))
+
+    def visit_ReturnStatement(self, node: ReturnStatement) -> None:
+        if node.return_value is None:
+            self._function.emit(OpCode.NULL, source=node)
+        else:
+            self.visit(node.return_value)
+        self._function.emit(OpCode.RETURN, source=node)
+
+    def visit_ExpressionStatement(self, node: ExpressionStatement) -> None:
+        if node.expression is None:
+            self._function.emit(OpCode.NULL, source=node)
+        else:
+            self.visit(node.expression)
+
+    def visit_Integer(self, node: Integer) -> None:
+        self._function.emit(OpCode.CONSTANT, self._integer(node), node)
+
+    def _integer(self, node: Integer) -> int:
+        assert node.value is not None
+        value = node.value
+        index = self._integers.get(value)
+        if index is None:
+            index = self._integers[value] = self._constant(value)
+        return index
+
+    # El String internado, asi que el mismo literal es el mismo objeto en
+    # todos los programas de la sesion
+    def visit_StringLiteral(self, node: StringLiteral) -> None:
+        assert node.value is not None
+        value = node.value
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = self._constant(intern(value))
+        self._function.emit(OpCode.CONSTANT, index, node)
+
+    def visit_Boolean(self, node: Boolean) -> None:
+        self._function.emit(OpCode.TRUE if node.value else OpCode.FALSE, source=node)
+
+    def visit_Identifier(self, node: Identifier) -> None:
+        function = self._function
+        if node.depth == 0:
+            opcode = OpCode.GET_CELL if node.boxed else OpCode.GET_LOCAL
+            function.emit(opcode, node.slot, node)
+        elif node.depth > 0:
+            if node.free >= 0:
+                function.emit(OpCode.GET_FREE, node.free, node)
+            else:
+                function.emit(OpCode.GET_GLOBAL, node.slot, node)
+        else:
+            index = self._names.get(node.value)
+            if index is None:
+                index = self._names[node.value] = self._constant(node.value)
+            function.emit(OpCode.UNDEFINED, index, node)
+
+    def visit_Prefix(self, node: Prefix) -> None:
+        assert node.right is not None
+        self.visit(node.right)
+        if node.operator == '-':
+            self._function.emit(OpCode.NEG, source=node)
+        else:
+            self._function.emit(OpCode.NOT, source=node)
+
+    def visit_Infix(self, node: Infix) -> None:
+        assert node.right is not None
+        left = node.left
+        right = node.right
+        opcode = BINARY_OPERATORS[node.operator]
+        if type(right) is Integer and type(left) is Identifier and _in_frame(left) \
+                and left.slot < 256:
+            self._function.emit(OpCode(opcode + LOCAL_CONSTANT_OPERANDS),
+                                (self._integer(right) << 8) | left.slot, node)
+            return
+
+        self.visit(left)
+        if type(right) is Integer:
+            self._function.emit(OpCode(opcode + CONSTANT_OPERAND),
+                                self._integer(right), node)
+        elif type(right) is Identifier and _in_frame(right):
+            self._function.emit(OpCode(opcode + LOCAL_OPERAND), right.slot, node)
+        else:
+            self.visit(right)
+            self._function.emit(opcode, source=node)
+
+    def visit_If(self, node: If) -> None:
+        assert node.condition is not None and node.consequence is not None
+        function = self._function
+
+        self.visit(node.condition)
+        jump_if_false = function.emit(OpCode.JUMP_IF_FALSE, source=node)
+        self.visit(node.consequence)
+        jump = function.emit(OpCode.JUMP, source=node)
+
+        function.patch(jump_if_false, len(function.code))
+        if node.alternative is None:
+            function.emit(OpCode.NULL, source=node)
+        else:
+            self.visit(node.alternative)
+        function.patch(jump, len(function.code))
+
+    # Un literal de puros enteros y booleanos se construye al compilar y es
+    # una constante
+    def visit_ArrayLiteral(self, node: ArrayLiteral) -> None:
+        constant = literal_list(node)
+        if constant is not None:
+            self._function.emit(OpCode.CONSTANT, self._constant(constant), node)
+            return
+
+        for element in node.elements:
+            self.visit(element)
+        self._function.emit(OpCode.ARRAY, len(node.elements), node)
+
+    def visit_Index(self, node: Index) -> None:
+        assert node.index is not None
+        self.visit(node.left)
+        self.visit(node.index)
+        self._function.emit(OpCode.INDEX, source=node)
+
+    def visit_MapLiteral(self, node: MapLiteral) -> None:
+        for entry in node.entries:
+            self.visit(entry)
+        self._function.emit(OpCode.MAP, len(node.entries) // 2, node)
+
+    def visit_Length(self, node: Length) -> None:
+        assert node.argument is not None
+        self.visit(node.argument)
+        self._function.emit(OpCode.LENGTH, source=node)
+
+    def visit_Function(self, node: Function) -> None:
+        compiled = CompiledFunction(f'funcion@{node.start}', node.parameters,
+                                    node.frame_size, node.cells, node.captures,
+                                    self.constants)
+        compiled.memoize = node.memoize
+
+        outer = self._function
+        self._function = compiled
+        if node.body is None:
+            compiled.emit(OpCode.NULL, source=node)
+        else:
+            self.visit(node.body)
+        compiled.emit(OpCode.RETURN, source=node)
+        self._function = outer
+
+        outer.emit(OpCode.CLOSURE, self._constant(compiled), node)
+
+    def visit_Call(self, node: Call) -> None:
+        arguments = node.arguments or []
+
+        self.visit(node.function)
+        for argument in arguments:
+            self.visit(argument)
+        opcode = OpCode.TAIL_CALL if node.tail else OpCode.CALL
+        self._function.emit(opcode, len(arguments), node)
+
+
+def compile_program(program: Program, predefined: Iterable[str] = ()) -> Bytecode:
+    return Compiler().compile(program, predefined)
@@ -0,0 +1,118 @@
+from typing import Any
+
+from lpp.arrays import (
+    literal_array,
+    make_array,
+)
+from lpp.ast import (
+    ArrayLiteral,
+    Boolean,
+    Integer,
+)
+from lpp.object import (
+    Array,
+    EvaluationError,
+    FALSE,
+    List,
+    Map,
+    String,
+    TRUE,
+    type_name,
+)
+
+'''
+    Listas y mapas de lpp, y lo que comparten con los arreglos: indexar y
+    `tamano`.
+
+    Un literal [...] que no es un arreglo (ver lpp.arrays) es una List: una
+    list de Python con los valores de lpp tal cual. Los enteros son int y
+    los booleanos las instancias unicas TRUE y FALSE, asi que ningun
+    elemento lleva un objeto extra encima. Un mapa {llave: valor} es un Map
+    sobre un dict de Python; las llaves son valores de lpp con el hash de
+    Python (los enteros por valor, los booleanos y las funciones por
+    identidad y los arreglos, listas, mapas y textos por contenido). Si una
+    llave se repite gana el ultimo valor.
+
+    Indexar y `tamano` son O(1). Un literal se construye de una vez con
+    todos sus elementos ya evaluados; la maquina virtual y lpp.specializing
+    construyen antes de ejecutar los que solo tienen constantes.
+
+    Indexar un texto da un texto de un caracter. Un String que todavia es
+    una cuerda (ver lpp.strings) se une la primera vez que se indexa y
+    despues ya es O(1).
+
+    Todos los evaluadores usan estas funciones, asi que dan los mismos
+    resultados y los mismos errores.
+'''
+
+
+def _fail(message: str) -> Any:
+    raise EvaluationError(message)
+
+
+# Los enteros y booleanos se muestran y lo demas solo por su tipo
+def _describe(value: Any) -> str:
+    if type(value) is int or value is TRUE or value is FALSE:
+        return str(value)
+    return type_name(value)
+
+
+def make_list(elements: list[Any]) -> Any:
+    array = make_array(elements)
+    if array is not None:
+        return array
+    return List(elements)
+
+
+# El arreglo o la lista de un literal que solo tiene enteros y booleanos,
+# para construirlo una vez antes de ejecutar; None si depende de algo mas
+def literal_list(node: ArrayLiteral) -> Any:
+    array = literal_array(node)
+    if array is not None:
+        return array
+
+    elements = node.elements
+    kinds = set(type(element) for element in elements)
+    if kinds != {Integer, Boolean}:
+        return None
+    return List([element.value if type(element) is Integer  # type: ignore
+                 else TRUE if element.value else FALSE  # type: ignore
+                 for element in elements])
+
+
+# Llaves y valores alternados: [llave, valor, llave, valor, ...]
+def make_map(items: list[Any]) -> Map:
+    return Map(dict(zip(items[::2], items[1::2])))
+
+
+def index(container: Any, position: Any) -> Any:
+    kind = type(container)
+
+    if kind is Map:
+        value = container.pairs.get(position)
+        if value is None:
+            return _fail(f'Llave no encontrada: {_describe(position)}')
+        return value
+
+    if kind is not Array and kind is not List and kind is not String:
+        return _fail(f'No se puede indexar: {type_name(container)}')
+    if type(position) is not int:
+        return _fail(f'Indice invalido: {type_name(position)}')
+
+    if position < 0 or position >= len(container):
+        return _fail(f'Indice fuera de rango: {position}')
+    if kind is String:
+        return String(container.value()[position])
+    values = container.values
+    if kind is List:
+        return values[position]
+    if container.boolean:
+        return TRUE if values[position] else FALSE
+    return int(values[position])
+
+
+def length(value: Any) -> int:
+    kind = type(value)
+    if kind is Array or kind is List or kind is Map or kind is String:
+        return len(value)
+    return _fail(f'Argumento invalido para tamano: {type_name(value)}')
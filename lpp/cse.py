@@ -0,0 +1,286 @@
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Block,
+    Boolean,
+    Call,
+    Expression,
+    ExpressionStatement,
+    Identifier,
+    If,
+    Infix,
+    Integer,
+    LetStatement,
+    Prefix,
+    Program,
+    ReturnStatement,
+    Statement,
+)
+from lpp.optimizer import (
+    count_nodes,
+    OptimizationPass,
+    PassStats,
+)
+from lpp.symbols import (
+    build_symbol_table,
+    SymbolTable,
+)
+from lpp.token import (
+    Token,
+    TokenType,
+)
+from lpp.visitor import walk
+
+'''
+    Eliminacion de subexpresiones comunes.
+
+    Dentro de cada lista de statements (el programa o un bloque) numeramos
+    las expresiones por valor: dos expresiones tienen el mismo numero si
+    tienen la misma forma y sus identificadores se refieren al mismo simbolo.
+    Una variable solo cambia de valor en las asignaciones de su `para`, y
+    aqui no se numera nada de la condicion ni de las asignaciones de un
+    `para` (su cuerpo es otro bloque, que dentro de una vuelta ve valores
+    fijos). Despues del `para` sus variables ya no cambian y `variable x` en
+    el mismo scope crea otro simbolo, asi que dos Infix con el mismo numero
+    siempre valen lo mismo.
+
+    Cada Infix que aparece dos o mas veces se calcula una sola vez en una
+    variable temporal nueva, justo antes del statement donde aparece por
+    primera vez, y todas las apariciones se reemplazan por esa variable:
+
+        (a * b) + (a * b) * c  ->  variable _t1 = (a * b); (_t1 + (_t1 * c))
+
+    Solo cuentan las expresiones hechas de literales, identificadores
+    definidos, Prefix e Infix. Los cuerpos de las funciones y las ramas de
+    los `si` son otros scopes y se procesan aparte. Adelantar el calculo no
+    puede saltarse una llamada (no sabemos que hace) ni entrar a la rama de
+    un `si` (puede regresar antes), asi que si antes de la primera aparicion
+    hay una llamada o un `si`, esa expresion se deja como esta.
+'''
+
+
+StatementContainer = Union[Program, Block]
+# (padre, campo, indice en la lista o -1)
+Location = tuple[ASTNode, str, int]
+
+
+class _Occurrence:
+
+    def __init__(self,
+                 node: Infix,
+                 location: Location,
+                 statement: int,
+                 after_barrier: bool) -> None:
+        self.node = node
+        self.location = location
+        # Statement de la lista en el que aparece
+        self.statement = statement
+        # Si antes de evaluarla ya hubo una llamada o un `si`
+        self.after_barrier = after_barrier
+
+
+class _ValueNumbering:
+
+    def __init__(self, table: SymbolTable) -> None:
+        self._table = table
+        self._numbers: dict[tuple[Any, ...], int] = {}
+        self.sizes: list[int] = []
+        self.occurrences: list[list[_Occurrence]] = []
+
+    def _number(self, key: tuple[Any, ...], size: int) -> int:
+        number = self._numbers.get(key)
+        if number is None:
+            number = self._numbers[key] = len(self.sizes)
+            self.sizes.append(size)
+            self.occurrences.append([])
+        return number
+
+    # Recorre las expresiones de un statement en el orden en que se evaluan
+    def add_statement(self, statement: Statement, position: int) -> None:
+        if type(statement) is LetStatement:
+            root, field = statement.value, 'value'
+        elif type(statement) is ReturnStatement:
+            root, field = statement.return_value, 'return_value'
+        elif type(statement) is ExpressionStatement:
+            root, field = statement.expression, 'expression'
+        else:
+            return
+        if root is None:
+            return
+
+        barrier = False
+        # Numero y tamaño de cada expresion ya visitada (None si no es pura)
+        values: list[Optional[tuple[int, int]]] = []
+        stack: list[tuple[Expression, Location, bool]] = \
+            [(root, (statement, field, -1), False)]
+
+        while stack:
+            node, location, expanded = stack.pop()
+            node_class = type(node)
+
+            if not expanded:
+                if node_class is Infix:
+                    stack.append((node, location, True))
+                    stack.append((node.right, (node, 'right', -1), False))  # type: ignore
+                    stack.append((node.left, (node, 'left', -1), False))  # type: ignore
+                    continue
+                if node_class is Prefix:
+                    stack.append((node, location, True))
+                    stack.append((node.right, (node, 'right', -1), False))  # type: ignore
+                    continue
+                if node_class is Call:
+                    stack.append((node, location, True))
+                    arguments = node.arguments or []  # type: ignore
+                    for index in range(len(arguments) - 1, -1, -1):
+                        stack.append((arguments[index], (node, 'arguments', index),
+                                      False))
+                    stack.append((node.function, (node, 'function', -1), False))  # type: ignore
+                    continue
+                if node_class is If:
+                    stack.append((node, location, True))
+                    if node.condition is not None:  # type: ignore
+                        stack.append((node.condition, (node, 'condition', -1),  # type: ignore
+                                      False))
+                    continue
+
+            values.append(self._value(node, values))
+            if node_class is Call or node_class is If:
+                barrier = True
+            elif node_class is Infix and values[-1] is not None:
+                number, _ = values[-1]  # type: ignore
+                self.occurrences[number].append(
+                    _Occurrence(node, location, position, barrier))  # type: ignore
+
+    # Numero de la expresion; los valores de sus hijos son los ultimos de
+    # `values`, que se consumen
+    def _value(self,
+               node: Expression,
+               values: list[Optional[tuple[int, int]]]) -> Optional[tuple[int, int]]:
+        node_class = type(node)
+
+        if node_class is Integer:
+            return self._number(('int', node.value), 1), 1  # type: ignore
+        if node_class is Boolean:
+            return self._number(('bool', node.value), 1), 1  # type: ignore
+        if node_class is Identifier:
+            symbol = self._table.definition(node)  # type: ignore
+            if symbol is None:
+                return None
+            return self._number(('id', id(symbol)), 1), 1
+        if node_class is Prefix:
+            right = values.pop()
+            if right is None:
+                return None
+            size = right[1] + 1
+            return self._number((node.operator, right[0]), size), size  # type: ignore
+        if node_class is Infix:
+            right = values.pop()
+            left = values.pop()
+            if left is None or right is None:
+                return None
+            size = left[1] + right[1] + 1
+            return self._number((node.operator, left[0], right[0]), size), size  # type: ignore
+        if node_class is Call:
+            del values[len(values) - len(node.arguments or []) - 1:]  # type: ignore
+            return None
+        if node_class is If:
+            if node.condition is not None:  # type: ignore
+                values.pop()
+            return None
+
+        # Funciones y cualquier otra cosa
+        return None
+
+
+class CommonSubexpressionElimination(OptimizationPass):
+    name = 'subexpresiones comunes'
+
+    def run(self, program: Program) -> PassStats:
+        stats = PassStats(self.name, count_nodes(program))
+
+        table = build_symbol_table(program)
+        self._names = {node.value for node in walk(program)
+                       if type(node) is Identifier}  # type: ignore
+        self._counter = 0
+
+        containers = [node for node in walk(program)
+                      if type(node) is Program or type(node) is Block]
+        for container in containers:
+            stats.changes += self._eliminate(container, table)  # type: ignore
+
+        if stats.changes:
+            stats.nodes_after = count_nodes(program)
+
+        return stats
+
+    def _eliminate(self, container: StatementContainer, table: SymbolTable) -> int:
+        numbering = _ValueNumbering(table)
+        for position, statement in enumerate(container.statements):
+            numbering.add_statement(statement, position)
+
+        repeated = [number for number, occurrences in enumerate(numbering.occurrences)
+                    if len(occurrences) > 1]
+        if not repeated:
+            return 0
+
+        # Primero las expresiones mas grandes; sus subexpresiones
+        # desaparecen junto con ellas
+        repeated.sort(key=lambda number: -numbering.sizes[number])
+        replaced: set[ASTNode] = set()
+        # Temporales a insertar antes de cada statement, en orden
+        hoisted: dict[int, list[LetStatement]] = {}
+
+        for number in repeated:
+            occurrences = [occurrence for occurrence in numbering.occurrences[number]
+                           if occurrence.node not in replaced]
+            if len(occurrences) < 2 or occurrences[0].after_barrier:
+                continue
+
+            first = occurrences[0]
+            name = self._fresh_name()
+            temporary = LetStatement(Token(TokenType.LET, 'variable'),
+                                     self._identifier(name, first.node),
+                                     first.node)
+            temporary.start, temporary.end = first.node.start, first.node.end
+            hoisted.setdefault(first.statement, []).append(temporary)
+
+            for occurrence in occurrences:
+                replaced.update(walk(occurrence.node))
+                self._replace(occurrence.location,
+                              self._identifier(name, occurrence.node))
+
+        if not hoisted:
+            return 0
+
+        statements: list[Statement] = []
+        for position, statement in enumerate(container.statements):
+            statements.extend(hoisted.get(position, []))
+            statements.append(statement)
+        container.statements = statements
+
+        return sum(len(temporaries) for temporaries in hoisted.values())
+
+    def _fresh_name(self) -> str:
+        while True:
+            self._counter += 1
+            name = f'_t{self._counter}'
+            if name not in self._names:
+                self._names.add(name)
+                return name
+
+    def _identifier(self, name: str, original: Expression) -> Identifier:
+        identifier = Identifier(Token(TokenType.IDENT, name), name)
+        identifier.start, identifier.end = original.start, original.end
+        return identifier
+
+    def _replace(self, location: Location, node: Expression) -> None:
+        parent, field, index = location
+        if index < 0:
+            setattr(parent, field, node)
+        else:
+            getattr(parent, field)[index] = node
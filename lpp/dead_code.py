@@ -0,0 +1,220 @@
+from typing import Optional
+
+from lpp.ast import (
+    ASTNode,
+    Block,
+    Boolean,
+    Expression,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Integer,
+    LetStatement,
+    Program,
+    ReturnStatement,
+    Statement,
+)
+from lpp.optimizer import (
+    count_nodes,
+    make_boolean,
+    OptimizationPass,
+    PassStats,
+)
+from lpp.symbols import (
+    build_symbol_table,
+    SymbolTable,
+)
+from lpp.visitor import (
+    NodeTransformer,
+    walk,
+)
+
+'''
+    Eliminacion de codigo muerto.
+
+    - Los statements que siguen a un `retorna` del mismo bloque nunca se
+      ejecutan y se quitan.
+    - Un `si` con condicion literal se queda solo con la rama que se toma.
+      Si esa rama es una sola expresion, el `si` se reemplaza por ella; si
+      es un statement suelto y la rama no define variables (con `variable`
+      o en un `para`, que las define en el bloque donde esta), sus
+      statements se insertan en el bloque de afuera.
+    - `variable x = <valor>;` se quita si nadie usa x y evaluar el valor no
+      puede tener efectos ni fallar (literales, funciones e identificadores
+      definidos).
+
+    El valor de un bloque es el de su ultimo statement, asi que ese nunca se
+    quita ni se reemplaza por una rama vacia.
+'''
+
+
+# Valor de verdad de una condicion literal, None si no es constante. Solo
+# falso (y nulo) son falsos; cualquier entero es verdadero
+def _constant_truth(condition: Optional[Expression]) -> Optional[bool]:
+    if type(condition) is Boolean:
+        return bool(condition.value)
+    if type(condition) is Integer:
+        return True
+    return None
+
+
+def _defines_names(block: Block) -> bool:
+    return any(type(statement) is LetStatement or type(statement) is For
+               for statement in block.statements)
+
+
+class _Pruner(NodeTransformer):
+
+    def __init__(self) -> None:
+        self.changes = 0
+
+    def leave_If(self, node: If) -> Expression:
+        truth = _constant_truth(node.condition)
+        if truth is None:
+            return node
+
+        taken = node.consequence if truth else node.alternative
+        if taken is not None and len(taken.statements) == 1 and \
+                type(taken.statements[0]) is ExpressionStatement:
+            expression = taken.statements[0].expression  # type: ignore
+            if expression is not None:
+                self.changes += 1
+                return expression
+
+        if truth:
+            if node.alternative is not None:
+                node.alternative = None
+                self.changes += 1
+        elif node.alternative is not None:
+            # si (falso) {a} si_no {b} -> si (verdadero) {b}
+            assert node.condition is not None
+            node.condition = make_boolean(True, node.condition)
+            node.consequence = node.alternative
+            node.alternative = None
+            self.changes += 1
+        elif node.consequence is not None and node.consequence.statements:
+            empty = Block(node.consequence.token, [])
+            empty.start, empty.end = node.consequence.start, node.consequence.end
+            node.consequence = empty
+            self.changes += 1
+
+        return node
+
+    def leave_Block(self, node: Block) -> Block:
+        node.statements = self._prune(node.statements)
+        return node
+
+    def leave_Program(self, node: Program) -> Program:
+        node.statements = self._prune(node.statements)
+        return node
+
+    def _prune(self, statements: list[Statement]) -> list[Statement]:
+        pruned: list[Statement] = []
+        last = len(statements) - 1
+
+        # Los bloques internos ya se podaron, asi que una rama insertada no
+        # trae codigo despues de su `retorna` ni otros `si` constantes
+        for position, statement in enumerate(statements):
+            if type(statement) is ExpressionStatement and \
+                    type(statement.expression) is If:
+                branch = self._taken_branch(statement.expression, position < last)
+                if branch is not None:
+                    self.changes += 1
+                    pending = branch
+                else:
+                    pending = [statement]
+            else:
+                pending = [statement]
+
+            for current in pending:
+                pruned.append(current)
+                if type(current) is ReturnStatement:
+                    if current is not pending[-1] or position < last:
+                        self.changes += 1
+                    return pruned
+
+        return pruned
+
+    # Statements que reemplazan a un `si` constante usado como statement, o
+    # None si hay que dejarlo
+    def _taken_branch(self,
+                      node: If,
+                      has_next: bool) -> Optional[list[Statement]]:
+        truth = _constant_truth(node.condition)
+        if truth is None:
+            return None
+
+        # leave_If ya dejo la rama que se toma como consecuencia (vacia si
+        # la condicion es falsa)
+        branch = node.consequence
+        if branch is None or _defines_names(branch):
+            return None
+        if not branch.statements and not has_next:
+            return None
+
+        return branch.statements
+
+
+class DeadCodeElimination(OptimizationPass):
+    name = 'eliminacion de codigo muerto'
+
+    def run(self, program: Program) -> PassStats:
+        stats = PassStats(self.name, count_nodes(program))
+
+        pruner = _Pruner()
+        pruner.transform(program)
+        stats.changes = pruner.changes + self._remove_unused(program)
+
+        if stats.changes:
+            stats.nodes_after = count_nodes(program)
+
+        return stats
+
+    def _remove_unused(self, program: Program) -> int:
+        table = build_symbol_table(program)
+        removed = 0
+
+        for node in list(walk(program)):
+            if type(node) is not Program and type(node) is not Block:
+                continue
+
+            statements = node.statements  # type: ignore
+            kept = [statement for position, statement in enumerate(statements)
+                    if position == len(statements) - 1 or
+                    not self._is_unused(statement, table)]
+            if len(kept) != len(statements):
+                removed += len(statements) - len(kept)
+                node.statements = kept  # type: ignore
+
+        return removed
+
+    def _is_unused(self, statement: Statement, table: SymbolTable) -> bool:
+        if type(statement) is not LetStatement or statement.name is None or \
+                not self._is_pure(statement.value, table):
+            return False
+
+        symbol = table.definition(statement.name)
+        if symbol is None:
+            return False
+
+        # Con varias definiciones del mismo nombre en el scope, una funcion
+        # puede leer cualquiera de ellas segun cuando se llame
+        if len(symbol.scope.definitions[symbol.name]) > 1:
+            return False
+
+        if not symbol.references:
+            return True
+
+        # Una funcion que solo se llama a si misma tampoco se usa
+        assert statement.value is not None
+        inside: set[ASTNode] = set(walk(statement.value))
+        return all(reference in inside for reference in symbol.references)
+
+    def _is_pure(self, value: Optional[Expression], table: SymbolTable) -> bool:
+        if type(value) in (Integer, Boolean, Function):
+            return True
+        if type(value) is Identifier:
+            return table.definition(value) is not None  # type: ignore
+        return False
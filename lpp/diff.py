@@ -0,0 +1,436 @@
+from bisect import bisect_left
+from enum import (
+    auto,
+    Enum,
+    unique,
+)
+from typing import (
+    Any,
+    Callable,
+    NamedTuple,
+    Optional,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Boolean,
+    Identifier,
+    Infix,
+    Integer,
+    Prefix,
+    StringLiteral,
+)
+from lpp.visitor import node_fields
+
+'''
+    Diff estructural entre dos versiones de un programa.
+
+    1. Se aplana cada arbol en preorden y se calcula de abajo hacia arriba
+       un hash estructural de cada subarbol (clase, etiqueta y hashes de los
+       hijos).
+    2. De arriba hacia abajo se emparejan los subarboles identicos por su
+       hash. Como un subarbol ocupa un rango contiguo del preorden, sus
+       descendientes se emparejan sin volver a compararlos. Si el hash
+       aparece una sola vez en cada arbol la pareja es directa. Si hay
+       varias copias se decide despues: primero la copia vieja que sigue a
+       la pareja del hermano anterior o la que esta en el mismo lugar bajo
+       el padre ya emparejado; si no, de las siguientes
+       _CANDIDATES copias libres (en preorden, con un cursor por hash) la
+       de padre mas parecido, como en GumTree (coeficiente de Dice).
+    3. De abajo hacia arriba, un nodo sin pareja se empareja con el padre
+       (de la misma clase) de la mayoria de las parejas de sus hijos.
+    4. De arriba hacia abajo se alinean los hijos que falten de cada pareja,
+       campo por campo, si son de la misma clase.
+
+    Con las parejas se arma el script de cambios: UPDATE si cambio la
+    etiqueta, MOVE si cambio el padre o el orden entre hermanos, INSERT y
+    DELETE para las raices de los subarboles sin pareja. Todo es lineal
+    salvo el orden de hermanos, que usa una subsecuencia creciente
+    (O(k log k)).
+'''
+
+
+@unique
+class EditKind(Enum):
+    INSERT = auto()
+    DELETE = auto()
+    UPDATE = auto()
+    MOVE = auto()
+
+
+class Edit(NamedTuple):
+    kind: EditKind
+    old: Optional[ASTNode]
+    new: Optional[ASTNode]
+
+    def __str__(self) -> str:
+        return f'{self.kind.name}: {self.old} -> {self.new}'
+
+
+# Lo que distingue a dos nodos de la misma clase ademas de sus hijos
+_LABELS: dict[type, Callable[[Any], Any]] = {
+    Identifier: lambda node: node.value,
+    Integer: lambda node: node.value,
+    Boolean: lambda node: node.value,
+    StringLiteral: lambda node: node.value,
+    Prefix: lambda node: node.operator,
+    Infix: lambda node: node.operator,
+}
+
+
+def _label(node: ASTNode) -> Any:
+    label = _LABELS.get(type(node))
+    return None if label is None else label(node)
+
+
+# Copias viejas que se comparan con cada subarbol nuevo repetido
+_CANDIDATES: int = 8
+
+
+class _Tree:
+
+    def __init__(self, root: ASTNode) -> None:
+        self.nodes: list[ASTNode] = []
+        self.parents: list[int] = []
+        # Campo del padre en el que esta el nodo y su indice si es lista
+        self.positions: list[tuple[str, int]] = []
+        self.children: list[list[int]] = []
+        # Indice del nodo entre los hijos de su padre
+        self.ranks: list[int] = []
+
+        stack: list[tuple[ASTNode, int, str, int]] = [(root, -1, '', 0)]
+        while stack:
+            node, parent, field, position = stack.pop()
+            index = len(self.nodes)
+            self.nodes.append(node)
+            self.parents.append(parent)
+            self.positions.append((field, position))
+            self.children.append([])
+            if parent >= 0:
+                self.ranks.append(len(self.children[parent]))
+                self.children[parent].append(index)
+            else:
+                self.ranks.append(0)
+
+            pending: list[tuple[ASTNode, int, str, int]] = []
+            for name, is_list in node_fields(type(node)):
+                value = getattr(node, name)
+                if value is None:
+                    continue
+                if is_list:
+                    pending.extend((child, index, name, offset)
+                                   for offset, child in enumerate(value))
+                else:
+                    pending.append((value, index, name, 0))
+            stack.extend(reversed(pending))
+
+        count = len(self.nodes)
+        self.labels: list[Any] = [_label(node) for node in self.nodes]
+        self.sizes: list[int] = [1] * count
+        self.hashes: list[int] = [0] * count
+
+        for index in range(count - 1, -1, -1):
+            node_class = type(self.nodes[index]).__name__
+            self.hashes[index] = hash((node_class, self.labels[index],
+                                       tuple(self.hashes[child]
+                                             for child in self.children[index])))
+            parent = self.parents[index]
+            if parent >= 0:
+                self.sizes[parent] += self.sizes[index]
+
+
+class TreeDiff:
+
+    def __init__(self, old: ASTNode, new: ASTNode) -> None:
+        self._old = _Tree(old)
+        self._new = _Tree(new)
+        # Pareja de cada nodo por indice de preorden, -1 si no tiene
+        self._old_match: list[int] = [-1] * len(self._old.nodes)
+        self._new_match: list[int] = [-1] * len(self._new.nodes)
+        # Nodos viejos con algun descendiente ya emparejado; ya no pueden
+        # emparejarse como subarbol identico
+        self._partially_matched: list[bool] = [False] * len(self._old.nodes)
+
+        self._match_identical()
+        self._match_bottom_up()
+        self._match_children()
+
+        self.edits: list[Edit] = self._edit_script()
+
+    # Pares (viejo, nuevo) de todos los nodos emparejados
+    @property
+    def mapping(self) -> dict[ASTNode, ASTNode]:
+        return {self._old.nodes[old]: self._new.nodes[new]
+                for old, new in enumerate(self._old_match) if new >= 0}
+
+    def _match(self, old: int, new: int) -> None:
+        self._old_match[old] = new
+        self._new_match[new] = old
+
+    def _match_subtree(self, old: int, new: int) -> None:
+        for offset in range(self._old.sizes[old]):
+            self._match(old + offset, new + offset)
+
+        parent = self._old.parents[old]
+        while parent >= 0 and not self._partially_matched[parent]:
+            self._partially_matched[parent] = True
+            parent = self._old.parents[parent]
+
+    def _available(self, old: int) -> bool:
+        return self._old_match[old] < 0 and not self._partially_matched[old]
+
+    def _same_class(self, old: int, new: int) -> bool:
+        return type(self._old.nodes[old]) is type(self._new.nodes[new])
+
+    def _match_identical(self) -> None:
+        old, new = self._old, self._new
+
+        candidates: dict[int, list[int]] = {}
+        for index in range(len(old.nodes)):
+            candidates.setdefault(old.hashes[index], []).append(index)
+        copies: dict[int, int] = {}
+        for node_hash in new.hashes:
+            copies[node_hash] = copies.get(node_hash, 0) + 1
+
+        if old.hashes[0] == new.hashes[0]:
+            self._match_subtree(0, 0)
+            return
+
+        # Nodos nuevos con mas de un subarbol identico posible
+        ambiguous: list[int] = []
+
+        index = 1
+        while index < len(new.nodes):
+            node_hash = new.hashes[index]
+            options = candidates.get(node_hash)
+
+            # Las hojas sueltas (un identificador, un numero) se repiten
+            # mucho, emparejarlas con cualquier otra solo produce
+            # movimientos falsos
+            if new.sizes[index] < 2 or not options:
+                index += 1
+            elif len(options) == 1 and copies[node_hash] == 1:
+                if old.sizes[options[0]] == new.sizes[index]:
+                    self._match_subtree(options[0], index)
+                index += new.sizes[index]
+            else:
+                ambiguous.append(index)
+                index += new.sizes[index]
+
+        self._match_ambiguous(ambiguous, candidates)
+
+    def _match_ambiguous(self,
+                         ambiguous: list[int],
+                         candidates: dict[int, list[int]]) -> None:
+        old, new = self._old, self._new
+        cursors: dict[int, int] = {}
+        dice: dict[tuple[int, int], float] = {}
+        # Por padre nuevo, el lugar entre los hijos viejos que sigue al
+        # ultimo hijo emparejado
+        following: dict[int, int] = {}
+
+        # La raiz siempre es un Program: emparejarla antes deja alinear a
+        # sus hijos por posicion
+        if self._new_match[0] < 0 and self._old_match[0] < 0 and \
+                self._same_class(0, 0):
+            self._match(0, 0)
+
+        for index in ambiguous:
+            node_hash = new.hashes[index]
+            size = new.sizes[index]
+
+            # La copia que sigue a la del hermano anterior, o la que esta en
+            # el mismo lugar, bajo el padre emparejado
+            parent = new.parents[index]
+            old_parent = self._new_match[parent]
+            if old_parent >= 0:
+                siblings = old.children[old_parent]
+                rank = new.ranks[index]
+                expected = following.get(parent, rank)
+                if rank > 0:
+                    previous = self._new_match[new.children[parent][rank - 1]]
+                    if previous >= 0 and old.parents[previous] == old_parent:
+                        expected = old.ranks[previous] + 1
+
+                aligned = -1
+                for position in (expected, rank):
+                    if position < len(siblings):
+                        option = siblings[position]
+                        if old.hashes[option] == node_hash and \
+                                old.sizes[option] == size and self._available(option):
+                            aligned = option
+                            break
+                if aligned >= 0:
+                    self._match_subtree(aligned, index)
+                    following[parent] = old.ranks[aligned] + 1
+                    continue
+
+            # Si no, las siguientes copias libres en preorden. Las que ya no
+            # estan libres al principio no vuelven a revisarse
+            options = candidates[node_hash]
+            cursor = cursors.get(node_hash, 0)
+            while cursor < len(options) and not self._available(options[cursor]):
+                cursor += 1
+            cursors[node_hash] = cursor
+
+            best = -1
+            best_dice = -1.0
+            for option in options[cursor:cursor + _CANDIDATES]:
+                if not self._available(option) or old.sizes[option] != size:
+                    continue
+                parents = (old.parents[option], parent)
+                similarity = dice.get(parents)
+                if similarity is None:
+                    similarity = dice[parents] = self._dice(*parents)
+                if similarity > best_dice:
+                    best, best_dice = option, similarity
+
+            if best >= 0:
+                self._match_subtree(best, index)
+
+    # Fraccion de los descendientes de ambos nodos que estan emparejados
+    # entre si. Los descendientes ocupan un rango contiguo del preorden
+    def _dice(self, old: int, new: int) -> float:
+        old_end = old + self._old.sizes[old]
+        new_end = new + self._new.sizes[new]
+
+        common = 0
+        for descendant in range(old + 1, old_end):
+            if new < self._old_match[descendant] < new_end:
+                common += 1
+
+        return 2 * common / (old_end - old - 1 + new_end - new - 1)
+
+    def _match_bottom_up(self) -> None:
+        old, new = self._old, self._new
+
+        for index in range(len(new.nodes) - 1, -1, -1):
+            if self._new_match[index] >= 0 or not new.children[index]:
+                continue
+
+            votes: dict[int, int] = {}
+            for child in new.children[index]:
+                matched = self._new_match[child]
+                if matched >= 0:
+                    parent = old.parents[matched]
+                    if parent >= 0 and self._old_match[parent] < 0 and \
+                            self._same_class(parent, index):
+                        votes[parent] = votes.get(parent, 0) + 1
+
+            if votes:
+                best = max(votes, key=lambda parent: votes[parent])
+                self._match(best, index)
+
+        if self._new_match[0] < 0 and self._old_match[0] < 0 and \
+                self._same_class(0, 0):
+            self._match(0, 0)
+
+    def _match_children(self) -> None:
+        old, new = self._old, self._new
+
+        # En preorden: al emparejar un nodo aqui, sus hijos se revisan despues
+        for index in range(len(new.nodes)):
+            matched = self._new_match[index]
+            if matched < 0:
+                continue
+
+            unmatched_old: dict[str, list[int]] = {}
+            for child in old.children[matched]:
+                if self._old_match[child] < 0:
+                    unmatched_old.setdefault(old.positions[child][0], []).append(child)
+
+            for child in new.children[index]:
+                if self._new_match[child] >= 0:
+                    continue
+                options = unmatched_old.get(new.positions[child][0])
+                if not options:
+                    continue
+                # Primer hijo viejo libre del mismo campo y la misma clase
+                for position, option in enumerate(options):
+                    if self._same_class(option, child):
+                        self._match(option, child)
+                        del options[position]
+                        break
+
+    def _edit_script(self) -> list[Edit]:
+        old, new = self._old, self._new
+        edits: list[Edit] = []
+
+        for index, matched in enumerate(self._old_match):
+            if matched < 0:
+                parent = old.parents[index]
+                if parent < 0 or self._old_match[parent] >= 0:
+                    edits.append(Edit(EditKind.DELETE, old.nodes[index], None))
+
+        moved = self._reordered()
+        for index, matched in enumerate(self._new_match):
+            parent = new.parents[index]
+            if matched < 0:
+                if parent < 0 or self._new_match[parent] >= 0:
+                    edits.append(Edit(EditKind.INSERT, None, new.nodes[index]))
+                continue
+
+            if old.labels[matched] != new.labels[index]:
+                edits.append(Edit(EditKind.UPDATE, old.nodes[matched],
+                                  new.nodes[index]))
+
+            old_parent = old.parents[matched]
+            if parent >= 0 and (
+                    old_parent < 0 or self._old_match[old_parent] != parent or
+                    old.positions[matched][0] != new.positions[index][0] or
+                    index in moved):
+                edits.append(Edit(EditKind.MOVE, old.nodes[matched],
+                                  new.nodes[index]))
+
+        return edits
+
+    # Hijos que siguen con el mismo padre pero cambiaron de orden: los que
+    # no estan en la subsecuencia creciente mas larga de posiciones viejas
+    def _reordered(self) -> set[int]:
+        old, new = self._old, self._new
+        moved: set[int] = set()
+
+        for index, matched in enumerate(self._new_match):
+            if matched < 0 or len(new.children[index]) < 2:
+                continue
+
+            kept: list[int] = []
+            for child in new.children[index]:
+                old_child = self._new_match[child]
+                if old_child >= 0 and old.parents[old_child] == matched:
+                    kept.append(child)
+
+            if len(kept) > 1:
+                moved.update(_outside_increasing(
+                    kept, [self._new_match[child] for child in kept]))
+
+        return moved
+
+
+# Elementos que no forman parte de la subsecuencia creciente mas larga
+def _outside_increasing(items: list[int], keys: list[int]) -> list[int]:
+    tails: list[int] = []
+    tail_positions: list[int] = []
+    previous: list[int] = [-1] * len(keys)
+
+    for position, key in enumerate(keys):
+        slot = bisect_left(tails, key)
+        if slot == len(tails):
+            tails.append(key)
+            tail_positions.append(position)
+        else:
+            tails[slot] = key
+            tail_positions[slot] = position
+        previous[position] = tail_positions[slot - 1] if slot > 0 else -1
+
+    keep: set[int] = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position >= 0:
+        keep.add(position)
+        position = previous[position]
+
+    return [item for position, item in enumerate(items) if position not in keep]
+
+
+def diff(old: ASTNode, new: ASTNode) -> list[Edit]:
+    return TreeDiff(old, new).edits
@@ -0,0 +1,515 @@
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+from lpp.arrays import (
+    array_infix,
+    array_negate,
+)
+from lpp.ast import (
+    ArrayLiteral,
+    ASTNode,
+    Block,
+    Boolean,
+    Call,
+    Expression,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+)
+from lpp.containers import (
+    index,
+    length,
+    make_list,
+    make_map,
+)
+from lpp.object import (
+    Array,
+    Cell,
+    Closure,
+    Environment,
+    Error,
+    EvaluationError,
+    FALSE,
+    make_closure,
+    Map,
+    MemoCache,
+    NULL,
+    Return,
+    String,
+    TRUE,
+    type_name,
+)
+from lpp.purity import (
+    global_reads,
+    mark_memoizable,
+    redefined_globals,
+    stale_functions,
+)
+from lpp.resolver import resolve
+from lpp.stackless import call_without_stack
+from lpp.strings import (
+    concat,
+    intern,
+)
+
+'''
+    Evaluador que recorre el AST.
+
+    Antes de ejecutar, lpp.resolver le da a cada identificador su posicion
+    (depth, slot), asi que leer una variable es indexar una lista y no
+    buscar un nombre en una cadena de diccionarios:
+
+    - depth == 0: el frame actual (el global en el programa)
+    - depth > 0: una celda de la closure actual si es una variable libre
+      (free >= 0) o el frame global si no
+    - depth == -1: el nombre no existe
+
+    El entorno de cada llamada es una lista de Function.frame_size
+    posiciones. En lugar de ligar el frame al de afuera, la closure guarda
+    solo las celdas de las variables que usa (ver lpp.object), asi que un
+    frame se libera cuando su llamada termina.
+
+    Cada clase de nodo tiene su metodo en una tabla por tipo, sin cadenas
+    de isinstance. Los errores de ejecucion se lanzan como EvaluationError
+    y evaluate los regresa como un Error, para que el camino normal no
+    tenga que revisar si cada valor es un error.
+
+    Un `retorna` sube como un valor Return por los bloques hasta la
+    funcion. Si el `si` que lo contiene esta dentro de otra expresion
+    (`1 + si (x) { retorna 2; }`) no hay un bloque que lo revise, asi que
+    ese `si` lo convierte en una excepcion que atrapa la llamada.
+
+    Las llamadas en posicion de cola (Call.tail, ver lpp.tail_calls) no se
+    ejecutan ahi: regresan un _TailCall y la funcion que llamo la ejecuta
+    en su propio ciclo, asi que la recursion de cola no usa pila de Python.
+    Las demas llamadas si la usan, unos cuantos frames de Python por cada
+    una. Pasando de _STACK_CALLS llamadas anidadas, la llamada sigue en
+    lpp.stackless (call_without_stack), que no usa la pila de Python, asi
+    que una recursion que no es de cola llega a max_depth llamadas como en
+    lpp.vm, sin tocar el limite de recursion de Python. Lo que se ejecuta
+    ahi no se memoriza.
+
+    Las funciones marcadas por lpp.purity guardan sus resultados en un
+    MemoCache por funcion (memo_caches, con sus estadisticas). Los caches
+    duran un evaluate: el siguiente programa en el mismo entorno puede
+    volver a definir una global que esas funciones usan. Si lo hace, las
+    funciones anteriores que la usan dejan de memorizarse (ver
+    lpp.purity.stale_functions). memoize=False lo apaga.
+
+    Los arreglos y sus operaciones son los de lpp.arrays; las listas, los
+    mapas, indexar y `tamano` los de lpp.containers.
+'''
+
+
+Frame = list[Any]
+EvalFn = Callable[[ASTNode, Frame, Optional[Closure]], Any]
+
+# Llamadas anidadas que usan la pila de Python. Cada una usa unos 8 frames
+# (_apply, _block, _if, ... y las expresiones que la rodean), asi que caben
+# con el limite de recursion de siempre
+_STACK_CALLS = 50
+
+
+def _fail(message: str) -> Any:
+    raise EvaluationError(message)
+
+
+class _Returned(Exception):
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+# Llamada pendiente que regresa una llamada en posicion de cola
+class _TailCall:
+    __slots__ = ('function', 'arguments')
+
+    def __init__(self, function: Any, arguments: list[Any]) -> None:
+        self.function = function
+        self.arguments = arguments
+
+
+class Evaluator:
+
+    def __init__(self,
+                 environment: Optional[Environment] = None,
+                 memoize: bool = True,
+                 memo_size: int = 1024,
+                 max_depth: int = 100_000) -> None:
+        self.environment = environment if environment is not None else Environment()
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.max_depth = max_depth
+        self.memo_caches: dict[Function, MemoCache] = {}
+        self._globals = self.environment.values
+        # Llamadas activas en la pila de Python
+        self._depth = 0
+        self._dispatch: dict[type, EvalFn] = {
+            Program: self._program,  # type: ignore
+            Block: self._block,  # type: ignore
+            LetStatement: self._let,  # type: ignore
+            ReturnStatement: self._return,  # type: ignore
+            ExpressionStatement: self._expression_statement,  # type: ignore
+            For: self._for,  # type: ignore
+            Identifier: self._identifier,  # type: ignore
+            Integer: self._integer,  # type: ignore
+            Boolean: self._boolean,  # type: ignore
+            Prefix: self._prefix,  # type: ignore
+            Infix: self._infix,  # type: ignore
+            If: self._if_expression,  # type: ignore
+            Function: self._function,  # type: ignore
+            Call: self._call,  # type: ignore
+            ArrayLiteral: self._array,  # type: ignore
+            Index: self._index,  # type: ignore
+            MapLiteral: self._map,  # type: ignore
+            Length: self._length,  # type: ignore
+            StringLiteral: self._string,  # type: ignore
+        }
+
+    # Resuelve y ejecuta el programa con las globales del entorno. Regresa
+    # el valor del ultimo statement o un Error
+    def evaluate(self, program: Program) -> Any:
+        environment = self.environment
+        predefined = len(environment.names)
+        resolution = resolve(program, environment.names)
+        self.memo_caches = {}
+        if self.memoize:
+            mark_memoizable(resolution.table)
+            self._unmark_stale(redefined_globals(resolution.table, predefined))
+
+        environment.names = resolution.globals
+        missing = len(resolution.globals) - len(self._globals)
+        if missing > 0:
+            self._globals.extend([None] * missing)
+
+        self._depth = 0
+        try:
+            return self._program(program, self._globals, None)
+        except EvaluationError as error:
+            return Error(error.message)
+        except RecursionError:
+            return Error('Limite de recursion excedido')
+
+    # Quita la marca de memorizar a las funciones de programas anteriores
+    # que usan una global que este programa vuelve a definir
+    def _unmark_stale(self, redefined: set[int]) -> None:
+        if not redefined:
+            return
+
+        values = self._globals
+
+        def function_at(slot: int) -> Optional[Function]:
+            value = values[slot] if slot < len(values) else None
+            return value.function if type(value) is Closure else None
+
+        functions = [value.function for value in values if type(value) is Closure]
+        for function in stale_functions(functions, redefined, global_reads, function_at):
+            function.memoize = False
+
+    def _program(self, node: Program, frame: Frame, closure: Optional[Closure]) -> Any:
+        dispatch = self._dispatch
+        result: Any = NULL
+        try:
+            for statement in node.statements:
+                result = dispatch[type(statement)](statement, frame, closure)
+                if type(result) is Return:
+                    return result.value
+        except _Returned as returned:
+            return returned.value
+        return result
+
+    def _block(self, node: Block, frame: Frame, closure: Optional[Closure]) -> Any:
+        dispatch = self._dispatch
+        result: Any = NULL
+        for statement in node.statements:
+            result = dispatch[type(statement)](statement, frame, closure)
+            if type(result) is Return:
+                return result
+        return result
+
+    def _let(self, node: LetStatement, frame: Frame, closure: Optional[Closure]) -> Any:
+        value = node.value
+        name = node.name
+        assert value is not None and name is not None
+        result = self._dispatch[type(value)](value, frame, closure)
+        if name.boxed:
+            frame[name.slot].value = result
+        else:
+            frame[name.slot] = result
+        return NULL
+
+    def _return(self,
+                node: ReturnStatement,
+                frame: Frame,
+                closure: Optional[Closure]) -> Return:
+        value = node.return_value
+        if value is None:
+            return Return(NULL)
+        return Return(self._dispatch[type(value)](value, frame, closure))
+
+    # Las variables del `para` viven en el frame actual: cada vuelta solo
+    # cambia sus posiciones
+    def _for(self, node: For, frame: Frame, closure: Optional[Closure]) -> Any:
+        dispatch = self._dispatch
+        for variable in node.variables:
+            self._let(variable, frame, closure)
+
+        condition = node.condition
+        assert condition is not None
+        updates: list[tuple[Identifier, Expression]] = []
+        for update in node.updates:
+            assert update.name is not None and update.value is not None
+            updates.append((update.name, update.value))
+        body = node.body
+
+        while True:
+            value = dispatch[type(condition)](condition, frame, closure)
+            if value is FALSE or value is NULL:
+                return NULL
+
+            if body is not None:
+                result = self._block(body, frame, closure)
+                if type(result) is Return:
+                    return result
+
+            # Primero todos los valores nuevos y despues las asignaciones,
+            # como los argumentos de una llamada
+            values = [dispatch[type(value)](value, frame, closure)
+                      for _, value in updates]
+            for (name, _), value in zip(updates, values):
+                if name.boxed:
+                    frame[name.slot].value = value
+                else:
+                    frame[name.slot] = value
+
+    def _expression_statement(self,
+                              node: ExpressionStatement,
+                              frame: Frame,
+                              closure: Optional[Closure]) -> Any:
+        expression = node.expression
+        if expression is None:
+            return NULL
+        # Aqui el Return de un `si` llega al bloque
+        if type(expression) is If:
+            return self._if(expression, frame, closure)
+        return self._dispatch[type(expression)](expression, frame, closure)
+
+    def _identifier(self, node: Identifier, frame: Frame, closure: Optional[Closure]) -> Any:
+        depth = node.depth
+        if depth == 0:
+            value = frame[node.slot]
+            if node.boxed:
+                value = value.value
+        elif depth > 0:
+            if node.free >= 0:
+                assert closure is not None
+                value = closure.cells[node.free].value
+            else:
+                value = self._globals[node.slot]
+        else:
+            value = None
+
+        if value is None:
+            return _fail(f'Identificador no encontrado: {node.value}')
+        return value
+
+    def _integer(self, node: Integer, frame: Frame, closure: Optional[Closure]) -> int:
+        return node.value  # type: ignore
+
+    def _boolean(self, node: Boolean, frame: Frame, closure: Optional[Closure]) -> Any:
+        return TRUE if node.value else FALSE
+
+    def _string(self, node: StringLiteral, frame: Frame, closure: Optional[Closure]) -> String:
+        return intern(node.value)  # type: ignore
+
+    def _prefix(self, node: Prefix, frame: Frame, closure: Optional[Closure]) -> Any:
+        right = node.right
+        assert right is not None
+        value = self._dispatch[type(right)](right, frame, closure)
+        operator = node.operator
+
+        if operator == '!':
+            return TRUE if value is FALSE or value is NULL else FALSE
+        if operator == '-' and type(value) is int:
+            return -value
+        if operator == '-' and type(value) is Array:
+            return array_negate(value)
+
+        return _fail(f'Operador desconocido: {operator}{type_name(value)}')
+
+    def _infix(self, node: Infix, frame: Frame, closure: Optional[Closure]) -> Any:
+        dispatch = self._dispatch
+        left = node.left
+        right = node.right
+        a = dispatch[type(left)](left, frame, closure)
+        b = dispatch[type(right)](right, frame, closure)  # type: ignore
+        operator = node.operator
+
+        if type(a) is int and type(b) is int:
+            if operator == '+':
+                return a + b
+            if operator == '-':
+                return a - b
+            if operator == '*':
+                return a * b
+            if operator == '<':
+                return TRUE if a < b else FALSE
+            if operator == '>':
+                return TRUE if a > b else FALSE
+            if operator == '==':
+                return TRUE if a == b else FALSE
+            if operator == '!=':
+                return TRUE if a != b else FALSE
+            if operator == '/':
+                if b == 0:
+                    return _fail('Division entre cero')
+                return a // b
+        elif type(a) is Array or type(b) is Array:
+            return array_infix(operator, a, b)
+        elif type(a) is String and type(b) is String and operator == '+':
+            return concat(a, b)
+        elif operator == '==':
+            return TRUE if a == b else FALSE
+        elif operator == '!=':
+            return FALSE if a == b else TRUE
+        elif type(a) is not type(b):
+            return _fail(f'Discrepancia de tipos: {type_name(a)} {operator} {type_name(b)}')
+
+        return _fail(f'Operador desconocido: {type_name(a)} {operator} {type_name(b)}')
+
+    def _array(self, node: ArrayLiteral, frame: Frame, closure: Optional[Closure]) -> Any:
+        dispatch = self._dispatch
+        return make_list([dispatch[type(element)](element, frame, closure)
+                          for element in node.elements])
+
+    def _map(self, node: MapLiteral, frame: Frame, closure: Optional[Closure]) -> Map:
+        dispatch = self._dispatch
+        return make_map([dispatch[type(entry)](entry, frame, closure)
+                         for entry in node.entries])
+
+    def _length(self, node: Length, frame: Frame, closure: Optional[Closure]) -> int:
+        argument = node.argument
+        assert argument is not None
+        return length(self._dispatch[type(argument)](argument, frame, closure))
+
+    def _index(self, node: Index, frame: Frame, closure: Optional[Closure]) -> Any:
+        dispatch = self._dispatch
+        left = node.left
+        position = node.index
+        assert position is not None
+        container = dispatch[type(left)](left, frame, closure)
+        return index(container, dispatch[type(position)](position, frame, closure))
+
+    def _if(self, node: If, frame: Frame, closure: Optional[Closure]) -> Any:
+        condition = node.condition
+        assert condition is not None
+        value = self._dispatch[type(condition)](condition, frame, closure)
+
+        # Solo falso y nulo son falsos
+        if value is not FALSE and value is not NULL:
+            return self._block(node.consequence, frame, closure)  # type: ignore
+        if node.alternative is not None:
+            return self._block(node.alternative, frame, closure)
+        return NULL
+
+    def _if_expression(self, node: If, frame: Frame, closure: Optional[Closure]) -> Any:
+        result = self._if(node, frame, closure)
+        if type(result) is Return:
+            raise _Returned(result.value)
+        return result
+
+    def _function(self, node: Function, frame: Frame, closure: Optional[Closure]) -> Closure:
+        return make_closure(node, frame, closure)
+
+    def _call(self, node: Call, frame: Frame, closure: Optional[Closure]) -> Any:
+        dispatch = self._dispatch
+        callee = node.function
+        function = dispatch[type(callee)](callee, frame, closure)
+        arguments = [dispatch[type(argument)](argument, frame, closure)
+                     for argument in node.arguments or ()]
+
+        if node.tail:
+            return _TailCall(function, arguments)
+        return self._apply(function, arguments)
+
+    def _apply(self, function: Any, arguments: list[Any]) -> Any:
+        # Donde guardar el resultado: el cache de la primera funcion
+        # memorizada de la cadena de llamadas de cola y sus argumentos
+        memo: Optional[tuple[MemoCache, tuple[Any, ...]]] = None
+
+        while True:
+            if type(function) is not Closure:
+                return _fail(f'No es una funcion: {type_name(function)}')
+
+            definition = function.function
+            parameters = definition.parameters
+            if len(arguments) != len(parameters):
+                return _fail(f'Numero de argumentos incorrecto: se esperaban '
+                             f'{len(parameters)} y se recibieron {len(arguments)}')
+
+            if definition.memoize and self.memoize:
+                cache = self.memo_caches.get(definition)
+                if cache is None:
+                    cache = self.memo_caches[definition] = MemoCache(
+                        f'funcion@{definition.start}', self.memo_size)
+                key = tuple(arguments)
+                result = cache.get(key)
+                if result is not None:
+                    break
+                if memo is None:
+                    memo = (cache, key)
+
+            call_frame: Frame = [None] * definition.frame_size
+            for slot in definition.cells:
+                call_frame[slot] = Cell()
+            for parameter, argument in zip(parameters, arguments):
+                if parameter.boxed:
+                    call_frame[parameter.slot].value = argument
+                else:
+                    call_frame[parameter.slot] = argument
+
+            if definition.body is None:
+                result = NULL
+                break
+            if self._depth >= _STACK_CALLS or self._depth >= self.max_depth:
+                result = call_without_stack(function, call_frame, self._globals,
+                                            self.max_depth - self._depth)
+                break
+
+            self._depth += 1
+            try:
+                result = self._block(definition.body, call_frame, function)
+            except _Returned as returned:
+                result = returned.value
+            finally:
+                self._depth -= 1
+            if type(result) is Return:
+                result = result.value
+
+            if type(result) is not _TailCall:
+                break
+            function = result.function
+            arguments = result.arguments
+
+        if memo is not None:
+            memo[0].put(memo[1], result)
+        return result
+
+
+def evaluate(program: Program, environment: Optional[Environment] = None) -> Any:
+    return Evaluator(environment).evaluate(program)
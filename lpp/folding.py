@@ -0,0 +1,137 @@
+from typing import Optional, Union
+
+from lpp.ast import (
+    Boolean,
+    Expression,
+    Infix,
+    Integer,
+    Prefix,
+    Program,
+)
+from lpp.optimizer import (
+    count_nodes,
+    make_boolean,
+    make_integer,
+    OptimizationPass,
+    PassStats,
+)
+from lpp.visitor import NodeTransformer
+
+'''
+    Plegado de constantes.
+
+    Calcula en tiempo de compilacion los Infix y Prefix cuyos operandos son
+    literales, por ejemplo `60 * 60 * 24` -> `86400` o `!verdadero` -> `falso`.
+    Respeta exactamente la semantica de lpp:
+
+    - `+ - * /` solo con enteros; `/` es division entera hacia abajo y una
+      division entre cero se deja sin plegar para que falle al ejecutarse.
+    - `< >` solo con enteros.
+    - `== !=` comparan el valor de dos enteros; con cualquier otra cosa
+      comparan identidad (verdadero solo es igual a verdadero y un entero
+      nunca es igual a un booleano).
+    - `-` solo con enteros; `!x` es verdadero solo para falso.
+
+    Lo que daria error al ejecutarse (sumar booleanos, negar un booleano)
+    tambien se deja igual.
+'''
+
+
+Literal = Union[Integer, Boolean]
+
+
+def fold_infix(node: Infix) -> Optional[Literal]:
+    left, right, operator = node.left, node.right, node.operator
+
+    if type(left) is Integer and type(right) is Integer:
+        assert left.value is not None and right.value is not None
+        a, b = left.value, right.value
+
+        if operator == '+':
+            return make_integer(a + b, node)
+        elif operator == '-':
+            return make_integer(a - b, node)
+        elif operator == '*':
+            return make_integer(a * b, node)
+        elif operator == '/':
+            # La division entre cero es un error en tiempo de ejecucion
+            if b == 0:
+                return None
+            return make_integer(a // b, node)
+        elif operator == '<':
+            return make_boolean(a < b, node)
+        elif operator == '>':
+            return make_boolean(a > b, node)
+        elif operator == '==':
+            return make_boolean(a == b, node)
+        elif operator == '!=':
+            return make_boolean(a != b, node)
+        return None
+
+    if type(left) not in (Integer, Boolean) or type(right) not in (Integer, Boolean):
+        return None
+
+    # Al menos uno es booleano: solo se pueden comparar por identidad
+    same = type(left) is type(right) and \
+        left.value == right.value  # type: ignore
+    if operator == '==':
+        return make_boolean(same, node)
+    elif operator == '!=':
+        return make_boolean(not same, node)
+
+    return None
+
+
+def fold_prefix(node: Prefix) -> Optional[Literal]:
+    right, operator = node.right, node.operator
+
+    if operator == '-' and type(right) is Integer:
+        assert right.value is not None
+        return make_integer(-right.value, node)
+
+    if operator == '!':
+        if type(right) is Boolean:
+            return make_boolean(not right.value, node)
+        if type(right) is Integer:
+            # Todo lo que no es falso (o nulo) es verdadero
+            return make_boolean(False, node)
+
+    return None
+
+
+class _Folder(NodeTransformer):
+
+    def __init__(self) -> None:
+        self.folded = 0
+
+    def leave_Infix(self, node: Infix) -> Expression:
+        folded = fold_infix(node)
+        if folded is None:
+            return node
+
+        self.folded += 1
+        return folded
+
+    def leave_Prefix(self, node: Prefix) -> Expression:
+        folded = fold_prefix(node)
+        if folded is None:
+            return node
+
+        self.folded += 1
+        return folded
+
+
+class ConstantFolding(OptimizationPass):
+    name = 'plegado de constantes'
+
+    def run(self, program: Program) -> PassStats:
+        stats = PassStats(self.name, count_nodes(program))
+
+        folder = _Folder()
+        folder.transform(program)
+
+        stats.changes = folder.folded
+        stats.nodes_after = count_nodes(program) if folder.folded else \
+            stats.nodes_before
+
+        return stats
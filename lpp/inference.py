@@ -0,0 +1,455 @@
+from typing import (
+    Iterable,
+    Optional,
+)
+
+from lpp.ast import (
+    ArrayLiteral,
+    ASTNode,
+    Assignment,
+    Block,
+    Boolean,
+    Call,
+    Expression,
+    ExpressionStatement,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+    ValueType,
+)
+from lpp.symbols import (
+    build_symbol_table,
+    Symbol,
+    SymbolKind,
+    SymbolTable,
+)
+from lpp.visitor import (
+    NodeVisitor,
+    walk,
+)
+
+'''
+    Inferencia de tipos local.
+
+    Etiqueta cada expresion con INTEGER, BOOLEAN, FUNCTION, ARRAY, LIST, MAP,
+    STRING o UNKNOWN (Expression.inferred_type). Es un analisis de flujo sobre la tabla de
+    simbolos: el tipo de una variable es la union de los valores con los que
+    se define (y se asigna en un `para`) y el de un parametro la union de
+    los argumentos de todas las llamadas a su funcion. Eso ultimo solo se
+    puede cuando sabemos todos los lugares donde se llama: la funcion se
+    asigna con `variable f = funcion` (una sola vez en su scope) y `f` solo
+    se usa para llamarla. Si la funcion se pasa como valor sus parametros
+    son UNKNOWN. El tipo de una llamada es la union de lo que regresa la
+    funcion.
+
+    Como las funciones pueden ser recursivas o llamarse antes de definirse,
+    repetimos el recorrido hasta que ningun tipo cambia. Los tipos solo
+    suben (nada -> INTEGER -> UNKNOWN), asi que termina rapido.
+
+    Los Infix y Prefix cuyos operandos son seguro enteros (o booleanos en
+    `== != !`) se marcan en operand_type para usar la version rapida. Un
+    operador con un arreglo da un arreglo, asi que si un operando puede ser
+    un arreglo (es UNKNOWN) tampoco sabemos el tipo del resultado. Un
+    literal [...] es ARRAY si sus elementos son todos enteros o todos
+    booleanos y si no LIST. `+` con un texto solo puede dar otro texto (o
+    fallar), asi que es STRING aunque no sepamos el otro operando; con dos
+    textos se marca en operand_type. Las operaciones que siempre fallarian
+    (`verdadero + 1`, `-falso`, llamar a un entero) se reportan en `errors` con su posicion en el codigo.
+'''
+
+
+ARITHMETIC: frozenset[str] = frozenset(('+', '-', '*', '/'))
+COMPARISON: frozenset[str] = frozenset(('<', '>'))
+EQUALITY: frozenset[str] = frozenset(('==', '!='))
+
+# Los tipos de los que estamos seguros
+KNOWN: frozenset[ValueType] = frozenset(
+    (ValueType.INTEGER, ValueType.BOOLEAN, ValueType.FUNCTION, ValueType.ARRAY,
+     ValueType.LIST, ValueType.MAP, ValueType.STRING))
+
+# Operandos que seguro no son arreglos (None: todavia no llega ningun valor)
+_SCALARS: frozenset[Optional[ValueType]] = frozenset(
+    (None, ValueType.INTEGER, ValueType.BOOLEAN, ValueType.FUNCTION,
+     ValueType.LIST, ValueType.MAP, ValueType.STRING))
+
+# Lo que se puede indexar con un entero y lo que tiene tamano
+_SEQUENCES: frozenset[ValueType] = frozenset(
+    (ValueType.ARRAY, ValueType.LIST, ValueType.STRING))
+_CONTAINERS: frozenset[ValueType] = frozenset(
+    (ValueType.ARRAY, ValueType.LIST, ValueType.MAP, ValueType.STRING))
+
+# Lo que se puede sumar a un texto sin que sea seguro un error
+_TEXTS: frozenset[Optional[ValueType]] = frozenset(
+    (None, ValueType.STRING, ValueType.UNKNOWN))
+
+# Los operandos validos de la aritmetica y las comparaciones
+_NUMERIC: frozenset[Optional[ValueType]] = frozenset(
+    (ValueType.INTEGER, ValueType.ARRAY))
+
+
+# Tipo del resultado de un operador que da `scalar` con operandos que no
+# son arreglos
+def _result(scalar: ValueType, *operands: Optional[ValueType]) -> ValueType:
+    if ValueType.ARRAY in operands:
+        return ValueType.ARRAY
+    if all(operand in _SCALARS for operand in operands):
+        return scalar
+    return ValueType.UNKNOWN
+
+
+# None es "todavia no sabemos nada": todavia no se ha visto ningun valor
+def join(a: Optional[ValueType], b: Optional[ValueType]) -> Optional[ValueType]:
+    if a is None:
+        return b
+    if b is None or a == b:
+        return a
+    return ValueType.UNKNOWN
+
+
+class Inference:
+
+    def __init__(self, program: Program, table: SymbolTable) -> None:
+        self.program = program
+        self.table = table
+        self.errors: list[str] = []
+        # Nodos donde estan los errores, en el mismo orden
+        self.error_nodes: list[Expression] = []
+        # Lo que puede regresar cada funcion
+        self.return_types: dict[Function, ValueType] = {}
+        # Cuantas veces se recorrio el programa hasta llegar al punto fijo
+        self.iterations = 0
+
+
+class _Calls:
+
+    def __init__(self, table: SymbolTable) -> None:
+        # Llamadas conocidas a cada funcion; las que no estan aqui escapan
+        self.calls: dict[Function, list[Call]] = {}
+        # Funcion a la que llama cada Call, si se sabe
+        self.targets: dict[Call, Function] = {}
+
+        callees: dict[ASTNode, Call] = {}
+        bindings: dict[Symbol, Function] = {}
+
+        for node in walk(table.program):
+            if isinstance(node, Call):
+                callees[node.function] = node
+            elif isinstance(node, LetStatement) and \
+                    isinstance(node.value, Function) and node.name is not None:
+                symbol = table.definition(node.name)
+                # Si el nombre se redefine o se asigna, el slot puede tener
+                # otra cosa
+                if symbol is not None and not symbol.assignments and \
+                        len(symbol.scope.definitions[symbol.name]) == 1:
+                    bindings[symbol] = node.value
+
+        for callee, call in callees.items():
+            if isinstance(callee, Function):
+                self._add(callee, call)
+
+        for symbol, function in bindings.items():
+            references = [callees.get(reference) for reference in symbol.references]
+            calls = [call for call in references if call is not None]
+            if len(calls) == len(references):
+                self.calls.setdefault(function, [])
+                for call in calls:
+                    self._add(function, call)
+
+    def _add(self, function: Function, call: Call) -> None:
+        self.calls.setdefault(function, []).append(call)
+        self.targets[call] = function
+
+
+class _Inferrer(NodeVisitor):
+
+    def __init__(self, inference: Inference, calls: _Calls) -> None:
+        self._inference = inference
+        self._table = inference.table
+        self._calls = calls
+
+        # Estado que se conserva entre recorridos y solo sube
+        self._symbols: dict[Symbol, Optional[ValueType]] = {}
+        self.returns: dict[Function, Optional[ValueType]] = {}
+        self.changed = False
+
+        # Estado de un recorrido
+        self._types: dict[ASTNode, Optional[ValueType]] = {}
+        self._functions: list[Function] = []
+
+        for symbol in self._table.symbols:
+            if symbol.kind == SymbolKind.PREDEFINED:
+                self._symbols[symbol] = ValueType.UNKNOWN
+
+        for node in walk(self._table.program):
+            if isinstance(node, Function) and node not in calls.calls:
+                for parameter in node.parameters:
+                    definition = self._table.definition(parameter)
+                    if definition is not None:
+                        self._symbols[definition] = ValueType.UNKNOWN
+
+    def run(self, program: Program) -> None:
+        self.changed = False
+        self._types = {}
+        self._inference.errors = []
+        self._inference.error_nodes = []
+        self.traverse(program)
+
+    def type_of(self, node: Optional[ASTNode]) -> Optional[ValueType]:
+        if node is None:
+            return ValueType.UNKNOWN
+        return self._types.get(node)
+
+    def _raise(self, symbol: Symbol, value: Optional[ValueType]) -> None:
+        old = self._symbols.get(symbol)
+        new = join(old, value)
+        if new != old:
+            self._symbols[symbol] = new
+            self.changed = True
+
+    def _error(self, message: str, node: Expression) -> None:
+        self._inference.errors.append(
+            f'{message} (posicion {node.start}-{node.end})')
+        self._inference.error_nodes.append(node)
+
+    # Valor de un bloque: su ultimo statement. Si termina con `retorna` no
+    # llega al final (None); con `variable` o vacio es nulo
+    def _block_type(self, block: Optional[Block]) -> Optional[ValueType]:
+        if block is None or not block.statements:
+            return ValueType.UNKNOWN
+
+        last = block.statements[-1]
+        if isinstance(last, ExpressionStatement):
+            return self.type_of(last.expression)
+        if isinstance(last, ReturnStatement):
+            return None
+        return ValueType.UNKNOWN
+
+    def enter_Function(self, node: Function) -> None:
+        self._functions.append(node)
+
+    def leave_Function(self, node: Function) -> None:
+        self._functions.pop()
+
+        old = self.returns.get(node)
+        new = join(old, self._block_type(node.body))
+        if new != old:
+            self.returns[node] = new
+            self.changed = True
+
+        self._types[node] = ValueType.FUNCTION
+
+    def leave_ReturnStatement(self, node: ReturnStatement) -> None:
+        if not self._functions:
+            return
+
+        function = self._functions[-1]
+        old = self.returns.get(function)
+        new = join(old, self.type_of(node.return_value))
+        if new != old:
+            self.returns[function] = new
+            self.changed = True
+
+    def leave_LetStatement(self, node: LetStatement) -> None:
+        if node.name is None:
+            return
+
+        symbol = self._table.definition(node.name)
+        if symbol is not None:
+            self._raise(symbol, self.type_of(node.value))
+            self._types[node.name] = self._symbols.get(symbol)
+
+    # Lo que se asigna en un `para` tambien es un valor de la variable
+    def leave_Assignment(self, node: Assignment) -> None:
+        if node.name is None:
+            return
+
+        symbol = self._table.definition(node.name)
+        if symbol is not None:
+            self._raise(symbol, self.type_of(node.value))
+
+    def leave_Integer(self, node: Integer) -> None:
+        self._types[node] = ValueType.INTEGER
+
+    def leave_Boolean(self, node: Boolean) -> None:
+        self._types[node] = ValueType.BOOLEAN
+
+    def leave_StringLiteral(self, node: StringLiteral) -> None:
+        self._types[node] = ValueType.STRING
+
+    def leave_Identifier(self, node: Identifier) -> None:
+        symbol = self._table.definition(node)
+        if symbol is None:
+            self._types[node] = ValueType.UNKNOWN
+            return
+
+        value = self._symbols.get(symbol)
+        owner = symbol.scope.owner.node
+        current = self._functions[-1] if self._functions else self._table.program
+        if owner is not current:
+            # Desde otra funcion se lee la posicion del frame cuando se
+            # llama, que puede tener cualquier definicion del mismo nombre
+            for other in symbol.scope.definitions[symbol.name]:
+                value = join(value, self._symbols.get(other))
+
+        self._types[node] = value
+
+    def leave_Prefix(self, node: Prefix) -> None:
+        right = self.type_of(node.right)
+        operator = node.operator
+
+        node.operand_type = ValueType.UNKNOWN
+        if operator == '-':
+            self._types[node] = _result(ValueType.INTEGER, right)
+            if right == ValueType.INTEGER:
+                node.operand_type = ValueType.INTEGER
+            elif right in KNOWN and right != ValueType.ARRAY:
+                assert right is not None
+                self._error(f'Operador desconocido: -{right.name}', node)
+        elif operator == '!':
+            self._types[node] = ValueType.BOOLEAN
+            if right == ValueType.BOOLEAN:
+                node.operand_type = ValueType.BOOLEAN
+        else:
+            self._types[node] = ValueType.UNKNOWN
+
+    def leave_Infix(self, node: Infix) -> None:
+        left = self.type_of(node.left)
+        right = self.type_of(node.right)
+        operator = node.operator
+
+        node.operand_type = ValueType.UNKNOWN
+        if operator in EQUALITY:
+            self._types[node] = _result(ValueType.BOOLEAN, left, right)
+            if left == right and left in (ValueType.INTEGER, ValueType.BOOLEAN):
+                assert left is not None
+                node.operand_type = left
+            return
+
+        if operator == '+' and ValueType.STRING in (left, right) and \
+                left in _TEXTS and right in _TEXTS:
+            self._types[node] = ValueType.STRING
+            if left == right:
+                node.operand_type = ValueType.STRING
+            return
+
+        if operator in ARITHMETIC:
+            self._types[node] = _result(ValueType.INTEGER, left, right)
+        elif operator in COMPARISON:
+            self._types[node] = _result(ValueType.BOOLEAN, left, right)
+        else:
+            self._types[node] = ValueType.UNKNOWN
+            return
+
+        if left == right == ValueType.INTEGER:
+            node.operand_type = ValueType.INTEGER
+        elif left in KNOWN and right in KNOWN and \
+                not (left in _NUMERIC and right in _NUMERIC):
+            assert left is not None and right is not None
+            if left == right:
+                message = 'Operador desconocido'
+            else:
+                message = 'Discrepancia de tipos'
+            self._error(f'{message}: {left.name} {operator} {right.name}', node)
+
+    # Los elementos que todavia no tienen tipo no cuentan
+    def leave_ArrayLiteral(self, node: ArrayLiteral) -> None:
+        elements = set(self.type_of(element) for element in node.elements) - {None}
+
+        if ValueType.UNKNOWN in elements:
+            self._types[node] = ValueType.UNKNOWN
+        elif elements <= {ValueType.INTEGER} or elements == {ValueType.BOOLEAN}:
+            self._types[node] = ValueType.ARRAY
+        else:
+            self._types[node] = ValueType.LIST
+
+    def leave_MapLiteral(self, node: MapLiteral) -> None:
+        self._types[node] = ValueType.MAP
+
+    # No sabemos el tipo de los elementos, salvo en un texto; un mapa
+    # acepta cualquier llave
+    def leave_Index(self, node: Index) -> None:
+        container = self.type_of(node.left)
+        position = self.type_of(node.index)
+
+        if container in KNOWN and container not in _CONTAINERS:
+            assert container is not None
+            self._error(f'No se puede indexar: {container.name}', node)
+        elif container in _SEQUENCES and position in KNOWN and \
+                position != ValueType.INTEGER:
+            assert position is not None
+            self._error(f'Indice invalido: {position.name}', node)
+        self._types[node] = ValueType.STRING if container == ValueType.STRING \
+            else ValueType.UNKNOWN
+
+    def leave_Length(self, node: Length) -> None:
+        argument = self.type_of(node.argument)
+
+        if argument in KNOWN and argument not in _CONTAINERS:
+            assert argument is not None
+            self._error(f'Argumento invalido para tamano: {argument.name}', node)
+        self._types[node] = ValueType.INTEGER
+
+    def leave_If(self, node: If) -> None:
+        consequence = self._block_type(node.consequence)
+        # Sin si_no el valor puede ser nulo
+        alternative = self._block_type(node.alternative) \
+            if node.alternative is not None else ValueType.UNKNOWN
+        self._types[node] = join(consequence, alternative)
+
+    def leave_Call(self, node: Call) -> None:
+        callee = self.type_of(node.function)
+        arguments = node.arguments or []
+
+        function = self._calls.targets.get(node)
+        if function is None:
+            if callee in KNOWN and callee != ValueType.FUNCTION:
+                assert callee is not None
+                self._error(f'No es una funcion: {callee.name}', node)
+            self._types[node] = ValueType.UNKNOWN
+            return
+
+        for index, parameter in enumerate(function.parameters):
+            symbol = self._table.definition(parameter)
+            if symbol is None:
+                continue
+            if index < len(arguments):
+                self._raise(symbol, self.type_of(arguments[index]))
+            else:
+                self._raise(symbol, ValueType.UNKNOWN)
+
+        self._types[node] = self.returns.get(function)
+
+
+# Infiere los tipos del programa y los guarda en los nodos. `predefined`
+# son nombres que ya existen (como en lpp.resolver) y son UNKNOWN
+def infer_types(program: Program, predefined: Iterable[str] = ()) -> Inference:
+    table = build_symbol_table(program, predefined)
+    inference = Inference(program, table)
+    inferrer = _Inferrer(inference, _Calls(table))
+
+    while True:
+        inferrer.run(program)
+        inference.iterations += 1
+        if not inferrer.changed:
+            break
+
+    # Lo que nunca recibio un valor (una funcion que no se llama) se queda
+    # como UNKNOWN
+    for node in walk(program):
+        if isinstance(node, Expression):
+            node.inferred_type = inferrer.type_of(node) or ValueType.UNKNOWN
+        if isinstance(node, Function):
+            inference.return_types[node] = \
+                inferrer.returns.get(node) or ValueType.UNKNOWN
+
+    return inference
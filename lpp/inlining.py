@@ -0,0 +1,379 @@
+from typing import (
+    Optional,
+    Union,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Block,
+    Boolean,
+    Call,
+    Expression,
+    ExpressionStatement,
+    Function,
+    Identifier,
+    If,
+    Infix,
+    Integer,
+    LetStatement,
+    Prefix,
+    Program,
+    ReturnStatement,
+    Statement,
+)
+from lpp.optimizer import (
+    count_nodes,
+    OptimizationPass,
+    PassStats,
+)
+from lpp.symbols import (
+    build_symbol_table,
+    Scope,
+    Symbol,
+    SymbolTable,
+)
+from lpp.token import (
+    Token,
+    TokenType,
+)
+from lpp.visitor import (
+    copy_tree,
+    walk,
+)
+
+'''
+    Inlining de funciones pequeñas.
+
+    Una funcion se puede inlinear si:
+    - esta ligada con `variable f = funcion(...) { ... };` y f no se vuelve
+      a definir en el mismo scope;
+    - su cuerpo es un solo statement (`expresion` o `retorna expresion`)
+      de a lo mas max_size nodos;
+    - esa expresion solo tiene literales, identificadores, Prefix, Infix,
+      llamadas y `si` cuyos bloques son solo expresiones (sin variables, sin
+      `retorna` y sin funciones), y no menciona a f (no es recursiva).
+
+    Cada llamada `f(a1, ..., an)` con el numero correcto de argumentos se
+    reemplaza por una copia del cuerpo. Los argumentos que son literales o
+    identificadores se sustituyen directamente; los demas se evaluan antes
+    del statement, en orden, en variables nuevas (los parametros
+    renombrados), para que se evaluen una sola vez aunque el parametro se
+    use varias veces o ninguna. Eso solo se puede hacer si antes de la
+    llamada, dentro del mismo statement, no hay otra llamada ni un `si`.
+
+    Como el cuerpo no define nombres no puede capturar los identificadores
+    de los argumentos; al reves, cada identificador libre del cuerpo tiene
+    que referirse al mismo simbolo desde la llamada, si no la llamada se
+    deja igual.
+
+    En cada pasada los cuerpos copiados suman a lo mas growth veces el
+    tamaño del programa (mas max_size, para que los programas chicos
+    tambien se puedan inlinear).
+'''
+
+
+StatementContainer = Union[Program, Block]
+# (padre, campo, indice en la lista o -1)
+Location = tuple[ASTNode, str, int]
+
+_ALLOWED: tuple[type, ...] = (Identifier, Integer, Boolean, Prefix, Infix, Call,
+                              If, Block, ExpressionStatement)
+
+
+class _Inlinable:
+
+    def __init__(self,
+                 symbol: Symbol,
+                 function: Function,
+                 template: Expression,
+                 parameters: dict[Identifier, int],
+                 free: list[Identifier],
+                 table: SymbolTable) -> None:
+        self.symbol = symbol
+        self.function = function
+        # Copia del cuerpo tomada antes de modificar el programa
+        self.template = template
+        # Identificadores de la copia que son parametros y cual
+        self.parameters = parameters
+        # Identificadores libres de la copia con el simbolo al que se
+        # refieren en el original, o None si no se refieren a ninguno
+        self.free: list[tuple[str, Optional[Symbol]]] = []
+        self.size = count_nodes(template)
+        self.has_calls = any(type(node) is Call or type(node) is If
+                             for node in walk(template))
+
+        for identifier in free:
+            self.free.append((identifier.value, table.definition(identifier)))
+
+
+def _body_expression(function: Function) -> Optional[Expression]:
+    if function.body is None or len(function.body.statements) != 1:
+        return None
+
+    statement = function.body.statements[0]
+    if type(statement) is ExpressionStatement:
+        return statement.expression
+    if type(statement) is ReturnStatement:
+        return statement.return_value
+    return None
+
+
+def _is_trivial(argument: Expression, table: SymbolTable) -> bool:
+    if type(argument) is Integer or type(argument) is Boolean:
+        return True
+    # Un identificador definido se puede leer mas de una vez (o ninguna)
+    # sin efectos; uno sin definir tiene que fallar como antes
+    return type(argument) is Identifier and \
+        table.definition(argument) is not None  # type: ignore
+
+
+class FunctionInlining(OptimizationPass):
+    name = 'inlining'
+
+    def __init__(self, max_size: int = 16, growth: float = 0.5) -> None:
+        self.max_size = max_size
+        self.growth = growth
+
+    def run(self, program: Program) -> PassStats:
+        stats = PassStats(self.name, count_nodes(program))
+
+        self._table = build_symbol_table(program)
+        self._inlinable = self._find_inlinable(program)
+        if not self._inlinable:
+            return stats
+
+        self._budget = int(stats.nodes_before * self.growth) + self.max_size
+        self._names = {node.value for node in walk(program)
+                       if type(node) is Identifier}  # type: ignore
+        self._counter = 0
+
+        containers = [node for node in walk(program)
+                      if type(node) is Program or type(node) is Block]
+        for container in containers:
+            stats.changes += self._inline_calls(container)  # type: ignore
+
+        if stats.changes:
+            stats.nodes_after = count_nodes(program)
+
+        return stats
+
+    def _find_inlinable(self, program: Program) -> dict[Symbol, _Inlinable]:
+        inlinable: dict[Symbol, _Inlinable] = {}
+
+        for node in walk(program):
+            if type(node) is not LetStatement or type(node.value) is not Function or \
+                    node.name is None:  # type: ignore
+                continue
+
+            symbol = self._table.definition(node.name)  # type: ignore
+            function: Function = node.value  # type: ignore
+            expression = _body_expression(function)
+            if symbol is None or expression is None or symbol.assignments or \
+                    len(symbol.scope.definitions[symbol.name]) > 1:
+                continue
+
+            nodes = list(walk(expression))
+            if len(nodes) > self.max_size or \
+                    any(type(child) not in _ALLOWED for child in nodes):
+                continue
+
+            parameters = {self._table.definition(parameter): position
+                          for position, parameter in enumerate(function.parameters)}
+            template_parameters: dict[Identifier, int] = {}
+            free: list[Identifier] = []
+            recursive = False
+
+            # La copia tiene los nodos en el mismo preorden
+            template: Expression = copy_tree(expression)  # type: ignore
+            for child, copy in zip(nodes, walk(template)):
+                if type(child) is not Identifier:
+                    continue
+                definition = self._table.definition(child)  # type: ignore
+                if definition is None:
+                    # Sin definir: no puede quedar ligado en la llamada
+                    free.append(child)  # type: ignore
+                    continue
+                if definition is symbol:
+                    recursive = True
+                    break
+                if definition in parameters and definition.scope.node is function:
+                    template_parameters[copy] = parameters[definition]  # type: ignore
+                else:
+                    free.append(child)  # type: ignore
+
+            if not recursive:
+                inlinable[symbol] = _Inlinable(symbol, function, template,
+                                               template_parameters, free, self._table)
+
+        return inlinable
+
+    def _inline_calls(self, container: StatementContainer) -> int:
+        scope = self._table.scope(container)
+        if scope is None:
+            return 0
+
+        inlined = 0
+        statements: list[Statement] = []
+        for statement in container.statements:
+            hoisted: list[LetStatement] = []
+            inlined += self._inline_statement(statement, scope, hoisted)
+            statements.extend(hoisted)
+            statements.append(statement)
+
+        if inlined:
+            container.statements = statements
+        return inlined
+
+    # Recorre las expresiones del statement en el orden en que se evaluan y
+    # reemplaza las llamadas que se pueden inlinear
+    def _inline_statement(self,
+                          statement: Statement,
+                          scope: Scope,
+                          hoisted: list[LetStatement]) -> int:
+        if type(statement) is LetStatement:
+            root, field = statement.value, 'value'
+        elif type(statement) is ReturnStatement:
+            root, field = statement.return_value, 'return_value'
+        elif type(statement) is ExpressionStatement:
+            root, field = statement.expression, 'expression'
+        else:
+            return 0
+        if root is None:
+            return 0
+
+        inlined = 0
+        barrier = False
+        # (nodo, donde esta, si ya se visitaron sus hijos, barrera al entrar)
+        stack: list[tuple[Expression, Location, bool, bool]] = \
+            [(root, (statement, field, -1), False, False)]
+
+        while stack:
+            node, location, expanded, barrier_before = stack.pop()
+            node_class = type(node)
+
+            if not expanded:
+                if node_class is Infix:
+                    stack.append((node, location, True, barrier))
+                    stack.append((node.right, (node, 'right', -1), False, False))  # type: ignore
+                    stack.append((node.left, (node, 'left', -1), False, False))  # type: ignore
+                elif node_class is Prefix:
+                    stack.append((node, location, True, barrier))
+                    stack.append((node.right, (node, 'right', -1), False, False))  # type: ignore
+                elif node_class is Call:
+                    stack.append((node, location, True, barrier))
+                    arguments = node.arguments or []  # type: ignore
+                    for index in range(len(arguments) - 1, -1, -1):
+                        stack.append((arguments[index], (node, 'arguments', index),
+                                      False, False))
+                    stack.append((node.function, (node, 'function', -1), False, False))  # type: ignore
+                elif node_class is If:
+                    stack.append((node, location, True, barrier))
+                    if node.condition is not None:  # type: ignore
+                        stack.append((node.condition, (node, 'condition', -1),  # type: ignore
+                                      False, False))
+                continue
+
+            if node_class is If:
+                barrier = True
+            elif node_class is Call:
+                inlinable = self._target(node, scope)  # type: ignore
+                replacement = None
+                if inlinable is not None:
+                    replacement = self._expand(node, inlinable, barrier_before,  # type: ignore
+                                               hoisted)
+                if replacement is None:
+                    barrier = True
+                else:
+                    self._replace(location, replacement)
+                    inlined += 1
+                    barrier = barrier or inlinable.has_calls  # type: ignore
+
+        return inlined
+
+    def _target(self, call: Call, scope: Scope) -> Optional[_Inlinable]:
+        if type(call.function) is not Identifier:
+            return None
+
+        symbol = self._table.definition(call.function)  # type: ignore
+        if symbol is None:
+            return None
+        inlinable = self._inlinable.get(symbol)
+        if inlinable is None or \
+                len(call.arguments or []) != len(inlinable.function.parameters) or \
+                inlinable.size > self._budget:
+            return None
+
+        # Lo que el cuerpo lee desde su definicion tiene que ser lo mismo
+        # que se ve desde la llamada
+        for name, free_symbol in inlinable.free:
+            if not self._visible(name, free_symbol, scope):
+                return None
+
+        return inlinable
+
+    def _visible(self, name: str, symbol: Optional[Symbol], scope: Scope) -> bool:
+        current: Optional[Scope] = scope
+        while current is not None:
+            definitions = current.definitions.get(name)
+            if definitions:
+                return symbol is not None and current is symbol.scope and \
+                    len(definitions) == 1
+            current = current.parent
+        return symbol is None
+
+    def _expand(self,
+                call: Call,
+                inlinable: _Inlinable,
+                barrier_before: bool,
+                hoisted: list[LetStatement]) -> Optional[Expression]:
+        arguments = call.arguments or []
+        trivial = [_is_trivial(argument, self._table) for argument in arguments]
+        if not all(trivial) and barrier_before:
+            return None
+
+        # Parametros renombrados para los argumentos que hay que evaluar antes
+        values: list[Expression] = []
+        bindings: list[LetStatement] = []
+        for argument, is_trivial in zip(arguments, trivial):
+            if is_trivial:
+                values.append(argument)
+                continue
+
+            parameter = inlinable.function.parameters[len(values)]
+            name = self._fresh_name(parameter.value)
+            binding = LetStatement(Token(TokenType.LET, 'variable'),
+                                   self._identifier(name, parameter), argument)
+            binding.start, binding.end = argument.start, argument.end
+            bindings.append(binding)
+            values.append(self._identifier(name, argument))
+
+        replacements: dict[ASTNode, ASTNode] = {
+            identifier: values[position]
+            for identifier, position in inlinable.parameters.items()
+        }
+        result: Expression = copy_tree(inlinable.template, replacements)  # type: ignore
+
+        self._budget -= inlinable.size
+        hoisted.extend(bindings)
+        result.start, result.end = call.start, call.end
+        return result
+
+    def _fresh_name(self, base: str) -> str:
+        while True:
+            self._counter += 1
+            name = f'_{base}{self._counter}'
+            if name not in self._names:
+                self._names.add(name)
+                return name
+
+    def _identifier(self, name: str, original: Expression) -> Identifier:
+        identifier = Identifier(Token(TokenType.IDENT, name), name)
+        identifier.start, identifier.end = original.start, original.end
+        return identifier
+
+    def _replace(self, location: Location, node: Expression) -> None:
+        parent, field, index = location
+        if index < 0:
+            setattr(parent, field, node)
+        else:
+            getattr(parent, field)[index] = node
@@ -2,6 +2,22 @@ from re import match
 from lpp.token import Token, TokenType, lookup_token_type
 
 
+# Lo que va despues de \ dentro de "..." y el caracter que representa
+ESCAPES: dict[str, str] = {
+    'n': '\n',
+    't': '\t',
+    '"': '"',
+    '\\': '\\',
+}
+
+_UNESCAPES: dict[str, str] = {value: f'\\{key}' for key, value in ESCAPES.items()}
+
+
+# El literal de lpp (con comillas y escapes) que da el texto `value`
+def escape_string(value: str) -> str:
+    return '"' + ''.join(_UNESCAPES.get(character, character)
+                         for character in value) + '"'
+
 
 class Lexer:
     def __init__(self, source:str) -> None:
@@ -9,11 +25,23 @@ class Lexer:
       self._character: str = ''
       self._read_position: int = 0
       self._position: int = 0
+      # Donde empieza y termina (sin incluirlo) el ultimo token leido
+      self._token_start: int = 0
+      self._token_end: int = 0
 
       self._read_character()
 
+    @property
+    def token_start(self) -> int:
+      return self._token_start
+
+    @property
+    def token_end(self) -> int:
+      return self._token_end
+
     def next_token(self) -> Token:
       self._skip_whitespace()
+      self._token_start = self._position
 
       if match(r"^=$", self._character):
         if self._peek_character() == '=':
@@ -32,6 +60,12 @@ class Lexer:
           token = Token(TokenType.LBRACE, self._character)
       elif match(r"^}$", self._character):
           token = Token(TokenType.RBRACE, self._character)
+      elif match(r"^\[$", self._character):
+          token = Token(TokenType.LBRACKET, self._character)
+      elif match(r"^\]$", self._character):
+          token = Token(TokenType.RBRACKET, self._character)
+      elif match(r"^:$", self._character):
+          token = Token(TokenType.COLON, self._character)
       elif match(r"^,$", self._character):
           token = Token(TokenType.COMMA, self._character)
       elif match(r"^;$", self._character):
@@ -51,17 +85,22 @@ class Lexer:
             token = self._make_two_character_token(TokenType.NOTEQUALS)
         else:
             token = Token(TokenType.NOT, self._character)
+      elif self._character == '"':
+          return self._read_string()
       elif self._is_letter(self._character):
           literal = self._read_identifier()
           token_type = lookup_token_type(literal)
+          self._token_end = self._position
           return Token(token_type, literal)
       elif self._is_number(self._character):
          literal = self._read_number()
+         self._token_end = self._position
          return Token(TokenType.INT, literal)
       else:
         token = Token(TokenType.ILLEGAL, self._character)
 
       self._read_character()
+      self._token_end = min(self._position, len(self._source))
 
       return token
 
@@ -100,6 +139,38 @@ class Lexer:
 
       return self._source[initial_position:self._position]
 
+    # Lee "..." y regresa un STRING con el texto sin escapes. Sin la
+    # comilla final o con un escape desconocido es ILLEGAL con todo el texto
+    def _read_string(self) -> Token:
+      initial_position = self._position
+      characters: list[str] = []
+      valid = True
+      self._read_character()
+
+      while self._character != '"' and self._character != '':
+        if self._character == '\\':
+          self._read_character()
+          character = ESCAPES.get(self._character)
+          if character is None:
+            valid = False
+            if self._character == '':
+              break
+          else:
+            characters.append(character)
+        else:
+          characters.append(self._character)
+        self._read_character()
+
+      if self._character == '':
+        valid = False
+      else:
+        self._read_character()
+      self._token_end = min(self._position, len(self._source))
+
+      if not valid:
+        return Token(TokenType.ILLEGAL, self._source[initial_position:self._token_end])
+      return Token(TokenType.STRING, ''.join(characters))
+
     def _skip_whitespace(self) -> None:
       while match(r'^\s$', self._character):
         self._read_character()
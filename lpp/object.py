@@ -0,0 +1,355 @@
+from collections import OrderedDict
+from types import FunctionType
+from typing import (
+    Any,
+    MutableSequence,
+    Optional,
+)
+
+from lpp.ast import Function
+from lpp.code import CompiledFunction
+
+'''
+    Objetos que existen al ejecutar un programa.
+
+    Los enteros de lpp son int de Python, sin envolver. verdadero, falso y
+    nulo son instancias unicas (TRUE, FALSE, NULL) y se comparan con `is`;
+    no usamos los bool de Python porque True == 1 y en lpp un entero nunca
+    es igual a un booleano.
+
+    Un frame es una lista de tamaño fijo (Function.frame_size). Las
+    posiciones en Function.cells guardan una Cell porque alguna closure las
+    captura; una closure solo guarda la funcion y esas celdas, no los frames
+    de afuera. Una posicion con None todavia no tiene valor.
+
+    Un arreglo guarda sus elementos sin envolver en un arreglo de NumPy o
+    en un array.array (ver lpp.arrays). Una lista es una list de Python con
+    los valores tal cual y un mapa un dict de Python con los valores como
+    llaves (ver lpp.containers); ninguno envuelve sus elementos. Los tres no
+    cambian despues de crearse, asi que su igualdad y su hash de Python son
+    los de su contenido, y el == de lpp entre listas o mapas tambien.
+
+    Un texto es un String: una hoja con un str de Python o un nodo de una
+    cuerda (rope) con las dos partes que se concatenaron (ver lpp.strings).
+    Tampoco cambia; la primera vez que se necesita el contenido completo se
+    une y se guarda en la raiz.
+'''
+
+
+# Error de ejecucion. Los evaluadores lo lanzan en lugar de regresar un
+# Error para que el camino normal no tenga que revisar cada valor
+class EvaluationError(Exception):
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+class Boolean:
+    __slots__ = ('value',)
+
+    def __init__(self, value: bool) -> None:
+        self.value = value
+
+    def __str__(self) -> str:
+        return 'verdadero' if self.value else 'falso'
+
+    __repr__ = __str__
+
+
+class Null:
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        return 'nulo'
+
+    __repr__ = __str__
+
+
+TRUE: Boolean = Boolean(True)
+FALSE: Boolean = Boolean(False)
+NULL: Null = Null()
+
+
+# Valor de un `retorna` mientras sube por los bloques hasta la funcion
+class Return:
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class Error:
+    __slots__ = ('message',)
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return f'Error: {self.message}'
+
+    __repr__ = __str__
+
+
+# Arreglo de enteros de 64 bits o de booleanos. values es un
+# numpy.ndarray o un array.array segun lo que haya (ver lpp.arrays)
+class Array:
+    __slots__ = ('values', 'boolean')
+
+    # values es un array.array o un numpy.ndarray (ver lpp.arrays)
+    def __init__(self, values: MutableSequence[int], boolean: bool = False) -> None:
+        self.values = values
+        self.boolean = boolean
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    # Igualdad y hash de Python por contenido, para los caches de funciones
+    # puras; el == de lpp entre arreglos es elemento por elemento y esta en
+    # lpp.arrays
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not Array:
+            return NotImplemented
+        return self.boolean == other.boolean and \
+            self.values.tobytes() == other.values.tobytes()  # type: ignore
+
+    def __hash__(self) -> int:
+        return hash((self.boolean, self.values.tobytes()))  # type: ignore
+
+    def __str__(self) -> str:
+        if self.boolean:
+            elements = ('verdadero' if value else 'falso' for value in self.values)
+        else:
+            elements = (str(value) for value in self.values)
+        return f'[{", ".join(elements)}]'
+
+    __repr__ = __str__
+
+
+# Lista con elementos de cualquier tipo
+class List:
+    __slots__ = ('values',)
+
+    def __init__(self, values: list[Any]) -> None:
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not List:
+            return NotImplemented
+        return self.values == other.values
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.values))
+
+    def __str__(self) -> str:
+        return f'[{", ".join(str(value) for value in self.values)}]'
+
+    __repr__ = __str__
+
+
+class Map:
+    __slots__ = ('pairs',)
+
+    def __init__(self, pairs: dict[Any, Any]) -> None:
+        self.pairs = pairs
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not Map:
+            return NotImplemented
+        return self.pairs == other.pairs
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.pairs.items()))
+
+    def __str__(self) -> str:
+        pairs = ', '.join(f'{key}: {value}' for key, value in self.pairs.items())
+        return f'{{{pairs}}}'
+
+    __repr__ = __str__
+
+
+# Texto de lpp. Una hoja tiene el texto en flat; un nodo tiene flat en None
+# y el texto es left + right. length siempre es el total
+class String:
+    __slots__ = ('flat', 'left', 'right', 'length')
+
+    def __init__(self,
+                 flat: Optional[str],
+                 left: Optional['String'] = None,
+                 right: Optional['String'] = None) -> None:
+        self.flat = flat
+        self.left = left
+        self.right = right
+        self.length = len(flat) if flat is not None \
+            else left.length + right.length  # type: ignore
+
+    # El texto completo. En un nodo junta las hojas de izquierda a derecha
+    # sin recursion (la cuerda puede ser muy profunda) y se vuelve hoja
+    def value(self) -> str:
+        flat = self.flat
+        if flat is not None:
+            return flat
+
+        parts: list[str] = []
+        stack: list[String] = [self]
+        while stack:
+            node = stack.pop()
+            if node.flat is not None:
+                parts.append(node.flat)
+            else:
+                stack.append(node.right)  # type: ignore
+                stack.append(node.left)  # type: ignore
+
+        flat = self.flat = ''.join(parts)
+        self.left = self.right = None
+        return flat
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not String:
+            return NotImplemented
+        return self is other or \
+            (self.length == other.length and self.value() == other.value())  # type: ignore
+
+    def __hash__(self) -> int:
+        return hash(self.value())
+
+    def __str__(self) -> str:
+        return self.value()
+
+    __repr__ = __str__
+
+
+class Cell:
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any = None) -> None:
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f'Cell({self.value!r})'
+
+
+class Closure:
+    __slots__ = ('function', 'cells')
+
+    def __init__(self, function: Function, cells: tuple[Cell, ...]) -> None:
+        self.function = function
+        self.cells = cells
+
+    def __repr__(self) -> str:
+        parameters = ', '.join(str(parameter) for parameter in self.function.parameters)
+        return f'funcion({parameters})'
+
+
+# Closure de la maquina virtual: una funcion compilada, que tiene los
+# mismos parametros y capturas que el nodo
+class CompiledClosure:
+    __slots__ = ('function', 'cells')
+
+    def __init__(self, function: CompiledFunction, cells: tuple[Cell, ...]) -> None:
+        self.function = function
+        self.cells = cells
+
+    def __repr__(self) -> str:
+        parameters = ', '.join(str(parameter) for parameter in self.function.parameters)
+        return f'funcion({parameters})'
+
+
+# Resultados guardados de una funcion pura (ver lpp.purity) por tupla de
+# argumentos. Cuando se llena sale el que se uso hace mas tiempo
+class MemoCache:
+    __slots__ = ('name', 'capacity', 'entries', 'hits', 'misses', 'evictions')
+
+    def __init__(self, name: str, capacity: int) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.entries: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # El valor guardado o None (ningun valor de lpp es None)
+    def get(self, key: tuple[Any, ...]) -> Any:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: tuple[Any, ...], value: Any) -> None:
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.hits} aciertos, {self.misses} fallos ' + \
+            f'({self.hit_rate:.0%}), {len(self.entries)} guardados, ' + \
+            f'{self.evictions} descartados'
+
+
+# Variables globales de una sesion. Cada programa nuevo (una linea del
+# REPL) las recibe como nombres predefinidos, asi que sus posiciones no
+# cambian
+class Environment:
+    __slots__ = ('names', 'values')
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.values: list[Any] = []
+
+
+def type_name(value: Any) -> str:
+    if type(value) is int:
+        return 'INTEGER'
+    if type(value) is Boolean:
+        return 'BOOLEAN'
+    # El codigo transpilado (lpp.transpile) usa funciones de Python
+    if type(value) is Closure or type(value) is CompiledClosure or \
+            type(value) is FunctionType:
+        return 'FUNCTION'
+    if type(value) is Array:
+        return 'ARRAY'
+    if type(value) is List:
+        return 'LIST'
+    if type(value) is Map:
+        return 'MAP'
+    if type(value) is String:
+        return 'STRING'
+    return 'NULL'
+
+
+def new_frame(function: Function) -> list[Any]:
+    frame: list[Any] = [None] * function.frame_size
+    for slot in function.cells:
+        frame[slot] = Cell()
+    return frame
+
+
+# Crea la closure de `function` dentro de un frame que pertenece a la
+# closure `creator` (None en el programa)
+def make_closure(function: Function, frame: list[Any], creator: Any = None) -> Closure:
+    if not function.captures:
+        return Closure(function, ())
+
+    cells: list[Cell] = []
+    for depth, index in function.captures:
+        cells.append(frame[index] if depth == 0 else creator.cells[index])
+    return Closure(function, tuple(cells))
@@ -0,0 +1,111 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+
+from typing import (
+    Optional,
+    Sequence,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Boolean,
+    Expression,
+    Integer,
+    Program,
+)
+from lpp.token import (
+    Token,
+    TokenType,
+)
+from lpp.visitor import walk
+
+'''
+    Infraestructura comun de las pasadas de optimizacion sobre el AST.
+
+    Cada pasada modifica el programa en su lugar y regresa un PassStats con
+    cuantos cambios hizo y cuantos nodos tenia el programa antes y despues.
+    optimize corre varias pasadas en ronda hasta que ninguna cambia nada,
+    porque lo que hace una suele habilitar a otra (plegar `1 < 2` deja un
+    `si` con condicion constante, quitar ese `si` deja variables sin usar).
+'''
+
+
+class PassStats:
+
+    def __init__(self, name: str, nodes_before: int) -> None:
+        self.name = name
+        self.nodes_before = nodes_before
+        self.nodes_after = nodes_before
+        # Cuantas transformaciones hizo la pasada
+        self.changes = 0
+
+    @property
+    def nodes_removed(self) -> int:
+        return self.nodes_before - self.nodes_after
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.changes} cambios, ' + \
+            f'{self.nodes_removed} nodos eliminados ' + \
+            f'({self.nodes_before} -> {self.nodes_after})'
+
+
+class OptimizationPass(ABC):
+    name: str = ''
+
+    @abstractmethod
+    def run(self, program: Program) -> PassStats:
+        pass
+
+
+def count_nodes(node: ASTNode) -> int:
+    return sum(1 for _ in walk(node))
+
+
+# Literales nuevos que reemplazan a `original` y conservan su posicion
+def make_integer(value: int, original: Expression) -> Integer:
+    integer = Integer(token=Token(TokenType.INT, str(value)), value=value)
+    integer.start, integer.end = original.start, original.end
+    return integer
+
+
+def make_boolean(value: bool, original: Expression) -> Boolean:
+    token = Token(TokenType.TRUE, 'verdadero') if value else \
+        Token(TokenType.FALSE, 'falso')
+    boolean = Boolean(token=token, value=value)
+    boolean.start, boolean.end = original.start, original.end
+    return boolean
+
+
+def default_passes() -> list[OptimizationPass]:
+    from lpp.cse import CommonSubexpressionElimination
+    from lpp.dead_code import DeadCodeElimination
+    from lpp.folding import ConstantFolding
+    from lpp.inlining import FunctionInlining
+
+    return [FunctionInlining(), ConstantFolding(), DeadCodeElimination(),
+            CommonSubexpressionElimination()]
+
+
+# Corre las pasadas en orden hasta llegar a un punto fijo (una ronda sin
+# cambios) o hasta max_iterations rondas. Regresa las estadisticas de cada
+# ejecucion de cada pasada, en el orden en que corrieron
+def optimize(program: Program,
+             passes: Optional[Sequence[OptimizationPass]] = None,
+             max_iterations: int = 10) -> list[PassStats]:
+    if passes is None:
+        passes = default_passes()
+
+    history: list[PassStats] = []
+    for _ in range(max_iterations):
+        changes = 0
+        for optimization in passes:
+            stats = optimization.run(program)
+            history.append(stats)
+            changes += stats.changes
+
+        if not changes:
+            break
+
+    return history
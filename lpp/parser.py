@@ -1,4 +1,9 @@
 from lpp.ast import (
+    ASTNode,
+    ArrayLiteral,
+    MapLiteral,
+    Assignment,
+    For,
     Program, 
     Statement, 
     LetStatement, 
@@ -13,7 +18,10 @@ from lpp.ast import (
     If,
     Block,
     Function,
-    Call
+    Call,
+    Index,
+    Length,
+    StringLiteral,
     )
 from lpp.lexer import Lexer
 from lpp.token import TokenType, Token
@@ -64,6 +72,7 @@ PRECEDENCES: dict[TokenType, Precedence] = {
     TokenType.DIVIDE: Precedence.PRODUCT,
     TokenType.MULT: Precedence.PRODUCT,
     TokenType.LPAREN: Precedence.CALL,
+    TokenType.LBRACKET: Precedence.CALL,
 }
 
 
@@ -72,6 +81,9 @@ class Parser:
         self._lexer = lexer
         self._current_token: Optional[Token] = None
         self._peek_token: Optional[Token] = None
+        # (inicio, fin) de cada token en el codigo fuente
+        self._current_span: tuple[int, int] = (0, 0)
+        self._peek_span: tuple[int, int] = (0, 0)
         self._errors: list[str] = []
 
         # Registra toda las funciones
@@ -96,13 +108,23 @@ class Parser:
 
             self._advance_tokens()
 
+        program.start = 0
+        program.end = self._current_span[1]
+
         return program
     
     # Es como el next_caracter, solo que este pasa al siguiente Token
     def _advance_tokens(self) -> None:
         self._current_token = self._peek_token
+        self._current_span = self._peek_span
         # Avanzamos a otro token
         self._peek_token = self._lexer.next_token()
+        self._peek_span = (self._lexer.token_start, self._lexer.token_end)
+
+    # Guarda en el nodo su posicion, desde start hasta el final del token actual
+    def _mark(self, node: ASTNode, start: int) -> None:
+        node.start = start
+        node.end = self._current_span[1]
 
     # Buscamos que precedencia tiene le token
     def _current_precedence(self) -> Precedence:
@@ -141,9 +163,16 @@ class Parser:
             self._errors.append(message)
             return None
         
+        start = self._current_span[0]
+
         # Expresion de izquierda
         left_expression = prefix_parse_fn()
 
+        # Las expresiones agrupadas ya traen la posicion de lo que esta
+        # dentro de los parentesis
+        if left_expression is not None and left_expression.start < 0:
+            self._mark(left_expression, start)
+
         assert self._peek_token is not None
         while not self._peek_token.token_type == TokenType.SEMICOLON and precedence < self._peek_precedence():
             try:
@@ -156,6 +185,9 @@ class Parser:
             except KeyError:
                 return left_expression
 
+            if left_expression is not None:
+                self._mark(left_expression, start)
+
         return left_expression
 
     def _parse_expression_statement(self) -> Optional[ExpressionStatement]:
@@ -203,14 +235,116 @@ class Parser:
 
     def _parse_statement(self) -> Optional[Statement]:
         assert self._current_token is not None
+        start = self._current_span[0]
 
+        statement: Optional[Statement]
         # Aqui podemos colocar que cuando se escriba leer o read lo parse
         if self._current_token.token_type == TokenType.LET:
-            return self._parse_let_statement()
+            statement = self._parse_let_statement()
         elif self._current_token.token_type == TokenType.RETURN:
-            return self._parse_return_statement()
+            statement = self._parse_return_statement()
+        elif self._current_token.token_type == TokenType.FOR:
+            statement = self._parse_for()
         else:
-            return self._parse_expression_statement()
+            statement = self._parse_expression_statement()
+
+        if statement is not None:
+            self._mark(statement, start)
+
+        return statement
+
+    # para (variable i = 0, total = 0; i < n; i = i + 1, total = total + i) { ... }
+    def _parse_for(self) -> Optional[For]:
+        assert self._current_token is not None
+        for_statement = For(token=self._current_token)
+
+        if not self._expected_token(TokenType.LPAREN):
+            return None
+
+        assert self._peek_token is not None
+        if self._peek_token.token_type == TokenType.LET:
+            self._advance_tokens()
+            let_token = self._current_token
+            start = self._current_span[0]
+
+            while True:
+                if not self._expected_token(TokenType.IDENT):
+                    return None
+                binding = self._parse_binding()
+                if binding is None:
+                    return None
+
+                variable = LetStatement(let_token, *binding)
+                self._mark(variable, start)
+                for_statement.variables.append(variable)
+
+                if self._peek_token.token_type != TokenType.COMMA:
+                    break
+                self._advance_tokens() # Avanzamos la coma
+                start = self._peek_span[0]
+
+        if not self._expected_token(TokenType.SEMICOLON):
+            return None
+        self._advance_tokens()
+
+        for_statement.condition = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expected_token(TokenType.SEMICOLON):
+            return None
+
+        names = {variable.name.value for variable in for_statement.variables
+                 if variable.name is not None}
+        assigned: set[str] = set()
+        while self._peek_token.token_type == TokenType.IDENT:
+            self._advance_tokens()
+            start = self._current_span[0]
+            binding = self._parse_binding()
+            if binding is None:
+                return None
+
+            name, value = binding
+            if name.value not in names:
+                self._errors.append(
+                    f'Solo se pueden asignar las variables del para: {name.value}')
+                return None
+            if name.value in assigned:
+                self._errors.append(f'La variable {name.value} se asigna dos veces')
+                return None
+            assigned.add(name.value)
+
+            update = Assignment(name.token, name, value)
+            self._mark(update, start)
+            for_statement.updates.append(update)
+
+            if self._peek_token.token_type != TokenType.COMMA:
+                break
+            self._advance_tokens() # Avanzamos la coma
+
+        if not self._expected_token(TokenType.RPAREN):
+            return None
+        if not self._expected_token(TokenType.LBRACE):
+            return None
+
+        for_statement.body = self._parse_block()
+
+        if self._peek_token.token_type == TokenType.SEMICOLON:
+            self._advance_tokens()
+
+        return for_statement
+
+    # nombre = valor, con el token actual en el nombre
+    def _parse_binding(self) -> Optional[tuple[Identifier, Expression]]:
+        name = self._parse_identifier()
+
+        if not self._expected_token(TokenType.ASSIGN):
+            return None
+        self._advance_tokens()
+
+        value = self._parse_expression(Precedence.LOWEST)
+        if value is None:
+            return None
+
+        return name, value
 
     def _parse_return_statement(self) -> Optional[ReturnStatement]:
         assert self._current_token is not None
@@ -234,8 +368,11 @@ class Parser:
     def _parse_identifier(self) -> Identifier:
         assert self._current_token is not None
 
-        return Identifier(token=self._current_token,
-                          value=self._current_token.literal)
+        identifier = Identifier(token=self._current_token,
+                                value=self._current_token.literal)
+        self._mark(identifier, self._current_span[0])
+
+        return identifier
     
     def _parse_integer(self) -> Optional[Integer]:
         assert self._current_token is not None
@@ -301,6 +438,12 @@ class Parser:
         return Boolean(token=self._current_token,
                        value=self._current_token.token_type == TokenType.TRUE)
 
+    def _parse_string(self) -> StringLiteral:
+        assert self._current_token is not None
+
+        return StringLiteral(token=self._current_token,
+                             value=self._current_token.literal)
+
     # Funcion que agrupa las expressiones
     def _parse_grouped_expression(self) -> Optional[Expression]:
         self._advance_tokens()
@@ -351,6 +494,7 @@ class Parser:
         assert self._current_token is not None
         block_statement = Block(token=self._current_token,
                                 statements=[])
+        start = self._current_span[0]
         
         self._advance_tokens()
 
@@ -364,6 +508,8 @@ class Parser:
 
             self._advance_tokens()
 
+        self._mark(block_statement, start)
+
         return block_statement
 
     # -----------------------------
@@ -401,18 +547,13 @@ class Parser:
         
         assert self._current_token is not None
 
-        identifier = Identifier(token=self._current_token,
-                                value=self._current_token.literal)
-        
-        params.append(identifier)
+        params.append(self._parse_identifier())
 
         while self._peek_token.token_type == TokenType.COMMA:
             self._advance_tokens() # Avanzamos la comma
             self._advance_tokens() # Avanzamos al siguiente identificador
 
-            identifier = Identifier(token=self._current_token,
-                                    value=self._current_token.literal)
-            params.append(identifier)
+            params.append(self._parse_identifier())
 
         if not self._expected_token(TokenType.RPAREN):
             return []
@@ -428,11 +569,90 @@ class Parser:
         return call
     
     def _parse_call_arguments(self) -> Optional[list[Expression]]:
+        return self._parse_expression_list(TokenType.RPAREN)
+
+    # [1, 2, 3]
+    def _parse_array(self) -> Optional[ArrayLiteral]:
+        assert self._current_token is not None
+        array = ArrayLiteral(self._current_token)
+
+        elements = self._parse_expression_list(TokenType.RBRACKET)
+        if elements is None:
+            return None
+        array.elements = elements
+
+        return array
+
+    # arreglo[indice], se liga como una llamada
+    def _parse_index(self, left: Expression) -> Optional[Index]:
+        assert self._current_token is not None
+        index = Index(self._current_token, left)
+
+        self._advance_tokens()
+        index.index = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expected_token(TokenType.RBRACKET):
+            return None
+
+        return index
+
+    # {1: verdadero, x: [1, 2]}
+    def _parse_map(self) -> Optional[MapLiteral]:
+        assert self._current_token is not None
+        map_literal = MapLiteral(self._current_token)
+
+        assert self._peek_token is not None
+        if self._peek_token.token_type == TokenType.RBRACE:
+            self._advance_tokens()
+
+            return map_literal
+
+        while True:
+            self._advance_tokens() # Para llegar a la llave
+            key = self._parse_expression(Precedence.LOWEST)
+
+            if not self._expected_token(TokenType.COLON):
+                return None
+
+            self._advance_tokens() # Para llegar al valor
+            value = self._parse_expression(Precedence.LOWEST)
+
+            if key is not None and value is not None:
+                map_literal.entries.append(key)
+                map_literal.entries.append(value)
+
+            if self._peek_token.token_type != TokenType.COMMA:
+                break
+            self._advance_tokens() # Para llegar a la coma
+
+        if not self._expected_token(TokenType.RBRACE):
+            return None
+
+        return map_literal
+
+    # tamano(x)
+    def _parse_length(self) -> Optional[Length]:
+        assert self._current_token is not None
+        length = Length(self._current_token)
+
+        if not self._expected_token(TokenType.LPAREN):
+            return None
+
+        self._advance_tokens()
+        length.argument = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expected_token(TokenType.RPAREN):
+            return None
+
+        return length
+
+    # Expresiones separadas por comas hasta el token `end`
+    def _parse_expression_list(self, end: TokenType) -> Optional[list[Expression]]:
         arguments: list[Expression] = []
 
         assert self._peek_token is not None
 
-        if self._peek_token.token_type == TokenType.LPAREN:
+        if self._peek_token.token_type == end:
             self._advance_tokens()
 
             return arguments
@@ -450,7 +670,7 @@ class Parser:
             if expression := self._parse_expression(Precedence.LOWEST):
                 arguments.append(expression)
 
-        if not self._expected_token(TokenType.RPAREN):
+        if not self._expected_token(end):
             return None
         
         return arguments
@@ -466,6 +686,7 @@ class Parser:
             TokenType.LT: self._parse_infix_expression,
             TokenType.MT: self._parse_infix_expression,
             TokenType.LPAREN: self._parse_call,
+            TokenType.LBRACKET: self._parse_index,
         }
     
     def _register_prefix_parse_fns(self) -> PrefixParseFns:
@@ -477,9 +698,12 @@ class Parser:
             TokenType.TRUE: self._parse_boolean,
             TokenType.FALSE: self._parse_boolean,
             TokenType.LPAREN: self._parse_grouped_expression,
-            TokenType.LBRACE: self._parse_if,
+            TokenType.LBRACE: self._parse_map,
             TokenType.IF: self._parse_if,
             TokenType.FUNCTION: self._parse_function,
+            TokenType.LBRACKET: self._parse_array,
+            TokenType.LENGTH: self._parse_length,
+            TokenType.STRING: self._parse_string,
         }
 
     
\ No newline at end of file
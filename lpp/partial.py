@@ -0,0 +1,338 @@
+from typing import (
+    Optional,
+    Union,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Block,
+    Boolean,
+    Call,
+    Expression,
+    ExpressionStatement,
+    Function,
+    Identifier,
+    Integer,
+    LetStatement,
+    Program,
+    ReturnStatement,
+)
+from lpp.dead_code import DeadCodeElimination
+from lpp.folding import (
+    ConstantFolding,
+    Literal,
+)
+from lpp.optimizer import (
+    count_nodes,
+    OptimizationPass,
+    optimize,
+    PassStats,
+)
+from lpp.symbols import (
+    build_symbol_table,
+    Symbol,
+    SymbolTable,
+)
+from lpp.token import (
+    Token,
+    TokenType,
+)
+from lpp.visitor import (
+    copy_tree,
+    NodeTransformer,
+    walk,
+)
+
+'''
+    Evaluacion parcial de funciones llamadas con argumentos constantes.
+
+    Para cada llamada `f(a1, ..., an)` a una funcion ligada con
+    `variable f = funcion(...)` (una sola vez en su scope) en la que algun
+    argumento es un literal, creamos una copia de f sin esos parametros, con
+    cada uso del parametro cambiado por el literal, y la simplificamos con
+    el plegado de constantes y la eliminacion de codigo muerto. La copia se
+    define justo despues de f, en el mismo scope, asi que sus nombres libres
+    se refieren a lo mismo que en f, y la llamada pasa a usarla solo con los
+    argumentos que no son constantes:
+
+        potencia(x, 3)  ->  _potencia1(x)
+
+    Las llamadas que quedan dentro de la copia tambien se especializan, asi
+    que una recursion sobre un argumento constante se desenrolla (el cuerpo
+    de _potencia1 llama a _potencia2 con exponente 2 y asi hasta el caso
+    base). Despues el inlining puede terminar de pegar las copias pequeñas.
+
+    Si todos los argumentos son constantes especializamos primero las
+    llamadas de la copia y volvemos a plegarla; cuando el cuerpo queda en un
+    solo literal la llamada se cambia por el literal y la copia no se
+    emite, asi que potencia(2, 3) se vuelve 8 sin dejar funciones.
+
+    Cada combinacion de funcion y constantes se especializa una sola vez y
+    las demas llamadas con las mismas constantes reutilizan la copia. En una
+    corrida cada funcion tiene a lo mas max_specializations copias y todas
+    suman a lo mas growth veces el tamaño del programa (mas max_size);
+    cuando se acaba el presupuesto las llamadas que faltan se dejan igual.
+    Una recursion que nunca llega a su caso base se queda con una llamada a
+    la funcion original, como antes.
+'''
+
+
+StatementContainer = Union[Program, Block]
+# Por cada parametro, el literal constante como (tipo, valor) o None
+ConstantKey = tuple[Optional[tuple[type, Union[int, bool]]], ...]
+
+
+class _Binding:
+
+    def __init__(self,
+                 symbol: Symbol,
+                 statement: LetStatement,
+                 function: Function,
+                 container: StatementContainer) -> None:
+        self.symbol = symbol
+        self.statement = statement
+        self.function = function
+        self.container = container
+
+
+def _constant(argument: Expression) -> Optional[tuple[type, Union[int, bool]]]:
+    if type(argument) is Integer or type(argument) is Boolean:
+        assert argument.value is not None  # type: ignore
+        # El tipo va en la llave porque en Python True == 1
+        return type(argument), argument.value  # type: ignore
+    return None
+
+
+# El literal que regresa una funcion cuyo cuerpo es solo ese literal
+def _constant_body(function: Function) -> Optional[Literal]:
+    if function.body is None or len(function.body.statements) != 1:
+        return None
+
+    statement = function.body.statements[0]
+    if type(statement) is ExpressionStatement:
+        value = statement.expression
+    elif type(statement) is ReturnStatement:
+        value = statement.return_value
+    else:
+        return None
+
+    if type(value) is Integer or type(value) is Boolean:
+        return value
+    return None
+
+
+class _CallReplacer(NodeTransformer):
+
+    def __init__(self, literals: dict[Call, Literal]) -> None:
+        self.literals = literals
+
+    def leave_Call(self, node: Call) -> Expression:
+        return self.literals.get(node, node)
+
+
+class PartialEvaluation(OptimizationPass):
+    name = 'evaluacion parcial'
+
+    def __init__(self,
+                 max_specializations: int = 16,
+                 max_size: int = 64,
+                 growth: float = 1.0) -> None:
+        self.max_specializations = max_specializations
+        self.max_size = max_size
+        self.growth = growth
+
+    def run(self, program: Program) -> PassStats:
+        stats = PassStats(self.name, count_nodes(program))
+
+        table = build_symbol_table(program)
+        self._bindings = self._find_bindings(program, table)
+        if not self._bindings:
+            return stats
+
+        # Simbolo al que se refiere cada identificador, incluidos los de las
+        # copias, que no estan en la tabla
+        self._symbols: dict[Identifier, Symbol] = {}
+        for symbol in self._bindings:
+            for reference in symbol.references:
+                self._symbols[reference] = symbol
+        # Usos de cada parametro de las funciones ligadas
+        self._parameters: dict[Identifier, list[Identifier]] = {}
+        for binding in self._bindings.values():
+            for parameter in binding.function.parameters:
+                definition = table.definition(parameter)
+                if definition is not None:
+                    self._parameters[parameter] = definition.references
+
+        # Nombre de la copia o el literal al que se redujo
+        self._cache: dict[tuple[Symbol, ConstantKey], Union[str, Literal]] = {}
+        self._created: dict[Symbol, int] = {}
+        self._budget = int(stats.nodes_before * self.growth) + self.max_size
+        self._names = {node.value for node in walk(program)
+                       if type(node) is Identifier}  # type: ignore
+        self._counter = 0
+        self._changes = 0
+
+        # En orden de creacion, para que una recursion que no termina no se
+        # quede con todo el presupuesto
+        self._pending: list[ASTNode] = [program]
+        position = 0
+        while position < len(self._pending):
+            self._specialize_calls(self._pending[position])
+            position += 1
+
+        stats.changes = self._changes
+        if stats.changes:
+            stats.nodes_after = count_nodes(program)
+
+        return stats
+
+    def _find_bindings(self,
+                       program: Program,
+                       table: SymbolTable) -> dict[Symbol, _Binding]:
+        bindings: dict[Symbol, _Binding] = {}
+
+        for node in walk(program):
+            if type(node) is not Program and type(node) is not Block:
+                continue
+
+            for statement in node.statements:  # type: ignore
+                if type(statement) is not LetStatement or statement.name is None or \
+                        type(statement.value) is not Function:
+                    continue
+
+                symbol = table.definition(statement.name)
+                if symbol is None or len(symbol.scope.definitions[symbol.name]) > 1:
+                    continue
+                bindings[symbol] = _Binding(symbol, statement, statement.value,
+                                            node)  # type: ignore
+
+        return bindings
+
+    # Especializa las llamadas del subarbol y cambia por su literal las que
+    # se redujeron a uno. Regresa cuantas cambio por un literal
+    def _specialize_calls(self, root: ASTNode) -> int:
+        literals: dict[Call, Literal] = {}
+        for node in list(walk(root)):
+            if type(node) is not Call:
+                continue
+            result = self._specialize_call(node)  # type: ignore
+            if result is not None:
+                self._changes += 1
+                if not isinstance(result, bool):
+                    literals[node] = result  # type: ignore
+
+        if literals:
+            _CallReplacer(literals).transform(root)
+
+        return len(literals)
+
+    # Cambia la llamada por una a la version especializada, creandola si
+    # hace falta, y regresa True, o regresa el literal que la reemplaza
+    def _specialize_call(self, call: Call) -> Union[bool, Literal, None]:
+        if type(call.function) is not Identifier:
+            return None
+        symbol = self._symbols.get(call.function)  # type: ignore
+        if symbol is None:
+            return None
+
+        binding = self._bindings[symbol]
+        arguments = call.arguments or []
+        if len(arguments) != len(binding.function.parameters):
+            return None
+
+        key: ConstantKey = tuple(_constant(argument) for argument in arguments)
+        if all(constant is None for constant in key):
+            return None
+
+        result = self._cache.get((symbol, key))
+        if result is None:
+            result = self._specialize(binding, key, arguments)
+            if result is None:
+                return None
+
+        if not isinstance(result, str):
+            literal: Literal = copy_tree(result)  # type: ignore
+            literal.start, literal.end = call.start, call.end
+            return literal
+
+        callee = self._identifier(result, call.function)
+        call.function = callee
+        call.arguments = [argument for argument, constant in zip(arguments, key)
+                          if constant is None]
+        return True
+
+    def _specialize(self,
+                    binding: _Binding,
+                    key: ConstantKey,
+                    arguments: list[Expression]) -> Union[str, Literal, None]:
+        if self._created.get(binding.symbol, 0) >= self.max_specializations:
+            return None
+
+        function = binding.function
+        replacements: dict[ASTNode, ASTNode] = {}
+        for parameter, constant, argument in zip(function.parameters, key, arguments):
+            if constant is not None:
+                for reference in self._parameters.get(parameter, []):
+                    replacements[reference] = argument
+
+        # Los literales no tienen hijos, asi que la copia conserva el
+        # preorden y podemos saber a que simbolo se refiere cada identificador
+        copy: Function = copy_tree(function, replacements)  # type: ignore
+        for original, copied in zip(walk(function), walk(copy)):
+            if type(original) is Identifier and original in self._symbols:
+                self._symbols[copied] = self._symbols[original]  # type: ignore
+        copy.parameters = [parameter for parameter, constant
+                           in zip(copy.parameters, key) if constant is None]
+
+        name = self._fresh_name(binding.symbol.name)
+        assert binding.statement.name is not None
+        statement = LetStatement(binding.statement.token,
+                                 self._identifier(name, binding.statement.name),
+                                 copy)
+        statement.start, statement.end = binding.statement.start, binding.statement.end
+
+        # Lo que se puede calcular ya con las constantes
+        optimize(Program([statement]), [ConstantFolding(), DeadCodeElimination()])
+
+        size = count_nodes(statement)
+        if size > self._budget:
+            return None
+
+        self._budget -= size
+        self._created[binding.symbol] = self._created.get(binding.symbol, 0) + 1
+        self._cache[(binding.symbol, key)] = name
+
+        container = binding.container
+        position = container.statements.index(binding.statement)
+        container.statements.insert(position + 1, statement)
+
+        # Con algun parametro libre el cuerpo no se puede reducir a un
+        # literal; sus llamadas se especializan despues, en orden
+        if copy.parameters:
+            self._pending.append(copy)
+            return name
+
+        if self._specialize_calls(copy):
+            optimize(Program([statement]), [ConstantFolding(), DeadCodeElimination()])
+        literal = _constant_body(copy)
+        if literal is None:
+            return name
+
+        # Ya no hace falta la copia: la quitamos y devolvemos su tamaño
+        container.statements.remove(statement)
+        self._budget += size
+        self._cache[(binding.symbol, key)] = literal
+        return literal
+
+    def _fresh_name(self, base: str) -> str:
+        while True:
+            self._counter += 1
+            name = f'_{base}{self._counter}'
+            if name not in self._names:
+                self._names.add(name)
+                return name
+
+    def _identifier(self, name: str, original: Expression) -> Identifier:
+        identifier = Identifier(Token(TokenType.IDENT, name), name)
+        identifier.start, identifier.end = original.start, original.end
+        return identifier
@@ -0,0 +1,175 @@
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+from typing import Optional
+
+from lpp.ast import (
+    ASTNode,
+    Program,
+    Statement,
+)
+from lpp.visitor import child_nodes
+
+'''
+    Indice de posiciones para preguntar que nodo hay en un offset del codigo
+    fuente (hover, ir a la definicion, seleccion) sin recorrer todo el arbol.
+
+    Los nodos del AST forman intervalos anidados, asi que para cada statement
+    de nivel superior guardamos sus nodos en preorden y partimos su rango en
+    segmentos donde el nodo mas interno no cambia. Una busqueda es un bisect
+    sobre los statements y otro sobre los segmentos: O(log n).
+
+    Las posiciones dentro de cada tabla son relativas al inicio de su
+    statement, por eso reemplazar un statement solo reconstruye su tabla y
+    recorre los offsets de los statements que le siguen.
+'''
+
+
+class _StatementTable:
+
+    def __init__(self, statement: Statement) -> None:
+        base = statement.start
+        self.length = statement.end - statement.start
+
+        # Nodos en preorden, con posiciones relativas y el indice del padre
+        self.nodes: list[ASTNode] = []
+        self.starts: list[int] = []
+        self.parents: list[int] = []
+
+        stack: list[tuple[ASTNode, int]] = [(statement, -1)]
+        while stack:
+            node, parent = stack.pop()
+            if node.start < 0:
+                # Nodo sin posicion (creado a mano), no se indexa pero sus
+                # hijos si pueden tenerla
+                index = parent
+            else:
+                index = len(self.nodes)
+                self.nodes.append(node)
+                self.starts.append(node.start - base)
+                self.parents.append(parent)
+
+            children = child_nodes(node)
+            for position in range(len(children) - 1, -1, -1):
+                stack.append((children[position], index))
+
+        self.ends: list[int] = [node.end - base for node in self.nodes]
+
+        # Segmentos [segment_starts[i], segment_starts[i + 1]) y el nodo mas
+        # interno que los cubre (-1 si ninguno)
+        self.segment_starts: list[int] = []
+        self.segment_nodes: list[int] = []
+
+        open_nodes: list[int] = []
+        for index, start in enumerate(self.starts):
+            while open_nodes and self.ends[open_nodes[-1]] <= start:
+                self._close(open_nodes)
+            self._add_segment(start, index)
+            open_nodes.append(index)
+
+        while open_nodes:
+            self._close(open_nodes)
+
+    def _close(self, open_nodes: list[int]) -> None:
+        closed = open_nodes.pop()
+        self._add_segment(self.ends[closed], open_nodes[-1] if open_nodes else -1)
+
+    def _add_segment(self, position: int, node: int) -> None:
+        if self.segment_starts and self.segment_starts[-1] == position:
+            self.segment_nodes[-1] = node
+        else:
+            self.segment_starts.append(position)
+            self.segment_nodes.append(node)
+
+    def innermost(self, offset: int) -> int:
+        segment = bisect_right(self.segment_starts, offset) - 1
+        if segment < 0:
+            return -1
+        return self.segment_nodes[segment]
+
+
+class PositionIndex:
+
+    def __init__(self, program: Program) -> None:
+        self._program = program
+        self._offsets: list[int] = []
+        self._tables: list[_StatementTable] = []
+        self._length = max(program.end, 0)
+
+        for statement in program.statements:
+            self._offsets.append(statement.start)
+            self._tables.append(_StatementTable(statement))
+
+    @property
+    def program(self) -> Program:
+        return self._program
+
+    # Nodo mas interno que contiene al offset, o el programa si el offset
+    # cae entre dos statements
+    def node_at(self, offset: int) -> Optional[ASTNode]:
+        position = bisect_right(self._offsets, offset) - 1
+        if position >= 0:
+            table = self._tables[position]
+            node = table.innermost(offset - self._offsets[position])
+            if node >= 0:
+                return table.nodes[node]
+
+        if 0 <= offset < self._length:
+            return self._program
+
+        return None
+
+    # Todos los nodos que se traslapan con [start, end), en preorden
+    def nodes_in_range(self, start: int, end: int) -> list[ASTNode]:
+        if start >= end or end <= 0 or start >= self._length:
+            return []
+
+        nodes: list[ASTNode] = [self._program]
+
+        # Primer statement que termina despues de start
+        position = max(bisect_right(self._offsets, start) - 1, 0)
+        while position < len(self._tables) and self._offsets[position] < end:
+            table = self._tables[position]
+            base = self._offsets[position]
+            position += 1
+
+            if base + table.length <= start:
+                continue
+
+            relative_start = start - base
+            relative_end = end - base
+
+            # Los ancestros del nodo que contiene a start empiezan antes que
+            # el rango pero tambien se traslapan con el
+            ancestors: list[ASTNode] = []
+            node = table.innermost(relative_start)
+            while node >= 0:
+                if table.starts[node] < relative_start:
+                    ancestors.append(table.nodes[node])
+                node = table.parents[node]
+            nodes.extend(reversed(ancestors))
+
+            first = bisect_left(table.starts, max(relative_start, 0))
+            last = bisect_left(table.starts, relative_end)
+            nodes.extend(table.nodes[first:last])
+
+        return nodes
+
+    # Reemplaza el statement de nivel superior `index`. Las posiciones del
+    # nuevo statement pueden venir de cualquier origen (por ejemplo de
+    # parsear solo su texto); los statements siguientes se recorren lo que
+    # haya cambiado el largo
+    def replace_statement(self, index: int, statement: Statement) -> None:
+        old_length = self._tables[index].length
+
+        table = _StatementTable(statement)
+        self._tables[index] = table
+        self._program.statements[index] = statement
+
+        delta = table.length - old_length
+        if delta:
+            self._length += delta
+            offsets = self._offsets
+            for position in range(index + 1, len(offsets)):
+                offsets[position] += delta
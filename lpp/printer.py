@@ -0,0 +1,443 @@
+from io import StringIO
+from typing import (
+    Callable,
+    TextIO,
+    Union,
+)
+
+from lpp.ast import (
+    ArrayLiteral,
+    ASTNode,
+    Assignment,
+    Block,
+    Boolean,
+    Call,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+)
+from lpp.visitor import walk
+
+'''
+    Formateador de programas lpp.
+
+    A diferencia de __str__, no construye strings anidados: primero calcula
+    en una sola pasada el ancho que tendria cada nodo escrito en una linea y
+    despues escribe directamente en el stream usando una pila explicita. Los
+    dos pasos son O(n) y no dependen del limite de recursion.
+
+    La salida siempre se puede volver a parsear y produce el mismo arbol.
+'''
+
+
+# Los argumentos de una llamada se formatean hasta que sabemos en que
+# columna terminan la funcion y el parentesis
+class _Arguments:
+
+    def __init__(self, call: Call, level: int) -> None:
+        self.call = call
+        self.level = level
+
+
+# Un elemento de la pila es texto para escribir, un salto de linea con su
+# nivel de indentacion, un nodo pendiente (nodo, nivel, con_parentesis) o
+# los argumentos pendientes de una llamada
+_Item = Union[str, int, tuple[ASTNode, int, bool], _Arguments]
+
+_OPERATORS: tuple[type, ...] = (Prefix, Infix)
+
+
+class _Output:
+
+    def __init__(self, stream: TextIO, indent: int) -> None:
+        self._stream = stream
+        self._indent = indent
+        self.column = 0
+
+    def write(self, text: str) -> None:
+        self._stream.write(text)
+        self.column += len(text)
+
+    def newline(self, level: int) -> None:
+        padding = ' ' * (self._indent * level)
+        self._stream.write('\n' + padding)
+        self.column = len(padding)
+
+
+class Printer:
+
+    def __init__(self, width: int = 80, indent: int = 4) -> None:
+        self._width = width
+        self._indent = indent
+        self._widths: dict[ASTNode, int] = {}
+        self._column = 0
+
+        self._handlers: dict[type, Callable[[ASTNode, int], list[_Item]]] = {
+            Program: self._program,  # type: ignore
+            LetStatement: self._let_statement,  # type: ignore
+            ReturnStatement: self._return_statement,  # type: ignore
+            ExpressionStatement: self._expression_statement,  # type: ignore
+            Block: self._block,  # type: ignore
+            For: self._for,  # type: ignore
+            Assignment: self._assignment,  # type: ignore
+            Identifier: self._identifier,  # type: ignore
+            Integer: self._integer,  # type: ignore
+            Boolean: self._boolean,  # type: ignore
+            Prefix: self._prefix,  # type: ignore
+            Infix: self._infix,  # type: ignore
+            If: self._if,  # type: ignore
+            Function: self._function,  # type: ignore
+            Call: self._call,  # type: ignore
+            ArrayLiteral: self._array,  # type: ignore
+            Index: self._index,  # type: ignore
+            MapLiteral: self._map,  # type: ignore
+            Length: self._length,  # type: ignore
+            StringLiteral: self._string,  # type: ignore
+        }
+
+        self._measures: dict[type, Callable[[ASTNode], int]] = {
+            Program: self._measure_program,  # type: ignore
+            LetStatement: self._measure_let_statement,  # type: ignore
+            ReturnStatement: self._measure_return_statement,  # type: ignore
+            ExpressionStatement: self._measure_expression_statement,  # type: ignore
+            Block: self._measure_block,  # type: ignore
+            For: self._measure_for,  # type: ignore
+            Assignment: self._measure_assignment,  # type: ignore
+            Identifier: lambda node: len(node.value),  # type: ignore
+            Integer: lambda node: len(str(node.value)),  # type: ignore
+            Boolean: lambda node: len(_boolean_literal(node)),  # type: ignore
+            Prefix: self._measure_prefix,  # type: ignore
+            Infix: self._measure_infix,  # type: ignore
+            If: self._measure_if,  # type: ignore
+            Function: self._measure_function,  # type: ignore
+            Call: self._measure_call,  # type: ignore
+            ArrayLiteral: self._measure_array,  # type: ignore
+            Index: self._measure_index,  # type: ignore
+            MapLiteral: self._measure_map,  # type: ignore
+            Length: self._measure_length,  # type: ignore
+            StringLiteral: lambda node: len(str(node)),  # type: ignore
+        }
+
+    def write(self, node: ASTNode, stream: TextIO) -> None:
+        self._measure(node)
+
+        output = _Output(stream, self._indent)
+        handlers = self._handlers
+
+        stack: list[_Item] = [(node, 0, False)]
+        while stack:
+            item = stack.pop()
+
+            if isinstance(item, str):
+                output.write(item)
+            elif isinstance(item, int):
+                output.newline(item)
+            elif isinstance(item, _Arguments):
+                self._column = output.column
+                stack.extend(reversed(self._arguments(item)))
+            else:
+                current, level, parens = item
+                if parens:
+                    output.write('(')
+                    stack.append(')')
+
+                # Los bloques y las llamadas deciden si caben en la linea
+                # segun la columna en la que empiezan
+                self._column = output.column
+                stack.extend(reversed(handlers[type(current)](current, level)))
+
+        self._widths.clear()
+
+    # -----------------------------
+    # Anchos en una sola linea
+    # -----------------------------
+
+    def _measure(self, node: ASTNode) -> None:
+        # Recorremos el preorden al reves para medir a los hijos antes que
+        # al padre
+        widths = self._widths
+        measures = self._measures
+        for current in reversed(list(walk(node))):
+            widths[current] = measures[type(current)](current)
+
+    def _width_of(self, node: object, parens: bool = False) -> int:
+        if node is None:
+            return 0
+        return self._widths[node] + (2 if parens else 0)  # type: ignore
+
+    def _operand_width(self, node: object) -> int:
+        return self._width_of(node, isinstance(node, _OPERATORS))
+
+    def _measure_program(self, node: Program) -> int:
+        return sum(self._width_of(statement) for statement in node.statements)
+
+    def _measure_let_statement(self, node: LetStatement) -> int:
+        # 'variable ' + nombre + ' = ' + valor + ';'
+        return 9 + self._width_of(node.name) + 3 + self._width_of(node.value) + 1
+
+    def _measure_return_statement(self, node: ReturnStatement) -> int:
+        return 8 + self._width_of(node.return_value) + 1
+
+    def _measure_expression_statement(self, node: ExpressionStatement) -> int:
+        return self._width_of(node.expression) + 1
+
+    def _measure_block(self, node: Block) -> int:
+        if not node.statements:
+            return 2
+        # '{' + ' stmt' por cada statement + ' }'
+        return 1 + sum(1 + self._width_of(statement)
+                       for statement in node.statements) + 2
+
+    def _measure_for(self, node: For) -> int:
+        # 'para (' + ['variable ' + asignaciones] + '; ' + condicion + '; '
+        # + asignaciones + ') ' + bloque
+        width = 6 + 2 + self._width_of(node.condition) + 2 + 2 + \
+            self._width_of(node.body)
+        if node.variables:
+            width += 9 + sum(self._width_of(variable.name) + 3 +
+                             self._width_of(variable.value)
+                             for variable in node.variables)
+            width += 2 * (len(node.variables) - 1)
+        width += sum(self._width_of(update) for update in node.updates)
+        width += 2 * max(len(node.updates) - 1, 0)
+        return width
+
+    def _measure_assignment(self, node: Assignment) -> int:
+        return self._width_of(node.name) + 3 + self._width_of(node.value)
+
+    def _measure_prefix(self, node: Prefix) -> int:
+        return len(node.operator) + self._operand_width(node.right)
+
+    def _measure_infix(self, node: Infix) -> int:
+        return self._operand_width(node.left) + len(node.operator) + 2 + \
+            self._operand_width(node.right)
+
+    def _measure_if(self, node: If) -> int:
+        width = 4 + self._width_of(node.condition) + 2 + \
+            self._width_of(node.consequence)
+        if node.alternative is not None:
+            width += 7 + self._width_of(node.alternative)
+        return width
+
+    def _measure_function(self, node: Function) -> int:
+        params = sum(self._width_of(parameter) for parameter in node.parameters)
+        separators = 2 * max(len(node.parameters) - 1, 0)
+        return 7 + 2 + params + separators + 1 + self._width_of(node.body)
+
+    def _measure_call(self, node: Call) -> int:
+        arguments = node.arguments or []
+        args = sum(self._width_of(argument) for argument in arguments)
+        separators = 2 * max(len(arguments) - 1, 0)
+        return self._operand_width(node.function) + 2 + args + separators
+
+    def _measure_array(self, node: ArrayLiteral) -> int:
+        elements = sum(self._width_of(element) for element in node.elements)
+        separators = 2 * max(len(node.elements) - 1, 0)
+        return 2 + elements + separators
+
+    def _measure_index(self, node: Index) -> int:
+        return self._operand_width(node.left) + 2 + self._width_of(node.index)
+
+    def _measure_map(self, node: MapLiteral) -> int:
+        # '{' + llave + ': ' + valor por cada par, separados por ', ' + '}'
+        pairs = sum(self._width_of(key) + 2 + self._width_of(value)
+                    for key, value in zip(node.keys, node.values))
+        separators = 2 * max(len(node.entries) // 2 - 1, 0)
+        return 2 + pairs + separators
+
+    def _measure_length(self, node: Length) -> int:
+        return 8 + self._width_of(node.argument)
+
+    def _fits(self, node: ASTNode) -> bool:
+        return self._column + self._widths[node] <= self._width
+
+    # -----------------------------
+    # Escritura de cada nodo
+    # -----------------------------
+
+    def _program(self, node: Program, level: int) -> list[_Item]:
+        items: list[_Item] = []
+        for index, statement in enumerate(node.statements):
+            if index > 0:
+                items.append(level)
+            items.append((statement, level, False))
+        return items
+
+    def _let_statement(self, node: LetStatement, level: int) -> list[_Item]:
+        return ['variable ', *self._optional(node.name, level), ' = ',
+                *self._optional(node.value, level), ';']
+
+    def _return_statement(self, node: ReturnStatement, level: int) -> list[_Item]:
+        return ['retorna ', *self._optional(node.return_value, level), ';']
+
+    def _expression_statement(self,
+                              node: ExpressionStatement,
+                              level: int) -> list[_Item]:
+        return [*self._optional(node.expression, level), ';']
+
+    def _block(self, node: Block, level: int) -> list[_Item]:
+        if not node.statements:
+            return ['{}']
+
+        items: list[_Item] = ['{']
+        if self._fits(node):
+            for statement in node.statements:
+                items.extend([' ', (statement, level, False)])
+            items.append(' }')
+            return items
+
+        for statement in node.statements:
+            items.extend([level + 1, (statement, level + 1, False)])
+        items.extend([level, '}'])
+
+        return items
+
+    def _for(self, node: For, level: int) -> list[_Item]:
+        items: list[_Item] = ['para (']
+        for index, variable in enumerate(node.variables):
+            items.append('variable ' if index == 0 else ', ')
+            items.extend([*self._optional(variable.name, level), ' = ',
+                          *self._optional(variable.value, level)])
+        items.extend(['; ', *self._optional(node.condition, level), '; '])
+        for index, update in enumerate(node.updates):
+            if index > 0:
+                items.append(', ')
+            items.append((update, level, False))
+        items.extend([') ', *self._optional(node.body, level)])
+        return items
+
+    def _assignment(self, node: Assignment, level: int) -> list[_Item]:
+        return [*self._optional(node.name, level), ' = ',
+                *self._optional(node.value, level)]
+
+    def _identifier(self, node: Identifier, level: int) -> list[_Item]:
+        return [node.value]
+
+    def _integer(self, node: Integer, level: int) -> list[_Item]:
+        return [str(node.value)]
+
+    def _boolean(self, node: Boolean, level: int) -> list[_Item]:
+        return [_boolean_literal(node)]
+
+    # Con comillas y escapes, asi que nunca ocupa mas de una linea
+    def _string(self, node: StringLiteral, level: int) -> list[_Item]:
+        return [str(node)]
+
+    def _prefix(self, node: Prefix, level: int) -> list[_Item]:
+        return [node.operator, *self._operand(node.right, level)]
+
+    def _infix(self, node: Infix, level: int) -> list[_Item]:
+        return [*self._operand(node.left, level), f' {node.operator} ',
+                *self._operand(node.right, level)]
+
+    def _if(self, node: If, level: int) -> list[_Item]:
+        items: list[_Item] = ['si (', *self._optional(node.condition, level),
+                              ') ', *self._optional(node.consequence, level)]
+        if node.alternative is not None:
+            items.extend([' si_no ', (node.alternative, level, False)])
+        return items
+
+    def _function(self, node: Function, level: int) -> list[_Item]:
+        params = ', '.join(parameter.value for parameter in node.parameters)
+        return [f'funcion({params}) ', *self._optional(node.body, level)]
+
+    def _call(self, node: Call, level: int) -> list[_Item]:
+        return [*self._operand(node.function, level), _Arguments(node, level)]
+
+    def _array(self, node: ArrayLiteral, level: int) -> list[_Item]:
+        items: list[_Item] = ['[']
+        for index, element in enumerate(node.elements):
+            if index > 0:
+                items.append(', ')
+            items.append((element, level, False))
+        items.append(']')
+        return items
+
+    def _index(self, node: Index, level: int) -> list[_Item]:
+        return [*self._operand(node.left, level), '[',
+                *self._optional(node.index, level), ']']
+
+    def _map(self, node: MapLiteral, level: int) -> list[_Item]:
+        items: list[_Item] = ['{']
+        for index, (key, value) in enumerate(zip(node.keys, node.values)):
+            if index > 0:
+                items.append(', ')
+            items.extend([(key, level, False), ': ', (value, level, False)])
+        items.append('}')
+        return items
+
+    def _length(self, node: Length, level: int) -> list[_Item]:
+        return ['tamano(', *self._optional(node.argument, level), ')']
+
+    def _arguments(self, pending: _Arguments) -> list[_Item]:
+        arguments = pending.call.arguments or []
+        level = pending.level
+        items: list[_Item] = ['(']
+
+        widths = [self._widths[argument] for argument in arguments]
+        inline = 2 + sum(widths) + 2 * max(len(arguments) - 1, 0)
+
+        # Si solo la ultima funcion no cabe, la dejamos en la misma linea
+        # y que sea su bloque el que se parta
+        last_is_function = bool(arguments) and \
+            isinstance(arguments[-1], Function)
+        fits = self._column + inline <= self._width or \
+            (last_is_function and
+             self._column + inline - widths[-1] + 10 <= self._width)
+
+        if fits or not arguments:
+            for index, argument in enumerate(arguments):
+                if index > 0:
+                    items.append(', ')
+                items.append((argument, level, False))
+            items.append(')')
+            return items
+
+        # Un argumento por linea
+        for index, argument in enumerate(arguments):
+            items.extend([level + 1, (argument, level + 1, False)])
+            if index < len(arguments) - 1:
+                items.append(',')
+        items.extend([level, ')'])
+
+        return items
+
+    def _optional(self, node: object, level: int) -> list[_Item]:
+        if node is None:
+            return []
+        return [(node, level, False)]  # type: ignore
+
+    def _operand(self, node: object, level: int) -> list[_Item]:
+        if node is None:
+            return []
+        return [(node, level, isinstance(node, _OPERATORS))]  # type: ignore
+
+
+def _boolean_literal(node: Boolean) -> str:
+    return 'verdadero' if node.value else 'falso'
+
+
+def write_node(node: ASTNode,
+               stream: TextIO,
+               width: int = 80,
+               indent: int = 4) -> None:
+    Printer(width=width, indent=indent).write(node, stream)
+
+
+def to_source(node: ASTNode, width: int = 80, indent: int = 4) -> str:
+    buffer = StringIO()
+    write_node(node, buffer, width=width, indent=indent)
+
+    return buffer.getvalue()
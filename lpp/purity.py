@@ -0,0 +1,220 @@
+from typing import (
+    Callable,
+    Iterable,
+    Optional,
+    Protocol,
+    TypeVar,
+)
+
+from lpp.ast import (
+    ArrayLiteral,
+    Assignment,
+    Block,
+    Boolean,
+    Call,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    ReturnStatement,
+    StringLiteral,
+)
+from lpp.symbols import (
+    Symbol,
+    SymbolTable,
+)
+from lpp.tail_calls import mark_tail_calls
+from lpp.visitor import walk
+
+'''
+    Analisis de pureza para memorizar funciones.
+
+    Una funcion es pura si su resultado solo depende de sus argumentos:
+
+    - solo lee sus parametros, sus variables y funciones conocidas (las que
+      se asignan una sola vez con `variable f = funcion`)
+    - solo llama a funciones conocidas que tambien son puras, ella incluida
+    - no crea funciones: cada closure nueva es un valor distinto
+    - lo demas son enteros, booleanos, arreglos, listas y mapas (que no
+      cambian y se comparan por contenido), `tamano`, operadores, `si` y
+      `para`
+
+    Otras variables de afuera pueden tener otro valor en la siguiente
+    llamada (si se vuelven a definir), asi que leerlas hace impura a la
+    funcion. Empezamos suponiendo que todas las candidatas son puras y
+    quitamos las que usan una funcion que no lo es hasta que ya no cambia
+    nada; asi la recursion, tambien la mutua, no impide ser pura.
+
+    Solo se marcan para memorizar (Function.memoize) las puras que hacen
+    alguna llamada fuera de posicion de cola (ver lpp.tail_calls). Sin
+    llamadas, calcular cuesta lo mismo que buscar en el cache; con solo
+    llamadas de cola la recursion es un ciclo y no repite trabajo.
+
+    La marca de una funcion de una linea anterior del REPL supone que las
+    globales que usa no cambian. Si el programa actual vuelve a definir una
+    de esas globales (o una que usan las funciones que llama), un resultado
+    guardado antes de la nueva definicion ya no vale: stale_functions
+    encuentra esas funciones y los evaluadores les quitan la marca.
+'''
+
+
+_ALLOWED: frozenset[type] = frozenset((
+    Block, ExpressionStatement, ReturnStatement, LetStatement,
+    Identifier, Integer, Boolean, Prefix, Infix, If, Call, For, Assignment,
+    ArrayLiteral, MapLiteral, Index, Length, StringLiteral,
+))
+
+
+# Funciones asignadas una sola vez con `variable f = funcion` (y que ningun
+# `para` vuelve a asignar)
+def known_functions(table: SymbolTable) -> dict[Symbol, Function]:
+    functions: dict[Symbol, Function] = {}
+    for node in walk(table.program):
+        if isinstance(node, LetStatement) and \
+                isinstance(node.value, Function) and node.name is not None:
+            symbol = table.definition(node.name)
+            if symbol is not None and not symbol.assignments and \
+                    len(symbol.scope.definitions[symbol.name]) == 1:
+                functions[symbol] = node.value
+    return functions
+
+
+# Funciones conocidas que usa `function`, o None si hace algo impuro
+def _uses(function: Function,
+          table: SymbolTable,
+          functions: dict[Symbol, Function]) -> Optional[list[Symbol]]:
+    uses: list[Symbol] = []
+    if function.body is None:
+        return uses
+
+    for node in walk(function.body):
+        node_class = type(node)
+        if node_class not in _ALLOWED:
+            return None
+
+        if node_class is Call:
+            callee = node.function  # type: ignore
+            symbol = table.definition(callee) if type(callee) is Identifier else None
+            if symbol not in functions:
+                return None
+        elif node_class is Identifier:
+            symbol = table.definition(node)  # type: ignore
+            if symbol is None:
+                return None
+            if symbol.scope.owner.node is function:
+                continue
+            if symbol not in functions:
+                return None
+            uses.append(symbol)
+
+    return uses
+
+
+def find_pure_functions(table: SymbolTable) -> set[Function]:
+    functions = known_functions(table)
+
+    candidates: dict[Function, list[Symbol]] = {}
+    for node in walk(table.program):
+        if isinstance(node, Function):
+            uses = _uses(node, table, functions)
+            if uses is not None:
+                candidates[node] = uses
+
+    changed = True
+    while changed:
+        changed = False
+        for function, uses in list(candidates.items()):
+            if any(functions[symbol] not in candidates for symbol in uses):
+                del candidates[function]
+                changed = True
+
+    return set(candidates)
+
+
+# Marca Function.memoize en las funciones puras que conviene memorizar (y
+# lo quita de las demas). Regresa las marcadas
+def mark_memoizable(table: SymbolTable) -> list[Function]:
+    mark_tail_calls(table.program)
+    pure = find_pure_functions(table)
+
+    marked: list[Function] = []
+    for node in walk(table.program):
+        if not isinstance(node, Function):
+            continue
+
+        node.memoize = node in pure and node.body is not None and any(
+            type(child) is Call and not child.tail  # type: ignore
+            for child in walk(node.body))
+        if node.memoize:
+            marked.append(node)
+
+    return marked
+
+
+# Posiciones globales predefinidas (las primeras `predefined`) que el
+# programa vuelve a escribir con `variable` o en un `para`
+def redefined_globals(table: SymbolTable, predefined: int) -> set[int]:
+    slots: set[int] = set()
+    for node in walk(table.program):
+        if not isinstance(node, (LetStatement, Assignment)) or node.name is None:
+            continue
+        symbol = table.definition(node.name)
+        if symbol is not None and symbol.scope.owner.node is table.program and \
+                node.name.slot < predefined:
+            slots.add(node.name.slot)
+    return slots
+
+
+# Globales que lee el cuerpo de una funcion (las que no son de su frame ni
+# de una closure, ver lpp.resolver)
+def global_reads(function: Function) -> Iterable[int]:
+    if function.body is None:
+        return ()
+    return [node.slot for node in walk(function.body)
+            if type(node) is Identifier and node.depth > 0 and node.free < 0]  # type: ignore
+
+
+# Lo que tienen en comun los nodos Function y las funciones compiladas
+class Memoizable(Protocol):
+    memoize: bool
+
+
+MemoizableT = TypeVar('MemoizableT', bound=Memoizable)
+
+
+# Funciones de `functions` marcadas para memorizar que leen alguna posicion
+# de `redefined`, directo o a traves de las funciones guardadas en las
+# globales que leen. `reads` da las globales que lee una funcion y
+# `function_at` la funcion guardada en una global (o None)
+def stale_functions(functions: Iterable[MemoizableT],
+                    redefined: set[int],
+                    reads: Callable[[MemoizableT], Iterable[int]],
+                    function_at: Callable[[int], Optional[MemoizableT]]
+                    ) -> list[MemoizableT]:
+    stale: list[MemoizableT] = []
+    for function in functions:
+        if not function.memoize:
+            continue
+
+        seen: set[MemoizableT] = {function}
+        pending: list[MemoizableT] = [function]
+        while pending:
+            slots = set(reads(pending.pop()))
+            if slots & redefined:
+                stale.append(function)
+                break
+            for slot in slots:
+                other = function_at(slot)
+                if other is not None and other not in seen:
+                    seen.add(other)
+                    pending.append(other)
+
+    return stale
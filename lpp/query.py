@@ -0,0 +1,243 @@
+import ast as python_ast
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+import lpp.ast
+from lpp.ast import (
+    ASTNode,
+    Program,
+)
+from lpp.visitor import walk
+
+'''
+    Consultas sobre el AST para reglas de lint.
+
+    Un Pattern describe un tipo de nodo y restricciones sobre sus atributos:
+
+        Pattern(Call, function=Pattern(Identifier, value='suma'),
+                arguments=[ANY, ANY])
+        Pattern(If, alternative=None)
+
+    o lo mismo como texto con parse_query:
+
+        parse_query("Call(function=Identifier(value='suma'), arguments=[_, _])")
+
+    Cada Pattern se compila una sola vez a una funcion que solo hace
+    comparaciones, y un NodeIndex agrupa los nodos de un programa por clase
+    para que una consulta solo revise los candidatos del tipo que busca.
+
+    Restricciones posibles para un atributo:
+    - ANY: cualquier valor (incluso None)
+    - None: el atributo debe ser None
+    - un Pattern o una clase de nodo: el hijo debe coincidir
+    - una lista: una lista del mismo largo que coincida elemento a elemento
+    - una funcion: predicado que recibe el valor
+    - cualquier otro valor: igualdad
+'''
+
+
+Matcher = Callable[[Any], bool]
+
+
+class _Any:
+
+    def __repr__(self) -> str:
+        return 'ANY'
+
+
+ANY = _Any()
+
+
+class Pattern:
+
+    def __init__(self, node_type: type, **fields: Any) -> None:
+        self.node_type = node_type
+        self.fields = fields
+        self._matcher: Optional[Matcher] = None
+
+    def compile(self) -> Matcher:
+        if self._matcher is None:
+            self._matcher = _compile_pattern(self)
+        return self._matcher
+
+    def matches(self, node: Any) -> bool:
+        return self.compile()(node)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={value!r}'
+                           for name, value in self.fields.items())
+        return f'{self.node_type.__name__}({fields})'
+
+
+def _compile_pattern(pattern: Pattern) -> Matcher:
+    node_type = pattern.node_type
+    checks: list[tuple[str, Matcher]] = [
+        (name, _compile_constraint(constraint))
+        for name, constraint in pattern.fields.items()
+        if constraint is not ANY
+    ]
+
+    if not checks:
+        return lambda node: isinstance(node, node_type)
+
+    if len(checks) == 1:
+        (name, check), = checks
+
+        def match_one(node: Any) -> bool:
+            return isinstance(node, node_type) and \
+                check(getattr(node, name, None))
+
+        return match_one
+
+    def match_all(node: Any) -> bool:
+        if not isinstance(node, node_type):
+            return False
+        for name, check in checks:
+            if not check(getattr(node, name, None)):
+                return False
+        return True
+
+    return match_all
+
+
+def _compile_constraint(constraint: Any) -> Matcher:
+    if constraint is ANY:
+        return lambda value: True
+
+    if constraint is None:
+        return lambda value: value is None
+
+    if isinstance(constraint, Pattern):
+        return constraint.compile()
+
+    if isinstance(constraint, type):
+        return lambda value: isinstance(value, constraint)
+
+    if isinstance(constraint, (list, tuple)):
+        elements = [_compile_constraint(element) for element in constraint]
+        size = len(elements)
+
+        def match_list(value: Any) -> bool:
+            if value is None or len(value) != size:
+                return False
+            for check, element in zip(elements, value):
+                if not check(element):
+                    return False
+            return True
+
+        return match_list
+
+    if callable(constraint):
+        return constraint
+
+    return lambda value: value == constraint
+
+
+class NodeIndex:
+
+    def __init__(self, program: Program) -> None:
+        self.program = program
+        self._by_type: dict[type, list[ASTNode]] = {}
+        self._candidates: dict[type, list[list[ASTNode]]] = {}
+
+        by_type = self._by_type
+        for node in walk(program):
+            node_class = type(node)
+            if node_class in by_type:
+                by_type[node_class].append(node)
+            else:
+                by_type[node_class] = [node]
+
+    # Nodos de la clase (y sus subclases), agrupados por clase y cada grupo
+    # en preorden
+    def nodes(self, node_type: type) -> list[ASTNode]:
+        nodes: list[ASTNode] = []
+        for group in self._groups(node_type):
+            nodes.extend(group)
+        return nodes
+
+    def find(self, pattern: Pattern) -> list[ASTNode]:
+        matcher = pattern.compile()
+
+        found: list[ASTNode] = []
+        for group in self._groups(pattern.node_type):
+            found.extend(node for node in group if matcher(node))
+        return found
+
+    def count(self, pattern: Pattern) -> int:
+        matcher = pattern.compile()
+        return sum(1 for group in self._groups(pattern.node_type)
+                   for node in group if matcher(node))
+
+    def _groups(self, node_type: type) -> list[list[ASTNode]]:
+        try:
+            return self._candidates[node_type]
+        except KeyError:
+            groups = [group for node_class, group in self._by_type.items()
+                      if issubclass(node_class, node_type)]
+            self._candidates[node_type] = groups
+            return groups
+
+
+class QueryError(Exception):
+    pass
+
+
+# Los patrones de texto usan la sintaxis de llamadas de Python, asi que los
+# leemos con su propio parser: Clase(campo=valor, ...), listas, literales y
+# _ como comodin
+def parse_query(text: str) -> Pattern:
+    try:
+        expression = python_ast.parse(text, mode='eval').body
+    except SyntaxError as error:
+        raise QueryError(f'Consulta invalida: {error.msg}') from error
+
+    pattern = _parse_query_value(expression)
+    if not isinstance(pattern, Pattern):
+        raise QueryError('La consulta debe empezar con un tipo de nodo')
+
+    return pattern
+
+
+def _node_type(name: str) -> type:
+    node_type = getattr(lpp.ast, name, None)
+    if not isinstance(node_type, type) or not issubclass(node_type, ASTNode):
+        raise QueryError(f'Tipo de nodo desconocido: {name}')
+    return node_type
+
+
+def _parse_query_value(expression: python_ast.expr) -> Any:
+    if isinstance(expression, python_ast.Call):
+        if not isinstance(expression.func, python_ast.Name) or expression.args:
+            raise QueryError('Los patrones solo aceptan Tipo(campo=valor, ...)')
+
+        fields: dict[str, Any] = {}
+        for keyword in expression.keywords:
+            if keyword.arg is None:
+                raise QueryError('Los patrones no aceptan **argumentos')
+            fields[keyword.arg] = _parse_query_value(keyword.value)
+
+        return Pattern(_node_type(expression.func.id), **fields)
+
+    if isinstance(expression, python_ast.Name):
+        if expression.id == '_':
+            return ANY
+        return _node_type(expression.id)
+
+    if isinstance(expression, python_ast.Constant):
+        return expression.value
+
+    if isinstance(expression, python_ast.List):
+        return [_parse_query_value(element) for element in expression.elts]
+
+    if isinstance(expression, python_ast.UnaryOp) and \
+            isinstance(expression.op, python_ast.USub) and \
+            isinstance(expression.operand, python_ast.Constant) and \
+            isinstance(expression.operand.value, int):
+        return -expression.operand.value
+
+    raise QueryError(f'Valor no soportado en la consulta: '
+                     f'{python_ast.dump(expression)}')
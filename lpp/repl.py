@@ -1,6 +1,14 @@
-from lpp.ast import Program
+from sys import stdout
+
+from lpp.ast import (
+    LetStatement,
+    Program,
+)
+from lpp.evaluator import Evaluator
 from lpp.lexer import Lexer
+from lpp.object import Environment
 from lpp.parser import Parser
+from lpp.printer import write_node
 from lpp.token import (
     Token,
     TokenType,
@@ -13,7 +21,11 @@ def _print_parse_errors(errors: list[str]):
     for error in errors:
         print(error)
 
-def start_repl() -> None:
+# Con format_only solo se muestra cada programa formateado, sin evaluarlo
+def start_repl(format_only: bool = False) -> None:
+    # Las variables de una linea siguen existiendo en las siguientes
+    evaluator: Evaluator = Evaluator(Environment())
+
     # Se usa el operador morsa aqui
     while (source := input('>> ')) != 'salir()':
         lexer: Lexer = Lexer(source)
@@ -29,4 +41,13 @@ def start_repl() -> None:
             _print_parse_errors(parser.errors)
             continue
 
-        print(program)
+        if format_only:
+            # El formateador escribe directo en stdout, sin armar todo el string
+            write_node(program, stdout)
+            print()
+            continue
+
+        evaluated = evaluator.evaluate(program)
+        # `variable x = ...` no tiene un valor que mostrar
+        if program.statements and type(program.statements[-1]) is not LetStatement:
+            print(evaluated)
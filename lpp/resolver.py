@@ -0,0 +1,205 @@
+from typing import (
+    Iterable,
+    Union,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Function,
+    Identifier,
+    Program,
+)
+from lpp.symbols import (
+    build_symbol_table,
+    Scope,
+    ScopeKind,
+    Symbol,
+    SymbolTable,
+)
+from lpp.tail_calls import mark_tail_calls
+from lpp.visitor import NodeVisitor
+
+'''
+    Resolucion estatica de nombres a posiciones en frames.
+
+    Cada llamada a una funcion tendra un frame de tamaño fijo (un arreglo) y
+    el programa uno para las variables globales. Los bloques de `si` no
+    tienen frame propio: sus variables ocupan posiciones del frame de la
+    funcion que los contiene, distintas de las de afuera aunque tengan el
+    mismo nombre.
+
+    A cada Identifier (usos, nombres de `variable` y parametros) se le
+    asigna (depth, slot): depth es cuantas funciones hay que salir desde
+    donde esta el identificador hasta la que define la variable y slot es
+    su indice en el frame de esa funcion. Volver a definir un nombre en el
+    mismo scope reutiliza su posicion, igual que reescribir una llave de un
+    diccionario.
+
+    Las closures no guardan los frames de afuera completos. Cada Function
+    registra sus variables libres (las de funciones de afuera que usa ella o
+    alguna funcion dentro de ella; las globales no, porque el frame global
+    vive todo el programa). Esas variables se guardan en una celda dentro de
+    su frame y la closure captura solo las celdas que usa:
+
+    - depth == 0: frame[slot] (o frame[slot].value si boxed)
+    - free >= 0: closure.cells[free].value
+    - si no: la global globals[slot]
+
+    Los nombres que no se pueden resolver se reportan en `errors` antes de
+    ejecutar nada. Tambien se marcan las llamadas en posicion de cola (ver
+    lpp.tail_calls), que usan los backends que ejecutan el resultado.
+'''
+
+
+FrameOwner = Union[Program, Function]
+
+
+class Resolution:
+
+    def __init__(self, program: Program, table: SymbolTable) -> None:
+        self.program = program
+        self.table = table
+        self.errors: list[str] = []
+        self.unresolved: list[Identifier] = []
+        # Tamaño del frame del programa y de cada funcion
+        self.frame_sizes: dict[FrameOwner, int] = {}
+        # Nombre de cada posicion del frame global
+        self.globals: list[str] = []
+        self._slots: dict[Symbol, int] = {}
+
+    def slot(self, symbol: Symbol) -> int:
+        return self._slots[symbol]
+
+
+class _Annotator(NodeVisitor):
+
+    def __init__(self, resolution: Resolution, levels: dict[Scope, int]) -> None:
+        self._resolution = resolution
+        self._levels = levels
+        self._level = 0
+        # Funciones que contienen al nodo actual, de afuera hacia adentro
+        self._functions: list[Function] = []
+        # Variables libres de cada funcion, en orden, con su indice
+        self._free: dict[Function, dict[Symbol, int]] = {}
+        self._captures: dict[Function, list[tuple[int, int]]] = {}
+        # Simbolos capturados por alguna closure y los identificadores del
+        # frame propio que los leen o definen
+        self._boxed: set[Symbol] = set()
+        self._locals: list[tuple[Identifier, Symbol]] = []
+
+    def enter_Function(self, node: Function) -> None:
+        self._level += 1
+        self._functions.append(node)
+        self._free[node] = {}
+        self._captures[node] = []
+
+    def leave_Function(self, node: Function) -> None:
+        self._level -= 1
+        self._functions.pop()
+
+        free = self._free[node]
+        node.free_variables = tuple(symbol.name for symbol in free)
+        node.captures = tuple(self._captures[node])
+
+    def enter_Identifier(self, node: Identifier) -> None:
+        resolution = self._resolution
+        symbol = resolution.table.definition(node)
+        if symbol is None:
+            node.depth = node.slot = -1
+            resolution.unresolved.append(node)
+            resolution.errors.append(
+                f'Identificador no definido: {node.value} (posicion {node.start})')
+            return
+
+        node.depth = self._level - self._levels[symbol.scope]
+        node.slot = resolution.slot(symbol)
+
+        owner_level = self._level - node.depth
+        if node.depth == 0:
+            self._locals.append((node, symbol))
+        elif owner_level > 0:
+            node.free = self._capture(symbol, owner_level)
+
+    # Registra la variable como libre en todas las funciones entre la que la
+    # define y la actual; regresa su indice en la actual
+    def _capture(self, symbol: Symbol, owner_level: int) -> int:
+        self._boxed.add(symbol)
+
+        index = -1
+        for position in range(owner_level, self._level):
+            function = self._functions[position]
+            free = self._free[function]
+            if symbol in free:
+                index = free[symbol]
+                continue
+
+            if position == owner_level:
+                capture = (0, self._resolution.slot(symbol))
+            else:
+                capture = (1, index)
+            index = free[symbol] = len(free)
+            self._captures[function].append(capture)
+
+        return index
+
+    def finish(self) -> None:
+        # Por posicion y no por simbolo: una redefinicion usa la misma celda
+        cells: dict[ASTNode, set[int]] = {}
+        for symbol in self._boxed:
+            cells.setdefault(symbol.scope.owner.node, set()).add(
+                self._resolution.slot(symbol))
+
+        for identifier, symbol in self._locals:
+            slots = cells.get(symbol.scope.owner.node)
+            if slots is not None and identifier.slot in slots:
+                identifier.boxed = True
+
+        for owner, slots in cells.items():
+            owner.cells = tuple(sorted(slots))  # type: ignore
+
+
+# Asigna las posiciones de los frames y anota cada identificador del
+# programa. `predefined` son nombres que ya existen en el frame global
+# (funciones nativas, variables de lineas anteriores del REPL) y ocupan sus
+# primeras posiciones, en orden
+def resolve(program: Program, predefined: Iterable[str] = ()) -> Resolution:
+    table = build_symbol_table(program, predefined)
+    resolution = Resolution(program, table)
+
+    # Nivel de anidamiento de funciones de cada scope
+    levels: dict[Scope, int] = {}
+    sizes: dict[Scope, int] = {}
+
+    stack: list[Scope] = [table.global_scope]
+    while stack:
+        scope = stack.pop()
+        owner = scope.owner
+        if scope.parent is None:
+            levels[scope] = 0
+        else:
+            levels[scope] = levels[scope.parent] + \
+                (1 if scope.kind == ScopeKind.FUNCTION else 0)
+
+        size = sizes.get(owner, 0)
+        for name, definitions in scope.definitions.items():
+            for symbol in definitions:
+                resolution._slots[symbol] = size
+            if owner is table.global_scope:
+                resolution.globals.append(name)
+            size += 1
+        sizes[owner] = size
+
+        # Los hijos en orden, para que las posiciones sigan al codigo
+        stack.extend(reversed(scope.children))
+
+    for scope, size in sizes.items():
+        node: ASTNode = scope.node
+        node.frame_size = size  # type: ignore
+        resolution.frame_sizes[node] = size  # type: ignore
+
+    annotator = _Annotator(resolution, levels)
+    annotator.traverse(program)
+    annotator.finish()
+    mark_tail_calls(program)
+
+    return resolution
@@ -0,0 +1,877 @@
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+from lpp.arrays import (
+    array_infix,
+    array_negate,
+)
+from lpp.ast import (
+    ArrayLiteral,
+    ASTNode,
+    Block,
+    Boolean,
+    Call,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    Program,
+    ReturnStatement,
+    Statement,
+    StringLiteral,
+)
+from lpp.containers import (
+    index,
+    length,
+    literal_list,
+    make_list,
+    make_map,
+)
+from lpp.evaluator import EvaluationError
+from lpp.object import (
+    Array,
+    Cell,
+    Closure,
+    Environment,
+    Error,
+    FALSE,
+    make_closure,
+    NULL,
+    Return,
+    String,
+    TRUE,
+    type_name,
+)
+from lpp.resolver import resolve
+from lpp.stackless import call_without_stack
+from lpp.strings import (
+    concat,
+    intern,
+)
+from lpp.visitor import walk
+
+'''
+    Evaluador con nodos que se especializan solos.
+
+    Antes de ejecutar, cada nodo del AST se convierte en un _Node cuyo
+    execute(frame, closure) es una closure de Python. Los padres siempre
+    llaman a `hijo.execute`, asi que un nodo puede cambiar su propio execute
+    mientras el programa corre:
+
+    - Identifier empieza sin inicializar. La primera vez ve si es local, de
+      celda, libre o global y se queda con la version que solo lee eso.
+    - Infix y Prefix ven sus operandos la primera vez. Con dos enteros (o
+      dos booleanos en `==` y `!=`) se quedan con una version sin cadena de
+      operadores que solo verifica que los tipos sigan siendo esos; si el
+      lado derecho es un entero literal ni siquiera lo evaluan.
+    - Call recuerda la funcion a la que llamo (cache monomorfico) y arma su
+      frame sin revisar parametros ni celdas. En posicion de cola regresa
+      ese frame y el cuerpo, y el trampolin de quien llamo solo los ejecuta.
+
+    Si un supuesto falla (un Infix de enteros recibe un booleano, el Call
+    recibe otra funcion) el nodo se desoptimiza: vuelve para siempre a la
+    version generica y calcula el resultado con los valores que ya evaluo,
+    sin evaluar nada dos veces.
+
+    Como en lpp.evaluator, pasando de _STACK_CALLS llamadas anidadas la
+    llamada sigue en lpp.stackless, asi que una recursion que no es de cola
+    llega a max_depth llamadas.
+
+    Los resultados, los errores y las llamadas de cola son los de
+    lpp.evaluator. No memoriza funciones puras.
+'''
+
+
+Frame = list[Any]
+Execute = Callable[[Frame, Optional[Closure]], Any]
+
+# Llamadas anidadas que usan la pila de Python, unos 3 frames cada una
+_STACK_CALLS = 50
+
+
+class _Node:
+    __slots__ = ('execute',)
+
+    def __init__(self, execute: Optional[Execute] = None) -> None:
+        self.execute: Execute = execute  # type: ignore
+
+
+# Llamada pendiente que regresa una llamada en posicion de cola. Si la
+# llamada ya esta especializada trae el cuerpo y arguments ya es el frame
+class _TailCall:
+    __slots__ = ('function', 'arguments', 'body')
+
+    def __init__(self, function: Any, arguments: list[Any], body: Optional[_Node]) -> None:
+        self.function = function
+        self.arguments = arguments
+        self.body = body
+
+
+class _Returned(Exception):
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+def _fail(message: str) -> Any:
+    raise EvaluationError(message)
+
+
+def _constant(value: Any) -> _Node:
+    return _Node(lambda frame, closure: value)
+
+
+def _prefix(operator: str, value: Any) -> Any:
+    if operator == '!':
+        return TRUE if value is FALSE or value is NULL else FALSE
+    if operator == '-' and type(value) is int:
+        return -value
+    if operator == '-' and type(value) is Array:
+        return array_negate(value)
+    return _fail(f'Operador desconocido: {operator}{type_name(value)}')
+
+
+def _infix(operator: str, a: Any, b: Any) -> Any:
+    if type(a) is int and type(b) is int:
+        if operator == '+':
+            return a + b
+        if operator == '-':
+            return a - b
+        if operator == '*':
+            return a * b
+        if operator == '<':
+            return TRUE if a < b else FALSE
+        if operator == '>':
+            return TRUE if a > b else FALSE
+        if operator == '==':
+            return TRUE if a == b else FALSE
+        if operator == '!=':
+            return TRUE if a != b else FALSE
+        if operator == '/':
+            if b == 0:
+                return _fail('Division entre cero')
+            return a // b
+    elif type(a) is Array or type(b) is Array:
+        return array_infix(operator, a, b)
+    elif type(a) is String and type(b) is String and operator == '+':
+        return concat(a, b)
+    elif operator == '==':
+        return TRUE if a == b else FALSE
+    elif operator == '!=':
+        return FALSE if a == b else TRUE
+    elif type(a) is not type(b):
+        return _fail(f'Discrepancia de tipos: {type_name(a)} {operator} {type_name(b)}')
+
+    return _fail(f'Operador desconocido: {type_name(a)} {operator} {type_name(b)}')
+
+
+# Versiones de un Infix para dos enteros. deoptimize(a, b) se llama con
+# los valores ya evaluados cuando alguno no es entero
+def _integer_infix(operator: str,
+                   left: _Node,
+                   right: _Node,
+                   deoptimize: Callable[[Any, Any], Any]) -> Execute:
+    if operator == '+':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int:
+                return a + b
+            return deoptimize(a, b)
+    elif operator == '-':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int:
+                return a - b
+            return deoptimize(a, b)
+    elif operator == '*':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int:
+                return a * b
+            return deoptimize(a, b)
+    elif operator == '<':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int:
+                return TRUE if a < b else FALSE
+            return deoptimize(a, b)
+    elif operator == '>':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int:
+                return TRUE if a > b else FALSE
+            return deoptimize(a, b)
+    elif operator == '==':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int:
+                return TRUE if a == b else FALSE
+            return deoptimize(a, b)
+    elif operator == '!=':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int:
+                return TRUE if a != b else FALSE
+            return deoptimize(a, b)
+    else:
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if type(a) is int and type(b) is int and b != 0:
+                return a // b
+            # Entre cero es un error, no un cambio de tipos
+            return _infix(operator, a, b) if type(a) is int and type(b) is int \
+                else deoptimize(a, b)
+
+    return execute
+
+
+# Lo mismo cuando el lado derecho es un entero literal (`n - 1`, `n < 2`)
+def _integer_constant_infix(operator: str,
+                            left: _Node,
+                            b: int,
+                            deoptimize: Callable[[Any, Any], Any]) -> Execute:
+    if operator == '+':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return a + b
+            return deoptimize(a, b)
+    elif operator == '-':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return a - b
+            return deoptimize(a, b)
+    elif operator == '*':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return a * b
+            return deoptimize(a, b)
+    elif operator == '<':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return TRUE if a < b else FALSE
+            return deoptimize(a, b)
+    elif operator == '>':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return TRUE if a > b else FALSE
+            return deoptimize(a, b)
+    elif operator == '==':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return TRUE if a == b else FALSE
+            return deoptimize(a, b)
+    elif operator == '!=':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return TRUE if a != b else FALSE
+            return deoptimize(a, b)
+    else:
+        # Solo se usa con b != 0
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            if type(a) is int:
+                return a // b
+            return deoptimize(a, b)
+
+    return execute
+
+
+def _boolean_infix(operator: str,
+                   left: _Node,
+                   right: _Node,
+                   deoptimize: Callable[[Any, Any], Any]) -> Execute:
+    if operator == '==':
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if (a is TRUE or a is FALSE) and (b is TRUE or b is FALSE):
+                return TRUE if a is b else FALSE
+            return deoptimize(a, b)
+    else:
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            if (a is TRUE or a is FALSE) and (b is TRUE or b is FALSE):
+                return FALSE if a is b else TRUE
+            return deoptimize(a, b)
+
+    return execute
+
+
+def _string_concat(left: _Node,
+                   right: _Node,
+                   deoptimize: Callable[[Any, Any], Any]) -> Execute:
+    def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+        a = left.execute(frame, closure)
+        b = right.execute(frame, closure)
+        if type(a) is String and type(b) is String:
+            return concat(a, b)
+        return deoptimize(a, b)
+
+    return execute
+
+
+# Evalua los argumentos de una llamada en una lista nueva
+def _arguments(arguments: list[_Node]) -> Callable[[Frame, Optional[Closure]], list[Any]]:
+    if not arguments:
+        return lambda frame, closure: []
+    if len(arguments) == 1:
+        first = arguments[0]
+        return lambda frame, closure: [first.execute(frame, closure)]
+    if len(arguments) == 2:
+        first, second = arguments
+        return lambda frame, closure: [first.execute(frame, closure),
+                                       second.execute(frame, closure)]
+    return lambda frame, closure: [argument.execute(frame, closure)
+                                   for argument in arguments]
+
+
+class SpecializingEvaluator:
+
+    def __init__(self,
+                 environment: Optional[Environment] = None,
+                 max_depth: int = 100_000) -> None:
+        self.environment = environment if environment is not None else Environment()
+        self.max_depth = max_depth
+        self._globals = self.environment.values
+        # Llamadas activas en la pila de Python
+        self._depth = 0
+        # Cuerpo ya construido de cada funcion
+        self._bodies: dict[Function, _Node] = {}
+        # Cuantos nodos se especializaron y cuantos volvieron a la version
+        # generica en el ultimo evaluate
+        self.specializations = 0
+        self.deoptimizations = 0
+        self._builders: dict[type, Callable[[Any], _Node]] = {
+            Identifier: self._identifier,
+            Integer: self._integer,
+            Boolean: self._boolean,
+            Prefix: self._prefix,
+            Infix: self._infix,
+            If: self._if_expression,
+            Function: self._function,
+            Call: self._call,
+            LetStatement: self._let,
+            ReturnStatement: self._return,
+            ExpressionStatement: self._expression_statement,
+            For: self._for,
+            Block: self._block_node,
+            ArrayLiteral: self._array,
+            Index: self._index,
+            MapLiteral: self._map,
+            Length: self._length,
+            StringLiteral: self._string,
+        }
+
+    def evaluate(self, program: Program) -> Any:
+        environment = self.environment
+        resolution = resolve(program, environment.names)
+
+        environment.names = resolution.globals
+        missing = len(resolution.globals) - len(self._globals)
+        if missing > 0:
+            self._globals.extend([None] * missing)
+
+        # Resolver de nuevo un programa puede cambiar las posiciones
+        self._bodies = {}
+        self.specializations = 0
+        self.deoptimizations = 0
+        self._depth = 0
+
+        try:
+            try:
+                result = self._block(program.statements).execute(self._globals, None)
+            except _Returned as returned:
+                result = returned.value
+        except EvaluationError as error:
+            return Error(error.message)
+        except RecursionError:
+            return Error('Limite de recursion excedido')
+
+        if type(result) is Return:
+            return result.value
+        return result
+
+    def _build(self, node: ASTNode) -> _Node:
+        return self._builders[type(node)](node)
+
+    def _block(self, statements: list[Statement]) -> _Node:
+        nodes = [self._build(statement) for statement in statements]
+        if not nodes:
+            return _constant(NULL)
+        if len(nodes) == 1:
+            return nodes[0]
+
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            result: Any = NULL
+            for node in nodes:
+                result = node.execute(frame, closure)
+                if type(result) is Return:
+                    return result
+            return result
+
+        return _Node(execute)
+
+    def _block_node(self, node: Block) -> _Node:
+        return self._block(node.statements)
+
+    def _body(self, function: Function) -> _Node:
+        body = self._bodies.get(function)
+        if body is None:
+            statements = function.body.statements if function.body is not None else []
+            body = self._bodies[function] = self._block(statements)
+        return body
+
+    def _let(self, node: LetStatement) -> _Node:
+        assert node.name is not None and node.value is not None
+        value = self._build(node.value)
+        slot = node.name.slot
+
+        if node.name.boxed:
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                frame[slot].value = value.execute(frame, closure)
+                return NULL
+        else:
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                frame[slot] = value.execute(frame, closure)
+                return NULL
+
+        return _Node(execute)
+
+    def _for(self, node: For) -> _Node:
+        assert node.condition is not None
+        variables = [self._build(variable) for variable in node.variables]
+        condition = self._build(node.condition)
+        body = self._block(node.body.statements if node.body is not None else [])
+        updates = [self._build(update.value) for update in node.updates]  # type: ignore
+        targets = [update.name for update in node.updates]
+        slots = [target.slot for target in targets]  # type: ignore
+        boxed = any(target.boxed for target in targets)  # type: ignore
+
+        def assign(frame: Frame, values: list[Any]) -> None:
+            for target, value in zip(targets, values):
+                if target.boxed:  # type: ignore
+                    frame[target.slot].value = value  # type: ignore
+                else:
+                    frame[target.slot] = value  # type: ignore
+
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            for variable in variables:
+                variable.execute(frame, closure)
+
+            while True:
+                value = condition.execute(frame, closure)
+                if value is FALSE or value is NULL:
+                    return NULL
+
+                result = body.execute(frame, closure)
+                if type(result) is Return:
+                    return result
+
+                # Todos los valores nuevos antes de cambiar alguno
+                values = [update.execute(frame, closure) for update in updates]
+                if boxed:
+                    assign(frame, values)
+                else:
+                    for slot, value in zip(slots, values):
+                        frame[slot] = value
+
+        return _Node(execute)
+
+    def _return(self, node: ReturnStatement) -> _Node:
+        value = self._build(node.return_value) if node.return_value is not None \
+            else _constant(NULL)
+        return _Node(lambda frame, closure: Return(value.execute(frame, closure)))
+
+    def _expression_statement(self, node: ExpressionStatement) -> _Node:
+        if node.expression is None:
+            return _constant(NULL)
+        # Aqui el Return de un `si` llega al bloque
+        if type(node.expression) is If:
+            return self._if(node.expression)
+        return self._build(node.expression)
+
+    def _integer(self, node: Integer) -> _Node:
+        return _constant(node.value)
+
+    def _boolean(self, node: Boolean) -> _Node:
+        return _constant(TRUE if node.value else FALSE)
+
+    def _string(self, node: StringLiteral) -> _Node:
+        return _constant(intern(node.value))  # type: ignore
+
+    def _identifier(self, node: Identifier) -> _Node:
+        result = _Node()
+
+        def uninitialized(frame: Frame, closure: Optional[Closure]) -> Any:
+            result.execute = self._reader(node)
+            self.specializations += 1
+            return result.execute(frame, closure)
+
+        result.execute = uninitialized
+        return result
+
+    # La version de un Identifier que solo lee de donde esta su variable
+    def _reader(self, node: Identifier) -> Execute:
+        slot = node.slot
+        message = f'Identificador no encontrado: {node.value}'
+
+        if node.depth == 0 and node.boxed:
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                value = frame[slot].value
+                if value is None:
+                    return _fail(message)
+                return value
+        elif node.depth == 0:
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                value = frame[slot]
+                if value is None:
+                    return _fail(message)
+                return value
+        elif node.depth > 0 and node.free >= 0:
+            free = node.free
+
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                value = closure.cells[free].value  # type: ignore
+                if value is None:
+                    return _fail(message)
+                return value
+        elif node.depth > 0:
+            globals_ = self._globals
+
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                value = globals_[slot]
+                if value is None:
+                    return _fail(message)
+                return value
+        else:
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                return _fail(message)
+
+        return execute
+
+    def _prefix(self, node: Prefix) -> _Node:
+        assert node.right is not None
+        right = self._build(node.right)
+        operator = node.operator
+        result = _Node()
+
+        def generic(frame: Frame, closure: Optional[Closure]) -> Any:
+            return _prefix(operator, right.execute(frame, closure))
+
+        def deoptimize(value: Any) -> Any:
+            result.execute = generic
+            self.deoptimizations += 1
+            return _prefix(operator, value)
+
+        def integer(frame: Frame, closure: Optional[Closure]) -> Any:
+            value = right.execute(frame, closure)
+            if type(value) is int:
+                return -value
+            return deoptimize(value)
+
+        def boolean(frame: Frame, closure: Optional[Closure]) -> Any:
+            value = right.execute(frame, closure)
+            if value is TRUE:
+                return FALSE
+            if value is FALSE:
+                return TRUE
+            return deoptimize(value)
+
+        def uninitialized(frame: Frame, closure: Optional[Closure]) -> Any:
+            value = right.execute(frame, closure)
+            if operator == '-' and type(value) is int:
+                result.execute = integer
+            elif operator == '!' and (value is TRUE or value is FALSE):
+                result.execute = boolean
+            else:
+                result.execute = generic
+            self.specializations += 1
+            return _prefix(operator, value)
+
+        result.execute = uninitialized
+        return result
+
+    def _infix(self, node: Infix) -> _Node:
+        assert node.right is not None
+        left = self._build(node.left)
+        right = self._build(node.right)
+        operator = node.operator
+        constant = node.right.value if type(node.right) is Integer else None
+        result = _Node()
+
+        def generic(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+            return _infix(operator, a, b)
+
+        def deoptimize(a: Any, b: Any) -> Any:
+            result.execute = generic
+            self.deoptimizations += 1
+            return _infix(operator, a, b)
+
+        def uninitialized(frame: Frame, closure: Optional[Closure]) -> Any:
+            a = left.execute(frame, closure)
+            b = right.execute(frame, closure)
+
+            if type(a) is int and type(b) is int:
+                if constant is not None and (operator != '/' or constant != 0):
+                    result.execute = _integer_constant_infix(
+                        operator, left, constant, deoptimize)
+                else:
+                    result.execute = _integer_infix(operator, left, right, deoptimize)
+            elif operator in ('==', '!=') and \
+                    (a is TRUE or a is FALSE) and (b is TRUE or b is FALSE):
+                result.execute = _boolean_infix(operator, left, right, deoptimize)
+            elif operator == '+' and type(a) is String and type(b) is String:
+                result.execute = _string_concat(left, right, deoptimize)
+            else:
+                result.execute = generic
+            self.specializations += 1
+            return _infix(operator, a, b)
+
+        result.execute = uninitialized
+        return result
+
+    # Un literal de puros enteros y booleanos es una constante
+    def _array(self, node: ArrayLiteral) -> _Node:
+        constant = literal_list(node)
+        if constant is not None:
+            return _constant(constant)
+
+        elements = _arguments([self._build(element) for element in node.elements])
+        return _Node(lambda frame, closure: make_list(elements(frame, closure)))
+
+    def _map(self, node: MapLiteral) -> _Node:
+        items = _arguments([self._build(entry) for entry in node.entries])
+        return _Node(lambda frame, closure: make_map(items(frame, closure)))
+
+    def _length(self, node: Length) -> _Node:
+        assert node.argument is not None
+        argument = self._build(node.argument)
+        return _Node(lambda frame, closure: length(argument.execute(frame, closure)))
+
+    def _index(self, node: Index) -> _Node:
+        assert node.index is not None
+        left = self._build(node.left)
+        position = self._build(node.index)
+        return _Node(lambda frame, closure: index(left.execute(frame, closure),
+                                                  position.execute(frame, closure)))
+
+    def _if(self, node: If) -> _Node:
+        assert node.condition is not None and node.consequence is not None
+        condition = self._build(node.condition)
+        consequence = self._block(node.consequence.statements)
+
+        if node.alternative is None:
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                value = condition.execute(frame, closure)
+                # Solo falso y nulo son falsos
+                if value is not FALSE and value is not NULL:
+                    return consequence.execute(frame, closure)
+                return NULL
+        else:
+            alternative = self._block(node.alternative.statements)
+
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                value = condition.execute(frame, closure)
+                if value is not FALSE and value is not NULL:
+                    return consequence.execute(frame, closure)
+                return alternative.execute(frame, closure)
+
+        return _Node(execute)
+
+    # Un `si` dentro de otra expresion: si una rama hace `retorna` no hay un
+    # bloque que lo revise, asi que se vuelve una excepcion
+    def _if_expression(self, node: If) -> _Node:
+        branch = self._if(node)
+        if not any(type(child) is ReturnStatement for child in walk(node)):
+            return branch
+
+        def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+            result = branch.execute(frame, closure)
+            if type(result) is Return:
+                raise _Returned(result.value)
+            return result
+
+        return _Node(execute)
+
+    def _function(self, node: Function) -> _Node:
+        return _Node(lambda frame, closure: make_closure(node, frame, closure))
+
+    def _call(self, node: Call) -> _Node:
+        assert node.function is not None
+        callee = self._build(node.function)
+        arguments = [self._build(argument) for argument in node.arguments or ()]
+        evaluate_arguments = _arguments(arguments)
+        tail = node.tail
+        result = _Node()
+
+        if tail:
+            def generic(frame: Frame, closure: Optional[Closure]) -> Any:
+                function = callee.execute(frame, closure)
+                return _TailCall(function, evaluate_arguments(frame, closure), None)
+        else:
+            def generic(frame: Frame, closure: Optional[Closure]) -> Any:
+                function = callee.execute(frame, closure)
+                return self._apply(function, evaluate_arguments(frame, closure))
+
+        def uninitialized(frame: Frame, closure: Optional[Closure]) -> Any:
+            function = callee.execute(frame, closure)
+            values = evaluate_arguments(frame, closure)
+
+            result.execute = generic
+            if type(function) is Closure:
+                definition = function.function
+                # Solo si los argumentos pueden ser el principio del frame
+                if not definition.cells and \
+                        len(definition.parameters) == len(arguments) and \
+                        all(parameter.slot == position
+                            for position, parameter in enumerate(definition.parameters)):
+                    result.execute = self._monomorphic(
+                        result, callee, evaluate_arguments, definition, generic, tail)
+            self.specializations += 1
+
+            if tail:
+                return _TailCall(function, values, None)
+            return self._apply(function, values)
+
+        result.execute = uninitialized
+        return result
+
+    def _monomorphic(self,
+                     result: _Node,
+                     callee: _Node,
+                     evaluate_arguments: Callable[[Frame, Optional[Closure]], list[Any]],
+                     definition: Function,
+                     generic: Execute,
+                     tail: bool) -> Execute:
+        body = self._body(definition)
+        padding = [None] * (definition.frame_size - len(definition.parameters))
+
+        def deoptimize(frame: Frame, closure: Optional[Closure], function: Any) -> Any:
+            result.execute = generic
+            self.deoptimizations += 1
+            if tail:
+                return _TailCall(function, evaluate_arguments(frame, closure), None)
+            return self._apply(function, evaluate_arguments(frame, closure))
+
+        if tail:
+            # La funcion que llamo ejecuta el cuerpo con este frame
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                function = callee.execute(frame, closure)
+                if type(function) is not Closure or function.function is not definition:
+                    return deoptimize(frame, closure, function)
+
+                call_frame = evaluate_arguments(frame, closure)
+                if padding:
+                    call_frame += padding
+                return _TailCall(function, call_frame, body)
+        else:
+            def execute(frame: Frame, closure: Optional[Closure]) -> Any:
+                function = callee.execute(frame, closure)
+                if type(function) is not Closure or function.function is not definition:
+                    return deoptimize(frame, closure, function)
+
+                call_frame = evaluate_arguments(frame, closure)
+                if padding:
+                    call_frame += padding
+                if self._depth >= _STACK_CALLS or self._depth >= self.max_depth:
+                    return self._without_stack(function, call_frame)
+
+                self._depth += 1
+                try:
+                    value = body.execute(call_frame, function)
+                except _Returned as returned:
+                    value = returned.value
+                finally:
+                    self._depth -= 1
+                if type(value) is Return:
+                    value = value.value
+                if type(value) is _TailCall:
+                    return self._run(value)
+                return value
+
+        return execute
+
+    def _apply(self, function: Any, arguments: list[Any]) -> Any:
+        return self._run(_TailCall(function, arguments, None))
+
+    # Ejecuta una llamada pendiente y las llamadas de cola que regrese, una
+    # tras otra, sin crecer la pila de Python
+    def _run(self, pending: _TailCall) -> Any:
+        while True:
+            function = pending.function
+            if pending.body is not None:
+                body = pending.body
+                call_frame = pending.arguments
+            else:
+                if type(function) is not Closure:
+                    return _fail(f'No es una funcion: {type_name(function)}')
+
+                definition = function.function
+                parameters = definition.parameters
+                arguments = pending.arguments
+                if len(arguments) != len(parameters):
+                    return _fail(f'Numero de argumentos incorrecto: se esperaban '
+                                 f'{len(parameters)} y se recibieron {len(arguments)}')
+
+                call_frame = [None] * definition.frame_size
+                for slot in definition.cells:
+                    call_frame[slot] = Cell()
+                for parameter, argument in zip(parameters, arguments):
+                    if parameter.boxed:
+                        call_frame[parameter.slot].value = argument
+                    else:
+                        call_frame[parameter.slot] = argument
+                body = self._body(definition)
+
+            if self._depth >= _STACK_CALLS or self._depth >= self.max_depth:
+                return self._without_stack(function, call_frame)
+            self._depth += 1
+            try:
+                result = body.execute(call_frame, function)
+            except _Returned as returned:
+                result = returned.value
+            finally:
+                self._depth -= 1
+            if type(result) is Return:
+                result = result.value
+
+            if type(result) is not _TailCall:
+                return result
+            pending = result
+
+    def _without_stack(self, function: Closure, frame: Frame) -> Any:
+        return call_without_stack(function, frame, self._globals,
+                                  self.max_depth - self._depth)
+
+
+def evaluate(program: Program, environment: Optional[Environment] = None) -> Any:
+    return SpecializingEvaluator(environment).evaluate(program)
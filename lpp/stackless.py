@@ -0,0 +1,513 @@
+import sys
+from typing import (
+    Any,
+    Optional,
+)
+
+from lpp.arrays import (
+    array_infix,
+    array_negate,
+)
+from lpp.ast import (
+    ArrayLiteral,
+    Boolean,
+    Call,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    Program,
+    ReturnStatement,
+    Statement,
+    StringLiteral,
+)
+from lpp.containers import (
+    index,
+    length,
+    make_list,
+    make_map,
+)
+from lpp.object import (
+    Array,
+    Cell,
+    Closure,
+    Environment,
+    Error,
+    EvaluationError,
+    FALSE,
+    make_closure,
+    NULL,
+    String,
+    TRUE,
+    type_name,
+)
+from lpp.resolver import resolve
+from lpp.strings import (
+    concat,
+    intern,
+)
+
+'''
+    Evaluador que no usa la pila de Python.
+
+    lpp.evaluator usa la pila de Python para cada nodo y cada llamada, asi
+    que una recursion profunda que no es de cola termina en RecursionError
+    mucho antes de acabarse la memoria. Aqui todo lo pendiente vive en
+    listas de un Execution:
+
+    - tasks: lo que falta por hacer, como (codigo, nodo). _EVAL evalua un
+      nodo, casi siempre agregando mas tareas; los demas codigos continuan
+      cuando sus operandos ya estan en values
+    - values: los resultados intermedios
+    - calls: por cada llamada activa, donde empiezan sus tareas y sus
+      valores y el frame y la closure de quien llamo
+
+    Un `retorna` corta tasks y values hasta el inicio de su llamada, asi
+    que funciona igual dentro de cualquier expresion. Una llamada de cola
+    (Call.tail) toma el lugar de la llamada actual en calls. Cada vuelta de
+    un `para` agrega las mismas tareas (condicion, _TEST, cuerpo, valores
+    nuevos, _ASSIGN) y no crea frames.
+
+    La profundidad solo la limita memory_budget, el numero de entradas que
+    pueden tener tasks, values y calls juntas, y call_limit si se da.
+    Execution.max_depth dice cuantas llamadas llegaron a estar activas a la
+    vez.
+
+    Como todo el estado esta en el Execution, el programa se puede correr
+    por pasos: start() lo prepara, step(n) avanza n tareas y resume() sigue
+    hasta el final. call_without_stack empieza dentro de una llamada en
+    lugar de un programa; asi siguen lpp.evaluator y lpp.specializing las
+    llamadas que ya no caben en la pila de Python.
+
+    Da los mismos resultados y los mismos errores que lpp.evaluator. No
+    memoriza funciones puras.
+'''
+
+
+_EVAL = 0
+_POP = 1
+_LET = 2
+_PREFIX = 3
+_INFIX = 4
+_BRANCH = 5
+_CALL = 6
+_EXIT = 7
+_RETURN = 8
+_TEST = 9
+_ASSIGN = 10
+_ARRAY = 11
+_INDEX = 12
+_MAP = 13
+_LENGTH = 14
+
+
+def _fail(message: str) -> Any:
+    raise EvaluationError(message)
+
+
+def _prefix(operator: str, value: Any) -> Any:
+    if operator == '!':
+        return TRUE if value is FALSE or value is NULL else FALSE
+    if operator == '-' and type(value) is int:
+        return -value
+    if operator == '-' and type(value) is Array:
+        return array_negate(value)
+    return _fail(f'Operador desconocido: {operator}{type_name(value)}')
+
+
+def _infix(operator: str, a: Any, b: Any) -> Any:
+    if type(a) is int and type(b) is int:
+        if operator == '+':
+            return a + b
+        if operator == '-':
+            return a - b
+        if operator == '*':
+            return a * b
+        if operator == '<':
+            return TRUE if a < b else FALSE
+        if operator == '>':
+            return TRUE if a > b else FALSE
+        if operator == '==':
+            return TRUE if a == b else FALSE
+        if operator == '!=':
+            return TRUE if a != b else FALSE
+        if operator == '/':
+            if b == 0:
+                return _fail('Division entre cero')
+            return a // b
+    elif type(a) is Array or type(b) is Array:
+        return array_infix(operator, a, b)
+    elif type(a) is String and type(b) is String and operator == '+':
+        return concat(a, b)
+    elif operator == '==':
+        return TRUE if a == b else FALSE
+    elif operator == '!=':
+        return FALSE if a == b else TRUE
+    elif type(a) is not type(b):
+        return _fail(f'Discrepancia de tipos: {type_name(a)} {operator} {type_name(b)}')
+
+    return _fail(f'Operador desconocido: {type_name(a)} {operator} {type_name(b)}')
+
+
+# Agrega las tareas de un bloque: cada statement deja un valor y todos
+# menos el ultimo se sacan. Un bloque vacio vale nulo
+def _push_block(tasks: list[tuple[int, Any]],
+                values: list[Any],
+                statements: list[Statement]) -> None:
+    if not statements:
+        values.append(NULL)
+        return
+
+    tasks.append((_EVAL, statements[-1]))
+    for statement in reversed(statements[:-1]):
+        tasks.append((_POP, None))
+        tasks.append((_EVAL, statement))
+
+
+class Execution:
+
+    def __init__(self,
+                 program: Optional[Program],
+                 globals_: list[Any],
+                 memory_budget: int,
+                 call_limit: int = sys.maxsize) -> None:
+        self.memory_budget = memory_budget
+        self.call_limit = call_limit
+        self._globals = globals_
+        self._tasks: list[tuple[int, Any]] = []
+        self._values: list[Any] = []
+        self._calls: list[tuple[int, int, list[Any], Optional[Closure]]] = []
+        self._frame = globals_
+        self._closure: Optional[Closure] = None
+        # Llamadas activas ahora y el maximo que hubo
+        self.depth = 0
+        self.max_depth = 0
+        # Tareas ejecutadas hasta ahora
+        self.steps = 0
+        self.done = False
+        self.result: Any = None
+
+        if program is not None:
+            _push_block(self._tasks, self._values, program.statements)
+
+    # Empieza dentro de una llamada a `function` con su frame ya hecho, como
+    # si un _CALL acabara de entrar. Es para un Execution sin programa
+    def enter(self, function: Closure, frame: list[Any]) -> None:
+        if self.call_limit < 1:
+            _fail('Limite de recursion excedido')
+
+        body = function.function.body
+        self._calls.append((0, 0, self._frame, self._closure))
+        self._tasks.append((_EXIT, None))
+        self._frame = frame
+        self._closure = function
+        self.depth = self.max_depth = 1
+        _push_block(self._tasks, self._values, body.statements if body else [])
+
+    # Avanza hasta count tareas. Regresa si el programa ya termino
+    def step(self, count: int = 1) -> bool:
+        if self.done:
+            return True
+
+        try:
+            self._run(count)
+        except EvaluationError as error:
+            self._finish(Error(error.message))
+        else:
+            if not self._tasks:
+                self._finish(self._values[-1])
+        return self.done
+
+    # Ejecuta lo que falta y regresa el resultado
+    def resume(self) -> Any:
+        self.step(sys.maxsize)
+        return self.result
+
+    def _finish(self, result: Any) -> None:
+        self.done = True
+        self.result = result
+        self._tasks = []
+        self._values = []
+        self._calls = []
+        self.depth = 0
+
+    def _run(self, count: int) -> None:
+        tasks = self._tasks
+        values = self._values
+        calls = self._calls
+        globals_ = self._globals
+        budget = self.memory_budget
+        call_limit = self.call_limit
+        frame = self._frame
+        closure = self._closure
+        depth = self.depth
+        max_depth = self.max_depth
+        remaining = count
+
+        try:
+            while tasks and remaining:
+                remaining -= 1
+                code, node = tasks.pop()
+
+                if code == _EVAL:
+                    kind = type(node)
+                    if kind is Identifier:
+                        depth_ = node.depth
+                        if depth_ == 0:
+                            value = frame[node.slot]
+                            if node.boxed:
+                                value = value.value
+                        elif depth_ > 0:
+                            if node.free >= 0:
+                                value = closure.cells[node.free].value  # type: ignore
+                            else:
+                                value = globals_[node.slot]
+                        else:
+                            value = None
+                        if value is None:
+                            _fail(f'Identificador no encontrado: {node.value}')
+                        values.append(value)
+                    elif kind is Integer:
+                        values.append(node.value)
+                    elif kind is Infix:
+                        tasks.append((_INFIX, node.operator))
+                        tasks.append((_EVAL, node.right))
+                        tasks.append((_EVAL, node.left))
+                    elif kind is Call:
+                        arguments = node.arguments or ()
+                        tasks.append((_CALL, node))
+                        for argument in reversed(arguments):
+                            tasks.append((_EVAL, argument))
+                        tasks.append((_EVAL, node.function))
+                    elif kind is If:
+                        tasks.append((_BRANCH, node))
+                        tasks.append((_EVAL, node.condition))
+                    elif kind is ExpressionStatement:
+                        if node.expression is None:
+                            values.append(NULL)
+                        else:
+                            tasks.append((_EVAL, node.expression))
+                    elif kind is ReturnStatement:
+                        tasks.append((_RETURN, None))
+                        if node.return_value is None:
+                            values.append(NULL)
+                        else:
+                            tasks.append((_EVAL, node.return_value))
+                    elif kind is LetStatement:
+                        tasks.append((_LET, node.name))
+                        tasks.append((_EVAL, node.value))
+                    elif kind is Boolean:
+                        values.append(TRUE if node.value else FALSE)
+                    elif kind is Prefix:
+                        tasks.append((_PREFIX, node.operator))
+                        tasks.append((_EVAL, node.right))
+                    elif kind is Function:
+                        values.append(make_closure(node, frame, closure))
+                    elif kind is ArrayLiteral:
+                        tasks.append((_ARRAY, len(node.elements)))
+                        for element in reversed(node.elements):
+                            tasks.append((_EVAL, element))
+                    elif kind is Index:
+                        tasks.append((_INDEX, None))
+                        tasks.append((_EVAL, node.index))
+                        tasks.append((_EVAL, node.left))
+                    elif kind is MapLiteral:
+                        tasks.append((_MAP, len(node.entries) // 2))
+                        for entry in reversed(node.entries):
+                            tasks.append((_EVAL, entry))
+                    elif kind is Length:
+                        tasks.append((_LENGTH, None))
+                        tasks.append((_EVAL, node.argument))
+                    elif kind is StringLiteral:
+                        values.append(intern(node.value))
+                    elif kind is For:
+                        tasks.append((_TEST, node))
+                        tasks.append((_EVAL, node.condition))
+                        for variable in reversed(node.variables):
+                            tasks.append((_POP, None))
+                            tasks.append((_EVAL, variable))
+                    else:
+                        _fail(f'Nodo desconocido: {kind.__name__}')
+
+                elif code == _INFIX:
+                    b = values.pop()
+                    values[-1] = _infix(node, values[-1], b)
+                elif code == _BRANCH:
+                    value = values.pop()
+                    # Solo falso y nulo son falsos
+                    if value is not FALSE and value is not NULL:
+                        _push_block(tasks, values, node.consequence.statements)
+                    elif node.alternative is not None:
+                        _push_block(tasks, values, node.alternative.statements)
+                    else:
+                        values.append(NULL)
+                elif code == _POP:
+                    values.pop()
+                elif code == _CALL:
+                    count_ = len(node.arguments or ())
+                    function = values[-count_ - 1]
+                    arguments = values[len(values) - count_:]
+                    del values[-count_ - 1:]
+
+                    if type(function) is not Closure:
+                        _fail(f'No es una funcion: {type_name(function)}')
+                    definition = function.function
+                    parameters = definition.parameters
+                    if count_ != len(parameters):
+                        _fail(f'Numero de argumentos incorrecto: se esperaban '
+                              f'{len(parameters)} y se recibieron {count_}')
+
+                    call_frame: list[Any] = [None] * definition.frame_size
+                    for slot in definition.cells:
+                        call_frame[slot] = Cell()
+                    for parameter, argument in zip(parameters, arguments):
+                        if parameter.boxed:
+                            call_frame[parameter.slot].value = argument
+                        else:
+                            call_frame[parameter.slot] = argument
+
+                    if node.tail:
+                        # Solo queda el _EXIT de la llamada actual
+                        start, base, _, _ = calls[-1]
+                        del tasks[start + 1:]
+                        del values[base:]
+                    else:
+                        if len(tasks) + len(values) + len(calls) >= budget or \
+                                depth >= call_limit:
+                            _fail('Limite de recursion excedido')
+                        calls.append((len(tasks), len(values), frame, closure))
+                        tasks.append((_EXIT, None))
+                        depth += 1
+                        if depth > max_depth:
+                            max_depth = depth
+
+                    frame = call_frame
+                    closure = function
+                    _push_block(tasks, values,
+                                definition.body.statements if definition.body else [])
+                elif code == _TEST:
+                    value = values.pop()
+                    if value is FALSE or value is NULL:
+                        values.append(NULL)
+                    else:
+                        tasks.append((_ASSIGN, node))
+                        for update in reversed(node.updates):
+                            tasks.append((_EVAL, update.value))
+                        tasks.append((_POP, None))
+                        _push_block(tasks, values,
+                                    node.body.statements if node.body else [])
+                elif code == _ASSIGN:
+                    # Todos los valores nuevos ya estan en values
+                    updates = node.updates
+                    if updates:
+                        new_values = values[len(values) - len(updates):]
+                        del values[len(values) - len(updates):]
+                        for update, value in zip(updates, new_values):
+                            name = update.name
+                            if name.boxed:
+                                frame[name.slot].value = value
+                            else:
+                                frame[name.slot] = value
+                    tasks.append((_TEST, node))
+                    tasks.append((_EVAL, node.condition))
+                elif code == _EXIT:
+                    _, _, frame, closure = calls.pop()
+                    depth -= 1
+                elif code == _LET:
+                    if node.boxed:
+                        frame[node.slot].value = values[-1]
+                    else:
+                        frame[node.slot] = values[-1]
+                    values[-1] = NULL
+                elif code == _PREFIX:
+                    values[-1] = _prefix(node, values[-1])
+                elif code == _INDEX:
+                    position = values.pop()
+                    values[-1] = index(values[-1], position)
+                elif code == _ARRAY:
+                    elements = values[len(values) - node:]
+                    del values[len(values) - node:]
+                    values.append(make_list(elements))
+                elif code == _MAP:
+                    items = values[len(values) - 2 * node:]
+                    del values[len(values) - 2 * node:]
+                    values.append(make_map(items))
+                elif code == _LENGTH:
+                    values[-1] = length(values[-1])
+                else:
+                    value = values.pop()
+                    if not calls:
+                        # `retorna` en el programa termina todo
+                        del tasks[:]
+                        del values[:]
+                        values.append(value)
+                        continue
+                    start, base, frame, closure = calls.pop()
+                    del tasks[start:]
+                    del values[base:]
+                    values.append(value)
+                    depth -= 1
+        finally:
+            self._frame = frame
+            self._closure = closure
+            self.depth = depth
+            self.max_depth = max_depth
+            self.steps += count - remaining
+
+
+# Ejecuta la llamada a `function` con su frame ya hecho, y todas las que
+# haga, con a lo mas call_limit llamadas activas. Los errores se lanzan
+# como EvaluationError
+def call_without_stack(function: Closure,
+                       frame: list[Any],
+                       globals_: list[Any],
+                       call_limit: int) -> Any:
+    execution = Execution(None, globals_, sys.maxsize, call_limit)
+    execution.enter(function, frame)
+    result = execution.resume()
+    if type(result) is Error:
+        return _fail(result.message)
+    return result
+
+
+class StacklessEvaluator:
+
+    def __init__(self,
+                 environment: Optional[Environment] = None,
+                 memory_budget: int = 50_000_000) -> None:
+        self.environment = environment if environment is not None else Environment()
+        self.memory_budget = memory_budget
+        self._globals = self.environment.values
+        # Profundidad maxima del ultimo evaluate
+        self.max_depth = 0
+
+    # Resuelve el programa con las globales del entorno y lo deja listo para
+    # ejecutarse por pasos
+    def start(self, program: Program) -> Execution:
+        environment = self.environment
+        resolution = resolve(program, environment.names)
+
+        environment.names = resolution.globals
+        missing = len(resolution.globals) - len(self._globals)
+        if missing > 0:
+            self._globals.extend([None] * missing)
+
+        return Execution(program, self._globals, self.memory_budget)
+
+    def evaluate(self, program: Program) -> Any:
+        execution = self.start(program)
+        result = execution.resume()
+        self.max_depth = execution.max_depth
+        return result
+
+
+def evaluate(program: Program, environment: Optional[Environment] = None) -> Any:
+    return StacklessEvaluator(environment).evaluate(program)
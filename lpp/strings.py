@@ -0,0 +1,60 @@
+from lpp.object import String
+
+'''
+    Textos de lpp: concatenacion con cuerdas (ropes) e interning de los
+    literales.
+
+    Con str de Python `s = s + linea` copia todo s en cada vuelta, asi que
+    construir un texto de n caracteres cuesta O(n^2). concat no copia: crea
+    un nodo con las dos partes y el texto completo se une una sola vez, en
+    O(n), cuando alguien lo necesita (indexar, comparar, mostrarlo). tamano
+    no necesita el texto, cada String sabe su longitud.
+
+    Para que la cuerda no tenga un nodo por cada pedazo pequeno, los textos
+    de hasta LEAF_SIZE caracteres se copian: si el pedazo que se agrega y la
+    hoja del extremo donde se agrega caben juntos en LEAF_SIZE se unen en
+    una hoja nueva. Asi agregar al final (o al principio) cuesta O(1)
+    amortizado mas la copia de a lo mas LEAF_SIZE caracteres, y la cuerda
+    tiene una hoja cada LEAF_SIZE caracteres. Los String no cambian despues
+    de crearse (solo se aplanan), asi que dos textos pueden compartir
+    partes.
+
+    Los literales "..." pasan por intern: el mismo texto en el codigo es
+    siempre el mismo String, sin importar cuantas veces se evalue el literal
+    o en que programa de la sesion aparezca, y dos literales iguales se
+    comparan por identidad.
+'''
+
+
+LEAF_SIZE: int = 1024
+
+_interned: dict[str, String] = {}
+
+
+def intern(text: str) -> String:
+    string = _interned.get(text)
+    if string is None:
+        string = _interned[text] = String(text)
+    return string
+
+
+def concat(a: String, b: String) -> String:
+    if not b.length:
+        return a
+    if not a.length:
+        return b
+
+    if a.length + b.length <= LEAF_SIZE:
+        return String(a.value() + b.value())
+
+    # Agregar un pedazo pequeno junto a la hoja del extremo
+    if b.flat is not None and a.flat is None:
+        last = a.right
+        if last.flat is not None and last.length + b.length <= LEAF_SIZE:  # type: ignore
+            return String(None, a.left, String(last.flat + b.flat))  # type: ignore
+    elif a.flat is not None and b.flat is None:
+        first = b.left
+        if first.flat is not None and a.length + first.length <= LEAF_SIZE:  # type: ignore
+            return String(None, String(a.flat + first.flat), b.right)  # type: ignore
+
+    return String(None, a, b)
@@ -0,0 +1,287 @@
+from bisect import bisect_left
+from enum import (
+    auto,
+    Enum,
+    unique,
+)
+from typing import (
+    Iterable,
+    Optional,
+)
+
+from lpp.ast import (
+    ASTNode,
+    Assignment,
+    Block,
+    Function,
+    Identifier,
+    LetStatement,
+    Program,
+)
+from lpp.visitor import NodeVisitor
+
+'''
+    Tabla de simbolos e indice de referencias.
+
+    Una sola pasada lineal sobre el programa registra cada definicion
+    (`variable x = ...` y los parametros de `funcion`), cada uso de un
+    identificador y el anidamiento de scopes. Al final resolvemos cada uso
+    con diccionarios y bisect, asi que preguntar por la definicion de un
+    identificador o por las referencias de un simbolo es O(1).
+
+    Reglas de resolucion:
+    - `variable x = <valor>` define x despues de evaluar el valor, asi que
+      dentro de <valor> x se refiere a la definicion anterior.
+    - Dentro de la misma funcion solo se ven las definiciones anteriores al
+      uso. Desde el cuerpo de una funcion tambien se ven las definiciones
+      posteriores de los scopes de afuera, porque la funcion se ejecuta
+      despues (asi funciona la recursion).
+    - Los parametros y el cuerpo de una funcion comparten scope; cualquier
+      otro bloque (`si`, `si_no`, el cuerpo de `para`) abre uno nuevo.
+    - Las variables de un `para` se definen en el scope de afuera. El nombre
+      de cada asignacion del `para` es un uso de su variable y queda en
+      Symbol.assignments.
+'''
+
+
+@unique
+class ScopeKind(Enum):
+    PROGRAM = auto()
+    FUNCTION = auto()
+    BLOCK = auto()
+
+
+@unique
+class SymbolKind(Enum):
+    VARIABLE = auto()
+    PARAMETER = auto()
+    PREDEFINED = auto()  # Nombres que existen antes del programa
+
+
+class Scope:
+
+    def __init__(self,
+                 kind: ScopeKind,
+                 node: ASTNode,
+                 parent: Optional['Scope'] = None) -> None:
+        self.kind = kind
+        self.node = node
+        self.parent = parent
+        self.children: list[Scope] = []
+        # Definiciones por nombre, en el orden en que aparecen
+        self.definitions: dict[str, list[Symbol]] = {}
+
+        if parent is not None:
+            parent.children.append(self)
+
+    # Funcion (o programa) a la que pertenece el scope
+    @property
+    def owner(self) -> 'Scope':
+        scope = self
+        while scope.kind == ScopeKind.BLOCK:
+            assert scope.parent is not None
+            scope = scope.parent
+        return scope
+
+    def __repr__(self) -> str:
+        return f'Scope({self.kind.name}, {sorted(self.definitions)})'
+
+
+class Symbol:
+
+    def __init__(self,
+                 name: str,
+                 kind: SymbolKind,
+                 scope: Scope,
+                 node: Optional[Identifier],
+                 order: int) -> None:
+        self.name = name
+        self.kind = kind
+        self.scope = scope
+        self.node = node
+        self.references: list[Identifier] = []
+        # Asignaciones de un `para` que cambian su valor. Si hay alguna, la
+        # variable no siempre tiene el valor con el que se definio
+        self.assignments: list[Assignment] = []
+        # Posicion de la definicion en el orden de evaluacion
+        self.order = order
+
+    def __repr__(self) -> str:
+        return f'Symbol({self.name}, {self.kind.name}, ' + \
+            f'{len(self.references)} referencias)'
+
+
+class SymbolTable:
+
+    def __init__(self, program: Program, global_scope: Scope) -> None:
+        self.program = program
+        self.global_scope = global_scope
+        self.symbols: list[Symbol] = []
+        self.unresolved: list[Identifier] = []
+        self._definitions: dict[Identifier, Symbol] = {}
+        self._scopes: dict[ASTNode, Scope] = {}
+
+    # Simbolo al que se refiere un identificador, tanto si es un uso como si
+    # es el nombre de una definicion
+    def definition(self, identifier: Identifier) -> Optional[Symbol]:
+        return self._definitions.get(identifier)
+
+    def references(self, symbol: Symbol) -> list[Identifier]:
+        return symbol.references
+
+    def is_definition(self, identifier: Identifier) -> bool:
+        symbol = self._definitions.get(identifier)
+        return symbol is not None and symbol.node is identifier
+
+    # Scope que abre un Program, Function o Block (los bloques que son el
+    # cuerpo de una funcion regresan el scope de la funcion)
+    def scope(self, node: ASTNode) -> Optional[Scope]:
+        return self._scopes.get(node)
+
+    # Ultima definicion visible de `name` desde `scope`, sin importar el orden
+    def lookup(self, name: str, scope: Scope) -> Optional[Symbol]:
+        current: Optional[Scope] = scope
+        while current is not None:
+            definitions = current.definitions.get(name)
+            if definitions:
+                return definitions[-1]
+            current = current.parent
+        return None
+
+
+class _Builder(NodeVisitor):
+
+    def __init__(self, program: Program, predefined: Iterable[str]) -> None:
+        self._scope = Scope(ScopeKind.PROGRAM, program)
+        self.table = SymbolTable(program, self._scope)
+        self.table._scopes[program] = self._scope
+
+        self._order = 0
+        self._definition_nodes: set[Identifier] = set()
+        self._function_bodies: set[Block] = set()
+        # (identificador, scope, orden) para resolver al final
+        self._pending: list[tuple[Identifier, Scope, int]] = []
+        # Asignacion de cada nombre que se asigna en un `para`
+        self._assignments: dict[Identifier, Assignment] = {}
+
+        for name in predefined:
+            self._define(name, SymbolKind.PREDEFINED, None, order=-1)
+
+    def _define(self,
+                name: str,
+                kind: SymbolKind,
+                node: Optional[Identifier],
+                order: Optional[int] = None) -> None:
+        if order is None:
+            order = self._next_order()
+
+        symbol = Symbol(name, kind, self._scope, node, order)
+        self._scope.definitions.setdefault(name, []).append(symbol)
+        self.table.symbols.append(symbol)
+        if node is not None:
+            self.table._definitions[node] = symbol
+
+    def _next_order(self) -> int:
+        self._order += 1
+        return self._order
+
+    def _push(self, kind: ScopeKind, node: ASTNode) -> None:
+        self._scope = Scope(kind, node, self._scope)
+        self.table._scopes[node] = self._scope
+
+    def _pop(self) -> None:
+        assert self._scope.parent is not None
+        self._scope = self._scope.parent
+
+    def enter_LetStatement(self, node: LetStatement) -> None:
+        if node.name is not None:
+            self._definition_nodes.add(node.name)
+
+    def leave_LetStatement(self, node: LetStatement) -> None:
+        # El nombre se define despues de visitar el valor
+        if node.name is not None:
+            self._define(node.name.value, SymbolKind.VARIABLE, node.name)
+
+    def enter_Function(self, node: Function) -> None:
+        self._push(ScopeKind.FUNCTION, node)
+        for parameter in node.parameters:
+            self._definition_nodes.add(parameter)
+            self._define(parameter.value, SymbolKind.PARAMETER, parameter)
+
+        if node.body is not None:
+            self._function_bodies.add(node.body)
+            self.table._scopes[node.body] = self._scope
+
+    def leave_Function(self, node: Function) -> None:
+        self._pop()
+
+    def enter_Block(self, node: Block) -> None:
+        if node not in self._function_bodies:
+            self._push(ScopeKind.BLOCK, node)
+
+    def leave_Block(self, node: Block) -> None:
+        if node not in self._function_bodies:
+            self._pop()
+
+    def enter_Assignment(self, node: Assignment) -> None:
+        if node.name is not None:
+            self._assignments[node.name] = node
+
+    def enter_Identifier(self, node: Identifier) -> None:
+        if node not in self._definition_nodes:
+            self._pending.append((node, self._scope, self._next_order()))
+
+    def resolve(self) -> SymbolTable:
+        # Ordenes de cada lista de definiciones, para buscar con bisect
+        orders: dict[int, list[int]] = {}
+
+        for identifier, scope, order in self._pending:
+            symbol = self._resolve(identifier.value, scope, order, orders)
+            if symbol is None:
+                self.table.unresolved.append(identifier)
+            else:
+                symbol.references.append(identifier)
+                self.table._definitions[identifier] = symbol
+                if identifier in self._assignments:
+                    symbol.assignments.append(self._assignments[identifier])
+
+        return self.table
+
+    def _resolve(self,
+                 name: str,
+                 scope: Scope,
+                 order: int,
+                 orders: dict[int, list[int]]) -> Optional[Symbol]:
+        crossed_function = False
+        current: Optional[Scope] = scope
+
+        while current is not None:
+            definitions = current.definitions.get(name)
+            if definitions:
+                key = id(definitions)
+                if key not in orders:
+                    orders[key] = [symbol.order for symbol in definitions]
+
+                # Ultima definicion anterior al uso
+                position = bisect_left(orders[key], order)
+                if position > 0:
+                    return definitions[position - 1]
+
+                # Si el uso esta dentro de una funcion, la definicion de
+                # afuera ya va a existir cuando la funcion se llame
+                if crossed_function:
+                    return definitions[0]
+
+            if current.kind == ScopeKind.FUNCTION:
+                crossed_function = True
+            current = current.parent
+
+        return None
+
+
+def build_symbol_table(program: Program,
+                       predefined: Iterable[str] = ()) -> SymbolTable:
+    builder = _Builder(program, predefined)
+    builder.traverse(program)
+
+    return builder.resolve()
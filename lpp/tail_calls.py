@@ -0,0 +1,83 @@
+from typing import Optional
+
+from lpp.ast import (
+    ASTNode,
+    Block,
+    Call,
+    Expression,
+    ExpressionStatement,
+    Function,
+    If,
+    Program,
+    ReturnStatement,
+)
+from lpp.visitor import (
+    child_nodes,
+    walk,
+)
+
+'''
+    Deteccion de llamadas en posicion de cola.
+
+    Una llamada esta en posicion de cola cuando lo que regresa es lo que
+    regresa la funcion que la contiene: el valor de un `retorna f(...)` o la
+    ultima expresion del cuerpo, tambien dentro de las ramas de un `si` que
+    esta en esa posicion. Se marcan con Call.tail = True para que cada
+    backend las ejecute sin crecer la pila:
+
+    - lpp.evaluator regresa la llamada pendiente y la funcion que llamo la
+      ejecuta en un ciclo (trampolin); lpp.specializing igual
+    - lpp.vm reutiliza el lugar de la funcion actual en la pila de llamadas
+    - lpp.transpile convierte la recursion directa en un ciclo y las demas
+      regresan la llamada pendiente, como lpp.evaluator
+
+    En el programa no hay una funcion a la cual regresar, asi que ahi no se
+    marca nada.
+'''
+
+
+def _mark_expression(expression: Optional[Expression], tail_calls: list[Call]) -> None:
+    if type(expression) is Call:
+        expression.tail = True
+        tail_calls.append(expression)
+    elif type(expression) is If:
+        _mark_block(expression.consequence, tail_calls)
+        _mark_block(expression.alternative, tail_calls)
+
+
+def _mark_block(block: Optional[Block], tail_calls: list[Call]) -> None:
+    if block is None or not block.statements:
+        return
+    last = block.statements[-1]
+    if type(last) is ExpressionStatement:
+        _mark_expression(last.expression, tail_calls)
+
+
+def _mark_function(function: Function, tail_calls: list[Call]) -> None:
+    _mark_block(function.body, tail_calls)
+
+    # Cualquier `retorna` de la funcion, sin entrar a las funciones de adentro
+    pending: list[ASTNode] = list(child_nodes(function))
+    while pending:
+        node = pending.pop()
+        if type(node) is Function:
+            continue
+        if type(node) is ReturnStatement:
+            _mark_expression(node.return_value, tail_calls)
+        pending.extend(child_nodes(node))
+
+
+# Marca las llamadas en posicion de cola (y desmarca las demas, por si el
+# arbol ya se habia marcado antes de cambiar). Regresa las marcadas
+def mark_tail_calls(program: Program) -> list[Call]:
+    functions: list[Function] = []
+    for node in walk(program):
+        if type(node) is Call:
+            node.tail = False
+        elif type(node) is Function:
+            functions.append(node)
+
+    tail_calls: list[Call] = []
+    for function in functions:
+        _mark_function(function, tail_calls)
+    return tail_calls
@@ -36,6 +36,11 @@ class TokenType(Enum):
     NOTEQUALS = auto() # es !=
     FLOAT = auto() # es float
     FOR = auto()
+    LBRACKET = auto() # [
+    RBRACKET = auto() # ]
+    COLON = auto() # :
+    LENGTH = auto() # tamano
+    STRING = auto() # "texto"
 
 class Token(NamedTuple):
     token_type: TokenType
@@ -57,6 +62,7 @@ def lookup_token_type(literal: str) -> TokenType:
         'variable': TokenType.LET,
         'funcion': TokenType.FUNCTION,
         'para': TokenType.FOR,
+        'tamano': TokenType.LENGTH,
     }
 
     return keywords.get(literal, TokenType.IDENT)
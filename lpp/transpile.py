@@ -0,0 +1,781 @@
+import ast
+import re
+from hashlib import sha256
+from types import (
+    CodeType,
+    FunctionType,
+)
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+from lpp.arrays import (
+    array_infix,
+    array_negate,
+)
+from lpp.ast import (
+    ArrayLiteral,
+    ASTNode,
+    Block,
+    Boolean,
+    Call,
+    Expression,
+    ExpressionStatement,
+    For,
+    Function,
+    Identifier,
+    If,
+    Index,
+    Infix,
+    Integer,
+    Length,
+    LetStatement,
+    MapLiteral,
+    Prefix,
+    Program,
+    ReturnStatement,
+    Statement,
+    StringLiteral,
+    ValueType,
+)
+from lpp.containers import (
+    index,
+    length,
+    make_list,
+    make_map,
+)
+from lpp.evaluator import EvaluationError
+from lpp.inference import infer_types
+from lpp.lexer import Lexer
+from lpp.object import (
+    Array,
+    Error,
+    FALSE,
+    NULL,
+    String,
+    TRUE,
+    type_name,
+)
+from lpp.parser import Parser
+from lpp.purity import known_functions
+from lpp.symbols import (
+    Scope,
+    Symbol,
+    SymbolKind,
+    SymbolTable,
+)
+from lpp.strings import (
+    concat,
+    intern,
+)
+from lpp.tail_calls import mark_tail_calls
+from lpp.visitor import (
+    child_nodes,
+    NodeVisitor,
+    walk,
+)
+
+'''
+    Transpilador de lpp a Python.
+
+    Convierte un Program en un ast.Module con una funcion `_programa` y lo
+    compila con compile(), asi que el programa corre como bytecode de
+    CPython. Cada funcion de lpp es una funcion de Python y cada variable
+    una variable local; las closures de Python ya guardan celdas como las
+    de lpp.object.
+
+    Para conservar la semantica de lpp:
+    - Cada nombre se renombra a `nombre_N`, uno por scope de lpp (ver
+      lpp.symbols). Dos `variable x` en el mismo scope son la misma
+      variable, como las posiciones de lpp.resolver, y un bloque `si` tiene
+      las suyas.
+    - Solo falso y nulo son falsos: una condicion es
+      `(t := c) is not FALSE and t is not NULL`, o `c is TRUE` si
+      lpp.inference sabe que es booleano.
+    - Las operaciones marcadas en operand_type son operaciones de Python
+      (`/` es `//`); las demas llaman a funciones que revisan los tipos y
+      dan los mismos errores que lpp.evaluator. Con un arreglo esas
+      funciones usan las operaciones de lpp.arrays; los literales,
+      indexar y `tamano` usan las de lpp.containers. Los textos son los
+      String de lpp.strings: un literal es `_string("...")`, que regresa
+      el internado, y `+` entre dos textos es `_concat`.
+    - Un `si` usado como valor es `a if c else b` cuando cada rama es una
+      expresion. Si no, corre antes como statement y deja su valor en una
+      variable temporal; los operandos de su izquierda se guardan antes en
+      temporales para no cambiar el orden de evaluacion.
+
+    Un `para` es un `while` sobre las variables de Python de sus variables
+    de lpp; las asignaciones son una sola asignacion de tupla, asi que todos
+    los valores nuevos se calculan antes de cambiar alguno.
+
+    Las llamadas usan la pila de Python, salvo las de cola (ver
+    lpp.tail_calls). La recursion de cola directa (`retorna f(n - 1)`
+    dentro de f) se genera como un `while True` que reasigna los
+    parametros y vuelve a empezar. Solo se hace si f no crea funciones,
+    porque una closure vera el parametro reasignado en lugar del de su
+    llamada, y si no tiene un `para`, porque el `continue` seria de ese
+    ciclo. Las demas llamadas de cola regresan un _TailCall, como en
+    lpp.evaluator: `_call` ejecuta los que reciba en un ciclo, y una
+    llamada directa a una funcion que puede regresarlos pasa su resultado
+    por `_bounce`. Asi la recursion mutua de cola corre con la pila
+    constante y el resto de las llamadas directas no cambia.
+
+    compile_source guarda los code objects por el hash del codigo fuente.
+'''
+
+
+# Destino del valor de un bloque: None lo descarta, _RETURN lo regresa y
+# cualquier otro nombre es la temporal donde se guarda
+_RETURN: str = 'return'
+
+_CACHE_SIZE: int = 256
+_cache: dict[str, CodeType] = {}
+
+_ARITHMETIC: dict[str, ast.operator] = {
+    '+': ast.Add(),
+    '-': ast.Sub(),
+    '*': ast.Mult(),
+    '/': ast.FloorDiv(),
+}
+
+_COMPARISON: dict[str, ast.cmpop] = {
+    '<': ast.Lt(),
+    '>': ast.Gt(),
+    '==': ast.Eq(),
+    '!=': ast.NotEq(),
+}
+
+_IDENTITY: dict[str, ast.cmpop] = {
+    '==': ast.Is(),
+    '!=': ast.IsNot(),
+}
+
+_INFIX_HELPERS: dict[str, str] = {
+    '+': '_add',
+    '-': '_sub',
+    '*': '_mul',
+    '/': '_div',
+    '<': '_lt',
+    '>': '_gt',
+    '==': '_eq',
+    '!=': '_ne',
+}
+
+# Lo que el codigo generado necesita en sus globales
+_SINGLETONS: frozenset[str] = frozenset(('TRUE', 'FALSE', 'NULL'))
+
+_QUOTED_NAME = re.compile(r"'(\w+)'")
+
+
+def _name(identifier: str) -> ast.Name:
+    return ast.Name(id=identifier, ctx=ast.Load())
+
+
+def _assign(identifier: str, value: ast.expr) -> ast.Assign:
+    return ast.Assign(targets=[ast.Name(id=identifier, ctx=ast.Store())], value=value)
+
+
+def _helper(helper: str, *arguments: ast.expr) -> ast.Call:
+    return ast.Call(func=_name(helper), args=list(arguments), keywords=[])
+
+
+def _boolean(test: ast.expr) -> ast.IfExp:
+    return ast.IfExp(test=test, body=_name('TRUE'), orelse=_name('FALSE'))
+
+
+def _is(value: ast.expr, operator: ast.cmpop, singleton: str) -> ast.Compare:
+    return ast.Compare(left=value, ops=[operator], comparators=[_name(singleton)])
+
+
+def _function_def(name: str, parameters: list[str], body: list[ast.stmt]) -> ast.stmt:
+    # Parsear la firma evita depender de los campos de ast.FunctionDef, que
+    # cambian entre versiones de Python
+    definition = ast.parse(f'def {name}({", ".join(parameters)}): pass').body[0]
+    definition.body = body  # type: ignore
+    return definition
+
+
+# Expresiones que se pueden descartar o mover sin cambiar nada
+def _is_constant(value: ast.expr) -> bool:
+    return isinstance(value, ast.Constant) or \
+        (isinstance(value, ast.Name) and value.id in _SINGLETONS)
+
+
+class Transpiler(NodeVisitor):
+
+    def __init__(self) -> None:
+        self._table: Optional[SymbolTable] = None
+        self._names: dict[tuple[Scope, str], str] = {}
+        # Funciones que se asignan una sola vez con `variable f = funcion`
+        self._functions: dict[Symbol, Function] = {}
+        self._temporaries = 0
+        # Donde se agregan los statements que se generan
+        self._out: list[ast.stmt] = []
+        # Funcion que se esta generando como ciclo
+        self._loop: Optional[Function] = None
+        # Si cada funcion puede regresar un _TailCall
+        self._bouncing: dict[Function, bool] = {}
+
+    def transpile(self, program: Program) -> ast.Module:
+        table = infer_types(program).table
+        self._table = table
+        mark_tail_calls(program)
+
+        self._functions = known_functions(table)
+
+        body = self._translate(program.statements, _RETURN)
+        module = ast.Module(body=[_function_def('_programa', [], body)], type_ignores=[])
+        return ast.fix_missing_locations(module)
+
+    def _python_name(self, identifier: Identifier) -> Optional[str]:
+        assert self._table is not None
+        symbol = self._table.definition(identifier)
+        if symbol is None or symbol.kind == SymbolKind.PREDEFINED:
+            return None
+
+        key = (symbol.scope, symbol.name)
+        name = self._names.get(key)
+        if name is None:
+            name = self._names[key] = f'{symbol.name}_{len(self._names)}'
+        return name
+
+    def _temporary(self) -> str:
+        self._temporaries += 1
+        return f'_t{self._temporaries}'
+
+    def _translate(self, statements: list[Statement], target: Optional[str]) -> list[ast.stmt]:
+        outer = self._out
+        self._out = []
+        self._statements(statements, target)
+        translated, self._out = self._out, outer
+        return translated
+
+    def _store(self, value: ast.expr, target: Optional[str]) -> None:
+        if target is None:
+            if not _is_constant(value):
+                self._out.append(ast.Expr(value=value))
+        elif target == _RETURN:
+            self._out.append(ast.Return(value=value))
+        else:
+            self._out.append(_assign(target, value))
+
+    # El valor del bloque es el de su ultimo statement; `variable` y el
+    # bloque vacio valen nulo
+    def _statements(self, statements: list[Statement], target: Optional[str]) -> None:
+        if not statements:
+            self._store(_name('NULL'), target)
+            return
+
+        last = len(statements) - 1
+        for position, statement in enumerate(statements):
+            destination = target if position == last else None
+
+            if type(statement) is LetStatement:
+                self._let(statement)
+                if position == last:
+                    self._store(_name('NULL'), target)
+            elif type(statement) is For:
+                self._for(statement)
+                if position == last:
+                    self._store(_name('NULL'), target)
+            elif type(statement) is ReturnStatement:
+                self._return(statement.return_value)
+                # Lo que sigue nunca se ejecuta
+                return
+            elif type(statement) is ExpressionStatement:
+                expression = statement.expression
+                if expression is None:
+                    self._store(_name('NULL'), destination)
+                elif type(expression) is If:
+                    self._out.append(self._if(
+                        expression, self._condition(expression.condition), destination))
+                elif destination == _RETURN and type(expression) is Call:
+                    self._return(expression)
+                else:
+                    self._store(self.visit(expression), destination)
+
+    def _let(self, node: LetStatement) -> None:
+        assert node.name is not None and node.value is not None
+        name = self._python_name(node.name)
+        assert name is not None
+
+        if type(node.value) is Function:
+            self._function(node.value, name)
+        else:
+            self._out.append(_assign(name, self.visit(node.value)))
+
+    def _for(self, node: For) -> None:
+        for variable in node.variables:
+            self._let(variable)
+
+        # Siempre `while True` con un break: es mas rapido en CPython que
+        # `while condicion`, y los statements que necesite la condicion se
+        # repiten en cada vuelta
+        outer = self._out
+        self._out = []
+        test = self._condition(node.condition)
+        before, self._out = self._out, outer
+
+        statements = node.body.statements if node.body is not None else []
+        body = self._translate(statements, None)
+
+        self._out = body
+        values = self._values([update.value for update in node.updates  # type: ignore
+                               if update.value is not None])
+        self._out = outer
+        names: list[ast.expr] = [
+            ast.Name(id=self._python_name(update.name), ctx=ast.Store())  # type: ignore
+            for update in node.updates]
+        if len(names) == 1:
+            body.append(ast.Assign(targets=names, value=values[0]))
+        elif names:
+            body.append(ast.Assign(targets=[ast.Tuple(elts=names, ctx=ast.Store())],
+                                   value=ast.Tuple(elts=values, ctx=ast.Load())))
+
+        stop = ast.If(test=ast.UnaryOp(op=ast.Not(), operand=test),
+                      body=[ast.Break()], orelse=[])
+        self._out.append(ast.While(test=ast.Constant(value=True),
+                                   body=before + [stop] + body, orelse=[]))
+
+    def _return(self, value: Optional[Expression]) -> None:
+        loop = self._loop
+        if loop is None or type(value) is not Call or not value.tail or \
+                not self._is_call_to(value, loop):
+            self._out.append(ast.Return(
+                value=self.visit(value) if value is not None else _name('NULL')))
+            return
+
+        # Recursion de cola directa: nuevos parametros y otra vuelta
+        arguments = self._values(value.arguments or [])
+        parameters: list[ast.expr] = [ast.Name(id=self._parameter(parameter), ctx=ast.Store())
+                                      for parameter in loop.parameters]
+        if len(parameters) == 1:
+            self._out.append(ast.Assign(targets=parameters, value=arguments[0]))
+        elif parameters:
+            self._out.append(ast.Assign(
+                targets=[ast.Tuple(elts=parameters, ctx=ast.Store())],
+                value=ast.Tuple(elts=arguments, ctx=ast.Load())))
+        self._out.append(ast.Continue())
+
+    def _parameter(self, parameter: Identifier) -> str:
+        return self._python_name(parameter) or parameter.value
+
+    def _function(self, node: Function, name: str) -> None:
+        parameters = [self._parameter(parameter) for parameter in node.parameters]
+        statements = node.body.statements if node.body is not None else []
+
+        outer = self._loop
+        self._loop = node if self._is_loop(node) else None
+        body = self._translate(statements, _RETURN)
+        if self._loop is not None:
+            body = [ast.While(test=ast.Constant(value=True), body=body, orelse=[])]
+        self._loop = outer
+
+        self._out.append(_function_def(name, parameters, body))
+
+    def _is_loop(self, node: Function) -> bool:
+        if node.body is None:
+            return False
+
+        loops = False
+        for child in walk(node.body):
+            if type(child) is Function or type(child) is For:
+                return False
+            if type(child) is Call and child.tail and self._is_call_to(child, node):
+                loops = True
+        return loops
+
+    def _if(self, node: If, test: ast.expr, target: Optional[str]) -> ast.If:
+        assert node.consequence is not None
+        body = self._translate(node.consequence.statements, target)
+        if node.alternative is not None:
+            orelse = self._translate(node.alternative.statements, target)
+        elif target is not None:
+            orelse = self._translate([], target)
+        else:
+            orelse = []
+        return ast.If(test=test, body=body or [ast.Pass()], orelse=orelse)
+
+    def _condition(self, node: Optional[Expression]) -> ast.expr:
+        assert node is not None
+        value = self.visit(node)
+
+        # `TRUE if a < b else FALSE` como condicion es solo `a < b`
+        if isinstance(value, ast.IfExp) and isinstance(value.body, ast.Name) and \
+                value.body.id == 'TRUE' and isinstance(value.orelse, ast.Name) and \
+                value.orelse.id == 'FALSE':
+            return value.test
+        if node.inferred_type == ValueType.BOOLEAN:
+            return _is(value, ast.Is(), 'TRUE')
+
+        temporary = self._temporary()
+        walrus = ast.NamedExpr(target=ast.Name(id=temporary, ctx=ast.Store()), value=value)
+        return ast.BoolOp(op=ast.And(), values=[
+            _is(walrus, ast.IsNot(), 'FALSE'),
+            _is(_name(temporary), ast.IsNot(), 'NULL'),
+        ])
+
+    # Valores de varias expresiones en orden. Si una necesita statements
+    # antes (un `si` con `variable` adentro, por ejemplo), las anteriores se
+    # guardan en temporales para que se sigan evaluando primero
+    def _values(self, nodes: list[Expression]) -> list[ast.expr]:
+        values: list[ast.expr] = []
+        for node in nodes:
+            outer = self._out
+            self._out = []
+            value = self.visit(node)
+            pending, self._out = self._out, outer
+
+            # Definir una funcion no tiene efectos, se puede adelantar
+            if any(not isinstance(statement, ast.FunctionDef) for statement in pending):
+                for position, previous in enumerate(values):
+                    if not _is_constant(previous):
+                        temporary = self._temporary()
+                        outer.append(_assign(temporary, previous))
+                        values[position] = _name(temporary)
+
+            outer.extend(pending)
+            values.append(value)
+        return values
+
+    def visit_Integer(self, node: Integer) -> ast.expr:
+        return ast.Constant(value=node.value)
+
+    def visit_Boolean(self, node: Boolean) -> ast.expr:
+        return _name('TRUE' if node.value else 'FALSE')
+
+    def visit_StringLiteral(self, node: StringLiteral) -> ast.expr:
+        return _helper('_string', ast.Constant(value=node.value))
+
+    def visit_Identifier(self, node: Identifier) -> ast.expr:
+        name = self._python_name(node)
+        if name is None:
+            return _helper('_undefined', ast.Constant(value=node.value))
+        return _name(name)
+
+    def visit_Prefix(self, node: Prefix) -> ast.expr:
+        assert node.right is not None
+        right = self.visit(node.right)
+
+        if node.operator == '-':
+            if node.operand_type == ValueType.INTEGER:
+                return ast.UnaryOp(op=ast.USub(), operand=right)
+            return _helper('_neg', right)
+
+        if node.operand_type == ValueType.BOOLEAN:
+            return ast.IfExp(test=_is(right, ast.Is(), 'TRUE'),
+                             body=_name('FALSE'), orelse=_name('TRUE'))
+        return _helper('_not', right)
+
+    def visit_Infix(self, node: Infix) -> ast.expr:
+        assert node.right is not None
+        left, right = self._values([node.left, node.right])
+        operator = node.operator
+
+        if node.operand_type == ValueType.INTEGER:
+            if operator in _ARITHMETIC:
+                return ast.BinOp(left=left, op=_ARITHMETIC[operator], right=right)
+            return _boolean(ast.Compare(
+                left=left, ops=[_COMPARISON[operator]], comparators=[right]))
+        if node.operand_type == ValueType.BOOLEAN:
+            return _boolean(ast.Compare(
+                left=left, ops=[_IDENTITY[operator]], comparators=[right]))
+        if node.operand_type == ValueType.STRING:
+            return _helper('_concat', left, right)
+
+        return _helper(_INFIX_HELPERS[operator], left, right)
+
+    def visit_ArrayLiteral(self, node: ArrayLiteral) -> ast.expr:
+        elements = self._values(node.elements)
+        return _helper('_list', ast.List(elts=elements, ctx=ast.Load()))
+
+    def visit_MapLiteral(self, node: MapLiteral) -> ast.expr:
+        items = self._values(node.entries)
+        return _helper('_map', ast.List(elts=items, ctx=ast.Load()))
+
+    def visit_Length(self, node: Length) -> ast.expr:
+        assert node.argument is not None
+        return _helper('_length', self.visit(node.argument))
+
+    def visit_Index(self, node: Index) -> ast.expr:
+        assert node.index is not None
+        left, position = self._values([node.left, node.index])
+        return _helper('_index', left, position)
+
+    def visit_If(self, node: If) -> ast.expr:
+        test = self._condition(node.condition)
+
+        consequence = self._expression(node.consequence)
+        alternative = self._expression(node.alternative) \
+            if node.alternative is not None else _name('NULL')
+        if consequence is not None and alternative is not None:
+            return ast.IfExp(test=test, body=consequence, orelse=alternative)
+
+        temporary = self._temporary()
+        self._out.append(self._if(node, test, temporary))
+        return _name(temporary)
+
+    # La expresion de un bloque que es solo una expresion sin statements
+    def _expression(self, block: Optional[Block]) -> Optional[ast.expr]:
+        if block is None or len(block.statements) != 1:
+            return None
+        statement = block.statements[0]
+        if type(statement) is not ExpressionStatement or statement.expression is None:
+            return None
+
+        outer = self._out
+        self._out = []
+        value = self.visit(statement.expression)
+        pending, self._out = self._out, outer
+        return value if not pending else None
+
+    def visit_Function(self, node: Function) -> ast.expr:
+        self._temporaries += 1
+        name = f'_funcion{self._temporaries}'
+        self._function(node, name)
+        return _name(name)
+
+    def visit_Call(self, node: Call) -> ast.expr:
+        assert node.function is not None
+        arguments = node.arguments or []
+        callee, *values = self._values([node.function, *arguments])
+
+        if node.tail and not self._continues(node):
+            return _helper('_TailCall', callee, ast.Tuple(elts=values, ctx=ast.Load()))
+
+        function = self._direct(node.function, len(arguments))
+        if function is None:
+            return _helper('_call', callee, *values)
+        call = ast.Call(func=callee, args=values, keywords=[])
+        return _helper('_bounce', call) if self._bounces(function) else call
+
+    # Llamada a la funcion que se esta generando como ciclo
+    def _continues(self, call: Call) -> bool:
+        return self._loop is not None and self._is_call_to(call, self._loop)
+
+    # Si la funcion tiene alguna llamada de cola que no sea la vuelta de
+    # su ciclo, sin contar las de las funciones de adentro
+    def _bounces(self, node: Function) -> bool:
+        bounces = self._bouncing.get(node)
+        if bounces is not None:
+            return bounces
+
+        loop = self._is_loop(node)
+        bounces = False
+        pending: list[ASTNode] = list(child_nodes(node))
+        while pending and not bounces:
+            child = pending.pop()
+            if type(child) is Function:
+                continue
+            if type(child) is Call and child.tail:
+                bounces = not (loop and self._is_call_to(child, node))
+            pending.extend(child_nodes(child))
+
+        self._bouncing[node] = bounces
+        return bounces
+
+    def _is_call_to(self, call: Call, function: Function) -> bool:
+        assert self._table is not None
+        if type(call.function) is not Identifier:
+            return False
+        symbol = self._table.definition(call.function)
+        return symbol is not None and self._functions.get(symbol) is function and \
+            len(call.arguments or []) == len(function.parameters)
+
+    # Si ya sabemos que el callee es una funcion con ese numero de
+    # parametros se llama sin revisar nada. Regresa esa funcion
+    def _direct(self, callee: Expression, arguments: int) -> Optional[Function]:
+        assert self._table is not None
+        function: Optional[Function] = None
+        if type(callee) is Function:
+            function = callee
+        elif type(callee) is Identifier:
+            symbol = self._table.definition(callee)
+            function = self._functions.get(symbol) if symbol is not None else None
+        if function is not None and len(function.parameters) == arguments:
+            return function
+        return None
+
+
+# Funciones que usa el codigo generado cuando no sabe los tipos
+
+def _operator_error(operator: str, a: Any, b: Any) -> Any:
+    if type(a) is not type(b):
+        raise EvaluationError(
+            f'Discrepancia de tipos: {type_name(a)} {operator} {type_name(b)}')
+    raise EvaluationError(
+        f'Operador desconocido: {type_name(a)} {operator} {type_name(b)}')
+
+
+def _integer_operator(operator: str,
+                      operation: Callable[[int, int], Any]) -> Callable[[Any, Any], Any]:
+    def apply(a: Any, b: Any) -> Any:
+        if type(a) is int and type(b) is int:
+            return operation(a, b)
+        if type(a) is Array or type(b) is Array:
+            return array_infix(operator, a, b)
+        return _operator_error(operator, a, b)
+
+    return apply
+
+
+def _add(a: Any, b: Any) -> Any:
+    if type(a) is int and type(b) is int:
+        return a + b
+    if type(a) is Array or type(b) is Array:
+        return array_infix('+', a, b)
+    if type(a) is String and type(b) is String:
+        return concat(a, b)
+    return _operator_error('+', a, b)
+
+
+def _eq(a: Any, b: Any) -> Any:
+    if type(a) is int and type(b) is int:
+        return TRUE if a == b else FALSE
+    if type(a) is Array or type(b) is Array:
+        return array_infix('==', a, b)
+    return TRUE if a == b else FALSE
+
+
+def _ne(a: Any, b: Any) -> Any:
+    if type(a) is int and type(b) is int:
+        return TRUE if a != b else FALSE
+    if type(a) is Array or type(b) is Array:
+        return array_infix('!=', a, b)
+    return FALSE if a == b else TRUE
+
+
+def _neg(value: Any) -> Any:
+    if type(value) is Array:
+        return array_negate(value)
+    if type(value) is not int:
+        raise EvaluationError(f'Operador desconocido: -{type_name(value)}')
+    return -value
+
+
+def _not(value: Any) -> Any:
+    return TRUE if value is FALSE or value is NULL else FALSE
+
+
+# Llamada de cola pendiente que regresa el codigo generado
+class _TailCall:
+    __slots__ = ('function', 'arguments')
+
+    def __init__(self, function: Any, arguments: tuple[Any, ...]) -> None:
+        self.function = function
+        self.arguments = arguments
+
+
+# Llama a cualquier valor revisando que sea una funcion con ese numero de
+# parametros, y despues a las llamadas de cola que regrese (trampolin)
+def _call(function: Any, *arguments: Any) -> Any:
+    while True:
+        if type(function) is not FunctionType:
+            raise EvaluationError(f'No es una funcion: {type_name(function)}')
+
+        expected = function.__code__.co_argcount
+        if expected != len(arguments):
+            raise EvaluationError(f'Numero de argumentos incorrecto: se esperaban '
+                                  f'{expected} y se recibieron {len(arguments)}')
+
+        result = function(*arguments)
+        if type(result) is not _TailCall:
+            return result
+        function = result.function
+        arguments = result.arguments
+
+
+def _bounce(result: Any) -> Any:
+    if type(result) is _TailCall:
+        return _call(result.function, *result.arguments)
+    return result
+
+
+def _undefined(name: str) -> Any:
+    raise EvaluationError(f'Identificador no encontrado: {name}')
+
+
+_RUNTIME: dict[str, Any] = {
+    'TRUE': TRUE,
+    'FALSE': FALSE,
+    'NULL': NULL,
+    '_add': _add,
+    '_sub': _integer_operator('-', lambda a, b: a - b),
+    '_mul': _integer_operator('*', lambda a, b: a * b),
+    # Entre cero lanza ZeroDivisionError, que run convierte en Error
+    '_div': _integer_operator('/', lambda a, b: a // b),
+    '_lt': _integer_operator('<', lambda a, b: TRUE if a < b else FALSE),
+    '_gt': _integer_operator('>', lambda a, b: TRUE if a > b else FALSE),
+    '_eq': _eq,
+    '_ne': _ne,
+    '_neg': _neg,
+    '_not': _not,
+    '_call': _call,
+    '_TailCall': _TailCall,
+    '_bounce': _bounce,
+    '_undefined': _undefined,
+    '_list': make_list,
+    '_map': make_map,
+    '_index': index,
+    '_length': length,
+    '_string': intern,
+    '_concat': concat,
+}
+
+
+def transpile(program: Program) -> ast.Module:
+    return Transpiler().transpile(program)
+
+
+# Parsea, transpila y compila el codigo, o regresa el code object que ya
+# se habia compilado para el mismo codigo
+def compile_source(source: str) -> CodeType:
+    key = sha256(source.encode('utf-8')).hexdigest()
+    code = _cache.get(key)
+    if code is not None:
+        return code
+
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    if parser.errors:
+        raise SyntaxError('\n'.join(parser.errors))
+
+    code = compile(transpile(program), '<lpp>', 'exec')
+    if len(_cache) >= _CACHE_SIZE:
+        # Los diccionarios guardan el orden de insercion: sale el mas viejo
+        del _cache[next(iter(_cache))]
+    _cache[key] = code
+    return code
+
+
+# Ejecuta un code object de compile_source. Regresa el valor del programa
+# o un Error con el mismo mensaje que lpp.evaluator
+def run(code: CodeType) -> Any:
+    namespace = dict(_RUNTIME)
+    exec(code, namespace)
+
+    try:
+        return namespace['_programa']()
+    except EvaluationError as error:
+        return Error(error.message)
+    except ZeroDivisionError:
+        return Error('Division entre cero')
+    except RecursionError:
+        return Error('Limite de recursion excedido')
+    except NameError as error:
+        # Una variable que se lee antes de definirse
+        name = error.name
+        if name is None:
+            match = _QUOTED_NAME.search(str(error))
+            name = match.group(1) if match else '?'
+        return Error(f'Identificador no encontrado: {name.rsplit("_", 1)[0]}')
+
+
+def execute(program: Program) -> Any:
+    return run(compile(transpile(program), '<lpp>', 'exec'))
+
+
+def execute_source(source: str) -> Any:
+    return run(compile_source(source))
@@ -0,0 +1,344 @@
+from copy import copy
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from lpp.ast import ASTNode
+
+'''
+    Visitors y transformers para recorrer el AST.
+
+    Cada clase de nodo declara en `_fields` los atributos que guardan hijos.
+    La primera vez que vemos una clase precalculamos cuales de esos campos
+    son listas y una funcion que regresa sus hijos, y tambien cacheamos que
+    metodo del visitor le corresponde. Asi el recorrido no tiene que hacer
+    cadenas de isinstance por cada nodo.
+'''
+
+
+# (nombre_del_campo, es_lista)
+FieldInfo = tuple[tuple[str, bool], ...]
+ChildrenFn = Callable[[ASTNode], Sequence[ASTNode]]
+
+_FIELDS: dict[type, FieldInfo] = {}
+_CHILDREN: dict[type, ChildrenFn] = {}
+
+
+def _is_list_annotation(annotation: Any) -> bool:
+    if get_origin(annotation) is list:
+        return True
+
+    # Optional[list[...]] es un Union con None
+    if get_origin(annotation) is Union:
+        return any(get_origin(arg) is list for arg in get_args(annotation))
+
+    return False
+
+
+def node_fields(node_class: type) -> FieldInfo:
+    try:
+        return _FIELDS[node_class]
+    except KeyError:
+        pass
+
+    # Las anotaciones del constructor nos dicen que campos son listas. Lo
+    # buscamos en el MRO para no leer __init__ desde la clase
+    init = next(klass.__dict__['__init__'] for klass in node_class.__mro__
+                if '__init__' in klass.__dict__)
+    hints = get_type_hints(init)
+    fields: FieldInfo = tuple(
+        (name, _is_list_annotation(hints.get(name)))
+        for name in node_class._fields  # type: ignore[attr-defined]
+    )
+    _FIELDS[node_class] = fields
+
+    return fields
+
+
+def _make_children_fn(node_class: type) -> ChildrenFn:
+    fields = node_fields(node_class)
+
+    if not fields:
+        return lambda node: ()
+
+    if len(fields) == 1:
+        name, is_list = fields[0]
+        get = attrgetter(name)
+
+        if is_list:
+            return lambda node: get(node) or ()
+
+        def single(node: ASTNode) -> Sequence[ASTNode]:
+            child = get(node)
+            return () if child is None else (child,)
+
+        return single
+
+    def many(node: ASTNode) -> Sequence[ASTNode]:
+        children: list[ASTNode] = []
+        for name, is_list in fields:
+            value = getattr(node, name)
+            if value is None:
+                continue
+            if is_list:
+                children.extend(value)
+            else:
+                children.append(value)
+
+        return children
+
+    return many
+
+
+def child_nodes(node: ASTNode) -> Sequence[ASTNode]:
+    try:
+        children_fn = _CHILDREN[type(node)]
+    except KeyError:
+        children_fn = _CHILDREN[type(node)] = _make_children_fn(type(node))
+
+    return children_fn(node)
+
+
+def iter_fields(node: ASTNode) -> Iterator[tuple[str, Any]]:
+    for name, _ in node_fields(type(node)):
+        yield name, getattr(node, name)
+
+
+# Recorrido iterativo en preorden, no depende del limite de recursion
+def walk(node: ASTNode) -> Iterator[ASTNode]:
+    stack: list[ASTNode] = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+
+        children = child_nodes(current)
+        if children:
+            stack.extend(reversed(children))
+
+
+# Copia los nodos de un subarbol (los tokens y los demas atributos se
+# comparten). Un nodo que este en `replacements` se cambia por una copia de
+# su reemplazo, una copia distinta cada vez que aparece
+def copy_tree(node: ASTNode,
+              replacements: Optional[dict[ASTNode, ASTNode]] = None) -> ASTNode:
+    root: Optional[ASTNode] = None
+    # (original, padre de la copia, campo, indice en la lista o -1)
+    stack: list[tuple[ASTNode, Optional[ASTNode], str, int]] = [(node, None, '', -1)]
+
+    while stack:
+        original, parent, name, index = stack.pop()
+
+        if replacements and original in replacements:
+            current = copy_tree(replacements[original])
+        else:
+            current = copy(original)
+            for field, is_list in node_fields(type(original)):
+                value = getattr(original, field)
+                if value is None:
+                    continue
+                if is_list:
+                    setattr(current, field, list(value))
+                    stack.extend((child, current, field, position)
+                                 for position, child in enumerate(value))
+                else:
+                    stack.append((value, current, field, -1))
+
+        if parent is None:
+            root = current
+        elif index < 0:
+            setattr(parent, name, current)
+        else:
+            getattr(parent, name)[index] = current
+
+    assert root is not None
+    return root
+
+
+# Busca el metodo `prefijo + NombreDeClase` siguiendo el MRO del nodo, asi
+# visit_Expression atrapa a todas las expresiones que no tengan uno propio
+def _find_method(visitor_class: type,
+                 prefix: str,
+                 node_class: type) -> Optional[Callable[..., Any]]:
+    for klass in node_class.__mro__:
+        method = getattr(visitor_class, prefix + klass.__name__, None)
+        if method is not None:
+            return method
+
+    return None
+
+
+class NodeVisitor:
+    # Cache por subclase de visitor: clase de nodo -> funcion
+    _visit_methods: dict[type, Callable[..., Any]] = {}
+    _enter_methods: dict[type, Optional[Callable[..., Any]]] = {}
+    _leave_methods: dict[type, Optional[Callable[..., Any]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._visit_methods = {}
+        cls._enter_methods = {}
+        cls._leave_methods = {}
+
+    def visit(self, node: ASTNode) -> Any:
+        try:
+            method = self._visit_methods[type(node)]
+        except KeyError:
+            method = _find_method(type(self), 'visit_', type(node)) or \
+                type(self).generic_visit
+            self._visit_methods[type(node)] = method
+
+        return method(self, node)
+
+    def generic_visit(self, node: ASTNode) -> Any:
+        for child in child_nodes(node):
+            self.visit(child)
+
+    # Recorrido sin recursion para arboles muy profundos. Llama a
+    # enter_<Clase> en preorden (si regresa False no se visitan los hijos
+    # ni se llama a leave) y a leave_<Clase> en postorden
+    def traverse(self, node: ASTNode) -> None:
+        enter_methods = self._enter_methods
+        leave_methods = self._leave_methods
+        visitor_class = type(self)
+
+        stack: list[tuple[ASTNode, bool]] = [(node, False)]
+        while stack:
+            current, leaving = stack.pop()
+            node_class = type(current)
+
+            if leaving:
+                leave = leave_methods[node_class]
+                if leave is not None:
+                    leave(self, current)
+                continue
+
+            try:
+                enter = enter_methods[node_class]
+            except KeyError:
+                enter = enter_methods[node_class] = \
+                    _find_method(visitor_class, 'enter_', node_class)
+                leave_methods[node_class] = \
+                    _find_method(visitor_class, 'leave_', node_class)
+
+            if enter is not None and enter(self, current) is False:
+                continue
+
+            stack.append((current, True))
+            children = child_nodes(current)
+            for index in range(len(children) - 1, -1, -1):
+                stack.append((children[index], False))
+
+
+# Resultado de transformar un nodo: el mismo nodo, uno nuevo, None para
+# eliminarlo o una lista para reemplazarlo por varios (solo en campos lista)
+TransformResult = Union[ASTNode, list[ASTNode], None]
+
+
+def _assign_field(node: ASTNode,
+                  name: str,
+                  is_list: bool,
+                  results: Sequence[TransformResult]) -> None:
+    if not is_list:
+        setattr(node, name, results[0])
+        return
+
+    new_values: list[ASTNode] = []
+    for result in results:
+        if result is None:
+            continue
+        if isinstance(result, list):
+            new_values.extend(result)
+        else:
+            new_values.append(result)
+
+    setattr(node, name, new_values)
+
+
+class NodeTransformer(NodeVisitor):
+
+    def generic_visit(self, node: ASTNode) -> TransformResult:
+        for name, is_list in node_fields(type(node)):
+            value = getattr(node, name)
+            if value is None:
+                continue
+
+            if is_list:
+                _assign_field(node, name, True,
+                              [self.visit(child) for child in value])
+            else:
+                setattr(node, name, self.visit(value))
+
+        return node
+
+    # Version iterativa y de abajo hacia arriba: primero se transforman los
+    # hijos y despues se llama a leave_<Clase>, cuyo resultado reemplaza al
+    # nodo. Si enter_<Clase> regresa False el subarbol se deja intacto
+    def transform(self, node: ASTNode) -> TransformResult:
+        enter_methods = self._enter_methods
+        leave_methods = self._leave_methods
+        visitor_class = type(self)
+
+        results: list[TransformResult] = []
+        # (nodo, campos con cuantos hijos tenia cada uno) o (nodo, None)
+        stack: list[tuple[ASTNode, Optional[list[tuple[str, bool, int]]]]] = \
+            [(node, None)]
+
+        while stack:
+            current, layout = stack.pop()
+            node_class = type(current)
+
+            if layout is not None:
+                total = sum(count for _, _, count in layout)
+                children_results = results[len(results) - total:]
+                del results[len(results) - total:]
+
+                offset = 0
+                for name, is_list, count in layout:
+                    if count:
+                        _assign_field(current, name, is_list,
+                                      children_results[offset:offset + count])
+                        offset += count
+
+                leave = leave_methods[node_class]
+                results.append(current if leave is None else leave(self, current))
+                continue
+
+            try:
+                enter = enter_methods[node_class]
+            except KeyError:
+                enter = enter_methods[node_class] = \
+                    _find_method(visitor_class, 'enter_', node_class)
+                leave_methods[node_class] = \
+                    _find_method(visitor_class, 'leave_', node_class)
+
+            if enter is not None and enter(self, current) is False:
+                results.append(current)
+                continue
+
+            new_layout: list[tuple[str, bool, int]] = []
+            children: list[ASTNode] = []
+            for name, is_list in node_fields(node_class):
+                value = getattr(current, name)
+                if value is None:
+                    new_layout.append((name, is_list, 0))
+                elif is_list:
+                    new_layout.append((name, is_list, len(value)))
+                    children.extend(value)
+                else:
+                    new_layout.append((name, is_list, 1))
+                    children.append(value)
+
+            stack.append((current, new_layout))
+            for index in range(len(children) - 1, -1, -1):
+                stack.append((children[index], None))
+
+        return results[0]
@@ -0,0 +1,427 @@
+from typing import (
+    Any,
+    Optional,
+)
+
+from lpp.arrays import (
+    array_infix,
+    array_negate,
+)
+from lpp.ast import (
+    Identifier,
+    Infix,
+    Program,
+)
+from lpp.code import (
+    Bytecode,
+    CompiledFunction,
+    CONSTANT_OPERAND,
+    LOCAL_CONSTANT_OPERANDS,
+    LOCAL_OPERAND,
+    OpCode,
+    OPERATOR_SYMBOLS,
+)
+from lpp.compiler import compile_program
+from lpp.containers import (
+    index,
+    length,
+    make_list,
+    make_map,
+)
+from lpp.evaluator import EvaluationError
+from lpp.object import (
+    Array,
+    Cell,
+    CompiledClosure,
+    Environment,
+    Error,
+    FALSE,
+    MemoCache,
+    NULL,
+    String,
+    TRUE,
+    type_name,
+)
+from lpp.purity import stale_functions
+from lpp.strings import concat
+
+'''
+    Maquina virtual de pila para el bytecode de lpp.compiler.
+
+    Todo el programa corre en un solo ciclo: lee [opcode, operando], elige
+    el rango del opcode (ver lpp.code.OpCode), lo compara con una cadena de
+    if ordenada por frecuencia y ejecuta la instruccion ahi mismo, sin
+    llamar a un metodo por nodo. Las llamadas de
+    lpp no usan la pila de Python: guardamos el estado de la funcion que
+    llama en una lista, asi que la profundidad de la recursion solo depende
+    de max_depth. TAIL_CALL no agrega nada a esa lista: la funcion llamada
+    toma el lugar de la actual y regresa directo a quien llamo a esta, asi
+    que la recursion de cola corre en memoria constante.
+
+    Las funciones marcadas por lpp.purity se memorizan como en
+    lpp.evaluator: una llamada que no esta en el cache guarda (cache,
+    argumentos) junto al estado de la funcion y RETURN guarda el resultado.
+
+    Los operadores con arreglos salen de la rama de dos enteros y van a
+    lpp.arrays, y la suma de dos textos a lpp.strings.
+
+    Da los mismos resultados y los mismos errores que lpp.evaluator.
+'''
+
+
+_CONSTANT = int(OpCode.CONSTANT)
+_TRUE = int(OpCode.TRUE)
+_FALSE = int(OpCode.FALSE)
+_NULL = int(OpCode.NULL)
+_POP = int(OpCode.POP)
+_ADD = int(OpCode.ADD)
+_SUB = int(OpCode.SUB)
+_MUL = int(OpCode.MUL)
+_DIV = int(OpCode.DIV)
+_LT = int(OpCode.LT)
+_GT = int(OpCode.GT)
+_EQ = int(OpCode.EQ)
+_NE = int(OpCode.NE)
+_NEG = int(OpCode.NEG)
+_NOT = int(OpCode.NOT)
+_JUMP = int(OpCode.JUMP)
+_JUMP_IF_FALSE = int(OpCode.JUMP_IF_FALSE)
+_GET_LOCAL = int(OpCode.GET_LOCAL)
+_SET_LOCAL = int(OpCode.SET_LOCAL)
+_GET_CELL = int(OpCode.GET_CELL)
+_SET_CELL = int(OpCode.SET_CELL)
+_GET_FREE = int(OpCode.GET_FREE)
+_GET_GLOBAL = int(OpCode.GET_GLOBAL)
+_UNDEFINED = int(OpCode.UNDEFINED)
+_CLOSURE = int(OpCode.CLOSURE)
+_CALL = int(OpCode.CALL)
+_TAIL_CALL = int(OpCode.TAIL_CALL)
+_RETURN = int(OpCode.RETURN)
+_ARRAY = int(OpCode.ARRAY)
+_INDEX = int(OpCode.INDEX)
+_MAP = int(OpCode.MAP)
+_LENGTH = int(OpCode.LENGTH)
+
+
+# El identificador de la instruccion, o el de la derecha de un operador
+def _undefined(function: CompiledFunction, position: int) -> Any:
+    source = function.sources[position // 2]
+    if isinstance(source, Infix):
+        source = source.right if isinstance(source.right, Identifier) else source.left
+    name = source.value if isinstance(source, Identifier) else '?'
+    raise EvaluationError(f'Identificador no encontrado: {name}')
+
+
+# Error de un operador binario que no son dos enteros (o `/` entre cero)
+def _binary_error(opcode: int, a: Any, b: Any) -> Any:
+    operator = OPERATOR_SYMBOLS[opcode]
+    if type(a) is int and type(b) is int:
+        raise EvaluationError('Division entre cero')
+    if type(a) is not type(b):
+        raise EvaluationError(
+            f'Discrepancia de tipos: {type_name(a)} {operator} {type_name(b)}')
+    raise EvaluationError(
+        f'Operador desconocido: {type_name(a)} {operator} {type_name(b)}')
+
+
+# Globales que lee una funcion compilada y las que crea dentro
+def _global_reads(function: CompiledFunction) -> list[int]:
+    slots: list[int] = []
+    pending = [function]
+    while pending:
+        current = pending.pop()
+        code = current.code
+        for position in range(0, len(code), 2):
+            if code[position] == _GET_GLOBAL:
+                slots.append(code[position + 1])
+            elif code[position] == _CLOSURE:
+                pending.append(current.constants[code[position + 1]])
+    return slots
+
+
+class VM:
+
+    def __init__(self,
+                 environment: Optional[Environment] = None,
+                 max_depth: int = 100_000,
+                 memoize: bool = True,
+                 memo_size: int = 1024) -> None:
+        self.environment = environment if environment is not None else Environment()
+        self.max_depth = max_depth
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.memo_caches: dict[CompiledFunction, MemoCache] = {}
+
+    # Compila el programa contra las globales del entorno y lo ejecuta
+    def execute(self, program: Program) -> Any:
+        return self.run(compile_program(program, self.environment.names))
+
+    def run(self, bytecode: Bytecode) -> Any:
+        environment = self.environment
+        environment.names = bytecode.globals
+        missing = len(bytecode.globals) - len(environment.values)
+        if missing > 0:
+            environment.values.extend([None] * missing)
+
+        self.memo_caches = {}
+        if self.memoize and bytecode.redefined:
+            self._unmark_stale(bytecode.redefined)
+        try:
+            return self._run(bytecode)
+        except EvaluationError as error:
+            return Error(error.message)
+
+    # Como en lpp.evaluator: las funciones de programas anteriores que usan
+    # una global que este programa vuelve a definir dejan de memorizarse
+    def _unmark_stale(self, redefined: set[int]) -> None:
+        values = self.environment.values
+
+        def function_at(slot: int) -> Optional[CompiledFunction]:
+            value = values[slot] if slot < len(values) else None
+            return value.function if type(value) is CompiledClosure else None
+
+        functions = [value.function for value in values if type(value) is CompiledClosure]
+        for function in stale_functions(functions, redefined, _global_reads, function_at):
+            function.memoize = False
+
+    def _run(self, bytecode: Bytecode) -> Any:
+        globals_ = self.environment.values
+        max_depth = self.max_depth
+        memoize = self.memoize
+        caches = self.memo_caches
+
+        function: CompiledFunction = bytecode.main
+        code = function.code
+        # Las de la funcion actual, que puede venir de otro programa
+        constants = function.constants
+        frame: list[Any] = globals_
+        closure: Optional[CompiledClosure] = None
+        ip = 0
+        # Inicio en la pila de los valores de la funcion actual
+        base = 0
+        stack: list[Any] = []
+        # Cache y argumentos donde guardar lo que regrese la funcion actual
+        memo: Optional[tuple[MemoCache, tuple[Any, ...]]] = None
+        # (funcion, codigo, ip, frame, closure, base, memo) de quien llamo
+        calls: list[tuple[Any, ...]] = []
+
+        while True:
+            opcode = code[ip]
+            operand = code[ip + 1]
+            ip += 2
+
+            if opcode < 10:
+                if opcode == _GET_LOCAL:
+                    value = frame[operand]
+                elif opcode == _CONSTANT:
+                    stack.append(constants[operand])
+                    continue
+                elif opcode == _GET_GLOBAL:
+                    value = globals_[operand]
+                elif opcode == _GET_FREE:
+                    value = closure.cells[operand].value  # type: ignore
+                elif opcode == _GET_CELL:
+                    value = frame[operand].value
+                elif opcode == _TRUE:
+                    value = TRUE
+                elif opcode == _FALSE:
+                    value = FALSE
+                else:
+                    value = NULL
+
+                if value is None:
+                    _undefined(function, ip - 2)
+                stack.append(value)
+
+            elif opcode < 50:
+                if opcode < _NEG:
+                    b = stack.pop()
+                elif opcode < 20:
+                    value = stack[-1]
+                    if opcode == _NOT:
+                        stack[-1] = TRUE if value is FALSE or value is NULL else FALSE
+                    elif type(value) is int:
+                        stack[-1] = -value
+                    elif type(value) is Array:
+                        stack[-1] = array_negate(value)
+                    else:
+                        raise EvaluationError(f'Operador desconocido: -{type_name(value)}')
+                    continue
+                # Valores que no pasaron por la pila (ver lpp.code.OpCode)
+                elif opcode < 30:
+                    b = constants[operand]
+                    opcode -= CONSTANT_OPERAND
+                elif opcode < 40:
+                    b = frame[operand]
+                    if b is None:
+                        _undefined(function, ip - 2)
+                    opcode -= LOCAL_OPERAND
+                else:
+                    a = frame[operand & 255]
+                    if a is None:
+                        _undefined(function, ip - 2)
+                    stack.append(a)
+                    b = constants[operand >> 8]
+                    opcode -= LOCAL_CONSTANT_OPERANDS
+                a = stack[-1]
+                if type(a) is int and type(b) is int:
+                    if opcode == _ADD:
+                        stack[-1] = a + b
+                    elif opcode == _SUB:
+                        stack[-1] = a - b
+                    elif opcode == _LT:
+                        stack[-1] = TRUE if a < b else FALSE
+                    elif opcode == _MUL:
+                        stack[-1] = a * b
+                    elif opcode == _GT:
+                        stack[-1] = TRUE if a > b else FALSE
+                    elif opcode == _EQ:
+                        stack[-1] = TRUE if a == b else FALSE
+                    elif opcode == _NE:
+                        stack[-1] = TRUE if a != b else FALSE
+                    elif b != 0:
+                        stack[-1] = a // b
+                    else:
+                        _binary_error(opcode, a, b)
+                elif type(a) is Array or type(b) is Array:
+                    stack[-1] = array_infix(OPERATOR_SYMBOLS[opcode], a, b)
+                elif opcode == _ADD and type(a) is String and type(b) is String:
+                    stack[-1] = concat(a, b)
+                elif opcode == _EQ:
+                    stack[-1] = TRUE if a == b else FALSE
+                elif opcode == _NE:
+                    stack[-1] = FALSE if a == b else TRUE
+                else:
+                    _binary_error(opcode, a, b)
+
+            elif opcode == _JUMP_IF_FALSE:
+                value = stack.pop()
+                if value is FALSE or value is NULL:
+                    ip = operand
+            elif opcode == _JUMP:
+                ip = operand
+            elif opcode == _CALL or opcode == _TAIL_CALL:
+                callee = stack[-operand - 1]
+                if type(callee) is not CompiledClosure:
+                    raise EvaluationError(f'No es una funcion: {type_name(callee)}')
+
+                target: CompiledFunction = callee.function
+                parameters = len(target.parameters)
+                if operand != parameters:
+                    raise EvaluationError(
+                        f'Numero de argumentos incorrecto: se esperaban '
+                        f'{parameters} y se recibieron {operand}')
+                if operand:
+                    arguments = stack[-operand:]
+                    del stack[-operand - 1:]
+                else:
+                    arguments = []
+                    stack.pop()
+
+                new_memo = None
+                if target.memoize and memoize:
+                    cache = caches.get(target)
+                    if cache is None:
+                        cache = caches[target] = MemoCache(target.name, self.memo_size)
+                    key = tuple(arguments)
+                    value = cache.get(key)
+                    if value is not None:
+                        if opcode == _CALL:
+                            stack.append(value)
+                            continue
+
+                        # Una llamada de cola que ya tiene resultado es un RETURN
+                        if memo is not None:
+                            memo[0].put(memo[1], value)
+                        if not calls:
+                            return value
+                        del stack[base:]
+                        function, code, ip, frame, closure, base, memo = calls.pop()
+                        constants = function.constants
+                        stack.append(value)
+                        continue
+                    new_memo = (cache, key)
+
+                if target.direct_arguments:
+                    if target.frame_size > operand:
+                        arguments.extend([None] * (target.frame_size - operand))
+                    new_frame = arguments
+                else:
+                    new_frame = [None] * target.frame_size
+                    for slot in target.cells:
+                        new_frame[slot] = Cell()
+                    for parameter, argument in zip(target.parameters, arguments):
+                        if parameter.boxed:
+                            new_frame[parameter.slot].value = argument
+                        else:
+                            new_frame[parameter.slot] = argument
+
+                if opcode == _CALL:
+                    if len(calls) >= max_depth:
+                        raise EvaluationError('Limite de recursion excedido')
+                    calls.append((function, code, ip, frame, closure, base, memo))
+                    base = len(stack)
+                    memo = new_memo
+                else:
+                    # Lo que la funcion actual tenia en la pila ya no se usa
+                    del stack[base:]
+                    if memo is None:
+                        memo = new_memo
+                function = target
+                code = target.code
+                constants = target.constants
+                ip = 0
+                frame = new_frame
+                closure = callee
+            elif opcode == _RETURN:
+                value = stack.pop()
+                if memo is not None:
+                    memo[0].put(memo[1], value)
+                if not calls:
+                    return value
+                del stack[base:]
+                function, code, ip, frame, closure, base, memo = calls.pop()
+                constants = function.constants
+                stack.append(value)
+            elif opcode == _POP:
+                stack.pop()
+            elif opcode == _SET_LOCAL:
+                frame[operand] = stack.pop()
+            elif opcode == _SET_CELL:
+                frame[operand].value = stack.pop()
+            elif opcode == _CLOSURE:
+                compiled: CompiledFunction = constants[operand]
+                if compiled.captures:
+                    cells = tuple(frame[index] if depth == 0 else
+                                  closure.cells[index]  # type: ignore
+                                  for depth, index in compiled.captures)
+                else:
+                    cells = ()
+                stack.append(CompiledClosure(compiled, cells))
+            elif opcode == _INDEX:
+                position = stack.pop()
+                stack[-1] = index(stack[-1], position)
+            elif opcode == _ARRAY:
+                if operand:
+                    elements = stack[-operand:]
+                    del stack[-operand:]
+                else:
+                    elements = []
+                stack.append(make_list(elements))
+            elif opcode == _MAP:
+                if operand:
+                    items = stack[-2 * operand:]
+                    del stack[-2 * operand:]
+                else:
+                    items = []
+                stack.append(make_map(items))
+            elif opcode == _LENGTH:
+                stack[-1] = length(stack[-1])
+            elif opcode == _UNDEFINED:
+                raise EvaluationError(f'Identificador no encontrado: {constants[operand]}')
+            else:
+                raise EvaluationError(f'Instruccion desconocida: {opcode}')
+
+
+def execute(program: Program, environment: Optional[Environment] = None) -> Any:
+    return VM(environment).execute(program)
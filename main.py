@@ -1,10 +1,12 @@
+from sys import argv
+
 from lpp.repl import start_repl
 
 def main() -> None:
     print('Lenguajes Formales y Automatas | Jesus David Benavides Chicaiza')
     print('Digita tu codigo a continuacion.')
 
-    start_repl()
+    start_repl(format_only='--formatear' in argv)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,130 @@
+from unittest import TestCase
+
+from lpp.ast import Program
+from lpp.code import (
+    Bytecode,
+    CompiledFunction,
+    disassemble,
+    OpCode,
+)
+from lpp.compiler import compile_program
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+class CompilerTest(TestCase):
+
+    def _compile(self, source: str) -> Bytecode:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        return compile_program(program)
+
+    def _opcodes(self, code: list[int]) -> list[OpCode]:
+        return [OpCode(code[position]) for position in range(0, len(code), 2)]
+
+    def test_expressions_and_statements(self) -> None:
+        bytecode = self._compile('variable a = 1; -a * 2 == 1; a;')
+
+        self.assertEqual(self._opcodes(bytecode.main.code), [
+            OpCode.CONSTANT, OpCode.SET_LOCAL,
+            OpCode.GET_LOCAL, OpCode.NEG, OpCode.MUL_CONSTANT, OpCode.EQ_CONSTANT,
+            OpCode.POP,
+            OpCode.GET_LOCAL, OpCode.RETURN,
+        ])
+        # Los enteros repetidos comparten constante
+        self.assertEqual(bytecode.constants, [1, 2])
+        self.assertEqual(bytecode.globals, ['a'])
+
+    def test_operands_in_instruction(self) -> None:
+        bytecode = self._compile('funcion(n) { variable a = n * 3; 1 + a < f(n) - 2 }')
+
+        self.assertEqual(disassemble(bytecode).split('\n')[4:], [
+            'funcion@0:',
+            '0000 MUL_LOCAL_CONSTANT 0 0 (3)',
+            '0002 SET_LOCAL 1',
+            '0004 CONSTANT 1 (1)',
+            '0006 ADD_LOCAL 1',
+            "0008 UNDEFINED 2 ('f')",
+            '0010 GET_LOCAL 0',
+            '0012 CALL 1',
+            '0014 SUB_CONSTANT 3 (2)',
+            '0016 LT',
+            '0018 RETURN',
+        ])
+
+    def test_if_jumps(self) -> None:
+        bytecode = self._compile('si (verdadero) { 1 } si_no { 2; 3 }; variable x = 0;')
+
+        self.assertEqual(disassemble(bytecode), '\n'.join([
+            '<programa>:',
+            '0000 TRUE',
+            '0002 JUMP_IF_FALSE 8',
+            '0004 CONSTANT 0 (1)',
+            '0006 JUMP 14',
+            '0008 CONSTANT 1 (2)',
+            '0010 POP',
+            '0012 CONSTANT 2 (3)',
+            '0014 POP',
+            '0016 CONSTANT 3 (0)',
+            '0018 SET_LOCAL 0',
+            '0020 NULL',
+            '0022 RETURN',
+        ]))
+
+    def test_functions_and_closures(self) -> None:
+        bytecode = self._compile('''
+            variable k = 1;
+            variable sumador = funcion(x) { funcion(y) { x + y + k } };
+            sumador(2)(3);
+            z;
+        ''')
+
+        self.assertEqual(disassemble(bytecode), '\n'.join([
+            '<programa>:',
+            '0000 CONSTANT 0 (1)',
+            '0002 SET_LOCAL 0',
+            '0004 CLOSURE 2 (<funcion@60>)',
+            '0006 SET_LOCAL 1',
+            '0008 GET_LOCAL 1',
+            '0010 CONSTANT 3 (2)',
+            '0012 CALL 1',
+            '0014 CONSTANT 4 (3)',
+            '0016 CALL 1',
+            '0018 POP',
+            '0020 UNDEFINED 5 (\'z\')',
+            '0022 RETURN',
+            '',
+            'funcion@60:',
+            '0000 CLOSURE 1 (<funcion@73>)',
+            '0002 RETURN',
+            '',
+            'funcion@73:',
+            '0000 GET_FREE 0',
+            '0002 ADD_LOCAL 0',
+            '0004 GET_GLOBAL 0',
+            '0006 ADD',
+            '0008 RETURN',
+        ]))
+
+        outer = bytecode.constants[2]
+        self.assertEqual(outer.cells, (0,))
+        self.assertFalse(outer.direct_arguments)
+        self.assertTrue(bytecode.constants[1].direct_arguments)
+
+    def test_tail_calls(self) -> None:
+        bytecode = self._compile('''
+            variable f = funcion(n) { si (n == 0) { retorna 0; } g(f(n - 1)) };
+            f(3);
+        ''')
+
+        function, = [constant for constant in bytecode.constants
+                     if isinstance(constant, CompiledFunction)]
+        opcodes = self._opcodes(function.code)
+        self.assertEqual(opcodes.count(OpCode.CALL), 1)
+        self.assertEqual(opcodes.count(OpCode.TAIL_CALL), 1)
+        self.assertLess(opcodes.index(OpCode.CALL), opcodes.index(OpCode.TAIL_CALL))
+        # En el programa no hay llamadas de cola
+        self.assertIn(OpCode.CALL, self._opcodes(bytecode.main.code))
@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+from lpp.ast import Program
+from lpp.cse import CommonSubexpressionElimination
+from lpp.lexer import Lexer
+from lpp.optimizer import PassStats
+from lpp.parser import Parser
+
+
+class CommonSubexpressionEliminationTest(TestCase):
+
+    def _eliminate(self, source: str) -> tuple[Program, PassStats]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        return program, CommonSubexpressionElimination().run(program)
+
+    def test_repeated_expression(self) -> None:
+        program, stats = self._eliminate('''
+            variable a = 2;
+            variable b = 3;
+            variable c = 4;
+            (a * b) + (a * b) * c;
+        ''')
+
+        self.assertEqual(str(program),
+                         'variable a = 2;variable b = 3;variable c = 4;'
+                         'variable _t1 = (a * b);(_t1 + (_t1 * c))')
+        self.assertEqual(stats.changes, 1)
+        # Se quito un (a * b) y se agregaron la temporal y dos referencias
+        self.assertEqual(stats.nodes_after, stats.nodes_before + 1)
+
+    def test_across_statements(self) -> None:
+        program, _ = self._eliminate('''
+            variable f = funcion(x, y) {
+                variable p = x * y + 1;
+                variable q = x * y + 1;
+                p + q;
+            };
+        ''')
+
+        self.assertEqual(str(program),
+                         'variable f = funcion(x, y) variable _t1 = ((x * y) + 1);'
+                         'variable p = _t1;variable q = _t1;(p + q);')
+
+    def test_largest_expression_first(self) -> None:
+        program, stats = self._eliminate('''
+            variable f = funcion(a, b) {
+                (a - b) * 2 + (a - b) * 2 + (a - b);
+            };
+        ''')
+
+        self.assertEqual(str(program),
+                         'variable f = funcion(a, b) variable _t1 = ((a - b) * 2);'
+                         '((_t1 + _t1) + (a - b));')
+        self.assertEqual(stats.changes, 1)
+
+    def test_fresh_names(self) -> None:
+        program, _ = self._eliminate('''
+            variable f = funcion(_t1, b) { _t1 + b - (_t1 + b) };
+        ''')
+
+        self.assertEqual(str(program),
+                         'variable f = funcion(_t1, b) variable _t2 = (_t1 + b);'
+                         '(_t2 - _t2);')
+
+    def test_different_bindings(self) -> None:
+        program, stats = self._eliminate('''
+            variable a = 1;
+            variable x = a + 1;
+            variable a = 2;
+            variable y = a + 1;
+            x + y;
+        ''')
+
+        self.assertEqual(stats.changes, 0)
+
+    def test_calls_and_branches_are_barriers(self) -> None:
+        tests: list[str] = [
+            # La llamada puede fallar o no terminar antes de la primera suma
+            'variable f = funcion(a, g) { g(a) + (a + 1) + (a + 1) };',
+            'variable f = funcion(a) { si (a > 1) { retorna 0 } + (a + 1) + (a + 1) };',
+            # Las ramas son otros scopes
+            'variable f = funcion(a) { si (a) { a + 1 } si_no { a + 1 } };',
+            # Identificadores sin definir
+            'x + 1; x + 1;',
+        ]
+
+        for source in tests:
+            _, stats = self._eliminate(source)
+            self.assertEqual(stats.changes, 0, source)
+
+    def test_arguments_before_call(self) -> None:
+        program, _ = self._eliminate(
+            'variable f = funcion(a, g) { g(a + 1) + g(a + 1) };')
+
+        self.assertEqual(str(program),
+                         'variable f = funcion(a, g) variable _t1 = (a + 1);'
+                         '(g(_t1) + g(_t1));')
+
+    def test_inner_blocks(self) -> None:
+        program, _ = self._eliminate('''
+            variable f = funcion(a) {
+                si (a > 1) { a * a - a * a } si_no { 0 };
+            };
+        ''')
+
+        self.assertEqual(str(program),
+                         'variable f = funcion(a) si (a > 1) variable _t1 = (a * a);'
+                         '(_t1 - _t1) si_no 0;')
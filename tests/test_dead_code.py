@@ -0,0 +1,148 @@
+from lpp.ast import Program
+from lpp.dead_code import DeadCodeElimination
+from lpp.evaluator import evaluate
+from lpp.folding import ConstantFolding
+from lpp.optimizer import (
+    optimize,
+    PassStats,
+)
+from tests.utils import ParsingTestCase
+
+
+class DeadCodeEliminationTest(ParsingTestCase):
+
+    def _eliminate(self, source: str) -> tuple[Program, PassStats]:
+        program = self._parse(source)
+        return program, DeadCodeElimination().run(program)
+
+    def test_statements_after_return(self) -> None:
+        program, stats = self._eliminate('''
+            variable f = funcion(x) {
+                retorna x;
+                x + 1;
+                retorna 2;
+            };
+            f(1);
+        ''')
+
+        self.assertEqual(str(program), 'variable f = funcion(x) retorna x;;f(1)')
+        self.assertEqual(stats.changes, 1)
+        self.assertEqual(stats.nodes_removed, 6)
+
+    def test_return_at_program_level(self) -> None:
+        program, _ = self._eliminate('5; retorna 10; 9;')
+
+        self.assertEqual(str(program), '5retorna 10;')
+
+    def test_constant_if_expression(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('variable x = si (verdadero) { 1 } si_no { 2 }; x;', 'variable x = 1;x'),
+            ('variable x = si (falso) { 1 } si_no { 2 }; x;', 'variable x = 2;x'),
+            ('variable x = si (0) { 1 }; x;', 'variable x = 1;x'),
+            ('variable x = si (falso) { 1 }; x;', 'variable x = si falso  ;x'),
+            ('variable x = si (verdadero) { 1; 2 } si_no { 3 }; x;',
+             'variable x = si verdadero 12 ;x'),
+            ('variable x = si (falso) { 1 } si_no { 2; 3 }; x;',
+             'variable x = si verdadero 23 ;x'),
+        ]
+
+        for source, expected in tests:
+            program, _ = self._eliminate(source)
+            self.assertEqual(str(program), expected, source)
+
+    def test_constant_if_statement(self) -> None:
+        program, _ = self._eliminate('''
+            variable f = funcion(x) {
+                si (verdadero) {
+                    x;
+                    retorna x * 2;
+                };
+                retorna x;
+            };
+            si (falso) { f(1) };
+            f(2);
+        ''')
+
+        self.assertEqual(str(program),
+                         'variable f = funcion(x) xretorna (x * 2);;f(2)')
+
+    def test_branch_with_definitions_is_not_inlined(self) -> None:
+        program, _ = self._eliminate('''
+            variable x = 1;
+            si (verdadero) { variable x = 2; x } si_no { 3 };
+            x;
+        ''')
+
+        self.assertEqual(str(program),
+                         'variable x = 1;si verdadero variable x = 2;x x')
+
+    def test_branch_with_for_is_not_inlined(self) -> None:
+        # El `para` define i en el bloque del `si`, no en el de afuera
+        source = '''
+            variable i = 100;
+            si (verdadero) { para (variable i = 0; i < 3; i = i + 1) { } };
+            i;
+        '''
+        program, _ = self._eliminate(source)
+
+        self.assertEqual(str(program), 'variable i = 100;si verdadero para '
+                                       '(variable i = 0; (i < 3); i = (i + 1))  i')
+
+        program = self._parse(source)
+        optimize(program)
+        self.assertEqual(evaluate(program), 100)
+
+    def test_block_value_is_kept(self) -> None:
+        program, _ = self._eliminate('''
+            variable f = funcion() { 1; si (falso) { 2 } };
+            f();
+        ''')
+
+        self.assertEqual(str(program), 'variable f = funcion() 1si falso  ;f()')
+
+    def test_unused_bindings(self) -> None:
+        program, stats = self._eliminate('''
+            variable a = 1;
+            variable b = a;
+            variable c = funcion(n) { c(n) };
+            variable d = a + 1;
+            variable e = desconocido;
+            variable usada = verdadero;
+            usada;
+        ''')
+
+        # d puede fallar y e no esta definido, asi que se quedan
+        self.assertEqual(str(program),
+                         'variable a = 1;variable d = (a + 1);'
+                         'variable e = desconocido;variable usada = verdadero;usada')
+        self.assertEqual(stats.changes, 2)
+
+    def test_redefinitions_are_kept(self) -> None:
+        program, _ = self._eliminate('''
+            variable f = funcion() { x };
+            variable x = 1;
+            variable x = 2;
+            f();
+        ''')
+
+        self.assertEqual(len(program.statements), 4)
+
+    def test_fixed_point(self) -> None:
+        program = self._parse('''
+            variable limite = 10;
+            variable log = funcion(mensaje) { mensaje };
+            variable f = funcion(x) {
+                si (1 > 2) { log(x) };
+                retorna x * 2;
+                log(x);
+            };
+            f(3);
+        ''')
+
+        history = optimize(program, [ConstantFolding(), DeadCodeElimination()])
+
+        self.assertEqual(str(program),
+                         'variable f = funcion(x) retorna (x * 2);;f(3)')
+        self.assertGreater(sum(stats.nodes_removed for stats in history), 0)
+        # La ultima ronda ya no cambia nada
+        self.assertEqual([stats.changes for stats in history[-2:]], [0, 0])
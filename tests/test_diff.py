@@ -0,0 +1,126 @@
+from typing import cast
+
+from lpp.ast import (
+    Identifier,
+    Infix,
+    Integer,
+    LetStatement,
+    Program,
+    Statement,
+)
+from lpp.diff import (
+    EditKind,
+    TreeDiff,
+    diff,
+)
+from lpp.visitor import copy_tree
+from tests.utils import ParsingTestCase
+
+
+class DiffTest(ParsingTestCase):
+
+    def _kinds(self, old: str, new: str) -> list[tuple[EditKind, str, str]]:
+        return [(edit.kind, str(edit.old), str(edit.new))
+                for edit in diff(self._parse(old), self._parse(new))]
+
+    def test_identical_programs(self) -> None:
+        source: str = 'variable x = suma(1, 2); si (x) { y } si_no { z };'
+
+        self.assertEqual(diff(self._parse(source), self._parse(source)), [])
+
+    def test_update_literal(self) -> None:
+        edits = self._kinds('variable x = suma(1, 2);',
+                            'variable x = suma(1, 5);')
+
+        self.assertEqual(edits, [(EditKind.UPDATE, '2', '5')])
+
+    def test_rename_identifier(self) -> None:
+        edits = self._kinds('variable x = 1; x + 2;', 'variable y = 1; y + 2;')
+
+        self.assertEqual(edits, [(EditKind.UPDATE, 'x', 'y'),
+                                 (EditKind.UPDATE, 'x', 'y')])
+
+    def test_insert_and_delete_statements(self) -> None:
+        edits = self._kinds('a; variable b = 2; c;', 'a; c; d(1);')
+
+        self.assertEqual(edits, [(EditKind.DELETE, 'variable b = 2;', 'None'),
+                                 (EditKind.INSERT, 'None', 'd(1)')])
+
+    def test_move_statement(self) -> None:
+        old: str = '''
+            variable suma = funcion(x, y) { x + y };
+            variable resta = funcion(x, y) { x - y };
+            suma(1, 2);
+        '''
+        new: str = '''
+            variable resta = funcion(x, y) { x - y };
+            variable suma = funcion(x, y) { x + y };
+            suma(1, 2);
+        '''
+        edits = diff(self._parse(old), self._parse(new))
+
+        self.assertEqual(len(edits), 1)
+        self.assertEqual(edits[0].kind, EditKind.MOVE)
+        self.assertIsInstance(edits[0].new, LetStatement)
+
+    def test_wrap_expression(self) -> None:
+        edits = self._kinds('variable z = x + y;', 'variable z = (x + y) * 2;')
+
+        self.assertEqual(edits, [(EditKind.INSERT, 'None', '((x + y) * 2)'),
+                                 (EditKind.MOVE, '(x + y)', '(x + y)')])
+
+    def test_mapping(self) -> None:
+        old: Program = self._parse('variable a = 1 + b;')
+        new: Program = self._parse('variable a = 1 - b;')
+
+        result = TreeDiff(old, new)
+        mapping = result.mapping
+
+        self.assertEqual(len(mapping), 6)
+        self.assertIs(mapping[old], new)
+        self.assertEqual([edit.kind for edit in result.edits], [EditKind.UPDATE])
+        self.assertIsInstance(result.edits[0].old, Infix)
+
+    def test_many_statements(self) -> None:
+        statements: list[str] = [f'variable x{i} = x{i - 1} * {i};'
+                                 for i in range(1, 2_000)]
+        old: Program = self._parse(''.join(statements))
+        statements[1_000] = 'variable x1001 = x1000 * 7;'
+        new: Program = self._parse(''.join(statements))
+
+        edits = diff(old, new)
+
+        self.assertEqual(len(edits), 1)
+        self.assertEqual(edits[0].kind, EditKind.UPDATE)
+        self.assertIsInstance(edits[0].old, Integer)
+        self.assertEqual(edits[0].new.value, 7)  # type: ignore
+
+    def test_repeated_statements(self) -> None:
+        statements: list[str] = [f'si (a < {i % 10}) {{ b * {i % 10} }};'
+                                 for i in range(1_000)]
+        old: Program = self._parse(''.join(statements))
+        changed: range = range(0, 1_000, 7)
+        for i in changed:
+            statements[i] = f'si (a < {i % 10 + 100}) {{ b * {i % 10 + 100} }};'
+        new: Program = self._parse(''.join(statements))
+
+        edits = diff(old, new)
+
+        self.assertEqual(len(edits), 2 * len(changed))
+        self.assertTrue(all(edit.kind == EditKind.UPDATE for edit in edits))
+        self.assertEqual({str(edit.new) for edit in edits},
+                         {str(i % 10 + 100) for i in changed})
+
+    def test_many_identical_statements(self) -> None:
+        # Cada copia se compara con pocas copias viejas, no con todas
+        statement = self._parse('variable x = a * 2;').statements[0]
+        inserted = self._parse('b;').statements[0]
+        old: Program = Program([cast(Statement, copy_tree(statement))
+                                for _ in range(20_000)])
+        new: Program = cast(Program, copy_tree(old))
+        new.statements.insert(10_000, inserted)
+
+        edits = diff(old, new)
+
+        self.assertEqual([(edit.kind, edit.new) for edit in edits],
+                         [(EditKind.INSERT, inserted)])
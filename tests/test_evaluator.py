@@ -0,0 +1,367 @@
+import sys
+from typing import (
+    Any,
+    Optional,
+)
+
+from lpp.evaluator import (
+    evaluate,
+    Evaluator,
+)
+from lpp.lexer import Lexer
+from lpp.object import (
+    Closure,
+    Environment,
+    Error,
+    FALSE,
+    NULL,
+    String,
+    TRUE,
+)
+from lpp.parser import Parser
+from lpp.strings import LEAF_SIZE
+from tests.utils import ParsingTestCase
+
+
+class EvaluatorTest(ParsingTestCase):
+
+    def _evaluate(self, source: str, environment: Optional[Environment] = None) -> Any:
+        return evaluate(self._parse(source), environment)
+
+    def _check(self, tests: list[tuple[str, Any]]) -> None:
+        for source, expected in tests:
+            evaluated = self._evaluate(source)
+            if type(expected) is int:
+                self.assertEqual(type(evaluated), int, source)
+                self.assertEqual(evaluated, expected, source)
+            else:
+                self.assertIs(evaluated, expected, source)
+
+    def test_integer_expressions(self) -> None:
+        self._check([
+            ('5', 5),
+            ('-10', -10),
+            ('5 + 5 + 5 + 5 - 10', 10),
+            ('2 * (5 + 10)', 30),
+            ('-50 + 100 + -50', 0),
+            ('7 / 2', 3),
+            ('-7 / 2', -4),
+            ('(5 + 10 * 2 + 15 / 3) * 2 + -10', 50),
+        ])
+
+    def test_boolean_expressions(self) -> None:
+        self._check([
+            ('verdadero', TRUE),
+            ('falso', FALSE),
+            ('1 < 2', TRUE),
+            ('1 > 2', FALSE),
+            ('1 == 1', TRUE),
+            ('1 != 1', FALSE),
+            ('verdadero == verdadero', TRUE),
+            ('verdadero != falso', TRUE),
+            ('(1 < 2) == verdadero', TRUE),
+            ('1 == verdadero', FALSE),
+            ('!verdadero', FALSE),
+            ('!!verdadero', TRUE),
+            ('!5', FALSE),
+        ])
+
+    def test_if_else(self) -> None:
+        self._check([
+            ('si (verdadero) { 10 }', 10),
+            ('si (falso) { 10 }', NULL),
+            ('si (1) { 10 }', 10),
+            ('si (1 > 2) { 10 } si_no { 20 }', 20),
+            ('si (1 < 2) { variable x = 1; }', NULL),
+        ])
+
+    def test_return(self) -> None:
+        self._check([
+            ('retorna 10; 9;', 10),
+            ('9; retorna 2 * 5; 9;', 10),
+            ('si (10 > 1) { si (10 > 1) { retorna 10; } retorna 1; }', 10),
+            ('variable f = funcion() { si (verdadero) { retorna 1; } 2 }; f() + 1', 2),
+        ])
+
+    def test_let_and_redefinition(self) -> None:
+        self._check([
+            ('variable a = 5; a;', 5),
+            ('variable a = 5 * 5; variable b = a; variable c = a + b + 5; c;', 55),
+            ('variable x = 1; variable x = x + 1; x;', 2),
+            ('variable x = 1; si (verdadero) { variable x = 2; }; x', 1),
+        ])
+
+    def test_functions_and_closures(self) -> None:
+        self._check([
+            ('variable identidad = funcion(x) { x }; identidad(5);', 5),
+            ('variable doble = funcion(x) { retorna 2 * x; }; doble(5);', 10),
+            ('variable suma = funcion(x, y) { x + y }; suma(5 + 5, suma(5, 5));', 20),
+            ('funcion(x) { x }(5)', 5),
+            ('''
+                variable sumador = funcion(x) { funcion(y) { x + y } };
+                variable mas_dos = sumador(2);
+                mas_dos(3);
+             ''', 5),
+            ('''
+                variable contador = funcion(n) {
+                    variable siguiente = funcion() { n + 1 };
+                    variable n = 10;
+                    siguiente()
+                };
+                contador(1);
+             ''', 11),
+            ('''
+                variable fib = funcion(n) {
+                    si (n < 2) { retorna n; }
+                    fib(n - 1) + fib(n - 2)
+                };
+                fib(15);
+             ''', 610),
+            ('''
+                variable f = funcion() {
+                    variable par = funcion(n) { si (n == 0) { verdadero } si_no { impar(n - 1) } };
+                    variable impar = funcion(n) { si (n == 0) { falso } si_no { par(n - 1) } };
+                    par(10)
+                };
+                f();
+             ''', TRUE),
+        ])
+
+        closure = self._evaluate('funcion(x, y) { x + y };')
+        self.assertIsInstance(closure, Closure)
+        self.assertEqual(str(closure), 'funcion(x, y)')
+
+    def test_errors(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('5 + verdadero;', 'Discrepancia de tipos: INTEGER + BOOLEAN'),
+            ('5 + verdadero; 5;', 'Discrepancia de tipos: INTEGER + BOOLEAN'),
+            ('-verdadero', 'Operador desconocido: -BOOLEAN'),
+            ('verdadero + falso;', 'Operador desconocido: BOOLEAN + BOOLEAN'),
+            ('si (10 > 1) { retorna verdadero * falso; }',
+             'Operador desconocido: BOOLEAN * BOOLEAN'),
+            ('foobar;', 'Identificador no encontrado: foobar'),
+            ('variable f = funcion() { g }; f(); variable g = 1;',
+             'Identificador no encontrado: g'),
+            ('5(1)', 'No es una funcion: INTEGER'),
+            ('1 / 0', 'Division entre cero'),
+            ('funcion(x) { x }()',
+             'Numero de argumentos incorrecto: se esperaban 1 y se recibieron 0'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate(source)
+            self.assertIsInstance(evaluated, Error, source)
+            self.assertEqual(evaluated.message, expected, source)
+
+    def test_tail_calls_do_not_grow_the_stack(self) -> None:
+        source = '''
+        variable cuenta = funcion(n, total) {
+            si (n == 0) { retorna total; }
+            cuenta(n - 1, total + 1)
+        };
+        variable par = funcion(n) { si (n == 0) { verdadero } si_no { retorna impar(n - 1); } };
+        variable impar = funcion(n) { si (n == 0) { falso } si_no { par(n - 1) } };
+'''
+
+        self.assertEqual(self._evaluate(source + 'cuenta(50000, 0)'), 50000)
+        self.assertIs(self._evaluate(source + 'par(30001)'), FALSE)
+
+    def test_deep_recursion(self) -> None:
+        source = '''
+        variable f = funcion(n) { si (n < 1) { 0 } si_no { 1 + f(n - 1) } };
+        f(20000)
+'''
+        limit = sys.getrecursionlimit()
+
+        self.assertEqual(self._evaluate(source), 20000)
+        self.assertEqual(sys.getrecursionlimit(), limit)
+
+        parser: Parser = Parser(Lexer(source))
+        result = Evaluator(max_depth=100).evaluate(parser.parse_program())
+        self.assertIsInstance(result, Error)
+        self.assertEqual(result.message, 'Limite de recursion excedido')
+
+        # Las llamadas que ya no usan la pila de Python hacen lo mismo
+        self._check([('''variable f = funcion(n) {
+                           si (n == 0) { retorna 7; };
+                           variable g = funcion(k) { k + n };
+                           g(f(n - 1))
+                       };
+                       f(2000)''', 2001007)])
+        error = self._evaluate(
+            'variable f = funcion(n) { si (n == 0) { retorna x; }; 1 + f(n - 1) }; f(300)')
+        self.assertIsInstance(error, Error)
+        self.assertEqual(error.message, 'Identificador no encontrado: x')
+
+    def test_for_loops(self) -> None:
+        self._check([
+            ('para (variable i = 0, t = 0; i < 4; i = i + 1, t = t + i) {}; t', 6),
+            ('para (variable i = 0; i < 100000; i = i + 1) {}; i', 100000),
+            ('para (variable i = 0; i < 3; i = i + 1) { variable i = 10; }; i', 3),
+            ('para (variable a = 1, b = 2; a < 2; a = b, b = a) {}; b * 10 + a', 12),
+            ('para (variable i = 0; i < 3; i = i + 1) {}', NULL),
+            ('para (; falso; ) {}', NULL),
+        ])
+
+    def test_arrays(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('[1, 2, 3]', '[1, 2, 3]'),
+            ('[]', '[]'),
+            ('variable a = [1, 2, 3]; a * 2 + a', '[3, 6, 9]'),
+            ('10 - [1, 2] / 2', '[10, 9]'),
+            ('-[1, -2]', '[-1, 2]'),
+            ('[1, 2, 3] < [3, 2, 1]', '[verdadero, falso, falso]'),
+            ('[verdadero, falso] != verdadero', '[falso, verdadero]'),
+            ('[9223372036854775807] + 1', '[-9223372036854775808]'),
+            ('variable x = 4; [x, x + 1]', '[4, 5]'),
+            ('variable a = [1, 2]; a == a', '[verdadero, verdadero]'),
+            ('[1, 2] == 2', '[falso, verdadero]'),
+        ]
+
+        for source, expected in tests:
+            self.assertEqual(str(self._evaluate(source)), expected, source)
+
+        self._check([
+            ('variable a = [5, 6, 7]; a[0] + a[2]', 12),
+            ('[verdadero, falso][1]', FALSE),
+        ])
+
+    def test_array_errors(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('[1, 9223372036854775808]', 'Entero fuera de rango para un arreglo'),
+            ('[1] + [1, 2]', 'Los arreglos tienen distinto tamano: 1 y 2'),
+            ('[1] + verdadero', 'Discrepancia de tipos: ARRAY + BOOLEAN'),
+            ('[verdadero] * falso', 'Operador desconocido: ARRAY * BOOLEAN'),
+            ('-[verdadero]', 'Operador desconocido: -ARRAY'),
+            ('[1, 2] / [1, 0]', 'Division entre cero'),
+            ('[1] + 9223372036854775808', 'Entero fuera de rango para un arreglo'),
+            ('[1][1]', 'Indice fuera de rango: 1'),
+            ('[1][-1]', 'Indice fuera de rango: -1'),
+            ('[1][verdadero]', 'Indice invalido: BOOLEAN'),
+            ('5[0]', 'No se puede indexar: INTEGER'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate(source)
+            self.assertIsInstance(evaluated, Error, source)
+            self.assertEqual(evaluated.message, expected, source)
+
+    def test_lists_and_maps(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('[1, verdadero, [2, 3]]', '[1, verdadero, [2, 3]]'),
+            ('variable x = falso; [x, 1]', '[falso, 1]'),
+            ('{1: verdadero, falso: [1, 2], [1, 2]: {}}', '{1: verdadero, falso: [1, 2], [1, 2]: {}}'),
+            ('{1: 2, 1: 3}', '{1: 3}'),
+        ]
+
+        for source, expected in tests:
+            self.assertEqual(str(self._evaluate(source)), expected, source)
+
+        self._check([
+            ('variable l = [1, verdadero, funcion(x) { x * 2 }]; l[2](l[0])', 2),
+            ('[1, [2, 3], verdadero][1][1]', 3),
+            ('variable m = {1: 10, verdadero: 20, [1, 2]: 30}; m[1] + m[verdadero] + m[[1, 2]]', 60),
+            ('variable f = funcion(x) { x }; {f: 5}[f]', 5),
+            ('tamano([1, verdadero]) + tamano([1, 2, 3]) + tamano({}) + tamano({1: 2})', 6),
+            ('[1, verdadero] == [1, verdadero]', TRUE),
+            ('{1: [verdadero, 2]} != {1: [verdadero, 2]}', FALSE),
+            ('[1, verdadero] == [1, falso]', FALSE),
+            ('{1: 2} == [1, falso]', FALSE),
+        ])
+
+    def test_list_and_map_errors(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('[1, verdadero][2]', 'Indice fuera de rango: 2'),
+            ('[1, verdadero][verdadero]', 'Indice invalido: BOOLEAN'),
+            ('{1: 2}[3]', 'Llave no encontrada: 3'),
+            ('{1: 2}[falso]', 'Llave no encontrada: falso'),
+            ('{1: 2}[[1]]', 'Llave no encontrada: ARRAY'),
+            ('tamano(5)', 'Argumento invalido para tamano: INTEGER'),
+            ('[1, verdadero] + 1', 'Discrepancia de tipos: LIST + INTEGER'),
+            ('{} + {}', 'Operador desconocido: MAP + MAP'),
+            ('-[1, verdadero]', 'Operador desconocido: -LIST'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate(source)
+            self.assertIsInstance(evaluated, Error, source)
+            self.assertEqual(evaluated.message, expected, source)
+
+    def test_strings(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('"hola" + " " + "mundo"', 'hola mundo'),
+            ('"a\\tb\\n\\"c\\"\\\\"', 'a\tb\n"c"\\'),
+            ('"abc"[1]', 'b'),
+            ('"" + "" + "x"', 'x'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate(source)
+            self.assertIsInstance(evaluated, String, source)
+            self.assertEqual(str(evaluated), expected, source)
+        self.assertEqual(str(self._evaluate('["a", 1]')), '[a, 1]')
+
+        self._check([
+            ('tamano("hola") + tamano("") + tamano("a\\n")', 6),
+            ('"ab" + "c" == "a" + "bc"', TRUE),
+            ('"a" != "a"', FALSE),
+            ('"1" == 1', FALSE),
+            ('{"a": 1, "ab": 2}["a" + "b"[0]]', 2),
+            ('{"ab": 1, "b": 2}["a" + "b"]', 1),
+        ])
+
+    def test_string_literals_are_interned(self) -> None:
+        self.assertIs(self._evaluate('"hola"'), self._evaluate('variable s = "hola"; s'))
+        self.assertIs(self._evaluate('"a" + ""'), self._evaluate('"a"'))
+
+    def test_string_concatenation(self) -> None:
+        source: str = '''
+            variable repite = funcion(n) {
+                para (variable i = 0, s = ""; i < n; i = i + 1, s = s + "abcdefghij") {};
+                s
+            };
+            repite(1000);
+        '''
+        evaluated = self._evaluate(source)
+
+        # Una cuerda con una hoja cada LEAF_SIZE caracteres, todavia sin unir
+        self.assertIsInstance(evaluated, String)
+        self.assertIsNone(evaluated.flat)
+        self.assertEqual(len(evaluated), 10_000)
+        leaves, nodes = 0, [evaluated]
+        while nodes:
+            node = nodes.pop()
+            if node.flat is not None:
+                self.assertLessEqual(len(node.flat), LEAF_SIZE)
+                leaves += 1
+            else:
+                nodes.extend((node.left, node.right))
+        self.assertLessEqual(leaves, 10_000 // (LEAF_SIZE - 10) + 1)
+
+        self.assertEqual(evaluated.value(), 'abcdefghij' * 1000)
+        self.assertIsNotNone(evaluated.flat)
+
+    def test_string_errors(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('"a" + 1', 'Discrepancia de tipos: STRING + INTEGER'),
+            ('"a" - "b"', 'Operador desconocido: STRING - STRING'),
+            ('"a" < "b"', 'Operador desconocido: STRING < STRING'),
+            ('-"a"', 'Operador desconocido: -STRING'),
+            ('"abc"[3]', 'Indice fuera de rango: 3'),
+            ('"abc"["a"]', 'Indice invalido: STRING'),
+            ('{1: 2}["a"]', 'Llave no encontrada: STRING'),
+            ('[1, 2] + "a"', 'Discrepancia de tipos: ARRAY + STRING'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate(source)
+            self.assertIsInstance(evaluated, Error, source)
+            self.assertEqual(evaluated.message, expected, source)
+
+    def test_environment_persists(self) -> None:
+        environment = Environment()
+
+        self._evaluate('variable a = 5; variable f = funcion(x) { x * a };', environment)
+        self._evaluate('variable b = f(2);', environment)
+        self.assertEqual(self._evaluate('a + b', environment), 15)
+        self.assertEqual(environment.names, ['a', 'f', 'b'])
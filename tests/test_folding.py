@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from lpp.ast import Program
+from lpp.folding import ConstantFolding
+from lpp.lexer import Lexer
+from lpp.optimizer import PassStats
+from lpp.parser import Parser
+
+
+class ConstantFoldingTest(TestCase):
+
+    def _fold(self, source: str) -> tuple[Program, PassStats]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        return program, ConstantFolding().run(program)
+
+    def test_arithmetic(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('variable x = 60 * 60 * 24;', 'variable x = 86400;'),
+            ('1 + 2 * 3 - 4;', '3'),
+            ('7 / 2;', '3'),
+            ('-7 / 2;', '-4'),
+            ('-(5 + 5);', '-10'),
+            ('--5;', '5'),
+        ]
+
+        for source, expected in tests:
+            program, _ = self._fold(source)
+            self.assertEqual(str(program), expected, source)
+
+    def test_comparisons_and_booleans(self) -> None:
+        tests: list[tuple[str, str]] = [
+            ('1 < 2;', 'verdadero'),
+            ('3 > 5 == verdadero;', 'falso'),
+            ('2 * 3 == 6;', 'verdadero'),
+            ('5 != 5;', 'falso'),
+            ('verdadero == falso;', 'falso'),
+            ('verdadero != falso;', 'verdadero'),
+            ('1 == verdadero;', 'falso'),
+            ('1 != verdadero;', 'verdadero'),
+            ('!verdadero;', 'falso'),
+            ('!!falso;', 'falso'),
+            ('!0;', 'falso'),
+        ]
+
+        for source, expected in tests:
+            program, _ = self._fold(source)
+            self.assertEqual(str(program), expected, source)
+
+    def test_runtime_errors_are_not_folded(self) -> None:
+        tests: list[str] = [
+            '(1 / 0)',
+            '(verdadero + falso)',
+            '(1 + verdadero)',
+            '(-verdadero)',
+            '(verdadero < falso)',
+        ]
+
+        for source in tests:
+            program, stats = self._fold(source + ';')
+            self.assertEqual(str(program), source)
+            self.assertEqual(stats.changes, 0)
+            self.assertEqual(stats.nodes_removed, 0)
+
+    def test_partial_folding(self) -> None:
+        program, stats = self._fold('x + 2 * 3; f(1 + 1, y); si (1 < 2) { 3 * 3 }')
+
+        self.assertEqual(str(program), '(x + 6)f(2, y)si verdadero 9 ')
+        self.assertEqual(stats.changes, 4)
+
+    def test_statistics(self) -> None:
+        program, stats = self._fold('variable x = 60 * 60 * 24;')
+
+        # Se quitaron dos Infix y dos de los tres enteros
+        self.assertEqual(stats.changes, 2)
+        self.assertEqual(stats.nodes_before, 8)
+        self.assertEqual(stats.nodes_after, 4)
+        self.assertEqual(stats.nodes_removed, 4)
+
+    def test_keeps_positions(self) -> None:
+        program, _ = self._fold('variable x = 2 * 3;')
+
+        value = program.statements[0].value  # type: ignore
+        self.assertEqual((value.start, value.end), (13, 18))
@@ -0,0 +1,214 @@
+from unittest import TestCase
+
+from lpp.ast import (
+    Call,
+    Function,
+    Infix,
+    Prefix,
+    Program,
+    ValueType,
+)
+from lpp.inference import (
+    infer_types,
+    Inference,
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.visitor import walk
+
+
+class InferenceTest(TestCase):
+
+    def _infer(self, source: str, predefined: list[str] = []) -> Inference:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        return infer_types(program, predefined)
+
+    def _operations(self, inference: Inference) -> list[tuple[str, str, str]]:
+        return [(str(node), node.inferred_type.name, node.operand_type.name)
+                for node in walk(inference.program)
+                if isinstance(node, (Infix, Prefix))]
+
+    def test_literals_and_variables(self) -> None:
+        inference = self._infer('''
+            variable a = 1;
+            variable b = a * 2 + 3;
+            variable c = b < 10;
+            c == verdadero;
+            !c;
+            -b;
+        ''')
+
+        self.assertEqual(self._operations(inference), [
+            ('((a * 2) + 3)', 'INTEGER', 'INTEGER'),
+            ('(a * 2)', 'INTEGER', 'INTEGER'),
+            ('(b < 10)', 'BOOLEAN', 'INTEGER'),
+            ('(c == verdadero)', 'BOOLEAN', 'BOOLEAN'),
+            ('(!c)', 'BOOLEAN', 'BOOLEAN'),
+            ('(-b)', 'INTEGER', 'INTEGER'),
+        ])
+        self.assertEqual(inference.errors, [])
+
+    def test_parameters_from_call_sites(self) -> None:
+        inference = self._infer('''
+            variable fact = funcion(n) {
+                si (n < 2) { retorna 1; }
+                n * fact(n - 1)
+            };
+            variable x = fact(10);
+            x + 1;
+        ''')
+
+        self.assertEqual(self._operations(inference), [
+            ('(n < 2)', 'BOOLEAN', 'INTEGER'),
+            ('(n * fact((n - 1)))', 'INTEGER', 'INTEGER'),
+            ('(n - 1)', 'INTEGER', 'INTEGER'),
+            ('(x + 1)', 'INTEGER', 'INTEGER'),
+        ])
+
+        function = inference.program.statements[0].value  # type: ignore
+        self.assertEqual(inference.return_types[function], ValueType.INTEGER)
+        calls = [node for node in walk(inference.program) if isinstance(node, Call)]
+        self.assertEqual([call.inferred_type for call in calls],
+                         [ValueType.INTEGER, ValueType.INTEGER])
+
+    def test_unknown_values(self) -> None:
+        inference = self._infer('''
+            variable doble = funcion(x) { x + x };
+            variable aplica = funcion(f) { f(1) };
+            aplica(doble);
+            variable suma = funcion(a) { a + 1 };
+            suma(1);
+            suma(verdadero);
+            variable k = 1;
+            variable lee = funcion() { k * 2 };
+            variable k = falso;
+            y - 1;
+        ''', ['y'])
+
+        # doble escapa, `a` puede ser entero o booleano, k se redefine con
+        # un booleano antes de que se llame a lee, y es predefinida
+        self.assertEqual([operand for _, _, operand in self._operations(inference)],
+                         ['UNKNOWN'] * 4)
+        self.assertEqual(inference.errors, [])
+
+        functions = [node for node in walk(inference.program)
+                     if isinstance(node, Function)]
+        self.assertEqual(functions[1].inferred_type, ValueType.FUNCTION)
+        self.assertEqual(inference.return_types[functions[1]], ValueType.UNKNOWN)
+
+    def test_if_values(self) -> None:
+        inference = self._infer('''
+            variable a = si (verdadero) { 1 } si_no { 2 };
+            variable b = si (verdadero) { 1 };
+            variable c = si (verdadero) { 1 } si_no { falso };
+            a + 1; b + 1; c + 1;
+        ''')
+
+        self.assertEqual([operand for _, _, operand in self._operations(inference)],
+                         ['INTEGER', 'UNKNOWN', 'UNKNOWN'])
+
+    def test_for_assignments(self) -> None:
+        inference = self._infer('''
+            para (variable i = 0, a = 0, b = 0; i < 3; i = i + 1, b = a == 0) {};
+            i + 1; a + 1; b + 1;
+        ''')
+
+        self.assertEqual([operand for _, _, operand in self._operations(inference)][-3:],
+                         ['INTEGER', 'INTEGER', 'UNKNOWN'])
+
+    def test_arrays(self) -> None:
+        inference = self._infer('''
+            variable a = [1, 2, 3];
+            variable b = a * 2 + 1;
+            -b;
+            a[0] + 1;
+            5[0];
+            a[verdadero];
+        ''')
+
+        self.assertEqual(self._operations(inference), [
+            ('((a * 2) + 1)', 'ARRAY', 'UNKNOWN'),
+            ('(a * 2)', 'ARRAY', 'UNKNOWN'),
+            ('(-b)', 'ARRAY', 'UNKNOWN'),
+            ('((a[0]) + 1)', 'UNKNOWN', 'UNKNOWN'),
+        ])
+        self.assertEqual(inference.errors, [
+            'No se puede indexar: INTEGER (posicion 123-127)',
+            'Indice invalido: BOOLEAN (posicion 141-153)',
+        ])
+
+    def test_lists_and_maps(self) -> None:
+        inference = self._infer('''
+            variable l = [1, verdadero];
+            variable m = {1: l};
+            l == l;
+            tamano(m) + 1;
+            l[verdadero];
+            m[verdadero];
+            tamano(1);
+            l + 1;
+        ''')
+
+        self.assertEqual(self._operations(inference), [
+            ('(l == l)', 'BOOLEAN', 'UNKNOWN'),
+            ('(tamano(m) + 1)', 'INTEGER', 'INTEGER'),
+            ('(l + 1)', 'INTEGER', 'UNKNOWN'),
+        ])
+        self.assertEqual([str(node) for node in inference.error_nodes],
+                         ['(l[verdadero])', 'tamano(1)', '(l + 1)'])
+        self.assertEqual(inference.errors[0].split(' (')[0], 'Indice invalido: BOOLEAN')
+        self.assertEqual(inference.errors[1].split(' (')[0],
+                         'Argumento invalido para tamano: INTEGER')
+        self.assertEqual(inference.errors[2].split(' (')[0],
+                         'Discrepancia de tipos: LIST + INTEGER')
+
+    def test_strings(self) -> None:
+        inference = self._infer('''
+            variable s = "a";
+            variable f = funcion(x) { x + "!" };
+            s + "b";
+            f(s)[0] + s;
+            s == "a";
+            s * s;
+            s + 1;
+            "abc"[s];
+            tamano(s) + 1;
+        ''')
+
+        self.assertEqual(self._operations(inference), [
+            ('(x + "!")', 'STRING', 'STRING'),
+            ('(s + "b")', 'STRING', 'STRING'),
+            ('((f(s)[0]) + s)', 'STRING', 'STRING'),
+            ('(s == "a")', 'BOOLEAN', 'UNKNOWN'),
+            ('(s * s)', 'INTEGER', 'UNKNOWN'),
+            ('(s + 1)', 'INTEGER', 'UNKNOWN'),
+            ('(tamano(s) + 1)', 'INTEGER', 'INTEGER'),
+        ])
+        self.assertEqual([error.split(' (')[0] for error in inference.errors], [
+            'Operador desconocido: STRING * STRING',
+            'Discrepancia de tipos: STRING + INTEGER',
+            'Indice invalido: STRING',
+        ])
+
+    def test_type_errors(self) -> None:
+        inference = self._infer('''
+            verdadero + 1;
+            falso * verdadero;
+            -falso;
+            variable n = 5;
+            n(1);
+            1 == verdadero;
+        ''')
+
+        self.assertEqual(inference.errors, [
+            'Discrepancia de tipos: BOOLEAN + INTEGER (posicion 13-26)',
+            'Operador desconocido: BOOLEAN * BOOLEAN (posicion 40-57)',
+            'Operador desconocido: -BOOLEAN (posicion 71-77)',
+            'No es una funcion: INTEGER (posicion 119-123)',
+        ])
+        self.assertEqual([str(node) for node in inference.error_nodes],
+                         ['(verdadero + 1)', '(falso * verdadero)', '(-falso)', 'n(1)'])
@@ -0,0 +1,123 @@
+from lpp.ast import (
+    Call,
+    Program,
+)
+from lpp.inlining import FunctionInlining
+from lpp.optimizer import (
+    optimize,
+    PassStats,
+)
+from lpp.visitor import walk
+from tests.utils import ParsingTestCase
+
+
+class FunctionInliningTest(ParsingTestCase):
+
+    def _inline(self, source: str, **options: float) -> tuple[Program, PassStats]:
+        program = self._parse(source)
+        return program, FunctionInlining(**options).run(program)  # type: ignore
+
+    def test_simple_helper(self) -> None:
+        program, stats = self._inline('''
+            variable suma = funcion(x, y) { x + y; };
+            variable a = 1;
+            suma(a, 2) * suma(3, a);
+        ''')
+
+        self.assertEqual(str(program.statements[2]), '((a + 2) * (3 + a))')
+        self.assertEqual(stats.changes, 2)
+
+    def test_complex_arguments_are_evaluated_once(self) -> None:
+        program, _ = self._inline('''
+            variable cuadrado = funcion(x) { retorna x * x; };
+            variable ignora = funcion(x) { 0 };
+            variable f = funcion(a) { cuadrado(a + 1) + ignora(a / 0) };
+        ''')
+
+        self.assertEqual(str(program.statements[2]),
+                         'variable f = funcion(a) variable _x1 = (a + 1);'
+                         'variable _x2 = (a / 0);((_x1 * _x1) + 0);')
+
+    def test_parameters_are_renamed(self) -> None:
+        program, _ = self._inline('''
+            variable f = funcion(x, y) { x - y };
+            variable g = funcion(x, y) { f(y, x) + f(x + y, x) };
+        ''')
+
+        self.assertEqual(str(program.statements[1]),
+                         'variable g = funcion(x, y) variable _x1 = (x + y);'
+                         '((y - x) + (_x1 - x));')
+
+    def test_free_variables_must_not_be_captured(self) -> None:
+        program, stats = self._inline('''
+            variable k = 10;
+            variable f = funcion(x) { x * k };
+            variable g = funcion(k) { f(k) };
+            variable h = funcion(n) { f(n) };
+        ''')
+
+        # Dentro de g, k es el parametro y no el k de afuera
+        self.assertEqual(str(program.statements[2]), 'variable g = funcion(k) f(k);')
+        self.assertEqual(str(program.statements[3]), 'variable h = funcion(n) (n * k);')
+        self.assertEqual(stats.changes, 1)
+
+    def test_undefined_names_must_not_be_captured(self) -> None:
+        program, stats = self._inline('''
+            variable f = funcion(x) { x * k };
+            variable g = funcion(k) { f(k) };
+            variable h = funcion(n) { f(n) };
+        ''')
+
+        self.assertEqual(str(program.statements[1]), 'variable g = funcion(k) f(k);')
+        self.assertEqual(str(program.statements[2]), 'variable h = funcion(n) (n * k);')
+        self.assertEqual(stats.changes, 1)
+
+    def test_not_inlinable(self) -> None:
+        tests: list[str] = [
+            # Recursiva
+            'variable f = funcion(n) { si (n < 1) { 0 } si_no { f(n - 1) } }; f(3);',
+            # Mas de un statement
+            'variable f = funcion(n) { variable m = n; m }; f(3);',
+            # Un retorna dentro del si regresaria de la funcion que llama
+            'variable f = funcion(n) { si (n) { retorna 1 } }; f(3);',
+            # Cuerpo con funciones
+            'variable f = funcion(n) { funcion() { n } }; f(3);',
+            # Redefinida
+            'variable f = funcion(n) { n }; variable f = funcion(n) { 0 }; f(3);',
+            # Numero de argumentos incorrecto
+            'variable f = funcion(n) { n }; f(3, 4);',
+            # Argumentos que se evaluarian antes de una llamada anterior
+            'variable f = funcion(n) { n }; variable g = funcion(h) { h(1) + f(h(2)) };',
+        ]
+
+        for source in tests:
+            _, stats = self._inline(source)
+            self.assertEqual(stats.changes, 0, source)
+
+    def test_size_budget(self) -> None:
+        source = '''
+            variable f = funcion(x) { x * x + x * x + x * x };
+            f(1); f(2); f(3); f(4); f(5); f(6);
+        '''
+
+        _, stats = self._inline(source, max_size=8)
+        self.assertEqual(stats.changes, 0)
+
+        _, stats = self._inline(source, growth=0.5)
+        self.assertLess(stats.changes, 6)
+
+        _, stats = self._inline(source, growth=10)
+        self.assertEqual(stats.changes, 6)
+
+    def test_with_other_passes(self) -> None:
+        program = self._parse('''
+            variable suma = funcion(x, y) { x + y; };
+            variable doble = funcion(x) { retorna suma(x, x); };
+            variable f = funcion(a) { doble(a) + suma(1, 2) };
+            f(5);
+        ''')
+
+        optimize(program)
+
+        self.assertEqual(str(program), '13')
+        self.assertFalse(any(type(node) is Call for node in walk(program)))
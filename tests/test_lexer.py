@@ -185,6 +185,81 @@ class LexerTest(TestCase):
         ]
         self.assertEqual(tokens, expected_tokens)
 
+    def test_brackets(self) -> None:
+        source: str = 'a[1, 2][0]'
+        lexer: Lexer = Lexer(source)
+
+        tokens: list[Token] = []
+        for i in range(10):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: list[Token] = [
+            Token(TokenType.IDENT, 'a'),
+            Token(TokenType.LBRACKET, '['),
+            Token(TokenType.INT, '1'),
+            Token(TokenType.COMMA, ','),
+            Token(TokenType.INT, '2'),
+            Token(TokenType.RBRACKET, ']'),
+            Token(TokenType.LBRACKET, '['),
+            Token(TokenType.INT, '0'),
+            Token(TokenType.RBRACKET, ']'),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEqual(tokens, expected_tokens)
+
+    def test_map_and_size(self) -> None:
+        source: str = '{a: 1}; tamano(a);'
+        lexer: Lexer = Lexer(source)
+
+        tokens: list[Token] = []
+        for i in range(11):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: list[Token] = [
+            Token(TokenType.LBRACE, '{'),
+            Token(TokenType.IDENT, 'a'),
+            Token(TokenType.COLON, ':'),
+            Token(TokenType.INT, '1'),
+            Token(TokenType.RBRACE, '}'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.LENGTH, 'tamano'),
+            Token(TokenType.LPAREN, '('),
+            Token(TokenType.IDENT, 'a'),
+            Token(TokenType.RPAREN, ')'),
+            Token(TokenType.SEMICOLON, ';'),
+        ]
+
+        self.assertEqual(tokens, expected_tokens)
+
+    def test_strings(self) -> None:
+        source: str = '"hola" + "a\\tb\\n\\"c\\"\\\\"; "";'
+        lexer: Lexer = Lexer(source)
+
+        tokens: list[Token] = []
+        for i in range(6):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: list[Token] = [
+            Token(TokenType.STRING, 'hola'),
+            Token(TokenType.PLUS, '+'),
+            Token(TokenType.STRING, 'a\tb\n"c"\\'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.STRING, ''),
+            Token(TokenType.SEMICOLON, ';'),
+        ]
+
+        self.assertEqual(tokens, expected_tokens)
+
+    def test_illegal_strings(self) -> None:
+        # Un escape desconocido o un texto sin cerrar es un solo ILLEGAL
+        lexer: Lexer = Lexer('"a\\q" 5 "abc')
+
+        self.assertEqual(lexer.next_token(), Token(TokenType.ILLEGAL, '"a\\q"'))
+        self.assertEqual(lexer.next_token(), Token(TokenType.INT, '5'))
+        self.assertEqual(lexer.next_token(), Token(TokenType.ILLEGAL, '"abc'))
+        self.assertEqual(lexer.next_token(), Token(TokenType.EOF, ''))
+
     def test_two_character_operator(self) -> None:
         source: str = '''
             10 == 10;
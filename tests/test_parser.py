@@ -1,5 +1,7 @@
 from unittest import TestCase
 from lpp.ast import (
+    Assignment,
+    For,
     LetStatement,
     Program,
     ReturnStatement,
@@ -13,7 +15,12 @@ from lpp.ast import (
     If,
     Block,
     Function,
-    Call
+    Call,
+    ArrayLiteral,
+    Index,
+    Length,
+    MapLiteral,
+    StringLiteral,
 ) 
 from lpp.lexer import Lexer
 from lpp.parser import Parser
@@ -186,7 +193,7 @@ class ParserTest(TestCase):
         self._test_literal_expression(expression_statement.expression, 5)
 
     def _test_integer(self,
-                      expression: Expression,
+                      expression: Optional[Expression],
                       expected_value: int) -> None:
         self.assertIsInstance(expression, Integer)
 
@@ -195,7 +202,7 @@ class ParserTest(TestCase):
         self.assertEquals(integer.token.literal, str(expected_value))
 
     def _test_boolean(self,
-                      expression: Expression,
+                      expression: Optional[Expression],
                       expected_value: Boolean) -> None:
         self.assertIsInstance(expression, Boolean)
 
@@ -366,6 +373,9 @@ class ParserTest(TestCase):
             ('suma(a, b, 1, 2 * 3, 4 + 5, suma(6, 7 * 8));',
              'suma(a, b, 1, (2 * 3), (4 + 5), suma(6, (7 * 8)))', 1),
             ('suma(a + b + c * d / f + g);', 'suma((((a + b) + ((c * d) / f)) + g))', 1),
+            ('a * [1, 2, 3, 4][b * c] * d;', '((a * ([1, 2, 3, 4][(b * c)])) * d)', 1),
+            ('suma(a * b[2], b[1], 2 * [1, 2][1]);',
+             'suma((a * (b[2])), (b[1]), (2 * ([1, 2][1])))', 1),
         ]
 
         for source, expected_result, expected_statement_count in test_sources:
@@ -583,6 +593,127 @@ class ParserTest(TestCase):
         self._test_literal_expression(call.arguments[0], 1)
         self._test_infix_expression(call.arguments[1], 2, '*', 3)
         self._test_infix_expression(call.arguments[2], 4, '+', 5)
-        
 
-    
\ No newline at end of file
+    def test_for_statement(self) -> None:
+        source: str = '''
+            para (variable i = 0, total = 0; i < 10; i = i + 1, total = total + i) {
+                total
+            }
+            para (; falso; ) {};
+        '''
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self.assertEquals(len(parser.errors), 0)
+        self.assertEquals(len(program.statements), 2)
+
+        loop = cast(For, program.statements[0])
+        self.assertIsInstance(loop, For)
+        self.assertEquals([str(variable) for variable in loop.variables],
+                          ['variable i = 0;', 'variable total = 0;'])
+        assert loop.condition is not None
+        self._test_infix_expression(loop.condition, 'i', '<', 10)
+
+        self.assertEquals(len(loop.updates), 2)
+        self.assertIsInstance(loop.updates[0], Assignment)
+        self.assertEquals(str(loop.updates[1]), 'total = (total + i)')
+        assert loop.body is not None
+        self.assertEquals(len(loop.body.statements), 1)
+
+        empty = cast(For, program.statements[1])
+        self.assertEquals(empty.variables, [])
+        self.assertEquals(empty.updates, [])
+        self.assertEquals(str(empty), 'para (; falso; ) ')
+
+    def test_array_and_index(self) -> None:
+        source: str = '[1, 2 * 3, verdadero][i + 1]; []; f(1)[0][1];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program, expected_statement_count=3)
+
+        index = cast(Index, cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(index, Index)
+        assert index.index is not None
+        self._test_infix_expression(index.index, 'i', '+', 1)
+
+        array = cast(ArrayLiteral, index.left)
+        self.assertIsInstance(array, ArrayLiteral)
+        self.assertEquals(len(array.elements), 3)
+        self._test_literal_expression(array.elements[0], 1)
+        self._test_infix_expression(array.elements[1], 2, '*', 3)
+        self._test_literal_expression(array.elements[2], True)
+
+        empty = cast(ArrayLiteral, cast(ExpressionStatement, program.statements[1]).expression)
+        self.assertEquals(empty.elements, [])
+        self.assertEquals(str(program.statements[2]), '((f(1)[0])[1])')
+
+    def test_map_and_size(self) -> None:
+        source: str = '{1: verdadero, a + 1: [2]}; {}; tamano(x)[0];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program, expected_statement_count=3)
+
+        map_literal = cast(MapLiteral, cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(map_literal, MapLiteral)
+        self.assertEquals(len(map_literal.keys), 2)
+        self._test_literal_expression(map_literal.keys[0], 1)
+        self._test_literal_expression(map_literal.values[0], True)
+        self._test_infix_expression(map_literal.keys[1], 'a', '+', 1)
+        self.assertEquals(str(map_literal.values[1]), '[2]')
+
+        empty = cast(MapLiteral, cast(ExpressionStatement, program.statements[1]).expression)
+        self.assertEquals(empty.keys, [])
+        self.assertEquals(empty.values, [])
+
+        index = cast(Index, cast(ExpressionStatement, program.statements[2]).expression)
+        self.assertIsInstance(index.left, Length)
+        self.assertEquals(str(index), '(tamano(x)[0])')
+
+    def test_string_literal(self) -> None:
+        source: str = '"hola\\n" + "mundo"; "a\\"b"[0];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program, expected_statement_count=2)
+
+        infix = cast(Infix, cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(infix.left, StringLiteral)
+        self.assertEquals(cast(StringLiteral, infix.left).value, 'hola\n')
+        self.assertEquals(cast(StringLiteral, infix.right).value, 'mundo')
+        # str regresa el literal con sus escapes
+        self.assertEquals(str(infix), '("hola\\n" + "mundo")')
+
+        index = cast(Index, cast(ExpressionStatement, program.statements[1]).expression)
+        self.assertEquals(cast(StringLiteral, index.left).value, 'a"b')
+        self.assertEquals(str(index), '("a\\"b"[0])')
+
+    def test_map_errors(self) -> None:
+        for source in ('{1 2}', '{1: 2,}', '{1: 2', 'tamano 5'):
+            parser: Parser = Parser(Lexer(source))
+            parser.parse_program()
+
+            self.assertNotEqual(parser.errors, [], source)
+
+    def test_for_errors(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('variable n = 1; para (; n > 0; n = n - 1) {}',
+             'Solo se pueden asignar las variables del para: n'),
+            ('para (variable i = 0; i < 3; i = i + 1, i = i + 2) {}',
+             'La variable i se asigna dos veces'),
+        ]
+
+        for source, expected in tests:
+            parser: Parser = Parser(Lexer(source))
+            parser.parse_program()
+
+            self.assertIn(expected, parser.errors)
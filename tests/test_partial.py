@@ -0,0 +1,118 @@
+from lpp.ast import (
+    Function,
+    Program,
+)
+from lpp.dead_code import DeadCodeElimination
+from lpp.folding import ConstantFolding
+from lpp.inlining import FunctionInlining
+from lpp.optimizer import (
+    optimize,
+    PassStats,
+)
+from lpp.partial import PartialEvaluation
+from lpp.visitor import walk
+from tests.utils import ParsingTestCase
+
+
+POTENCIA: str = '''
+    variable potencia = funcion(base, exp) {
+        si (exp == 0) { 1 } si_no { base * potencia(base, exp - 1) }
+    };
+'''
+
+
+class PartialEvaluationTest(ParsingTestCase):
+
+    def _specialize(self, source: str, **options: float) -> tuple[Program, PassStats]:
+        program = self._parse(source)
+        return program, PartialEvaluation(**options).run(program)  # type: ignore
+
+    def _functions(self, program: Program) -> int:
+        return sum(1 for node in walk(program) if type(node) is Function)
+
+    def test_recursion_on_constant_is_unrolled(self) -> None:
+        program, stats = self._specialize(POTENCIA + '''
+            variable f = funcion(x) { potencia(x, 2) };
+        ''')
+
+        self.assertEqual([str(statement) for statement in program.statements[1:]], [
+            'variable _potencia3 = funcion(base) 1;',
+            'variable _potencia2 = funcion(base) (base * _potencia3(base));',
+            'variable _potencia1 = funcion(base) (base * _potencia2(base));',
+            'variable f = funcion(x) _potencia1(x);',
+        ])
+        self.assertEqual(stats.changes, 3)
+
+    def test_specializations_are_cached(self) -> None:
+        program, stats = self._specialize('''
+            variable suma = funcion(a, b, c) { a + b * c };
+            variable f = funcion(x, y) { suma(x, 2, y) + suma(y, 2, x) };
+            suma(1, 2, 3);
+        ''')
+
+        self.assertEqual(str(program.statements[1]),
+                         'variable _suma1 = funcion(a, c) (a + (2 * c));')
+        self.assertEqual(str(program.statements[2]),
+                         'variable f = funcion(x, y) (_suma1(x, y) + _suma1(y, x));')
+        self.assertEqual(str(program.statements[3]), '7')
+        self.assertEqual(stats.changes, 3)
+
+    def test_constant_calls_are_evaluated(self) -> None:
+        program, stats = self._specialize(POTENCIA + '''
+            potencia(2, 3) + potencia(3, 3);
+        ''')
+
+        self.assertEqual(len(program.statements), 2)
+        self.assertEqual(str(program.statements[1]), '(8 + 27)')
+        self.assertEqual(self._functions(program), 1)
+        self.assertEqual(stats.changes, 8)
+
+    def test_constants_reach_closures(self) -> None:
+        program, _ = self._specialize('''
+            variable suma = funcion(n) { funcion(x) { x + n } };
+            variable mas_uno = suma(1);
+        ''')
+
+        self.assertEqual(str(program.statements[1]),
+                         'variable _suma1 = funcion() funcion(x) (x + 1);')
+
+    def test_not_specialized(self) -> None:
+        tests: list[str] = [
+            # Sin argumentos constantes
+            'variable f = funcion(n) { n }; variable g = funcion(m) { f(m + 1) };',
+            # Numero de argumentos incorrecto
+            'variable f = funcion(n) { n }; f(1, 2);',
+            # Redefinida
+            'variable f = funcion(n) { n }; variable f = funcion(n) { 0 }; f(1);',
+            # No sabemos que funcion es
+            'variable f = funcion(g) { g(1) };',
+        ]
+
+        for source in tests:
+            _, stats = self._specialize(source)
+            self.assertEqual(stats.changes, 0, source)
+
+    def test_budget(self) -> None:
+        source = '''
+            variable sigue = funcion(n) { sigue(n + 1) };
+            sigue(0);
+        '''
+
+        program, stats = self._specialize(source, max_specializations=3)
+        self.assertEqual(self._functions(program), 4)
+        self.assertEqual(stats.changes, 3)
+        # La ultima copia sigue llamando a la original
+        self.assertEqual(str(program.statements[1]), 'variable _sigue3 = funcion() sigue(3);')
+
+        program, _ = self._specialize(source, max_size=0, growth=0)
+        self.assertEqual(self._functions(program), 1)
+
+    def test_with_other_passes(self) -> None:
+        program = self._parse(POTENCIA + '''
+            variable f = funcion(x) { potencia(x, 3) };
+        ''')
+
+        optimize(program, [PartialEvaluation(), FunctionInlining(),
+                           ConstantFolding(), DeadCodeElimination()])
+
+        self.assertEqual(str(program), 'variable f = funcion(x) (x * (x * (x * 1)));')
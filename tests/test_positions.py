@@ -0,0 +1,116 @@
+from typing import Optional
+
+from lpp.ast import (
+    ASTNode,
+    Identifier,
+    Program,
+)
+from lpp.positions import PositionIndex
+from lpp.visitor import walk
+from tests.utils import ParsingTestCase
+
+
+class PositionIndexTest(ParsingTestCase):
+
+    SOURCE: str = '''variable suma = funcion(x, y) { (x + y) * 2 };
+suma(1, -2);
+si (a < b) { b } si_no { retorna c; }
+'''
+
+    # Busqueda lineal que usamos como referencia
+    def _innermost(self, program: Program, offset: int) -> Optional[ASTNode]:
+        found: Optional[ASTNode] = None
+        for node in walk(program):
+            if node.start <= offset < node.end:
+                found = node
+        return found
+
+    def test_nodes_have_spans(self) -> None:
+        program: Program = self._parse(self.SOURCE)
+
+        texts: list[str] = [self.SOURCE[node.start:node.end]
+                            for node in walk(program)][:8]
+
+        self.assertEqual(texts, [
+            self.SOURCE,
+            'variable suma = funcion(x, y) { (x + y) * 2 };',
+            'suma',
+            'funcion(x, y) { (x + y) * 2 }',
+            'x',
+            'y',
+            '{ (x + y) * 2 }',
+            '(x + y) * 2',
+        ])
+
+    def test_node_at_matches_linear_search(self) -> None:
+        program: Program = self._parse(self.SOURCE)
+        index = PositionIndex(program)
+
+        for offset in range(len(self.SOURCE) + 2):
+            self.assertIs(index.node_at(offset),
+                          self._innermost(program, offset), offset)
+
+    def test_node_at_identifier(self) -> None:
+        program: Program = self._parse(self.SOURCE)
+        index = PositionIndex(program)
+
+        node = index.node_at(self.SOURCE.index('c;'))
+
+        self.assertIsInstance(node, Identifier)
+        self.assertEqual(node.value, 'c')  # type: ignore
+
+    def test_nodes_in_range(self) -> None:
+        program: Program = self._parse(self.SOURCE)
+        index = PositionIndex(program)
+
+        start = self.SOURCE.index('2 }')
+        end = self.SOURCE.index('1, -2')
+
+        nodes = index.nodes_in_range(start, end)
+        expected = [node for node in walk(program)
+                    if node.start < end and node.end > start]
+
+        self.assertEqual(nodes, expected)
+        self.assertEqual([type(node).__name__ for node in nodes], [
+            'Program', 'LetStatement', 'Function', 'Block',
+            'ExpressionStatement', 'Infix', 'Integer',
+            'ExpressionStatement', 'Call', 'Identifier'])
+
+    def test_map_literal_in_source_order(self) -> None:
+        source: str = 'variable m = {1: a + b, cc: 2, d: e * f};'
+        program: Program = self._parse(source)
+        index = PositionIndex(program)
+
+        for offset in range(len(source) + 1):
+            self.assertIs(index.node_at(offset),
+                          self._innermost(program, offset), offset)
+
+        self.assertEqual(str(index.node_at(17)), 'a')
+        self.assertEqual(str(index.node_at(24)), 'cc')
+
+        start = source.index('b,')
+        end = source.index('2,')
+        nodes = index.nodes_in_range(start, end)
+
+        self.assertEqual([source[node.start:node.end] for node in nodes], [
+            source, source, '{1: a + b, cc: 2, d: e * f}', 'a + b', 'b', 'cc'])
+
+    def test_replace_statement(self) -> None:
+        program: Program = self._parse(self.SOURCE)
+        index = PositionIndex(program)
+
+        replacement: str = 'variable suma = funcion(x) { x };'
+        statement = self._parse(replacement).statements[0]
+        index.replace_statement(0, statement)
+
+        new_source = replacement + self.SOURCE[self.SOURCE.index('\n'):]
+        expected: Program = self._parse(new_source)
+        expected_index = PositionIndex(expected)
+
+        self.assertIs(program.statements[0], statement)
+        for offset in range(len(new_source) + 1):
+            node = index.node_at(offset)
+            expected_node = expected_index.node_at(offset)
+            self.assertEqual(type(node), type(expected_node), offset)
+            if node is not program:
+                self.assertEqual(str(node), str(expected_node), offset)
@@ -0,0 +1,120 @@
+from io import StringIO
+
+from lpp.ast import Program
+from lpp.printer import (
+    to_source,
+    write_node,
+)
+from tests.utils import ParsingTestCase
+
+
+class PrinterTest(ParsingTestCase):
+
+    def _assert_round_trip(self, source: str, width: int = 80) -> str:
+        program: Program = self._parse(source)
+        output: str = to_source(program, width=width)
+
+        reparsed: Program = self._parse(output)
+        self.assertEqual(str(reparsed), str(program))
+        self.assertEqual(to_source(reparsed, width=width), output)
+
+        return output
+
+    def test_statements(self) -> None:
+        output = self._assert_round_trip(
+            'variable x = 5; retorna x; -a * b; !verdadero == falso;')
+
+        self.assertEqual(output, 'variable x = 5;\n'
+                                 'retorna x;\n'
+                                 '(-a) * b;\n'
+                                 '(!verdadero) == falso;')
+
+    def test_precedence_is_preserved(self) -> None:
+        output = self._assert_round_trip('a + b * c - (d - e) / f;')
+
+        self.assertEqual(output, '(a + (b * c)) - ((d - e) / f);')
+
+    def test_short_blocks_stay_inline(self) -> None:
+        output = self._assert_round_trip(
+            'si (x < y) { x } si_no { y }; variable f = funcion() {};')
+
+        self.assertEqual(output, 'si (x < y) { x; } si_no { y; };\n'
+                                 'variable f = funcion() {};')
+
+    def test_long_blocks_are_indented(self) -> None:
+        source: str = '''
+            variable fib = funcion(n) {
+                si (n < 2) { retorna n; }
+                retorna fib(n - 1) + fib(n - 2);
+            };
+        '''
+        output = self._assert_round_trip(source, width=40)
+
+        self.assertEqual(output, 'variable fib = funcion(n) {\n'
+                                 '    si (n < 2) { retorna n; };\n'
+                                 '    retorna fib(n - 1) + fib(n - 2);\n'
+                                 '};')
+
+    def test_long_call_arguments(self) -> None:
+        output = self._assert_round_trip(
+            'suma(primer_argumento, segundo_argumento, tercero)(1);', width=30)
+
+        self.assertEqual(output, 'suma(\n'
+                                 '    primer_argumento,\n'
+                                 '    segundo_argumento,\n'
+                                 '    tercero\n'
+                                 ')(1);')
+
+    def test_indent_option(self) -> None:
+        program: Program = self._parse('funcion(x) { x + 1; x * 2; };')
+
+        output: str = to_source(program, width=10, indent=2)
+
+        self.assertEqual(output, 'funcion(x) {\n'
+                                 '  x + 1;\n'
+                                 '  x * 2;\n'
+                                 '};')
+
+    def test_empty_call(self) -> None:
+        self.assertEqual(self._assert_round_trip('f();'), 'f();')
+
+    def test_for(self) -> None:
+        output = self._assert_round_trip(
+            'para (variable i = 0, t = 0; i < n; i = i + 1, t = t + i) { t } '
+            'para (; falso; ) {}', width=40)
+
+        self.assertEqual(output, 'para (variable i = 0, t = 0; i < n; i = i + 1, t = t + i) {\n'
+                                 '    t;\n'
+                                 '}\n'
+                                 'para (; falso; ) {}')
+
+    def test_arrays(self) -> None:
+        output = self._assert_round_trip('[1, 2 + 3][0]; [][i]; (a + b)[f(1)]; -a[0];')
+
+        self.assertEqual(output, '[1, 2 + 3][0];\n'
+                                 '[][i];\n'
+                                 '(a + b)[f(1)];\n'
+                                 '-a[0];')
+
+    def test_maps_and_length(self) -> None:
+        output = self._assert_round_trip(
+            'variable m = {1: [verdadero, 2], x + 1: {}}; tamano(m) + m[2][0];')
+
+        self.assertEqual(output, 'variable m = {1: [verdadero, 2], x + 1: {}};\n'
+                                 'tamano(m) + m[2][0];')
+
+    def test_strings(self) -> None:
+        output = self._assert_round_trip('variable s = "a\\t\\"b\\"\\n" + "\\\\";s[0];')
+
+        self.assertEqual(output, 'variable s = "a\\t\\"b\\"\\n" + "\\\\";\ns[0];')
+
+    def test_deep_tree_to_stream(self) -> None:
+        # str(program) se queda sin pila con esta profundidad
+        program: Program = self._parse(' + '.join(['a'] * 10_000) + ';')
+        stream = StringIO()
+
+        write_node(program, stream)
+
+        output: str = stream.getvalue()
+        self.assertTrue(output.startswith('(' * 9_998 + 'a + a) + a)'))
+        self.assertTrue(output.endswith(') + a;'))
@@ -0,0 +1,149 @@
+from typing import Any
+
+from lpp.ast import (
+    Function,
+    LetStatement,
+    Program,
+)
+from lpp.evaluator import Evaluator
+from lpp.object import MemoCache
+from lpp.purity import (
+    find_pure_functions,
+    mark_memoizable,
+)
+from lpp.symbols import build_symbol_table
+from lpp.vm import VM
+from lpp.visitor import walk
+from tests.utils import ParsingTestCase
+
+
+FIBONACCI: str = '''
+    variable fib = funcion(n) { si (n < 2) { retorna n; } fib(n - 1) + fib(n - 2) };
+'''
+
+
+class PurityTest(ParsingTestCase):
+
+    def _names(self, program: Program, functions: Any) -> list[str]:
+        return sorted(str(node.name) for node in walk(program)
+                      if isinstance(node, LetStatement) and node.value in functions)
+
+    def _pure(self, source: str) -> list[str]:
+        program = self._parse(source)
+        return self._names(program, find_pure_functions(build_symbol_table(program)))
+
+    def test_pure_functions(self) -> None:
+        self.assertEqual(self._pure(FIBONACCI + '''
+            variable doble = funcion(x) { variable y = x * 2; y };
+            variable par = funcion(n) { si (n == 0) { verdadero } si_no { impar(n - 1) } };
+            variable impar = funcion(n) { si (n == 0) { falso } si_no { par(n - 1) } };
+            variable usa = funcion(n) { doble(fib(n)) };
+        '''), ['doble', 'fib', 'impar', 'par', 'usa'])
+
+    def test_impure_functions(self) -> None:
+        self.assertEqual(self._pure('''
+            variable a = 1;
+            variable global = funcion(x) { x + a };
+            variable aplica = funcion(f, x) { f(x) };
+            variable crea = funcion(x) { funcion() { x } };
+            variable usa_impura = funcion(x) { global(x) };
+            variable otra = funcion(x) { x };
+            variable otra = funcion(x) { x + 1 };
+            variable redefinida = funcion(x) { otra(x) };
+            variable desconocida = funcion(x) { g(x) };
+        '''), ['otra', 'otra'])
+
+    def test_for_loops(self) -> None:
+        self.assertEqual(self._pure('''
+            variable suma = funcion(n) {
+                para (variable i = 0, t = 0; i < n; i = i + 1, t = t + i) {};
+                t
+            };
+            variable f = funcion(x) { x };
+            para (variable f = f; falso; f = 1) {};
+            variable usa = funcion(x) { f(x) };
+        '''), ['f', 'suma'])
+
+    def test_only_functions_with_non_tail_calls_are_memoized(self) -> None:
+        program = self._parse(FIBONACCI + '''
+            variable doble = funcion(x) { x * 2 };
+            variable cuenta = funcion(n, total) {
+                si (n == 0) { total } si_no { cuenta(n - 1, total + 1) }
+            };
+        ''')
+
+        marked = mark_memoizable(build_symbol_table(program))
+
+        self.assertEqual(self._names(program, marked), ['fib'])
+        self.assertEqual([node.memoize for node in walk(program)
+                          if isinstance(node, Function)], [True, False, False])
+
+    def test_memo_cache_evicts_least_recently_used(self) -> None:
+        cache = MemoCache('f', 2)
+
+        cache.put((1,), 10)
+        cache.put((2,), 20)
+        self.assertEqual(cache.get((1,)), 10)
+        cache.put((3,), 30)
+
+        self.assertIsNone(cache.get((2,)))
+        self.assertEqual(list(cache.entries), [(1,), (3,)])
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+        self.assertEqual(str(cache), 'f: 1 aciertos, 1 fallos (50%), 2 guardados, 1 descartados')
+
+    def test_evaluator_and_vm_memoize(self) -> None:
+        source = FIBONACCI + 'fib(30) + fib(29)'
+
+        evaluator = Evaluator()
+        vm = VM()
+        self.assertEqual(evaluator.evaluate(self._parse(source)), 1346269)
+        self.assertEqual(vm.execute(self._parse(source)), 1346269)
+
+        for caches in (evaluator.memo_caches, vm.memo_caches):
+            cache, = caches.values()
+            # Cada n se calcula una vez (31 fallos); fib(n - 2) desde n >= 3
+            # y fib(29) al final ya estan guardados
+            self.assertEqual(cache.misses, 31)
+            self.assertEqual(cache.hits, 29)
+            self.assertEqual(cache.name, 'funcion@20')
+
+    def test_memoization_can_be_turned_off(self) -> None:
+        source = FIBONACCI + 'fib(12)'
+
+        evaluator = Evaluator(memoize=False)
+        self.assertEqual(evaluator.evaluate(self._parse(source)), 144)
+        self.assertEqual(evaluator.memo_caches, {})
+
+        vm = VM(memoize=False)
+        self.assertEqual(vm.execute(self._parse(source)), 144)
+        self.assertEqual(vm.memo_caches, {})
+
+    def test_small_cache(self) -> None:
+        evaluator = Evaluator(memo_size=2)
+
+        self.assertEqual(evaluator.evaluate(self._parse(FIBONACCI + 'fib(20)')), 6765)
+        cache, = evaluator.memo_caches.values()
+        self.assertEqual(len(cache.entries), 2)
+        self.assertGreater(cache.evictions, 0)
+
+    def test_redefined_globals_stop_memoization(self) -> None:
+        first = '''
+            variable f = funcion(x) { x + 1 };
+            variable h = funcion(x) { f(x) };
+            variable g = funcion(n) { si (n < 1) { 0 } si_no { f(n) + g(n - 1) + 0 } };
+            variable k = funcion(n) { si (n < 1) { 0 } si_no { h(n) + k(n - 1) + 0 } };
+            variable fib = funcion(n) { si (n < 2) { n } si_no { fib(n - 1) + fib(n - 2) } };
+        '''
+        second = '''
+            g(3) + k(3) + fib(10);
+            variable f = funcion(x) { x + 100 };
+            g(3) + k(3) + fib(10);
+        '''
+
+        for backend in (Evaluator(), VM()):
+            run = backend.evaluate if isinstance(backend, Evaluator) else backend.execute
+            run(self._parse(first))
+            # k llega a f a traves de h; fib no usa f y se sigue memorizando
+            self.assertEqual(run(self._parse(second)), 306 + 306 + 55)
+            self.assertEqual(len(backend.memo_caches), 1)
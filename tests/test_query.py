@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from lpp.ast import (
+    Call,
+    Expression,
+    Identifier,
+    If,
+    Infix,
+    Integer,
+    Program,
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.query import (
+    ANY,
+    NodeIndex,
+    Pattern,
+    QueryError,
+    parse_query,
+)
+
+
+class QueryTest(TestCase):
+
+    SOURCE: str = '''
+        variable a = suma(1, 2);
+        variable b = suma(1);
+        resta(3, 4);
+        si (a < b) { a } si_no { b };
+        si (a > b) { suma(a, b * 2) };
+    '''
+
+    def setUp(self) -> None:
+        parser: Parser = Parser(Lexer(self.SOURCE))
+        self.program: Program = parser.parse_program()
+        self.index = NodeIndex(self.program)
+
+        self.assertEqual(len(parser.errors), 0)
+
+    def test_calls_with_two_arguments(self) -> None:
+        pattern = Pattern(Call,
+                          function=Pattern(Identifier, value='suma'),
+                          arguments=[ANY, ANY])
+
+        found = self.index.find(pattern)
+
+        self.assertEqual([str(node) for node in found],
+                         ['suma(1, 2)', 'suma(a, (b * 2))'])
+
+    def test_if_without_alternative(self) -> None:
+        found = self.index.find(Pattern(If, alternative=None))
+
+        self.assertEqual(len(found), 1)
+        self.assertEqual(str(found[0].condition), '(a > b)')  # type: ignore
+
+    def test_class_and_predicate_constraints(self) -> None:
+        pattern = Pattern(Infix,
+                          operator='*',
+                          right=lambda node: isinstance(node, Integer) and
+                          node.value is not None and node.value > 1)
+
+        self.assertEqual(self.index.count(pattern), 1)
+        self.assertEqual(self.index.count(Pattern(Call, function=Identifier)), 4)
+
+    def test_base_class_patterns(self) -> None:
+        expressions = self.index.nodes(Expression)
+
+        self.assertIn(Call, {type(node) for node in expressions})
+        self.assertEqual(self.index.count(Pattern(Expression)), len(expressions))
+
+    def test_parse_query(self) -> None:
+        pattern = parse_query(
+            "Call(function=Identifier(value='suma'), arguments=[_, _])")
+
+        self.assertEqual(len(self.index.find(pattern)), 2)
+        self.assertEqual(len(self.index.find(parse_query('If(alternative=None)'))), 1)
+        self.assertEqual(self.index.count(parse_query('Integer(value=-5)')), 0)
+
+    def test_invalid_queries(self) -> None:
+        with self.assertRaises(QueryError):
+            parse_query('Desconocido()')
+
+        with self.assertRaises(QueryError):
+            parse_query('Call(')
+
+        with self.assertRaises(QueryError):
+            parse_query('[_]')
+
+    def test_pattern_is_compiled_once(self) -> None:
+        pattern = Pattern(If, alternative=None)
+
+        self.assertIs(pattern.compile(), pattern.compile())
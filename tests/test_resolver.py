@@ -0,0 +1,197 @@
+from unittest import TestCase
+
+from lpp.ast import (
+    Function,
+    Identifier,
+    Program,
+)
+from lpp.lexer import Lexer
+from lpp.object import (
+    Cell,
+    make_closure,
+    new_frame,
+)
+from lpp.parser import Parser
+from lpp.resolver import (
+    resolve,
+    Resolution,
+)
+from lpp.visitor import walk
+
+
+class ResolverTest(TestCase):
+
+    def _resolve(self, source: str, predefined: list[str] = []) -> Resolution:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        return resolve(program, predefined)
+
+    def _identifiers(self, resolution: Resolution) -> list[tuple[str, int, int]]:
+        return [(node.value, node.depth, node.slot)
+                for node in walk(resolution.program)
+                if isinstance(node, Identifier)]
+
+    def test_globals(self) -> None:
+        resolution = self._resolve('variable a = 1; variable b = a; a + b;')
+
+        self.assertEqual(self._identifiers(resolution), [
+            ('a', 0, 0), ('b', 0, 1), ('a', 0, 0), ('a', 0, 0), ('b', 0, 1),
+        ])
+        self.assertEqual(resolution.globals, ['a', 'b'])
+        self.assertEqual(resolution.program.frame_size, 2)
+        self.assertEqual(resolution.errors, [])
+
+    def test_functions_and_depth(self) -> None:
+        resolution = self._resolve('''
+            variable k = 10;
+            variable f = funcion(x, y) {
+                variable z = x + y;
+                funcion(w) { w + z + k };
+            };
+        ''')
+
+        self.assertEqual(self._identifiers(resolution), [
+            ('k', 0, 0), ('f', 0, 1),
+            ('x', 0, 0), ('y', 0, 1),
+            ('z', 0, 2), ('x', 0, 0), ('y', 0, 1),
+            ('w', 0, 0), ('w', 0, 0), ('z', 1, 2), ('k', 2, 0),
+        ])
+
+        functions = [node for node in walk(resolution.program)
+                     if isinstance(node, Function)]
+        self.assertEqual([function.frame_size for function in functions], [3, 1])
+        self.assertEqual(resolution.frame_sizes[functions[0]], 3)
+
+    def test_blocks_share_the_function_frame(self) -> None:
+        resolution = self._resolve('''
+            variable f = funcion(x) {
+                si (x) { variable x = 2; x } si_no { variable y = 3; y };
+                x;
+            };
+        ''')
+
+        self.assertEqual(self._identifiers(resolution), [
+            ('f', 0, 0), ('x', 0, 0), ('x', 0, 0),
+            ('x', 0, 1), ('x', 0, 1),
+            ('y', 0, 2), ('y', 0, 2),
+            ('x', 0, 0),
+        ])
+        function = resolution.program.statements[0].value  # type: ignore
+        self.assertEqual(function.frame_size, 3)
+
+    def test_redefinition_reuses_slot(self) -> None:
+        resolution = self._resolve('variable x = 1; variable x = x + 1; x;')
+
+        self.assertEqual({slot for _, _, slot in self._identifiers(resolution)}, {0})
+        self.assertEqual(resolution.program.frame_size, 1)
+
+    def test_recursion_and_later_definitions(self) -> None:
+        resolution = self._resolve('''
+            variable f = funcion(n) { g(n) };
+            variable g = funcion(n) { f(n - 1) };
+        ''')
+
+        self.assertEqual(resolution.errors, [])
+        self.assertEqual(self._identifiers(resolution)[2:4], [('g', 1, 1), ('n', 0, 0)])
+
+    def test_predefined(self) -> None:
+        resolution = self._resolve('variable x = longitud(y); x;', ['longitud', 'y'])
+
+        self.assertEqual(resolution.globals, ['longitud', 'y', 'x'])
+        self.assertEqual(self._identifiers(resolution), [
+            ('x', 0, 2), ('longitud', 0, 0), ('y', 0, 1), ('x', 0, 2),
+        ])
+
+    def test_unresolved_diagnostics(self) -> None:
+        resolution = self._resolve('''
+            x;
+            variable f = funcion() { y + z };
+            variable x = 1;
+        ''')
+
+        self.assertEqual([node.value for node in resolution.unresolved],
+                         ['x', 'y', 'z'])
+        self.assertEqual(resolution.errors[0],
+                         'Identificador no definido: x (posicion 13)')
+        self.assertEqual(resolution.unresolved[0].slot, -1)
+
+    def _functions(self, resolution: Resolution) -> list[Function]:
+        return [node for node in walk(resolution.program)
+                if isinstance(node, Function)]
+
+    def test_free_variables(self) -> None:
+        resolution = self._resolve('''
+            variable k = 10;
+            variable f = funcion(x, y) {
+                variable grande = 1;
+                variable z = x + y;
+                funcion(w) {
+                    funcion() { w + z + k + z }
+                };
+            };
+        ''')
+
+        outer, middle, inner = self._functions(resolution)
+
+        # k es global y grande no se usa adentro: ninguna se captura
+        self.assertEqual(outer.free_variables, ())
+        self.assertEqual(middle.free_variables, ('z',))
+        self.assertEqual(middle.captures, ((0, 3),))
+        self.assertEqual(inner.free_variables, ('w', 'z'))
+        self.assertEqual(inner.captures, ((0, 0), (1, 0)))
+
+        self.assertEqual(outer.cells, (3,))
+        self.assertEqual(middle.cells, (0,))
+        self.assertEqual(inner.cells, ())
+
+        identifiers = [(node.value, node.depth, node.slot, node.free, node.boxed)
+                       for node in walk(inner) if isinstance(node, Identifier)]
+        self.assertEqual(identifiers, [
+            ('w', 1, 0, 0, False), ('z', 2, 3, 1, False),
+            ('k', 3, 0, -1, False), ('z', 2, 3, 1, False),
+        ])
+        boxed = [node.value for node in walk(outer)
+                 if isinstance(node, Identifier) and node.boxed]
+        self.assertEqual(boxed, ['z', 'w'])
+
+    def test_recursive_closure(self) -> None:
+        resolution = self._resolve('''
+            variable f = funcion() {
+                variable g = funcion(n) { g(n - 1) };
+                g;
+            };
+        ''')
+
+        outer, inner = self._functions(resolution)
+
+        self.assertEqual(inner.free_variables, ('g',))
+        self.assertEqual(outer.cells, (0,))
+
+        # La closure captura la celda antes de que g tenga valor
+        frame = new_frame(outer)
+        closure = make_closure(inner, frame)
+        frame[0].value = closure
+        self.assertIs(closure.cells[0], frame[0])
+        self.assertIs(closure.cells[0].value, closure)
+
+    def test_closures_capture_only_cells(self) -> None:
+        resolution = self._resolve('''
+            variable f = funcion(a, b, c) {
+                funcion() { funcion() { b } }
+            };
+        ''')
+
+        outer, middle, inner = self._functions(resolution)
+        frame = new_frame(outer)
+        self.assertIsInstance(frame[1], Cell)
+        self.assertEqual([frame[0], frame[2]], [None, None])
+        frame[1].value = 42
+
+        middle_closure = make_closure(middle, frame)
+        inner_closure = make_closure(inner, new_frame(middle), middle_closure)
+
+        self.assertEqual(len(middle_closure.cells), 1)
+        self.assertEqual(inner_closure.cells[0].value, 42)
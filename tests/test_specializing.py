@@ -0,0 +1,142 @@
+from typing import Any
+
+from lpp.evaluator import evaluate
+from lpp.object import (
+    Environment,
+    Error,
+    FALSE,
+    TRUE,
+)
+from lpp.specializing import SpecializingEvaluator
+from tests.test_vm import PROGRAMS
+from tests.utils import ParsingTestCase
+
+
+class SpecializingTest(ParsingTestCase):
+
+    def _evaluate(self, source: str) -> tuple[Any, SpecializingEvaluator]:
+        evaluator = SpecializingEvaluator()
+        return evaluator.evaluate(self._parse(source)), evaluator
+
+    def test_same_results_as_evaluator(self) -> None:
+        for source in PROGRAMS:
+            expected = evaluate(self._parse(source))
+            result, _ = self._evaluate(source)
+
+            if isinstance(expected, Error):
+                self.assertIsInstance(result, Error, source)
+                self.assertEqual(result.message, expected.message, source)
+            else:
+                self.assertIs(type(result), type(expected), source)
+                self.assertEqual(result, expected, source)
+
+    def test_specializes_without_deoptimizing(self) -> None:
+        result, evaluator = self._evaluate('''
+            variable fib = funcion(n) {
+                si (n < 2) { retorna n; }
+                fib(n - 1) + fib(n - 2)
+            };
+            fib(15)
+        ''')
+
+        self.assertEqual(result, 610)
+        self.assertGreater(evaluator.specializations, 0)
+        self.assertEqual(evaluator.deoptimizations, 0)
+
+    def test_deoptimizes_arithmetic(self) -> None:
+        result, evaluator = self._evaluate('''
+            variable suma = funcion(a, b) { a + b };
+            suma(1, 2);
+            suma(verdadero, 1)
+        ''')
+
+        self.assertIsInstance(result, Error)
+        self.assertEqual(result.message, 'Discrepancia de tipos: BOOLEAN + INTEGER')
+        self.assertEqual(evaluator.deoptimizations, 1)
+
+    def test_deoptimizes_comparisons(self) -> None:
+        result, evaluator = self._evaluate('''
+            variable igual = funcion(a, b) { a == b };
+            variable c = igual(1, 1);
+            igual(verdadero, verdadero) == c
+        ''')
+
+        self.assertIs(result, TRUE)
+        self.assertEqual(evaluator.deoptimizations, 1)
+
+        result, evaluator = self._evaluate('''
+            variable resta = funcion(n) { n - 1 };
+            resta(3);
+            resta(-5)
+        ''')
+
+        self.assertEqual(result, -6)
+        self.assertEqual(evaluator.deoptimizations, 0)
+
+    def test_deoptimizes_prefix(self) -> None:
+        result, evaluator = self._evaluate('''
+            variable no = funcion(x) { !x };
+            no(verdadero);
+            no(5)
+        ''')
+
+        self.assertIs(result, FALSE)
+        self.assertEqual(evaluator.deoptimizations, 1)
+
+    def test_deoptimizes_calls(self) -> None:
+        result, evaluator = self._evaluate('''
+            variable aplica = funcion(f) { f(1) + 0 };
+            variable a = aplica(funcion(x) { x + 1 });
+            a + aplica(funcion(x) { x * 10 })
+        ''')
+
+        self.assertEqual(result, 12)
+        self.assertEqual(evaluator.deoptimizations, 1)
+
+        result, _ = self._evaluate('''
+            variable aplica = funcion(f) { f(1) };
+            aplica(funcion(x) { x });
+            aplica(5)
+        ''')
+
+        self.assertIsInstance(result, Error)
+        self.assertEqual(result.message, 'No es una funcion: INTEGER')
+
+    def test_returns_inside_expressions(self) -> None:
+        result, _ = self._evaluate('''
+            variable f = funcion(x) { 1 + si (x) { retorna 10; } si_no { 2 } };
+            f(verdadero) + f(falso)
+        ''')
+
+        self.assertEqual(result, 13)
+
+    def test_tail_calls_do_not_grow_the_stack(self) -> None:
+        result, _ = self._evaluate('''
+            variable cuenta = funcion(n, total) {
+                si (n == 0) { retorna total; }
+                cuenta(n - 1, total + 1)
+            };
+            cuenta(50000, 0)
+        ''')
+
+        self.assertEqual(result, 50000)
+
+    def test_deep_recursion(self) -> None:
+        source = '''
+            variable cuenta = funcion(n) { si (n == 0) { 0 } si_no { 1 + cuenta(n - 1) } };
+            cuenta(5000)
+        '''
+        result, _ = self._evaluate(source)
+
+        self.assertEqual(result, 5000)
+
+        result = SpecializingEvaluator(max_depth=100).evaluate(self._parse(source))
+        self.assertIsInstance(result, Error)
+        self.assertEqual(result.message, 'Limite de recursion excedido')
+
+    def test_environment(self) -> None:
+        environment = Environment()
+        evaluator = SpecializingEvaluator(environment)
+        evaluator.evaluate(self._parse('variable doble = funcion(x) { x * 2 };'))
+
+        self.assertEqual(evaluator.evaluate(self._parse('doble(21)')), 42)
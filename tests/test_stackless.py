@@ -0,0 +1,97 @@
+from typing import Any
+
+from lpp.evaluator import evaluate
+from lpp.object import (
+    Environment,
+    Error,
+)
+from lpp.stackless import StacklessEvaluator
+from tests.test_vm import PROGRAMS
+from tests.utils import ParsingTestCase
+
+
+class StacklessTest(ParsingTestCase):
+
+    def _evaluate(self, source: str) -> Any:
+        return StacklessEvaluator().evaluate(self._parse(source))
+
+    def test_same_results_as_evaluator(self) -> None:
+        for source in PROGRAMS:
+            expected = evaluate(self._parse(source))
+            result = self._evaluate(source)
+
+            if isinstance(expected, Error):
+                self.assertIsInstance(result, Error, source)
+                self.assertEqual(result.message, expected.message, source)
+            else:
+                self.assertIs(type(result), type(expected), source)
+                self.assertEqual(result, expected, source)
+
+    def test_returns_inside_expressions(self) -> None:
+        result = self._evaluate('''
+            variable f = funcion(x) { 1 + si (x) { retorna 10; } si_no { 2 } };
+            f(verdadero) + f(falso)
+        ''')
+
+        self.assertEqual(result, 13)
+        self.assertEqual(self._evaluate('retorna 5; 6'), 5)
+
+    def test_deep_recursion(self) -> None:
+        evaluator = StacklessEvaluator()
+        result = evaluator.evaluate(self._parse('''
+            variable suma = funcion(n) {
+                si (n == 0) { 0 } si_no { n + suma(n - 1) }
+            };
+            suma(100000)
+        '''))
+
+        self.assertEqual(result, 100000 * 100001 // 2)
+        self.assertEqual(evaluator.max_depth, 100001)
+
+    def test_tail_calls_do_not_grow_the_depth(self) -> None:
+        evaluator = StacklessEvaluator()
+        result = evaluator.evaluate(self._parse('''
+            variable cuenta = funcion(n, total) {
+                si (n == 0) { retorna total; }
+                cuenta(n - 1, total + 1)
+            };
+            cuenta(50000, 0)
+        '''))
+
+        self.assertEqual(result, 50000)
+        self.assertEqual(evaluator.max_depth, 1)
+
+    def test_memory_budget(self) -> None:
+        evaluator = StacklessEvaluator(memory_budget=1000)
+        result = evaluator.evaluate(self._parse('''
+            variable infinita = funcion(n) { 1 + infinita(n) };
+            infinita(1)
+        '''))
+
+        self.assertIsInstance(result, Error)
+        self.assertEqual(result.message, 'Limite de recursion excedido')
+
+    def test_pause_and_resume(self) -> None:
+        evaluator = StacklessEvaluator()
+        execution = evaluator.start(self._parse('''
+            variable fib = funcion(n) {
+                si (n < 2) { n } si_no { fib(n - 1) + fib(n - 2) }
+            };
+            fib(12)
+        '''))
+
+        self.assertFalse(execution.step(100))
+        self.assertEqual(execution.steps, 100)
+        self.assertGreater(execution.depth, 0)
+        while not execution.step(100):
+            pass
+
+        self.assertEqual(execution.result, 144)
+        self.assertEqual(execution.depth, 0)
+        self.assertEqual(execution.resume(), 144)
+
+    def test_environment(self) -> None:
+        evaluator = StacklessEvaluator(Environment())
+        evaluator.evaluate(self._parse('variable doble = funcion(x) { x * 2 };'))
+
+        self.assertEqual(evaluator.evaluate(self._parse('doble(21)')), 42)
@@ -0,0 +1,157 @@
+from typing import cast
+from unittest import TestCase
+
+from lpp.ast import (
+    Call,
+    ExpressionStatement,
+    Function,
+    Identifier,
+    If,
+    LetStatement,
+    Program,
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.symbols import (
+    ScopeKind,
+    SymbolKind,
+    SymbolTable,
+    build_symbol_table,
+)
+from lpp.visitor import walk
+
+
+class SymbolTableTest(TestCase):
+
+    def _build(self, source: str) -> tuple[Program, SymbolTable]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        return program, build_symbol_table(program)
+
+    def _identifiers(self, program: Program, name: str) -> list[Identifier]:
+        return [node for node in walk(program)
+                if isinstance(node, Identifier) and node.value == name]
+
+    def test_let_and_references(self) -> None:
+        program, table = self._build('''
+            variable x = 5;
+            variable y = x + x;
+            y;
+        ''')
+
+        x_definition, first_use, second_use = self._identifiers(program, 'x')
+        symbol = table.definition(first_use)
+
+        assert symbol is not None
+        self.assertEqual(symbol.kind, SymbolKind.VARIABLE)
+        self.assertIs(symbol.node, x_definition)
+        self.assertIs(table.definition(second_use), symbol)
+        self.assertEqual(table.references(symbol), [first_use, second_use])
+        self.assertTrue(table.is_definition(x_definition))
+        self.assertFalse(table.is_definition(first_use))
+        self.assertEqual(table.unresolved, [])
+
+    def test_let_value_sees_previous_definition(self) -> None:
+        program, table = self._build('variable x = 1; variable x = x + 1; x;')
+
+        first, second, use_in_value, last_use = self._identifiers(program, 'x')
+
+        self.assertIs(table.definition(use_in_value).node, first)  # type: ignore
+        self.assertIs(table.definition(last_use).node, second)  # type: ignore
+
+    def test_parameters_shadow_globals(self) -> None:
+        program, table = self._build('''
+            variable x = 1;
+            variable f = funcion(x) { x * 2 };
+            x;
+        ''')
+
+        _, parameter, use_in_body, global_use = self._identifiers(program, 'x')
+
+        symbol = table.definition(use_in_body)
+        assert symbol is not None
+        self.assertEqual(symbol.kind, SymbolKind.PARAMETER)
+        self.assertIs(symbol.node, parameter)
+        self.assertEqual(symbol.scope.kind, ScopeKind.FUNCTION)
+        self.assertEqual(table.definition(global_use).kind,  # type: ignore
+                         SymbolKind.VARIABLE)
+
+    def test_recursion_and_later_definitions(self) -> None:
+        program, table = self._build('''
+            variable fib = funcion(n) {
+                si (n < 2) { retorna n; }
+                retorna fib(n - 1) + ayuda(n);
+            };
+            variable ayuda = funcion(n) { n };
+        ''')
+
+        fib_symbol = table.definition(self._identifiers(program, 'fib')[0])
+        assert fib_symbol is not None
+        self.assertEqual(len(fib_symbol.references), 1)
+
+        help_uses = self._identifiers(program, 'ayuda')
+        self.assertIs(table.definition(help_uses[0]),
+                      table.definition(help_uses[1]))
+        self.assertEqual(table.unresolved, [])
+
+    def test_use_before_definition_is_unresolved(self) -> None:
+        program, table = self._build('y; variable y = 2; z;')
+
+        self.assertEqual([identifier.value for identifier in table.unresolved],
+                         ['y', 'z'])
+
+    def test_blocks_open_scopes(self) -> None:
+        program, table = self._build('''
+            si (verdadero) { variable a = 1; a; } si_no { a; };
+        ''')
+
+        if_expression = cast(If, cast(ExpressionStatement,
+                                      program.statements[0]).expression)
+        assert if_expression.consequence is not None
+        scope = table.scope(if_expression.consequence)
+
+        assert scope is not None
+        self.assertEqual(scope.kind, ScopeKind.BLOCK)
+        self.assertIs(scope.parent, table.global_scope)
+        self.assertEqual(list(scope.definitions), ['a'])
+        self.assertEqual([identifier.value for identifier in table.unresolved],
+                         ['a'])
+
+    def test_function_body_shares_scope(self) -> None:
+        program, table = self._build('variable f = funcion(x) { variable y = x; y };')
+
+        function = cast(Function, cast(LetStatement,
+                                       program.statements[0]).value)
+        assert function.body is not None
+
+        self.assertIs(table.scope(function), table.scope(function.body))
+        scope = table.scope(function)
+        assert scope is not None
+        self.assertEqual(sorted(scope.definitions), ['x', 'y'])
+
+    def test_predefined_names(self) -> None:
+        parser: Parser = Parser(Lexer('longitud(x);'))
+        program: Program = parser.parse_program()
+
+        table = build_symbol_table(program, predefined=['longitud'])
+
+        call = cast(Call, cast(ExpressionStatement,
+                               program.statements[0]).expression)
+        symbol = table.definition(cast(Identifier, call.function))
+        assert symbol is not None
+        self.assertEqual(symbol.kind, SymbolKind.PREDEFINED)
+        self.assertEqual([identifier.value for identifier in table.unresolved],
+                         ['x'])
+
+    def test_large_program(self) -> None:
+        source: str = 'variable x0 = 0;\n' + ''.join(
+            f'variable x{i} = x{i - 1} + x{i - 1};\n' for i in range(1, 3_000))
+        program, table = self._build(source)
+
+        self.assertEqual(len(table.symbols), 3_000)
+        self.assertEqual(table.unresolved, [])
+        for symbol in table.symbols[:-1]:
+            self.assertEqual(len(symbol.references), 2)
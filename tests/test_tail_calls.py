@@ -0,0 +1,49 @@
+from lpp.ast import Call
+from lpp.tail_calls import mark_tail_calls
+from lpp.visitor import walk
+from tests.utils import ParsingTestCase
+
+
+class TailCallsTest(ParsingTestCase):
+
+    def _tail_calls(self, source: str) -> list[str]:
+        return sorted(str(call) for call in mark_tail_calls(self._parse(source)))
+
+    def test_return_and_last_expression(self) -> None:
+        self.assertEqual(self._tail_calls('''
+            variable f = funcion(n) {
+                si (n == 0) { retorna a(n); }
+                b(n);
+                1 + si (n > 5) { retorna c(n); } si_no { d(n) };
+                si (n > 1) { e(n) } si_no { f(n - 1) }
+            };
+        '''), ['a(n)', 'c(n)', 'e(n)', 'f((n - 1))'])
+
+    def test_calls_that_are_not_tail_calls(self) -> None:
+        self.assertEqual(self._tail_calls('''
+            f(1);
+            retorna g(2);
+            variable h = funcion(n) {
+                variable x = a(n);
+                b(c(n)) + 1;
+                funcion() { d(n) }
+            };
+        '''), ['d(n)'])
+
+    def test_marks_are_reset(self) -> None:
+        program = self._parse('variable f = funcion(n) { g(n) };')
+        for node in walk(program):
+            if isinstance(node, Call):
+                node.tail = True
+
+        mark_tail_calls(program)
+        calls = [node for node in walk(program) if isinstance(node, Call)]
+        self.assertEqual([call.tail for call in calls], [True])
+
+        program = self._parse('f(g(1))')
+        for node in walk(program):
+            if isinstance(node, Call):
+                node.tail = True
+
+        self.assertEqual(mark_tail_calls(program), [])
+        self.assertFalse(any(node.tail for node in walk(program) if isinstance(node, Call)))
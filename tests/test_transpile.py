@@ -0,0 +1,142 @@
+import ast
+from typing import Any
+
+from lpp.evaluator import evaluate
+from lpp.object import (
+    Error,
+    FALSE,
+    NULL,
+    TRUE,
+)
+from lpp.transpile import (
+    compile_source,
+    execute,
+    execute_source,
+    transpile,
+)
+from tests.test_vm import PROGRAMS
+from tests.utils import ParsingTestCase
+
+
+class TranspileTest(ParsingTestCase):
+
+    def _python(self, source: str) -> str:
+        return ast.unparse(transpile(self._parse(source)))
+
+    def _execute(self, source: str) -> Any:
+        return execute(self._parse(source))
+
+    def test_same_results_as_evaluator(self) -> None:
+        for source in PROGRAMS:
+            expected = evaluate(self._parse(source))
+            result = self._execute(source)
+
+            if isinstance(expected, Error):
+                self.assertIsInstance(result, Error, source)
+                self.assertEqual(result.message, expected.message, source)
+            else:
+                self.assertIs(type(result), type(expected), source)
+                self.assertEqual(result, expected, source)
+
+    def test_values(self) -> None:
+        self.assertEqual(self._execute('-7 / 2'), -4)
+        self.assertEqual(self._execute('si (0) { 1 } si_no { 2 }'), 1)
+        self.assertIs(self._execute('1 < 2'), TRUE)
+        self.assertIs(self._execute('!5'), FALSE)
+        self.assertIs(self._execute('si (falso) { 1 }'), NULL)
+        self.assertIs(self._execute('variable a = 1;'), NULL)
+        self.assertIs(self._execute(''), NULL)
+
+    def test_integer_operations_are_native(self) -> None:
+        python = self._python('''
+            variable fib = funcion(n) { si (n < 2) { retorna n; } fib(n - 1) + fib(n - 2) };
+            fib(10);
+        ''')
+
+        self.assertIn('if n_1 < 2:', python)
+        self.assertIn('fib_0(n_1 - 1) + fib_0(n_1 - 2)', python)
+        self.assertNotIn('_call', python)
+
+        # Sin saber los tipos se usan las versiones que revisan
+        python = self._python('variable f = funcion(x) { x + 1 }; f')
+        self.assertIn('_add(x_1, 1)', python)
+
+    def test_if_as_value(self) -> None:
+        python = self._python('variable a = 3; variable b = si (a > 2) { a } si_no { 0 };')
+        self.assertIn('b_1 = a_0 if a_0 > 2 else 0', python)
+
+        # El operando de la izquierda se evalua antes que el `si`
+        source = '''
+            variable f = funcion() { 10 };
+            f() - si (verdadero) { variable y = 3; y };
+        '''
+        python = self._python(source)
+        self.assertLess(python.index('= f_0()'), python.index('y_1 = 3'))
+        self.assertEqual(self._execute(source), 7)
+
+    def test_scoping(self) -> None:
+        # Un `si` abre un scope; `variable` en el mismo scope es la misma
+        # variable aunque la lea una closure creada antes
+        self.assertEqual(self._execute('''
+            variable x = 1;
+            si (verdadero) { variable x = 2; };
+            variable f = funcion() { x };
+            variable x = x + 10;
+            f();
+        '''), 11)
+
+    def test_direct_tail_recursion_is_a_loop(self) -> None:
+        source = '''
+        variable cuenta = funcion(n, total) {
+            si (n == 0) { retorna total; }
+            cuenta(n - 1, total + 1)
+        };
+        variable par = funcion(n) { si (n == 0) { verdadero } si_no { retorna impar(n - 1); } };
+        variable impar = funcion(n) { si (n == 0) { falso } si_no { par(n - 1) } };
+'''
+        python = self._python(source)
+
+        # cuenta es un ciclo; par e impar se llaman entre si y no
+        self.assertEqual(python.count('while True:'), 1)
+        self.assertIn('n_1, total_2 = (n_1 - 1, total_2 + 1)', python)
+        self.assertEqual(self._execute(source + 'cuenta(1000000, 0)'), 1000000)
+
+        # Una closure veria los parametros de la siguiente vuelta
+        python = self._python('''
+            variable f = funcion(n) { si (n == 0) { 0 } si_no { funcion() { n }; f(n - 1) } };
+        ''')
+        self.assertNotIn('while', python)
+
+    def test_mutual_tail_recursion_is_a_trampoline(self) -> None:
+        source = '''
+        variable par = funcion(n) { si (n == 0) { verdadero } si_no { impar(n - 1) } };
+        variable impar = funcion(n) { si (n == 0) { falso } si_no { par(n - 1) } };
+        variable g = funcion(n) { si (n == 0) { 0 } si_no { h(n - 1) } };
+        variable h = funcion(n) { si (n == 0) { 1 } si_no { retorna g(n - 1); } };
+        variable doble = funcion(x) { x * 2 };
+'''
+        python = self._python(source + '1 + g(3); doble(2);')
+
+        self.assertIn('_TailCall(impar_', python)
+        self.assertIn('_bounce(g_', python)
+        self.assertNotIn('_bounce(doble_', python)
+        self.assertIs(self._execute(source + 'par(100001)'), FALSE)
+        self.assertEqual(self._execute(source + 'g(100000)'), 0)
+        self.assertEqual(self._execute(source + '1 + g(100001)'), 2)
+
+        # Una funcion que crea closures no es un ciclo, pero tampoco crece la pila
+        self.assertEqual(self._execute('''
+            variable f = funcion(n) { si (n == 0) { 0 } si_no { funcion() { n }; f(n - 1) } };
+            f(100000)
+        '''), 0)
+
+    def test_compiled_code_is_cached(self) -> None:
+        source = 'variable doble = funcion(x) { x * 2 }; doble(21);'
+
+        code = compile_source(source)
+        self.assertIs(compile_source(source), code)
+        self.assertIsNot(compile_source(source + ' '), code)
+        self.assertEqual(execute_source(source), 42)
+
+        with self.assertRaises(SyntaxError):
+            compile_source('variable = 5;')
@@ -0,0 +1,173 @@
+from typing import Optional
+
+from lpp.ast import (
+    ASTNode,
+    Expression,
+    ExpressionStatement,
+    Identifier,
+    If,
+    Infix,
+    Integer,
+    Program,
+)
+from lpp.visitor import (
+    NodeTransformer,
+    NodeVisitor,
+    child_nodes,
+    copy_tree,
+    walk,
+)
+from tests.utils import ParsingTestCase
+
+
+class VisitorTest(ParsingTestCase):
+
+    def test_walk_preorder(self) -> None:
+        program: Program = self._parse('variable x = a + 5;')
+
+        names: list[str] = [type(node).__name__ for node in walk(program)]
+
+        self.assertEqual(names, ['Program', 'LetStatement', 'Identifier',
+                                 'Infix', 'Identifier', 'Integer'])
+
+    def test_child_nodes_skip_empty_fields(self) -> None:
+        program: Program = self._parse('si (x) { y }')
+        if_expression = program.statements[0].expression  # type: ignore
+
+        self.assertIsInstance(if_expression, If)
+        self.assertEqual(len(child_nodes(if_expression)), 2)
+
+    def test_visit_dispatch_follows_mro(self) -> None:
+        program: Program = self._parse('suma(x, 2 * y);')
+
+        class Collector(NodeVisitor):
+            def __init__(self) -> None:
+                self.seen: list[str] = []
+
+            def visit_Identifier(self, node: Identifier) -> None:
+                self.seen.append(node.value)
+
+            def visit_Expression(self, node: Expression) -> None:
+                self.seen.append(type(node).__name__)
+                self.generic_visit(node)
+
+        collector = Collector()
+        collector.visit(program)
+
+        self.assertEqual(collector.seen,
+                         ['Call', 'suma', 'x', 'Infix', 'Integer', 'y'])
+
+    def test_traverse_deep_tree(self) -> None:
+        # Una cadena de sumas genera un arbol con una profundidad mucho
+        # mayor que el limite de recursion de Python
+        program: Program = self._parse(' + '.join(['a'] * 20_000) + ';')
+
+        class Depth(NodeVisitor):
+            def __init__(self) -> None:
+                self.current = 0
+                self.maximum = 0
+                self.identifiers = 0
+
+            def enter_Infix(self, node: Infix) -> None:
+                self.current += 1
+                self.maximum = max(self.maximum, self.current)
+
+            def leave_Infix(self, node: Infix) -> None:
+                self.current -= 1
+
+            def enter_Identifier(self, node: Identifier) -> None:
+                self.identifiers += 1
+
+        depth = Depth()
+        depth.traverse(program)
+
+        self.assertEqual(depth.maximum, 19_999)
+        self.assertEqual(depth.current, 0)
+        self.assertEqual(depth.identifiers, 20_000)
+
+    def test_traverse_skip_children(self) -> None:
+        program: Program = self._parse('f(a, b); c;')
+
+        class Skipper(NodeVisitor):
+            def __init__(self) -> None:
+                self.seen: list[str] = []
+
+            def enter_ASTNode(self, node: ASTNode) -> bool:
+                self.seen.append(type(node).__name__)
+                return type(node).__name__ != 'Call'
+
+        skipper = Skipper()
+        skipper.traverse(program)
+
+        self.assertEqual(skipper.seen, ['Program', 'ExpressionStatement',
+                                        'Call', 'ExpressionStatement',
+                                        'Identifier'])
+
+    def test_transformer_replace_and_remove(self) -> None:
+        program: Program = self._parse('a; 1 + b; c;')
+
+        class Rewriter(NodeTransformer):
+            def visit_Identifier(self, node: Identifier) -> Identifier:
+                return Identifier(node.token, node.value.upper())
+
+            def visit_ExpressionStatement(self,
+                                          node: ExpressionStatement) -> object:
+                if isinstance(node.expression, Identifier) and \
+                        node.expression.value == 'c':
+                    return None
+                return self.generic_visit(node)
+
+        Rewriter().visit(program)
+
+        self.assertEqual(str(program), 'A(1 + B)')
+
+    def test_transform_bottom_up_deep_tree(self) -> None:
+        program: Program = self._parse(' + '.join(['1'] * 5_000) + ';')
+
+        class Doubler(NodeTransformer):
+            def leave_Integer(self, node: Integer) -> Integer:
+                assert node.value is not None
+                return Integer(node.token, node.value * 2)
+
+        Doubler().transform(program)
+
+        values: list[Optional[int]] = [node.value for node in walk(program)
+                                       if isinstance(node, Integer)]
+        self.assertEqual(values, [2] * 5_000)
+
+    def test_transform_expands_lists(self) -> None:
+        program: Program = self._parse('a; b;')
+
+        class Duplicate(NodeTransformer):
+            def leave_ExpressionStatement(self,
+                                          node: ExpressionStatement) -> object:
+                return [node, node]
+
+        Duplicate().transform(program)
+
+        self.assertEqual(str(program), 'aabb')
+
+    def test_copy_tree(self) -> None:
+        program: Program = self._parse('variable f = funcion(x) { x * y + x };')
+
+        copy = copy_tree(program)
+
+        self.assertEqual(str(copy), str(program))
+        originals = set(walk(program))
+        self.assertFalse(any(node in originals for node in walk(copy)))
+
+    def test_copy_tree_replacements(self) -> None:
+        program: Program = self._parse('x * y + x;')
+        replacement: Expression = self._parse('(a - 1);').statements[0].expression  # type: ignore
+        parameters = {node: replacement for node in walk(program)
+                      if isinstance(node, Identifier) and node.value == 'x'}
+
+        copy = copy_tree(program, parameters)  # type: ignore
+
+        self.assertEqual(str(copy), '(((a - 1) * y) + (a - 1))')
+        self.assertEqual(str(program), '((x * y) + x)')
+        # Cada aparicion es una copia distinta
+        copies = [node for node in walk(copy) if isinstance(node, Infix)
+                  and node.operator == '-']
+        self.assertEqual(len(copies), 2)
+        self.assertIsNot(copies[0], copies[1])
@@ -0,0 +1,242 @@
+from typing import (
+    Any,
+    Optional,
+)
+
+from lpp.evaluator import evaluate
+from lpp.object import (
+    CompiledClosure,
+    Environment,
+    Error,
+    FALSE,
+    NULL,
+    TRUE,
+)
+from lpp.vm import (
+    execute,
+    VM,
+)
+from tests.utils import ParsingTestCase
+
+
+# Programas que deben dar lo mismo en la maquina virtual y en el evaluador
+PROGRAMS: list[str] = [
+    '(5 + 10 * 2 + 15 / 3) * 2 + -10',
+    '-7 / 2',
+    '1 < 2 == verdadero',
+    '1 == verdadero',
+    'verdadero != falso',
+    '!!5',
+    'si (1 > 2) { 10 }',
+    'si (1) { 10 } si_no { 20 }',
+    'si (verdadero) { variable x = 1; }',
+    '9; retorna 2 * 5; 9;',
+    'si (10 > 1) { si (10 > 1) { retorna 10; } retorna 1; }',
+    'variable x = 1; variable x = x + 1; x;',
+    'variable x = 1; si (verdadero) { variable x = 2; }; x',
+    'variable f = funcion() { si (verdadero) { retorna 1; } 2 }; f() + 1',
+    'funcion(x) { x }(5)',
+    'variable f = funcion(x, y) { 1 + si (x) { retorna y; } }; f(verdadero, 7)',
+    '''
+        variable contador = funcion(n) {
+            variable siguiente = funcion() { n + 1 };
+            variable n = 10;
+            siguiente()
+        };
+        contador(1);
+    ''',
+    '''
+        variable fib = funcion(n) { si (n < 2) { retorna n; } fib(n - 1) + fib(n - 2) };
+        fib(15);
+    ''',
+    '''
+        variable f = funcion() {
+            variable par = funcion(n) { si (n == 0) { verdadero } si_no { impar(n - 1) } };
+            variable impar = funcion(n) { si (n == 0) { falso } si_no { par(n - 1) } };
+            par(10)
+        };
+        f();
+    ''',
+    '''
+        variable componer = funcion(f, g) { funcion(x) { f(g(x)) } };
+        variable mas_uno = funcion(x) { x + 1 };
+        variable doble = funcion(x) { x * 2 };
+        componer(mas_uno, doble)(5) + componer(doble, mas_uno)(5);
+    ''',
+    '''
+        variable suma = funcion(n) {
+            para (variable i = 0, total = 0; i < n; i = i + 1, total = total + i) {};
+            total
+        };
+        suma(5)
+    ''',
+    '''
+        variable fib = funcion(n) {
+            para (variable k = n, a = 0, b = 1; k > 0; k = k - 1, a = b, b = a + b) {};
+            a
+        };
+        fib(10)
+    ''',
+    '''
+        variable busca = funcion(n) {
+            para (variable i = 0; verdadero; i = i + 1) {
+                si (i * i > n) { retorna i; }
+            }
+        };
+        busca(50)
+    ''',
+    '''
+        variable f = funcion() {
+            para (variable i = 0, g = funcion() { 0 }; i < 3;
+                  i = i + 1, g = funcion() { i * 10 }) {};
+            g() + i
+        };
+        f()
+    ''',
+    'para (variable i = 0; i < 3; i = i + 1) { i }',
+    'variable a = [1, 2, 3]; variable b = a * 2 + a; b[2] - b[0]',
+    '[verdadero, falso] == [verdadero, verdadero]',
+    '''
+        variable suma = funcion(a, n) {
+            para (variable i = 0, total = 0; i < n; i = i + 1, total = total + a[i]) {};
+            total
+        };
+        variable x = 5;
+        suma([x, x * 2, -x] < 6, 3) == verdadero;
+        suma([x, x * 2, -x] - 1, 3);
+    ''',
+    '[1, 2, 3] > 1',
+    'variable x = verdadero; [1, x]',
+    'variable l = [1, verdadero, [2, 3]]; l[2][1] + tamano(l)',
+    '''
+        variable m = {1: 10, verdadero: [1, 2], [1, 2]: {3: 4}};
+        m[1] + m[[1, 2]][3] + tamano(m) + m[verdadero][1];
+    ''',
+    '''
+        variable suma = funcion(l) {
+            para (variable i = 0, total = 0; i < tamano(l); i = i + 1,
+                  total = total + si (l[i] == verdadero) { 1 } si_no { 0 }) {};
+            total
+        };
+        suma([1, verdadero, falso, verdadero, 2]);
+    ''',
+    'variable f = funcion(x) { [x, verdadero] }; f(1) == f(1)',
+    '{1: [1, verdadero]} != {1: [1, falso]}',
+    '"hola" + " " + "mundo\\n"',
+    '''
+        variable repite = funcion(texto, n) {
+            para (variable i = 0, s = ""; i < n; i = i + 1, s = s + texto + "\\t") {};
+            s
+        };
+        variable r = repite("abc", 500);
+        tamano(r) + tamano(r + r) + si (r[5] == "b") { 1 } si_no { 0 };
+    ''',
+    '''
+        variable antes = funcion(n) {
+            para (variable i = 0, s = "."; i < n; i = i + 1, s = "xy" + s) {};
+            s
+        };
+        antes(700) == "xy" + antes(699) + "";
+    ''',
+    'variable m = {"a": 1, "b" + "c": 2}; m["a"] + m["bc"] + tamano("\\"")',
+    '["a", 1, "a" == "a"]',
+    # Errores
+    '5 + verdadero; 5;',
+    '-verdadero',
+    'verdadero + falso;',
+    'foobar;',
+    'variable f = funcion() { g }; f(); variable g = 1;',
+    'variable f = funcion(n) { variable a = n + b; variable b = 1; a }; f(2)',
+    'variable f = funcion(n) { variable a = b * c; variable b = 1; variable c = 2; a }; f(2)',
+    'variable f = funcion(n) { variable a = b - 1; variable b = 1; a }; f(2)',
+    '5(1)',
+    '1 / 0',
+    'funcion(x) { x }()',
+    'para (variable i = 0; i < 3; i = i + verdadero) {}',
+    '[1, 2] * [3]',
+    '[1, 2][2]',
+    'variable i = verdadero; [1, 2][i]',
+    '-[falso]',
+    '{1: 2}[verdadero]',
+    'variable m = {1: 2}; tamano(m[1])',
+    '[1, verdadero][5]',
+    '"a" + 1',
+    'variable f = funcion(x) { x + "!" }; f(1)',
+    '"a" * "b"',
+    '"abc"[-1]',
+    '{"a": 1}["b"]',
+]
+
+
+class VMTest(ParsingTestCase):
+
+    def _execute(self, source: str, environment: Optional[Environment] = None) -> Any:
+        return execute(self._parse(source), environment)
+
+    def test_same_results_as_evaluator(self) -> None:
+        for source in PROGRAMS:
+            expected = evaluate(self._parse(source))
+            result = self._execute(source)
+
+            if isinstance(expected, Error):
+                self.assertIsInstance(result, Error, source)
+                self.assertEqual(result.message, expected.message, source)
+            else:
+                self.assertIs(type(result), type(expected), source)
+                self.assertEqual(result, expected, source)
+
+    def test_values(self) -> None:
+        self.assertEqual(self._execute('variable a = 5; a * 2'), 10)
+        self.assertIs(self._execute('1 < 2'), TRUE)
+        self.assertIs(self._execute('!verdadero'), FALSE)
+        self.assertIs(self._execute('si (falso) { 1 }'), NULL)
+        self.assertIs(self._execute(''), NULL)
+
+        closure = self._execute('funcion(x, y) { x + y }')
+        self.assertIsInstance(closure, CompiledClosure)
+        self.assertEqual(str(closure), 'funcion(x, y)')
+
+    def test_deep_recursion(self) -> None:
+        source = '''
+            variable cuenta = funcion(n) { si (n == 0) { 0 } si_no { 1 + cuenta(n - 1) } };
+            cuenta(20000);
+        '''
+
+        self.assertEqual(self._execute(source), 20000)
+
+        result = VM(max_depth=100).execute(self._parse(source))
+        self.assertIsInstance(result, Error)
+        self.assertEqual(result.message, 'Limite de recursion excedido')
+
+    def test_tail_calls_do_not_grow_the_stack(self) -> None:
+        source = '''
+        variable cuenta = funcion(n, total) {
+            si (n == 0) { retorna total; }
+            cuenta(n - 1, total + 1)
+        };
+        variable par = funcion(n) { si (n == 0) { verdadero } si_no { retorna impar(n - 1); } };
+        variable impar = funcion(n) { si (n == 0) { falso } si_no { par(n - 1) } };
+'''
+        vm = VM(max_depth=10)
+
+        self.assertEqual(vm.execute(self._parse(source + 'cuenta(100000, 0)')), 100000)
+        self.assertIs(vm.execute(self._parse(source + 'par(100001)')), FALSE)
+
+    def test_environment_persists(self) -> None:
+        environment = Environment()
+
+        self._execute('variable a = 5; variable f = funcion(x) { x * a };', environment)
+        self._execute('variable b = f(2);', environment)
+        self.assertEqual(self._execute('a + b', environment), 15)
+        self.assertEqual(environment.names, ['a', 'f', 'b'])
+
+    def test_closures_keep_their_constants(self) -> None:
+        # f se compilo con las constantes de la primera linea
+        vm = VM()
+        vm.execute(self._parse('variable f = funcion() { 42 }; variable g = funcion() { h };'))
+
+        self.assertEqual(vm.execute(self._parse('variable z = 7; f();')), 42)
+        self.assertEqual(vm.execute(self._parse('f() + 1')), 43)
+        error = vm.execute(self._parse('g()'))
+        self.assertIsInstance(error, Error)
+        self.assertEqual(error.message, 'Identificador no encontrado: h')
@@ -0,0 +1,16 @@
+from unittest import TestCase
+
+from lpp.ast import Program
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+class ParsingTestCase(TestCase):
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0, parser.errors)
+
+        return program